@@ -6,6 +6,7 @@ from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
 from namel3ss.module_loader import load_project
 from namel3ss.config.dotenv import apply_dotenv, load_dotenv_for_path
+from namel3ss.runtime.server.concurrency import compiled_cache_enabled
 from namel3ss.secrets import set_audit_root
 
 
@@ -21,6 +22,10 @@ def load_program(path_str: str, allow_legacy_type_aliases: bool = True) -> tuple
             )
         )
     apply_dotenv(load_dotenv_for_path(str(path)))
-    project = load_project(path, allow_legacy_type_aliases=allow_legacy_type_aliases)
+    project = load_project(
+        path,
+        allow_legacy_type_aliases=allow_legacy_type_aliases,
+        compiled_cache=compiled_cache_enabled(app_path=path),
+    )
     set_audit_root(project.app_path.parent)
     return project.program, project.sources
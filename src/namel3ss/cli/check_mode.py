@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from namel3ss.config.loader import load_config
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.render import format_error
 from namel3ss.lint.engine import lint_project
 from namel3ss.module_loader import load_project
 from namel3ss.cli.text_output import prepare_cli_text
+from namel3ss.runtime.server.concurrency import compiled_cache_enabled
 from namel3ss.validation_entrypoint import build_static_manifest
 from namel3ss.validation import ValidationWarning
 
@@ -14,7 +17,11 @@ def run_check(path: str, allow_legacy_type_aliases: bool = True) -> int:
     sections: list[str] = []
     warnings: list[ValidationWarning] = []
     try:
-        project = load_project(path, allow_legacy_type_aliases=allow_legacy_type_aliases)
+        project = load_project(
+            path,
+            allow_legacy_type_aliases=allow_legacy_type_aliases,
+            compiled_cache=compiled_cache_enabled(app_path=Path(path)),
+        )
         program_ir = project.program
         sources = project.sources
         sections.append("Parse: OK")
@@ -468,6 +468,7 @@ def _validate_performance_settings(*, app_path: Path, project_root: Path, force_
             cache_size=runtime_config.cache_size,
             enable_batching=runtime_config.enable_batching,
             metrics_endpoint=runtime_config.metrics_endpoint,
+            max_fan_out=runtime_config.max_fan_out,
         )
     program_ir, _sources = load_program(app_path.as_posix())
     require_performance_capability(
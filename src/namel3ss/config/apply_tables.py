@@ -101,6 +101,15 @@ def _apply_embedding_toml(config: AppConfig, table: Any) -> None:
             config.embedding.candidate_limit = int(candidate_limit)
         except (TypeError, ValueError) as err:
             raise Namel3ssError("embedding.candidate_limit must be an integer") from err
+    index = table.get("index")
+    if index is not None:
+        config.embedding.index = str(index)
+    index_probes = table.get("index_probes")
+    if index_probes is not None:
+        try:
+            config.embedding.index_probes = int(index_probes)
+        except (TypeError, ValueError) as err:
+            raise Namel3ssError("embedding.index_probes must be an integer") from err
 
 
 def _apply_persistence_toml(config: AppConfig, table: Any) -> None:
@@ -288,6 +297,15 @@ def _apply_performance_toml(config: AppConfig, table: Any) -> None:
         if value < 1:
             raise Namel3ssError("performance.max_concurrency must be >= 1")
         config.performance.max_concurrency = value
+    max_fan_out = table.get("max_fan_out")
+    if max_fan_out is not None:
+        try:
+            value = int(max_fan_out)
+        except (TypeError, ValueError) as err:
+            raise Namel3ssError("performance.max_fan_out must be an integer") from err
+        if value < 1:
+            raise Namel3ssError("performance.max_fan_out must be >= 1")
+        config.performance.max_fan_out = value
     cache_size = table.get("cache_size")
     if cache_size is not None:
         try:
@@ -297,6 +315,15 @@ def _apply_performance_toml(config: AppConfig, table: Any) -> None:
         if value < 0:
             raise Namel3ssError("performance.cache_size must be >= 0")
         config.performance.cache_size = value
+    cache_max_bytes = table.get("cache_max_bytes")
+    if cache_max_bytes is not None:
+        try:
+            value = int(cache_max_bytes)
+        except (TypeError, ValueError) as err:
+            raise Namel3ssError("performance.cache_max_bytes must be an integer") from err
+        if value < 0:
+            raise Namel3ssError("performance.cache_max_bytes must be >= 0")
+        config.performance.cache_max_bytes = value
     enable_batching = table.get("enable_batching")
     if enable_batching is not None:
         if not isinstance(enable_batching, bool):
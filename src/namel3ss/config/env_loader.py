@@ -24,9 +24,12 @@ ENV_EMBEDDING_VERSION = "N3_EMBEDDING_VERSION"
 ENV_EMBEDDING_DIMS = "N3_EMBEDDING_DIMS"
 ENV_EMBEDDING_PRECISION = "N3_EMBEDDING_PRECISION"
 ENV_EMBEDDING_CANDIDATE_LIMIT = "N3_EMBEDDING_CANDIDATE_LIMIT"
+ENV_EMBEDDING_INDEX = "N3_EMBEDDING_INDEX"
 ENV_PERFORMANCE_ASYNC_RUNTIME = "N3_ASYNC_RUNTIME"
 ENV_PERFORMANCE_MAX_CONCURRENCY = "N3_MAX_CONCURRENCY"
+ENV_PERFORMANCE_MAX_FAN_OUT = "N3_MAX_FAN_OUT"
 ENV_PERFORMANCE_CACHE_SIZE = "N3_CACHE_SIZE"
+ENV_PERFORMANCE_CACHE_MAX_BYTES = "N3_CACHE_MAX_BYTES"
 ENV_PERFORMANCE_ENABLE_BATCHING = "N3_ENABLE_BATCHING"
 ENV_PERFORMANCE_METRICS_ENDPOINT = "N3_PERFORMANCE_METRICS_ENDPOINT"
 ENV_DETERMINISM_SEED = "N3_DETERMINISM_SEED"
@@ -35,6 +38,8 @@ ENV_DETERMINISM_REDACT_USER_DATA = "N3_REDACT_USER_DATA"
 ENV_AUDIT_POLICY = "N3_AUDIT_POLICY"
 RESERVED_TRUE_VALUES = {"1", "true", "yes", "on"}
 RESERVED_FALSE_VALUES = {"0", "false", "no", "off"}
+# Every variable read by apply_env_overrides starts with one of these.
+CONFIG_ENV_PREFIXES = ("N3_", "NAMEL3SS_")
 
 
 def apply_env_overrides(config: AppConfig) -> bool:
@@ -111,6 +116,10 @@ def apply_env_overrides(config: AppConfig) -> bool:
         except ValueError as err:
             raise Namel3ssError("N3_EMBEDDING_CANDIDATE_LIMIT must be an integer") from err
         used = True
+    embedding_index = os.getenv(ENV_EMBEDDING_INDEX)
+    if embedding_index:
+        config.embedding.index = embedding_index
+        used = True
     async_runtime = os.getenv(ENV_PERFORMANCE_ASYNC_RUNTIME)
     if async_runtime is not None:
         token = async_runtime.strip().lower()
@@ -131,6 +140,16 @@ def apply_env_overrides(config: AppConfig) -> bool:
             raise Namel3ssError("N3_MAX_CONCURRENCY must be >= 1")
         config.performance.max_concurrency = value
         used = True
+    max_fan_out = os.getenv(ENV_PERFORMANCE_MAX_FAN_OUT)
+    if max_fan_out:
+        try:
+            value = int(max_fan_out)
+        except ValueError as err:
+            raise Namel3ssError("N3_MAX_FAN_OUT must be an integer") from err
+        if value < 1:
+            raise Namel3ssError("N3_MAX_FAN_OUT must be >= 1")
+        config.performance.max_fan_out = value
+        used = True
     cache_size = os.getenv(ENV_PERFORMANCE_CACHE_SIZE)
     if cache_size:
         try:
@@ -141,6 +160,16 @@ def apply_env_overrides(config: AppConfig) -> bool:
             raise Namel3ssError("N3_CACHE_SIZE must be >= 0")
         config.performance.cache_size = value
         used = True
+    cache_max_bytes = os.getenv(ENV_PERFORMANCE_CACHE_MAX_BYTES)
+    if cache_max_bytes:
+        try:
+            value = int(cache_max_bytes)
+        except ValueError as err:
+            raise Namel3ssError("N3_CACHE_MAX_BYTES must be an integer") from err
+        if value < 0:
+            raise Namel3ssError("N3_CACHE_MAX_BYTES must be >= 0")
+        config.performance.cache_max_bytes = value
+        used = True
     enable_batching = os.getenv(ENV_PERFORMANCE_ENABLE_BATCHING)
     if enable_batching is not None:
         token = enable_batching.strip().lower()
@@ -376,8 +405,11 @@ __all__ = [
     "ENV_EMBEDDING_DIMS",
     "ENV_EMBEDDING_PRECISION",
     "ENV_EMBEDDING_CANDIDATE_LIMIT",
+    "ENV_EMBEDDING_INDEX",
     "ENV_PERFORMANCE_ASYNC_RUNTIME",
     "ENV_PERFORMANCE_MAX_CONCURRENCY",
+    "ENV_PERFORMANCE_MAX_FAN_OUT",
+    "ENV_PERFORMANCE_CACHE_MAX_BYTES",
     "ENV_PERFORMANCE_CACHE_SIZE",
     "ENV_PERFORMANCE_ENABLE_BATCHING",
     "ENV_PERFORMANCE_METRICS_ENDPOINT",
@@ -387,6 +419,7 @@ __all__ = [
     "ENV_AUDIT_POLICY",
     "RESERVED_TRUE_VALUES",
     "RESERVED_FALSE_VALUES",
+    "CONFIG_ENV_PREFIXES",
     "apply_env_overrides",
     "normalize_target",
 ]
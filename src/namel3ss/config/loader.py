@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from namel3ss.config.dotenv import load_dotenv_for_path
-from namel3ss.config.loader_base import CONFIG_FILENAME, load_config, resolve_config
+from namel3ss.config.loader_base import CONFIG_FILENAME, clear_config_cache, load_config, resolve_config
 from namel3ss.config.types import ConfigSource
 
 __all__ = [
     "load_config",
     "resolve_config",
+    "clear_config_cache",
     "ConfigSource",
     "CONFIG_FILENAME",
     "load_dotenv_for_path",
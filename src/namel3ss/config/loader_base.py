@@ -1,18 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 
 from namel3ss.config.apply_tables import _apply_toml_config
 from namel3ss.config.dotenv import apply_dotenv, load_dotenv_for_path
-from namel3ss.config.env_loader import apply_env_overrides
+from namel3ss.config.env_loader import CONFIG_ENV_PREFIXES, apply_env_overrides
 from namel3ss.config.model import AppConfig
+from namel3ss.config.snapshot import freeze_config
 from namel3ss.config.toml_parser import _parse_toml
 from namel3ss.config.types import ConfigSource
 
 CONFIG_FILENAME = "namel3ss.toml"
+CONFIG_CACHE_LIMIT = 32
+# Files changed this recently may share an mtime with a later write, so their bytes are compared too.
+_RACY_WINDOW_NS = 2_000_000_000
 
 
 def load_config(app_path: Path | None = None, root: Path | None = None) -> AppConfig:
+    """Return the shared read-only config snapshot; copy.deepcopy it before editing."""
     config, _ = resolve_config(app_path=app_path, root=root)
     return config
 
@@ -21,9 +32,42 @@ def resolve_config(
     app_path: Path | None = None,
     root: Path | None = None,
 ) -> tuple[AppConfig, list[ConfigSource]]:
+    project_root = _cached_root(app_path, root)
+    key = project_root.as_posix() if project_root else None
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+    if entry is not None and entry.is_current():
+        return entry.config, list(entry.sources)
+    files = _watched_files(project_root)
+    stamps = {path: _FileStamp.capture(path) for path in files}
+    config, sources, dotenv_values = _read_config(project_root)
+    entry = _CachedConfig(
+        config=freeze_config(config),
+        sources=tuple(sources),
+        stamps=stamps,
+        dotenv_values=dotenv_values,
+        env=_env_fingerprint(),
+    )
+    with _cache_lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > CONFIG_CACHE_LIMIT:
+            _cache.popitem(last=False)
+    return entry.config, list(entry.sources)
+
+
+def clear_config_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _resolved_roots.clear()
+
+
+def _read_config(project_root: Path | None) -> tuple[AppConfig, list[ConfigSource], dict[str, str]]:
     config = AppConfig()
     sources: list[ConfigSource] = []
-    project_root = _resolve_root(app_path, root)
+    dotenv_values: dict[str, str] = {}
     if project_root:
         toml_path = project_root / CONFIG_FILENAME
         if toml_path.exists():
@@ -32,16 +76,92 @@ def resolve_config(
             sources.append(ConfigSource(kind="toml", path=toml_path.as_posix()))
         env_path = project_root / ".env"
         if env_path.exists():
-            apply_dotenv(load_dotenv_for_path(str(env_path)))
-            sources.append(ConfigSource(kind="dotenv", path=env_path.as_posix()))
-    elif app_path:
-        env_path = Path(app_path).resolve().parent / ".env"
-        if env_path.exists():
-            apply_dotenv(load_dotenv_for_path(str(app_path)))
+            dotenv_values = load_dotenv_for_path(str(env_path))
+            apply_dotenv(dotenv_values)
             sources.append(ConfigSource(kind="dotenv", path=env_path.as_posix()))
     if apply_env_overrides(config):
         sources.append(ConfigSource(kind="env", path=None))
-    return config, sources
+    return config, sources, dotenv_values
+
+
+@dataclass(frozen=True)
+class _FileStamp:
+    stat: tuple[int, ...] | None
+    digest: str | None
+
+    @classmethod
+    def capture(cls, path: Path) -> "_FileStamp":
+        stat = _stat_key(path)
+        racy = stat is not None and time.time_ns() - stat[0] < _RACY_WINDOW_NS
+        return cls(stat=stat, digest=_file_digest(path) if racy else None)
+
+    def matches(self, path: Path) -> bool:
+        if _stat_key(path) != self.stat:
+            return False
+        return self.digest is None or _file_digest(path) == self.digest
+
+
+@dataclass
+class _CachedConfig:
+    config: AppConfig
+    sources: tuple[ConfigSource, ...]
+    stamps: dict[Path, _FileStamp]
+    dotenv_values: dict[str, str]
+    env: tuple[tuple[str, str], ...]
+
+    def is_current(self) -> bool:
+        if not all(stamp.matches(path) for path, stamp in self.stamps.items()):
+            return False
+        # Uncached loads apply .env on every call; keep doing that so removed variables come back.
+        apply_dotenv(self.dotenv_values)
+        return _env_fingerprint() == self.env
+
+
+_cache: OrderedDict[str | None, _CachedConfig] = OrderedDict()
+_cache_lock = threading.Lock()
+_resolved_roots: dict[tuple[str, bool, str], Path | None] = {}
+_RESOLVED_ROOT_LIMIT = 256
+
+
+def _watched_files(project_root: Path | None) -> list[Path]:
+    if project_root is None:
+        return []
+    return [project_root / CONFIG_FILENAME, project_root / ".env"]
+
+
+def _stat_key(path: Path) -> tuple[int, ...] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns)
+
+
+def _file_digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _env_fingerprint() -> tuple[tuple[str, str], ...]:
+    environ = os.environ
+    return tuple(sorted((name, environ[name]) for name in environ if name.startswith(CONFIG_ENV_PREFIXES)))
+
+
+def _cached_root(app_path: Path | None, root: Path | None) -> Path | None:
+    raw = root or app_path
+    if not raw:
+        return None
+    text = os.fspath(raw)
+    lookup = (text, bool(root), "" if os.path.isabs(text) else os.getcwd())
+    resolved = _resolved_roots.get(lookup)
+    if resolved is None:
+        resolved = _resolve_root(app_path, root)
+        if len(_resolved_roots) >= _RESOLVED_ROOT_LIMIT:
+            _resolved_roots.clear()
+        _resolved_roots[lookup] = resolved
+    return resolved
 
 
 def _resolve_root(app_path: Path | None, root: Path | None) -> Path | None:
@@ -52,4 +172,4 @@ def _resolve_root(app_path: Path | None, root: Path | None) -> Path | None:
     return None
 
 
-__all__ = ["load_config", "resolve_config", "ConfigSource", "CONFIG_FILENAME", "_resolve_root"]
+__all__ = ["load_config", "resolve_config", "clear_config_cache", "ConfigSource", "CONFIG_FILENAME", "_resolve_root"]
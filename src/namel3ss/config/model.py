@@ -44,6 +44,8 @@ class EmbeddingConfig:
     dims: int = 64
     precision: int = 6
     candidate_limit: int = 50
+    index: str = "exact"
+    index_probes: int = 8
 
 
 @dataclass
@@ -99,7 +101,9 @@ class MemoryPacksConfig:
 class PerformanceConfig:
     async_runtime: bool = False
     max_concurrency: int = 8
+    max_fan_out: int = 4
     cache_size: int = 128
+    cache_max_bytes: int = 0
     enable_batching: bool = False
     metrics_endpoint: str = "/api/metrics"
 
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import FrozenInstanceError, fields, is_dataclass
+
+from namel3ss.config.model import AppConfig
+
+
+_frozen_types: dict[type, type] = {}
+_frozen_lock = threading.Lock()
+
+
+def freeze_config(config: AppConfig) -> AppConfig:
+    """Make config and its nested sections read-only in place.
+
+    Lists and dicts inside sections become read-only list and dict subclasses.
+    Frozen values still pass isinstance checks. copy.deepcopy, pickling and
+    dataclasses.replace return plain, editable sections and containers.
+    """
+    _freeze(config)
+    return config
+
+
+def is_frozen_config(value: object) -> bool:
+    return type(value) in _frozen_types.values()
+
+
+def _freeze(value: object) -> object:
+    if isinstance(value, (_FrozenList, _FrozenDict)):
+        return value
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    if type(value) is tuple:
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if not is_dataclass(value) or isinstance(value, type) or is_frozen_config(value):
+        return value
+    for item in fields(value):
+        if item.name in value.__dict__:
+            value.__dict__[item.name] = _freeze(value.__dict__[item.name])
+    value.__class__ = _frozen_type(type(value))
+    return value
+
+
+def _blocked_container(self, *args, **kwargs):
+    raise TypeError(f"cannot modify a {type(self).__mro__[1].__name__} of a shared config snapshot; copy.deepcopy it first")
+
+
+class _FrozenList(list):
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _blocked_container
+    append = extend = insert = pop = remove = clear = sort = reverse = _blocked_container
+
+    def __reduce_ex__(self, protocol: int):
+        return list, (list(self),)
+
+
+class _FrozenDict(dict):
+    __setitem__ = __delitem__ = __ior__ = _blocked_container
+    pop = popitem = clear = update = setdefault = _blocked_container
+
+    def __reduce_ex__(self, protocol: int):
+        return dict, (dict(self),)
+
+
+def _frozen_type(cls: type) -> type:
+    with _frozen_lock:
+        frozen = _frozen_types.get(cls)
+        if frozen is None:
+            frozen = type(
+                cls.__name__,
+                (cls,),
+                {
+                    "__new__": _editable_new,
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__,
+                    "__setattr__": _blocked_setattr,
+                    "__delattr__": _blocked_delattr,
+                    "__reduce_ex__": _editable_reduce,
+                },
+            )
+            _frozen_types[cls] = frozen
+        return frozen
+
+
+def _blocked_setattr(self, name: str, value: object) -> None:
+    raise FrozenInstanceError(f"cannot assign to field '{name}' of a shared config snapshot; copy.deepcopy it first")
+
+
+def _blocked_delattr(self, name: str) -> None:
+    raise FrozenInstanceError(f"cannot delete field '{name}' of a shared config snapshot")
+
+
+def _editable_new(cls: type, *args, **kwargs) -> object:
+    # type(section)(...) and dataclasses.replace build a plain, editable section.
+    return cls.__mro__[1](*map(_thaw, args), **{key: _thaw(value) for key, value in kwargs.items()})
+
+
+def _thaw(value: object) -> object:
+    if isinstance(value, _FrozenList):
+        return [_thaw(item) for item in value]
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+def _editable_reduce(self, protocol: int):
+    return _rebuild, (type(self).__mro__[1], dict(self.__dict__))
+
+
+def _rebuild(cls: type, state: dict) -> object:
+    value = object.__new__(cls)
+    value.__dict__.update(state)
+    return value
+
+
+__all__ = ["freeze_config", "is_frozen_config"]
@@ -40,6 +40,14 @@ def build_index(project: ProjectLoadResult) -> ProjectIndex:
     return ProjectIndex(root=root, files=files, definitions=definitions, nodes=nodes, exports=exports)
 
 
+def build_source_index(path: Path, source: str) -> ProjectIndex:
+    """Index one source file on its own, e.g. a document open in an editor."""
+    path = Path(path)
+    file_index = _scan_file(path=path, source=source, module_name=None, origin="app", exports={})
+    definitions = {(item.module, item.kind, item.name): item for item in file_index.definitions}
+    return ProjectIndex(root=path.parent, files={path: file_index}, definitions=definitions, nodes={}, exports={})
+
+
 def _build_node_index(project: ProjectLoadResult) -> Dict[Tuple[str | None, str, str], ast.Node]:
     nodes: Dict[Tuple[str | None, str, str], ast.Node] = {}
     app = project.app_ast
@@ -120,4 +128,4 @@ def resolve_reference(
     return None, None
 
 
-__all__ = ["build_index", "find_occurrence", "resolve_reference"]
+__all__ = ["build_index", "build_source_index", "find_occurrence", "resolve_reference"]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from namel3ss.editor.commands import build_index, find_occurrence, resolve_reference
+from namel3ss.editor.commands import build_index, build_source_index, find_occurrence, resolve_reference
 from namel3ss.editor.io import FileIndex, ProjectIndex, SymbolDefinition, SymbolReference, TextSpan
 from namel3ss.editor.render import display_path
 
@@ -11,6 +11,7 @@ __all__ = [
     "SymbolReference",
     "TextSpan",
     "build_index",
+    "build_source_index",
     "find_occurrence",
     "resolve_reference",
     "display_path",
@@ -4,6 +4,7 @@ from namel3ss.config.loader import load_config
 from namel3ss.config.model import AppConfig
 from namel3ss.ingestion.hash import hash_chunk
 from namel3ss.runtime.performance.batching import batched
+from namel3ss.runtime.embeddings.ann import refresh_ivf_index
 from namel3ss.runtime.embeddings.service import embed_text, embedding_enabled, resolve_embedding_model
 from namel3ss.runtime.embeddings.store import EmbeddingRecord, get_embedding_store
 
@@ -73,6 +74,14 @@ def store_chunk_embeddings(
             )
     if records:
         store.write_records(records)
+        # Queries only read the IVF index, so it is kept current as vectors are stored.
+        if model.index == "ivf" or store.ann_build_id(model.model_id) is not None:
+            refresh_ivf_index(
+                store,
+                model_id=model.model_id,
+                dims=model.dims,
+                chunk_hashes=[record.chunk_hash for record in records if record.status == "ok"],
+            )
     return {
         "enabled": True,
         "stored": len(records),
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from namel3ss.retrieval.ordering import coerce_int
+
+
+def index_segments(index: object, entries: list) -> dict[str, dict] | None:
+    """Per-upload spans of state.index.chunks, or None when the manifest is missing or stale.
+
+    The manifest maps upload ids to {"start", "count"} in chunk order. Apps may
+    rewrite state.index.chunks directly, so spans are checked against the chunk
+    count and the upload id at both ends of every span.
+    """
+    if not isinstance(index, dict) or not isinstance(entries, list):
+        return None
+    manifest = index.get("segments")
+    if not isinstance(manifest, dict):
+        return None
+    spans: dict[str, dict] = {}
+    cursor = 0
+    for upload_id, span in dict.items(manifest):
+        start, count = _span(span)
+        if start != cursor or count <= 0 or cursor + count > len(entries):
+            return None
+        if _upload_at(entries, start) != upload_id or _upload_at(entries, start + count - 1) != upload_id:
+            return None
+        spans[upload_id] = {"start": start, "count": count}
+        cursor += count
+    if cursor != len(entries):
+        return None
+    return spans
+
+
+def build_segments(entries: list) -> tuple[list, dict[str, dict]]:
+    """Group chunks by upload id, keeping the order uploads first appear in."""
+    groups: dict[str, list] = {}
+    for entry in entries:
+        groups.setdefault(_upload_id(entry), []).append(entry)
+    ordered: list = []
+    manifest: dict[str, dict] = {}
+    for upload_id, group in groups.items():
+        manifest[upload_id] = {"start": len(ordered), "count": len(group)}
+        ordered.extend(group)
+    return ordered, manifest
+
+
+def remove_segment(entries: list, manifest: dict[str, dict], upload_id: str) -> dict[str, dict]:
+    """Delete one upload's span in place; ``manifest`` must come from index_segments or build_segments."""
+    span = manifest.get(upload_id)
+    if span is None:
+        return dict(manifest)
+    start, count = span["start"], span["count"]
+    del entries[start : start + count]
+    shifted: dict[str, dict] = {}
+    for key, value in manifest.items():
+        if key == upload_id:
+            continue
+        key_start = value["start"] - count if value["start"] > start else value["start"]
+        shifted[key] = {"start": key_start, "count": value["count"]}
+    return shifted
+
+
+def _span(value: object) -> tuple[int, int]:
+    if not isinstance(value, dict):
+        return -1, 0
+    start = coerce_int(dict.get(value, "start"))
+    count = coerce_int(dict.get(value, "count"))
+    if start is None or count is None:
+        return -1, 0
+    return start, count
+
+
+def _upload_at(entries: list, position: int) -> str:
+    return _upload_id(list.__getitem__(entries, position))
+
+
+def _upload_id(entry: object) -> str:
+    if not isinstance(entry, dict):
+        return ""
+    return str(dict.get(entry, "upload_id") or "")
+
+
+__all__ = ["build_segments", "index_segments", "remove_segment"]
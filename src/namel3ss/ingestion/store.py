@@ -4,6 +4,7 @@ from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
 from namel3ss.ingestion.hash import hash_chunk
 from namel3ss.ingestion.keywords import normalize_keywords
+from namel3ss.ingestion.segments import build_segments, index_segments, remove_segment
 
 
 def store_report(state: dict, *, upload_id: str, report: dict) -> None:
@@ -25,6 +26,9 @@ def update_index(
     chunks: list[dict],
     low_quality: bool,
 ) -> None:
+    # Imported here: keyword_index needs ingestion.keywords, whose package imports this module.
+    from namel3ss.retrieval.keyword_index import refresh_segment_index
+
     if not isinstance(state, dict):
         raise Namel3ssError(_state_type_message())
     index = state.get("index")
@@ -37,7 +41,7 @@ def update_index(
         entries = []
     if not isinstance(entries, list):
         raise Namel3ssError(_index_chunks_shape_message())
-    filtered = [entry for entry in entries if entry.get("upload_id") != upload_id]
+    segment: list[dict] = []
     for chunk in chunks:
         document_id = _string_value(chunk.get("document_id"))
         source_name = _string_value(chunk.get("source_name"))
@@ -85,12 +89,21 @@ def update_index(
             "keywords": keywords,
             "highlight": highlight,
         }
-        filtered.append(entry)
-    index["chunks"] = filtered
+        segment.append(entry)
+    entries, manifest = _segmented(index, entries)
+    manifest = remove_segment(entries, manifest, upload_id)
+    if segment:
+        manifest[upload_id] = {"start": len(entries), "count": len(segment)}
+        entries.extend(segment)
+    index["chunks"] = entries
+    index["segments"] = manifest
     state["index"] = index
+    refresh_segment_index(upload_id, segment)
 
 
 def drop_index(state: dict, *, upload_id: str) -> None:
+    from namel3ss.retrieval.keyword_index import forget_segment_index
+
     if not isinstance(state, dict):
         raise Namel3ssError(_state_type_message())
     index = state.get("index")
@@ -99,7 +112,18 @@ def drop_index(state: dict, *, upload_id: str) -> None:
     entries = index.get("chunks")
     if not isinstance(entries, list):
         return
-    index["chunks"] = [entry for entry in entries if entry.get("upload_id") != upload_id]
+    entries, manifest = _segmented(index, entries)
+    index["segments"] = remove_segment(entries, manifest, upload_id)
+    index["chunks"] = entries
+    forget_segment_index(upload_id)
+
+
+def _segmented(index: dict, entries: list) -> tuple[list, dict[str, dict]]:
+    # Chunks are grouped per upload so one document's chunks are a single slice.
+    manifest = index_segments(index, entries)
+    if manifest is not None:
+        return entries, manifest
+    return build_segments(entries)
 
 
 def _state_type_message() -> str:
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import List
+from typing import Callable, Iterable, Iterator, List
 
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
@@ -38,6 +39,14 @@ _ESCAPE_TABLE = {
 }
 
 
+@dataclass(frozen=True)
+class LineBlock:
+    start: int
+    count: int
+    tokens: tuple[Token, ...]
+    depth: int
+
+
 class Lexer:
     """Line-aware lexer with indentation and string escape support."""
 
@@ -57,10 +66,26 @@ class Lexer:
         return self._tokenize_python()
 
     def _tokenize_python(self) -> List[Token]:
+        lines = self.source.splitlines()
+        return assemble_tokens(self.scan_blocks(lines), len(lines))
+
+    def scan_blocks(
+        self,
+        lines: list[str],
+        start: int = 0,
+        *,
+        stop_at: Callable[[int], bool] | None = None,
+    ) -> Iterator[LineBlock]:
+        """Scan lines into blocks that each begin at an unindented line.
+
+        Indentation always returns to zero at a block start, so a block scans the
+        same on its own as in the whole file. ``start`` must be 0 or a block start;
+        scanning ends before any later block start where ``stop_at`` is true.
+        """
         tokens: List[Token] = []
         indent_stack = [0]
-        lines = self.source.splitlines()
-        idx = 0
+        block_start = start
+        idx = start
 
         while idx < len(lines):
             raw_line = lines[idx]
@@ -70,6 +95,13 @@ class Lexer:
 
             indent = self._leading_spaces(raw_line)
             line_no = idx + 1
+            if indent == 0 and idx > block_start:
+                yield LineBlock(block_start, idx - block_start, tuple(tokens), len(indent_stack) - 1)
+                if stop_at is not None and stop_at(idx):
+                    return
+                tokens = []
+                indent_stack = [0]
+                block_start = idx
             if indent > indent_stack[-1]:
                 tokens.append(Token("INDENT", None, line_no, 1))
                 indent_stack.append(indent)
@@ -90,12 +122,7 @@ class Lexer:
             tokens.append(Token("NEWLINE", None, end_line_idx + 1, len(end_line) + 1))
             idx = end_line_idx + 1
 
-        while len(indent_stack) > 1:
-            indent_stack.pop()
-            tokens.append(Token("DEDENT", None, len(lines), 1))
-
-        tokens.append(Token("EOF", None, len(lines) + 1, 1))
-        return tokens
+        yield LineBlock(block_start, len(lines) - block_start, tuple(tokens), len(indent_stack) - 1)
 
     @staticmethod
     def _leading_spaces(text: str) -> int:
@@ -290,6 +317,20 @@ class Lexer:
         return raw
 
 
+def assemble_tokens(blocks: Iterable[LineBlock], line_count: int) -> List[Token]:
+    """Join scanned blocks into the token list of the whole file."""
+    tokens: List[Token] = []
+    depth = 0
+    for block in blocks:
+        # Indents left open by the previous block close on this block's first line.
+        tokens.extend(Token("DEDENT", None, block.start + 1, 1) for _ in range(depth))
+        tokens.extend(block.tokens)
+        depth = block.depth
+    tokens.extend(Token("DEDENT", None, line_count, 1) for _ in range(depth))
+    tokens.append(Token("EOF", None, line_count + 1, 1))
+    return tokens
+
+
 def _is_identifier_text(value: str) -> bool:
     if not value:
         return False
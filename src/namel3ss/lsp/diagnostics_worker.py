@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+DEFAULT_DIAGNOSTICS_DELAY = 0.15
+
+Snapshot = tuple[int, int | None, str]
+
+
+class DiagnosticsWorker:
+    """Computes diagnostics on a background thread for the newest revision of each document.
+
+    ``schedule`` replaces any pending job for the document and restarts its
+    debounce delay, so fast typing produces one parse once the edits settle.
+    ``snapshot`` returns the current ``(revision, version, text)`` of a document,
+    or None once it is closed; a result is published only if the revision it was
+    computed for is still current. ``close`` computes whatever is still pending
+    without waiting for the delay.
+    """
+
+    def __init__(
+        self,
+        *,
+        snapshot: Callable[[str], Snapshot | None],
+        compute: Callable[[str], list],
+        publish: Callable[[str, int | None, list], None],
+        delay: float = DEFAULT_DIAGNOSTICS_DELAY,
+    ) -> None:
+        self._snapshot = snapshot
+        self._compute = compute
+        self._publish = publish
+        self._delay = max(0.0, float(delay))
+        self._pending: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, uri: str, revision: int) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._pending[uri] = (revision, time.monotonic() + self._delay)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="namel3ss-lsp-diagnostics", daemon=True)
+                self._thread.start()
+            self._lock.notify_all()
+
+    def cancel(self, uri: str) -> None:
+        with self._lock:
+            self._pending.pop(uri, None)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            self._lock.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            uri, revision = job
+            snapshot = self._snapshot(uri)
+            if snapshot is None or snapshot[0] != revision:
+                continue
+            diagnostics = self._compute(snapshot[2])
+            current = self._snapshot(uri)
+            if current is None or current[0] != revision:
+                # Edited while parsing; the newer revision is already scheduled.
+                continue
+            self._publish(uri, snapshot[1], diagnostics)
+
+    def _next_job(self) -> tuple[str, int] | None:
+        with self._lock:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._lock.wait()
+                    continue
+                uri, (revision, due) = min(self._pending.items(), key=lambda item: item[1][1])
+                remaining = 0.0 if self._closed else due - time.monotonic()
+                if remaining <= 0:
+                    del self._pending[uri]
+                    return uri, revision
+                self._lock.wait(remaining)
+
+
+__all__ = ["DEFAULT_DIAGNOSTICS_DELAY", "DiagnosticsWorker"]
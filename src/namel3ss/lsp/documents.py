@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from namel3ss.editor.index import ProjectIndex, build_source_index
+
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+class TextDocument:
+    """An open document kept as a line buffer so range edits only touch the lines they cover.
+
+    Positions follow the LSP default encoding: zero-based lines and UTF-16 code
+    unit offsets. ``revision`` increases with every change, even when the client
+    sends no version, and the symbol index is cached until the next change.
+    """
+
+    def __init__(self, uri: str, text: str, *, version: int | None = None) -> None:
+        self.uri = uri
+        self.path = uri_to_path(uri)
+        self.version = version
+        self.revision = 0
+        self._lines = _split_lines(text)
+        self._text: str | None = text
+        self._symbols: ProjectIndex | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._lines)
+        return self._text
+
+    def line(self, index: int) -> str:
+        if index < 0 or index >= len(self._lines):
+            return ""
+        return _strip_line_break(self._lines[index])
+
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def apply_changes(self, changes: list, *, version: int | None = None) -> None:
+        for change in changes:
+            if not isinstance(change, dict):
+                continue
+            text = str(change.get("text") or "")
+            edit_range = change.get("range")
+            if isinstance(edit_range, dict):
+                self._apply_range(edit_range, text)
+            else:
+                self._lines = _split_lines(text)
+        self._text = None
+        self._symbols = None
+        self.revision += 1
+        if version is not None:
+            self.version = version
+
+    def symbols(self) -> ProjectIndex:
+        if self._symbols is None:
+            self._symbols = build_source_index(self.path, self.text)
+        return self._symbols
+
+    def to_source_position(self, position: object) -> tuple[int, int]:
+        """One-based line and column, as used by lexer tokens and the symbol index."""
+        line, character = _position(position)
+        return line + 1, _char_index(self.line(line), character) + 1
+
+    def to_lsp_position(self, line: int, column: int) -> dict[str, int]:
+        text = self.line(line - 1)
+        return {"line": max(0, line - 1), "character": _utf16_length(text[: max(0, column - 1)])}
+
+    def _apply_range(self, edit_range: dict, text: str) -> None:
+        start = self._clamp(_position(edit_range.get("start")))
+        end = self._clamp(_position(edit_range.get("end")))
+        if end < start:
+            start, end = end, start
+        lines = self._lines
+        head = lines[start[0]] if start[0] < len(lines) else ""
+        tail = lines[end[0]] if end[0] < len(lines) else ""
+        prefix = head[: _char_index(_strip_line_break(head), start[1])]
+        suffix = tail[_char_index(_strip_line_break(tail), end[1]) :]
+        lines[start[0] : end[0] + 1] = _split_lines(prefix + text + suffix)
+
+    def _clamp(self, position: tuple[int, int]) -> tuple[int, int]:
+        lines = self._lines
+        if position[0] < len(lines):
+            return position
+        if lines and _strip_line_break(lines[-1]) == lines[-1]:
+            # Past the end of a document without a final line break: its last character.
+            return len(lines) - 1, len(lines[-1]) * 2
+        return len(lines), 0
+
+
+def uri_to_path(uri: str) -> Path:
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return Path(unquote(parsed.path))
+    return Path(uri)
+
+
+def _split_lines(text: str) -> list[str]:
+    lines: list[str] = []
+    start = 0
+    for match in _LINE_BREAK.finditer(text):
+        lines.append(text[start : match.end()])
+        start = match.end()
+    if start < len(text):
+        lines.append(text[start:])
+    return lines
+
+
+def _strip_line_break(line: str) -> str:
+    if line.endswith("\r\n"):
+        return line[:-2]
+    if line.endswith(("\n", "\r")):
+        return line[:-1]
+    return line
+
+
+def _position(value: object) -> tuple[int, int]:
+    if not isinstance(value, dict):
+        return 0, 0
+    return max(0, int(value.get("line") or 0)), max(0, int(value.get("character") or 0))
+
+
+def _char_index(line: str, utf16_offset: int) -> int:
+    """Index into ``line`` for a UTF-16 offset, clamped to the end of the line."""
+    if line.isascii():
+        return min(utf16_offset, len(line))
+    units = 0
+    for index, char in enumerate(line):
+        if units >= utf16_offset:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _utf16_length(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return sum(2 if ord(char) > 0xFFFF else 1 for char in text)
+
+
+__all__ = ["TextDocument", "uri_to_path"]
@@ -2,32 +2,65 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 from typing import BinaryIO
 
+from namel3ss.editor.index import find_occurrence
+from namel3ss.editor.navigation import get_definition
+from namel3ss.editor.rename import rename_symbol
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.lang.keywords import KEYWORD_LIST
+from namel3ss.lsp.diagnostics_worker import DiagnosticsWorker
+from namel3ss.lsp.documents import TextDocument
 from namel3ss.parser.core import Parser
 
 
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+REQUEST_FAILED = -32803
+
+
 class LspState:
     def __init__(self) -> None:
-        self.documents: dict[str, str] = {}
+        self.documents: dict[str, TextDocument] = {}
         self.shutting_down = False
+        self.diagnostics: DiagnosticsWorker | None = None
+        self.lock = threading.Lock()
+
+    def snapshot(self, uri: str) -> tuple[int, int | None, str] | None:
+        with self.lock:
+            document = self.documents.get(uri)
+            if document is None:
+                return None
+            return document.revision, document.version, document.text
 
 
 def serve_stdio(reader: BinaryIO, writer: BinaryIO) -> None:
     state = LspState()
-    while True:
-        message = _read_message(reader)
-        if message is None:
-            break
-        response, notifications = _handle_message(state, message)
-        if response is not None:
-            _write_message(writer, response)
-        for note in notifications:
-            _write_message(writer, note)
-        if state.shutting_down:
-            break
+    write_lock = threading.Lock()
+
+    def send(payload: dict) -> None:
+        with write_lock:
+            _write_message(writer, payload)
+
+    state.diagnostics = DiagnosticsWorker(
+        snapshot=state.snapshot,
+        compute=diagnostics_for_text,
+        publish=lambda uri, version, diagnostics: send(_publish_diagnostics(uri, diagnostics, version)),
+    )
+    try:
+        while True:
+            message = _read_message(reader)
+            if message is None:
+                break
+            response, notifications = _handle_message(state, message)
+            if response is not None:
+                send(response)
+            for note in notifications:
+                send(note)
+            if state.shutting_down:
+                break
+    finally:
+        state.diagnostics.close()
 
 
 def diagnostics_for_text(source: str) -> list[dict[str, object]]:
@@ -76,7 +109,7 @@ def _handle_message(state: LspState, message: dict) -> tuple[dict | None, list[d
                 "id": msg_id,
                 "result": {
                     "capabilities": {
-                        "textDocumentSync": 1,
+                        "textDocumentSync": TEXT_DOCUMENT_SYNC_INCREMENTAL,
                         "completionProvider": {"resolveProvider": False},
                         "definitionProvider": True,
                         "renameProvider": True,
@@ -100,8 +133,9 @@ def _handle_message(state: LspState, message: dict) -> tuple[dict | None, list[d
         if isinstance(text_doc, dict):
             uri = str(text_doc.get("uri") or "")
             text = str(text_doc.get("text") or "")
-            state.documents[uri] = text
-            notifications.append(_publish_diagnostics(uri, text))
+            with state.lock:
+                state.documents[uri] = TextDocument(uri, text, version=_version(text_doc))
+            notifications.extend(_schedule_diagnostics(state, uri))
         return None, notifications
 
     if method == "textDocument/didChange":
@@ -109,11 +143,20 @@ def _handle_message(state: LspState, message: dict) -> tuple[dict | None, list[d
         changes = params.get("contentChanges") if isinstance(params, dict) else None
         if isinstance(text_doc, dict) and isinstance(changes, list) and changes:
             uri = str(text_doc.get("uri") or "")
-            latest = changes[-1]
-            if isinstance(latest, dict):
-                text = str(latest.get("text") or "")
-                state.documents[uri] = text
-                notifications.append(_publish_diagnostics(uri, text))
+            with state.lock:
+                document = state.documents.get(uri)
+                if document is None:
+                    document = state.documents[uri] = TextDocument(uri, "")
+                document.apply_changes(changes, version=_version(text_doc))
+            notifications.extend(_schedule_diagnostics(state, uri))
+        return None, notifications
+
+    if method == "textDocument/didClose":
+        uri = _uri_from_params(params)
+        with state.lock:
+            state.documents.pop(uri, None)
+        if state.diagnostics is not None:
+            state.diagnostics.cancel(uri)
         return None, notifications
 
     if method == "textDocument/completion":
@@ -132,25 +175,28 @@ def _handle_message(state: LspState, message: dict) -> tuple[dict | None, list[d
 
     if method == "textDocument/definition":
         uri = _uri_from_params(params)
-        source = state.documents.get(uri, "")
-        position = params.get("position") if isinstance(params, dict) else {}
-        word = _word_at_position(source, position)
-        location = _definition_location(uri, source, word)
+        with state.lock:
+            document = state.documents.get(uri)
+            location = _definition_location(document, params.get("position")) if document else []
         return {"jsonrpc": "2.0", "id": msg_id, "result": location}, notifications
 
     if method == "textDocument/rename":
         uri = _uri_from_params(params)
-        source = state.documents.get(uri, "")
-        position = params.get("position") if isinstance(params, dict) else {}
         new_name = str(params.get("newName") or "")
-        old_name = _word_at_position(source, position)
-        edits = _rename_edits(source, old_name, new_name)
+        with state.lock:
+            document = state.documents.get(uri)
+            try:
+                edits = _rename_edits(document, params.get("position"), new_name) if document else []
+            except Namel3ssError as err:
+                error = {"code": REQUEST_FAILED, "message": err.message}
+                return {"jsonrpc": "2.0", "id": msg_id, "error": error}, notifications
         result = {"changes": {uri: edits}} if uri else {"changes": {}}
         return {"jsonrpc": "2.0", "id": msg_id, "result": result}, notifications
 
     if method == "namel3ss/diagnostics":
         uri = _uri_from_params(params)
-        source = state.documents.get(uri, "")
+        snapshot = state.snapshot(uri)
+        source = snapshot[2] if snapshot else ""
         if not source:
             source = str(params.get("text") or "")
         return {"jsonrpc": "2.0", "id": msg_id, "result": diagnostics_for_text(source)}, notifications
@@ -160,14 +206,24 @@ def _handle_message(state: LspState, message: dict) -> tuple[dict | None, list[d
     return None, notifications
 
 
-def _publish_diagnostics(uri: str, source: str) -> dict[str, object]:
+def _schedule_diagnostics(state: LspState, uri: str) -> list[dict]:
+    snapshot = state.snapshot(uri)
+    if snapshot is None:
+        return []
+    if state.diagnostics is not None:
+        state.diagnostics.schedule(uri, snapshot[0])
+        return []
+    return [_publish_diagnostics(uri, diagnostics_for_text(snapshot[2]), snapshot[1])]
+
+
+def _publish_diagnostics(uri: str, diagnostics: list, version: int | None = None) -> dict[str, object]:
+    params: dict[str, object] = {"uri": uri, "diagnostics": diagnostics}
+    if version is not None:
+        params["version"] = version
     return {
         "jsonrpc": "2.0",
         "method": "textDocument/publishDiagnostics",
-        "params": {
-            "uri": uri,
-            "diagnostics": diagnostics_for_text(source),
-        },
+        "params": params,
     }
 
 
@@ -178,61 +234,63 @@ def _uri_from_params(params: dict) -> str:
     return ""
 
 
-def _word_at_position(source: str, position: object) -> str:
-    if not isinstance(position, dict):
-        return ""
-    line_index = int(position.get("line") or 0)
-    char_index = int(position.get("character") or 0)
-    lines = source.splitlines()
-    if line_index < 0 or line_index >= len(lines):
-        return ""
-    line = lines[line_index]
-    if not line:
-        return ""
-    char_index = max(0, min(char_index, len(line) - 1))
+def _version(text_doc: dict) -> int | None:
+    version = text_doc.get("version")
+    return version if isinstance(version, int) and not isinstance(version, bool) else None
 
-    start = char_index
-    while start > 0 and _is_word_char(line[start - 1]):
-        start -= 1
-    end = char_index
-    while end < len(line) and _is_word_char(line[end]):
-        end += 1
-    return line[start:end]
 
-
-def _definition_location(uri: str, source: str, word: str) -> list[dict[str, object]]:
-    if not uri or not source or not word:
-        return []
-    pattern = re.compile(rf'^(flow|record|qa|translate|cot|chain|classification|summarise|rag)\s+"{re.escape(word)}"', re.MULTILINE)
-    match = pattern.search(source)
-    if not match:
+def _definition_location(document: TextDocument, position: object) -> list[dict[str, object]]:
+    line, column = document.to_source_position(position)
+    location = get_definition(document.symbols(), file_path=document.path, line=line, column=column)
+    if location is None:
         return []
-    start_offset = match.start()
-    line = source.count("\n", 0, start_offset)
-    col = start_offset - (source.rfind("\n", 0, start_offset) + 1 if "\n" in source[:start_offset] else 0)
     return [
         {
-            "uri": uri,
+            "uri": document.uri,
             "range": {
-                "start": {"line": line, "character": col},
-                "end": {"line": line, "character": col + len(word)},
+                "start": document.to_lsp_position(location.line, location.column),
+                "end": document.to_lsp_position(location.end_line, location.end_column),
             },
         }
     ]
 
 
-def _rename_edits(source: str, old_name: str, new_name: str) -> list[dict[str, object]]:
+def _rename_edits(document: TextDocument, position: object, new_name: str) -> list[dict[str, object]]:
+    line, column = document.to_source_position(position)
+    index = document.symbols()
+    occurrence, _ = find_occurrence(index, document.path, line, column)
+    if occurrence is None:
+        # Not a declared symbol (e.g. a local variable); rename the word instead.
+        return _word_rename_edits(document, line, column, new_name)
+    edits = rename_symbol(index, file_path=document.path, line=line, column=column, new_name=new_name)
+    return [
+        {
+            "range": {
+                "start": document.to_lsp_position(edit.start_line, edit.start_column),
+                "end": document.to_lsp_position(edit.end_line, edit.end_column),
+            },
+            "newText": edit.text,
+        }
+        for edit in edits
+    ]
+
+
+def _word_rename_edits(document: TextDocument, line: int, column: int, new_name: str) -> list[dict[str, object]]:
+    old_name = _word_at(document.line(line - 1), column - 1)
     if not old_name or not new_name or old_name == new_name:
         return []
+    pattern = re.compile(rf"\b{re.escape(old_name)}\b")
     edits: list[dict[str, object]] = []
-    lines = source.splitlines()
-    for line_index, line in enumerate(lines):
-        for match in re.finditer(rf"\b{re.escape(old_name)}\b", line):
+    for line_index in range(document.line_count()):
+        text = document.line(line_index)
+        if old_name not in text:
+            continue
+        for match in pattern.finditer(text):
             edits.append(
                 {
                     "range": {
-                        "start": {"line": line_index, "character": match.start()},
-                        "end": {"line": line_index, "character": match.end()},
+                        "start": document.to_lsp_position(line_index + 1, match.start() + 1),
+                        "end": document.to_lsp_position(line_index + 1, match.end() + 1),
                     },
                     "newText": new_name,
                 }
@@ -240,6 +298,19 @@ def _rename_edits(source: str, old_name: str, new_name: str) -> list[dict[str, o
     return edits
 
 
+def _word_at(line: str, char_index: int) -> str:
+    if not line:
+        return ""
+    char_index = max(0, min(char_index, len(line) - 1))
+    start = char_index
+    while start > 0 and _is_word_char(line[start - 1]):
+        start -= 1
+    end = char_index
+    while end < len(line) and _is_word_char(line[end]):
+        end += 1
+    return line[start:end]
+
+
 def _is_word_char(char: str) -> bool:
     return char.isalnum() or char in {"_", ".", '"'}
 
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from namel3ss.module_loader.parse import _collect_module_files
+from namel3ss.module_loader.source_io import (
+    ParseCache,
+    SourceOverrides,
+    _has_override,
+    _read_source,
+    _source_digest,
+)
+from namel3ss.module_loader.types import ProjectLoadResult
+from namel3ss.ui.external.detect import detect_external_ui
+
+
+CACHE_FORMAT = 3
+COMPILED_DIR = "compiled"
+AST_DIR = "ast"
+CACHE_DIR_ENV = "N3_COMPILED_CACHE_DIR"
+KEY_FILENAME = "cache.key"
+_TAG_SIZE = hashlib.sha256().digest_size
+_BLOB_NAME = re.compile(r"[0-9a-f]{64}")
+_KEYS: dict[Path, bytes] = {}
+
+
+class DiskParseCache(dict):
+    """Parse cache that also keeps each file's AST on disk, keyed by path and checked by digest.
+
+    Entries are pickles signed with a per-user key, and are only unpickled
+    after the signature checks out.
+    """
+
+    def __init__(self, root: Path, base: ParseCache | None = None) -> None:
+        super().__init__(base or {})
+        self.root = root
+        self._base = base
+
+    def get(self, path, default=None):  # type: ignore[override]
+        cached = super().get(path)
+        if cached is None:
+            cached = _read_pickle(self.root, self._entry_path(path))
+            if not _is_ast_entry(cached):
+                return default
+            super().__setitem__(path, cached)
+            if self._base is not None:
+                self._base[path] = cached
+        return cached
+
+    def __setitem__(self, path, entry) -> None:
+        super().__setitem__(path, entry)
+        if self._base is not None:
+            self._base[path] = entry
+        _write_pickle(self.root, self._entry_path(path), entry)
+
+    def _entry_path(self, path: Path) -> Path:
+        return self.root / AST_DIR / f"{_digest(compiler_key(), Path(path).as_posix())}.pickle"
+
+
+def load_compiled_project(
+    app_file: Path,
+    *,
+    build: Callable[[ParseCache], ProjectLoadResult],
+    parse_cache: ParseCache | None,
+    source_overrides: SourceOverrides | None,
+    options: tuple[object, ...],
+) -> ProjectLoadResult:
+    """Return the cached project for unchanged sources, or build it and store the result."""
+    root = compiled_cache_root(app_file)
+    if root is None:
+        return build(parse_cache if parse_cache is not None else {})
+    # Relative app paths are stored as given, so the working directory is part of the key.
+    base = "" if app_file.is_absolute() else Path.cwd().as_posix()
+    app_key = _digest(compiler_key(), base, app_file.as_posix(), repr(options))
+    index_path = root / COMPILED_DIR / f"index-{app_key[:24]}.json"
+    index = _read_index(index_path)
+    if index is not None:
+        project = _load_if_current(root, index, source_overrides)
+        if project is not None:
+            setattr(project.program, "external_ui_enabled", detect_external_ui(app_file.parent, app_file))
+            return project
+    project = build(DiskParseCache(root, parse_cache))
+    sources = sorted((path.as_posix(), _source_digest(text)) for path, text in project.sources.items())
+    layout = _module_layout(app_file.parent, project, source_overrides)
+    blob_key = _digest(app_key, json.dumps(sources), json.dumps(layout))
+    try:
+        payload = pickle.dumps(project, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return project
+    _write_bytes(root / COMPILED_DIR / f"{blob_key}.pickle", _sign(root, f"{COMPILED_DIR}/{blob_key}.pickle", payload))
+    _write_bytes(index_path, json.dumps({"blob": blob_key, "sources": sources, **layout}).encode("utf-8"))
+    if index is not None and index.get("blob") != blob_key:
+        _remove(root / COMPILED_DIR / f"{index.get('blob')}.pickle")
+    return project
+
+
+def compiled_cache_root(app_file: Path) -> Path | None:
+    """Per-user cache folder for one project, outside the project tree.
+
+    Project files may come from anyone, so pickles are never read from the
+    project itself. ``N3_COMPILED_CACHE_DIR`` moves the per-user folder.
+    """
+    override = os.getenv(CACHE_DIR_ENV, "").strip()
+    base = Path(override).expanduser() if override else Path.home() / ".namel3ss" / "cache"
+    try:
+        project = Path(app_file).resolve().parent
+    except OSError:
+        return None
+    return base / _digest(project.as_posix())[:24]
+
+
+@lru_cache(maxsize=1)
+def compiler_key() -> str:
+    from namel3ss.version import get_version
+
+    return f"{CACHE_FORMAT}:{get_version()}:{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def _load_if_current(root: Path, index: dict, source_overrides: SourceOverrides | None) -> ProjectLoadResult | None:
+    for path_text, digest in index["sources"]:
+        try:
+            text = _read_source(Path(path_text), source_overrides)
+        except Exception:
+            return None
+        if _source_digest(text) != digest:
+            return None
+    # New module files and capsules that would shadow a package are not in `sources` yet.
+    for module_dir, files in index["modules"]:
+        if _module_listing(Path(module_dir), source_overrides) != files:
+            return None
+    for capsule_path, existed in index["capsules"]:
+        if _capsule_exists(Path(capsule_path), source_overrides) != existed:
+            return None
+    project = _read_pickle(root, root / COMPILED_DIR / f"{index['blob']}.pickle")
+    return project if isinstance(project, ProjectLoadResult) else None
+
+
+def _module_layout(root: Path, project: ProjectLoadResult, source_overrides: SourceOverrides | None) -> dict:
+    modules = []
+    capsules = []
+    for name, info in sorted(project.modules.items()):
+        modules.append([info.path.as_posix(), _module_listing(info.path, source_overrides)])
+        for folder in ("modules", "packages"):
+            capsule_path = root / folder / name / "capsule.ai"
+            capsules.append([capsule_path.as_posix(), _capsule_exists(capsule_path, source_overrides)])
+    return {"modules": modules, "capsules": capsules}
+
+
+def _module_listing(module_dir: Path, source_overrides: SourceOverrides | None) -> list[str]:
+    return [path.relative_to(module_dir).as_posix() for path in _collect_module_files(module_dir, source_overrides)]
+
+
+def _capsule_exists(path: Path, source_overrides: SourceOverrides | None) -> bool:
+    return path.exists() or _has_override(path, source_overrides)
+
+
+def _read_index(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("blob"), str) or not _BLOB_NAME.fullmatch(data["blob"]):
+        return None
+    sources = data.get("sources")
+    if not _is_pair_list(sources):
+        return None
+    if not _is_pair_list(data.get("modules")) or not _is_pair_list(data.get("capsules")):
+        return None
+    return data
+
+
+def _is_pair_list(value: object) -> bool:
+    return isinstance(value, list) and all(isinstance(item, list) and len(item) == 2 for item in value)
+
+
+def _is_ast_entry(value: object) -> bool:
+    return isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str)
+
+
+def _read_pickle(root: Path, path: Path) -> object | None:
+    try:
+        signed = path.read_bytes()
+    except OSError:
+        return None
+    payload = _verified(root, path.relative_to(root).as_posix(), signed)
+    if payload is None:
+        return None
+    try:
+        return pickle.loads(payload)
+    except Exception:
+        # Truncated or stale entries are rebuilt from source.
+        return None
+
+
+def _write_pickle(root: Path, path: Path, value: object) -> None:
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return
+    _write_bytes(path, _sign(root, path.relative_to(root).as_posix(), payload))
+
+
+def _sign(root: Path, name: str, payload: bytes) -> bytes:
+    key = _cache_key(root.parent)
+    if key is None:
+        return b""
+    return _tag(key, name, payload) + payload
+
+
+def _verified(root: Path, name: str, signed: bytes) -> bytes | None:
+    key = _cache_key(root.parent)
+    if key is None or len(signed) <= _TAG_SIZE:
+        return None
+    tag, payload = signed[:_TAG_SIZE], signed[_TAG_SIZE:]
+    if not hmac.compare_digest(tag, _tag(key, name, payload)):
+        return None
+    return payload
+
+
+def _tag(key: bytes, name: str, payload: bytes) -> bytes:
+    # The entry name is signed too, so a valid entry cannot be swapped in for another.
+    return hmac.new(key, name.encode("utf-8") + b"\x00" + payload, hashlib.sha256).digest()
+
+
+def _cache_key(base: Path) -> bytes | None:
+    """Read or create the per-user signing key; None leaves the cache unused."""
+    key = _KEYS.get(base)
+    if key is not None:
+        return key
+    path = base / KEY_FILENAME
+    if not path.exists():
+        temp = base / f"{KEY_FILENAME}.{os.getpid()}.tmp"
+        try:
+            base.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(os.urandom(32))
+            # Linking never replaces a key another process created first.
+            os.link(temp, path)
+        except OSError:
+            pass
+        finally:
+            _remove(temp)
+    try:
+        key = path.read_bytes()
+    except OSError:
+        return None
+    if len(key) != 32:
+        return None
+    _KEYS[base] = key
+    return key
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    if not payload:
+        return
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        temp.write_bytes(payload)
+        os.replace(temp, path)
+    except OSError:
+        _remove(temp)
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _digest(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+__all__ = ["DiskParseCache", "compiled_cache_root", "compiler_key", "load_compiled_project"]
@@ -11,6 +11,7 @@ from namel3ss.ir.nodes import lower_program
 from namel3ss.ir.validation.duplicate_symbols_validation import validate_duplicate_symbols
 from namel3ss.ir.validation.includes_validation import ensure_include_capability, normalize_include_warnings
 from namel3ss.ir.validation.root_authority_validation import validate_root_authority
+from namel3ss.module_loader.compiled_cache import load_compiled_project
 from namel3ss.module_loader.graph import build_graph, topo_sort
 from namel3ss.module_loader.module_files import (
     apply_module_file_results,
@@ -42,8 +43,22 @@ def load_project(
     extra_uses: Iterable[ast.UseDecl] | None = None,
     source_overrides: SourceOverrides | None = None,
     parse_cache: ParseCache | None = None,
+    compiled_cache: bool = False,
 ) -> ProjectLoadResult:
     app_file = Path(app_path)
+    if compiled_cache and not extra_uses and app_file.exists():
+        return load_compiled_project(
+            app_file,
+            build=lambda cache: load_project(
+                app_file,
+                allow_legacy_type_aliases=allow_legacy_type_aliases,
+                source_overrides=source_overrides,
+                parse_cache=cache,
+            ),
+            parse_cache=parse_cache,
+            source_overrides=source_overrides,
+            options=(bool(allow_legacy_type_aliases),),
+        )
     if not app_file.exists() and not _has_override(app_file, source_overrides):
         raise Namel3ssError(
             build_guidance_message(
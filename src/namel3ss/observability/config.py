@@ -12,6 +12,9 @@ from namel3ss.utils.simple_yaml import parse_yaml, render_yaml
 OBSERVABILITY_FILENAME = "observability.yaml"
 DEFAULT_BATCH_SIZE = 64
 DEFAULT_MAX_TRACE_SIZE = 2000
+DEFAULT_FLUSH_INTERVAL_MS = 1000
+DEFAULT_MAX_QUEUE = 2048
+OTLP_COMPRESSIONS = ("gzip", "none")
 
 
 @dataclass(frozen=True)
@@ -19,11 +22,19 @@ class OTLPConfig:
     endpoint: str
     auth: dict[str, object]
     batch_size: int
+    continuous: bool = False
+    flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS
+    max_queue: int = DEFAULT_MAX_QUEUE
+    compression: str = "gzip"
 
     def to_dict(self) -> dict[str, object]:
         payload: dict[str, object] = {
             "endpoint": self.endpoint,
             "batch_size": int(self.batch_size),
+            "continuous": bool(self.continuous),
+            "flush_interval_ms": int(self.flush_interval_ms),
+            "max_queue": int(self.max_queue),
+            "compression": self.compression,
         }
         if self.auth:
             payload["auth"] = dict(self.auth)
@@ -137,6 +148,20 @@ def _parse_config_payload(payload: dict[str, object], *, path: Path) -> Observab
         field="otlp_config.batch_size",
         path=path,
     )
+    continuous = _parse_bool(otlp_raw.get("continuous", False), field="otlp_config.continuous", path=path)
+    flush_interval_ms = _parse_positive_int(
+        otlp_raw.get("flush_interval_ms", DEFAULT_FLUSH_INTERVAL_MS),
+        field="otlp_config.flush_interval_ms",
+        path=path,
+    )
+    max_queue = _parse_positive_int(
+        otlp_raw.get("max_queue", DEFAULT_MAX_QUEUE),
+        field="otlp_config.max_queue",
+        path=path,
+    )
+    compression = str(otlp_raw.get("compression", "gzip") or "").strip().lower()
+    if compression not in OTLP_COMPRESSIONS:
+        raise Namel3ssError(_invalid_config_message(path, "otlp_config.compression must be gzip or none"))
     metrics_enabled = _parse_bool(payload.get("metrics_enabled", True), field="metrics_enabled", path=path)
     max_trace_size = _parse_positive_int(
         payload.get("max_trace_size", DEFAULT_MAX_TRACE_SIZE),
@@ -145,7 +170,15 @@ def _parse_config_payload(payload: dict[str, object], *, path: Path) -> Observab
     )
     return ObservabilityConfig(
         redaction_rules=redaction_rules,
-        otlp_config=OTLPConfig(endpoint=endpoint, auth=auth, batch_size=batch_size),
+        otlp_config=OTLPConfig(
+            endpoint=endpoint,
+            auth=auth,
+            batch_size=batch_size,
+            continuous=continuous,
+            flush_interval_ms=flush_interval_ms,
+            max_queue=max_queue,
+            compression=compression,
+        ),
         metrics_enabled=metrics_enabled,
         max_trace_size=max_trace_size,
     )
@@ -187,6 +220,7 @@ def _invalid_config_message(path: Path, details: str) -> str:
             "  endpoint: \"\"\n"
             "  auth: {}\n"
             "  batch_size: 64\n"
+            "  continuous: false\n"
             "metrics_enabled: true\n"
             "max_trace_size: 2000"
         ),
@@ -195,6 +229,8 @@ def _invalid_config_message(path: Path, details: str) -> str:
 
 __all__ = [
     "DEFAULT_BATCH_SIZE",
+    "DEFAULT_FLUSH_INTERVAL_MS",
+    "DEFAULT_MAX_QUEUE",
     "DEFAULT_MAX_TRACE_SIZE",
     "OBSERVABILITY_FILENAME",
     "OTLPConfig",
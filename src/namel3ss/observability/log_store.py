@@ -4,7 +4,7 @@ import json
 from pathlib import Path
 from typing import Callable, Iterable
 
-from namel3ss.determinism import canonical_json_dump
+from namel3ss.observability.segment_store import SegmentStore
 from namel3ss.runtime.persistence_paths import resolve_persistence_root
 
 
@@ -20,6 +20,13 @@ def logs_path(project_root: str | Path | None, app_path: str | Path | None) -> P
     return Path(root) / ".namel3ss" / "observability" / LOG_DIRNAME / LOG_FILENAME
 
 
+def log_segments(project_root: str | Path | None, app_path: str | Path | None) -> SegmentStore | None:
+    path = logs_path(project_root, app_path)
+    if path is None:
+        return None
+    return SegmentStore(path.parent)
+
+
 def _legacy_logs_path(project_root: str | Path | None, app_path: str | Path | None) -> Path | None:
     root = resolve_persistence_root(project_root, app_path, allow_create=False)
     if root is None:
@@ -28,6 +35,8 @@ def _legacy_logs_path(project_root: str | Path | None, app_path: str | Path | No
 
 
 class LogStore:
+    """Log events of one observability session; ``flush`` appends only the events recorded since the last flush."""
+
     def __init__(
         self,
         *,
@@ -40,10 +49,14 @@ class LogStore:
         self._scrub = scrubber
         self._logs: list[dict] = []
         self._seq = 0
+        self._run_id: str | None = None
+        self._flushed = 0
 
     def reset(self) -> None:
         self._logs = []
         self._seq = 0
+        self._run_id = None
+        self._flushed = 0
 
     def record(
         self,
@@ -81,13 +94,33 @@ class LogStore:
         return list(self._logs)
 
     def flush(self) -> None:
-        path = logs_path(self._project_root, self._app_path)
-        if path is None:
+        store = log_segments(self._project_root, self._app_path)
+        if store is None:
             return
-        canonical_json_dump(path, self.snapshot(), pretty=True)
-
-
-def read_logs(project_root: str | Path | None, app_path: str | Path | None) -> list[dict]:
+        if self._run_id is None:
+            self._run_id = store.begin_run()
+        store.append(self._run_id, self._logs[self._flushed :])
+        self._flushed = len(self._logs)
+
+
+def read_logs(
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    *,
+    run_id: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[dict]:
+    """Log events of the latest session (or ``run_id``); a page only reads the segment ranges it covers."""
+    store = log_segments(project_root, app_path)
+    if store is not None and store.exists():
+        return store.read_run(run_id, offset=offset, limit=limit)
+    logs = _read_legacy(project_root, app_path)
+    start = max(0, int(offset))
+    return logs[start : start + limit if limit is not None else None]
+
+
+def _read_legacy(project_root: str | Path | None, app_path: str | Path | None) -> list[dict]:
     path = logs_path(project_root, app_path)
     if path is None:
         return []
@@ -113,4 +146,4 @@ def _coerce_message(message: object) -> str:
     return str(message)
 
 
-__all__ = ["LOG_LEVELS", "LogStore", "logs_path", "read_logs"]
+__all__ = ["LOG_LEVELS", "LogStore", "log_segments", "logs_path", "read_logs"]
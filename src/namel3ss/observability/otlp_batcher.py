@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 0.5
+DEFAULT_MAX_BACKOFF_SECONDS = 30.0
+
+
+class BatchingSpanExporter:
+    """Sends spans from a background thread in size- and time-bounded batches.
+
+    ``enqueue`` never blocks: spans that do not fit in the bounded queue are
+    dropped and counted. A batch is sent once ``batch_size`` spans are waiting
+    or ``flush_interval`` seconds after the oldest waiting span arrived. A
+    failed batch is retried with exponential backoff and handed to
+    ``on_give_up`` after ``max_attempts`` tries. ``prepare`` turns queued items
+    into spans on the export thread, just before a batch is first sent.
+    """
+
+    def __init__(
+        self,
+        *,
+        send: Callable[[list[dict]], None],
+        batch_size: int,
+        max_queue: int,
+        flush_interval: float,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF_SECONDS,
+        max_backoff: float = DEFAULT_MAX_BACKOFF_SECONDS,
+        on_give_up: Callable[[list[dict], Exception], None] | None = None,
+        prepare: Callable[[list], list[dict]] | None = None,
+    ) -> None:
+        self._send = send
+        self._batch_size = max(1, int(batch_size))
+        self._max_queue = max(1, int(max_queue))
+        self._flush_interval = max(0.0, float(flush_interval))
+        self._max_attempts = max(1, int(max_attempts))
+        self._backoff = max(0.0, float(backoff))
+        self._max_backoff = max(self._backoff, float(max_backoff))
+        self._on_give_up = on_give_up
+        self._prepare = prepare
+        self._queue: deque = deque()
+        self._oldest: float | None = None
+        self._flushing = False
+        self._in_flight = 0
+        self._closed = False
+        self._lock = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._exported_spans = 0
+        self._exported_batches = 0
+        self._dropped_spans = 0
+        self._overflow_spans = 0
+        self._failed_batches = 0
+        self._retries = 0
+
+    def enqueue(self, spans: list) -> int:
+        with self._lock:
+            if self._closed:
+                self._overflow_spans += len(spans)
+                self._dropped_spans += len(spans)
+                return 0
+            room = max(0, self._max_queue - len(self._queue))
+            accepted = spans[:room]
+            if len(spans) > room:
+                self._overflow_spans += len(spans) - room
+                self._dropped_spans += len(spans) - room
+            if accepted:
+                if not self._queue:
+                    self._oldest = time.monotonic()
+                self._queue.extend(accepted)
+                self._start_locked()
+                self._lock.notify_all()
+            return len(accepted)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send waiting spans now and wait until nothing is queued or in flight."""
+        with self._lock:
+            # Every waiting batch goes out now, not just the first one.
+            self._flushing = bool(self._queue)
+            self._lock.notify_all()
+            return self._lock.wait_for(lambda: not self._queue and not self._in_flight, timeout=timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            self._lock.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued_spans": len(self._queue),
+                "exported_spans": self._exported_spans,
+                "exported_batches": self._exported_batches,
+                "dropped_spans": self._dropped_spans,
+                "overflow_spans": self._overflow_spans,
+                "failed_batches": self._failed_batches,
+                "retries": self._retries,
+            }
+
+    def _start_locked(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="namel3ss-otlp-export", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._deliver(batch)
+            with self._lock:
+                self._in_flight = 0
+                self._lock.notify_all()
+
+    def _next_batch(self) -> list[dict] | None:
+        with self._lock:
+            while True:
+                if not self._queue:
+                    if self._closed:
+                        return None
+                    self._lock.wait()
+                    continue
+                due = (self._oldest or 0.0) + self._flush_interval
+                remaining = due - time.monotonic()
+                if len(self._queue) >= self._batch_size or self._closed or self._flushing or remaining <= 0:
+                    count = min(self._batch_size, len(self._queue))
+                    batch = [self._queue.popleft() for _ in range(count)]
+                    self._oldest = time.monotonic() if self._queue else None
+                    self._flushing = self._flushing and bool(self._queue)
+                    self._in_flight = len(batch)
+                    return batch
+                self._lock.wait(remaining)
+
+    def _deliver(self, batch: list) -> None:
+        if self._prepare is not None:
+            try:
+                batch = self._prepare(batch)
+            except Exception:
+                with self._lock:
+                    self._failed_batches += 1
+                    self._dropped_spans += len(batch)
+                return
+        delay = self._backoff
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                self._send(batch)
+            except Exception as err:
+                if attempt == self._max_attempts or self._closing():
+                    with self._lock:
+                        self._failed_batches += 1
+                        self._dropped_spans += len(batch)
+                    if self._on_give_up is not None:
+                        self._on_give_up(batch, err)
+                    return
+                with self._lock:
+                    self._retries += 1
+                    self._lock.wait_for(lambda: self._closed, timeout=delay)
+                delay = min(delay * 2, self._max_backoff)
+                continue
+            with self._lock:
+                self._exported_spans += len(batch)
+                self._exported_batches += 1
+            return
+
+    def _closing(self) -> bool:
+        with self._lock:
+            return self._closed
+
+
+__all__ = ["BatchingSpanExporter"]
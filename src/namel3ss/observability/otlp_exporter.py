@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+import atexit
 import base64
+import gzip
 import json
+import threading
 from pathlib import Path
 from urllib.request import Request, urlopen
 
 from namel3ss.determinism import canonical_json_dump, canonical_json_dumps
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
-from namel3ss.observability.config import load_observability_config
+from namel3ss.observability.config import ObservabilityConfig, OTLPConfig, load_observability_config
+from namel3ss.observability.otlp_batcher import BatchingSpanExporter
 from namel3ss.observability.trace_runs import list_trace_runs, read_trace_entries, trace_runs_root
 from namel3ss.utils.http_tls import open_url_with_tls_fallback
 
 
 OTLP_RETRY_FILENAME = "otlp_retry.json"
+BACKGROUND_CLOSE_TIMEOUT_SECONDS = 2.0
+
+_background: dict[str, tuple[tuple, BatchingSpanExporter]] = {}
+_background_lock = threading.Lock()
 
 
 def export_trace_runs(
@@ -38,7 +46,7 @@ def export_trace_runs(
     failed_batches: list[dict[str, object]] = []
     exported_spans = 0
     for batch in batches:
-        payload = {"resource": {"service.name": "namel3ss"}, "spans": batch}
+        payload = _batch_payload(batch)
         try:
             _post_json(endpoint=endpoint, payload=payload, auth=config.otlp_config.auth)
             exported_spans += len(batch)
@@ -55,6 +63,125 @@ def export_trace_runs(
     }
 
 
+def queue_trace_run(
+    *,
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    run_id: str,
+) -> int:
+    """Hand a written trace run to the background exporter when ``otlp_config.continuous`` is on.
+
+    Returns the number of spans queued; spans that do not fit are dropped and counted.
+    """
+    config = load_observability_config(project_root, app_path)
+    if not _continuous(config.otlp_config):
+        return 0
+    entries = read_trace_entries(project_root, app_path, run_id)
+    return queue_trace_entries(run_id, entries, config, project_root=project_root, app_path=app_path)
+
+
+def queue_trace_entries(
+    run_id: str,
+    entries: list[dict[str, object]],
+    config: ObservabilityConfig,
+    *,
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+) -> int:
+    """Queue entries ``write_trace_run`` just wrote; they become spans on the export thread."""
+    otlp = config.otlp_config
+    if not _continuous(otlp) or not entries:
+        return 0
+    exporter = _background_exporter(project_root, app_path, otlp)
+    if exporter is None:
+        return 0
+    return exporter.enqueue([(run_id, entry) for entry in entries])
+
+
+def background_export_stats(project_root: str | Path | None, app_path: str | Path | None) -> dict[str, int] | None:
+    root = trace_runs_root(project_root, app_path, allow_create=False)
+    if root is None:
+        return None
+    with _background_lock:
+        entry = _background.get(root.as_posix())
+    return entry[1].stats() if entry is not None else None
+
+
+def flush_background_exports(timeout: float | None = None) -> bool:
+    with _background_lock:
+        exporters = [exporter for _, exporter in _background.values()]
+    return all(exporter.flush(timeout) for exporter in exporters)
+
+
+def _background_exporter(
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    otlp: OTLPConfig,
+) -> BatchingSpanExporter | None:
+    root = trace_runs_root(project_root, app_path, allow_create=False)
+    if root is None:
+        return None
+    endpoint = otlp.endpoint.strip()
+    settings = (
+        endpoint,
+        canonical_json_dumps(otlp.auth, pretty=False, drop_run_keys=False),
+        otlp.batch_size,
+        otlp.max_queue,
+        otlp.flush_interval_ms,
+        otlp.compression,
+    )
+    with _background_lock:
+        entry = _background.get(root.as_posix())
+        if entry is not None and entry[0] == settings:
+            return entry[1]
+        if entry is not None:
+            # Config changed; the old exporter sends what it holds and stops.
+            entry[1].close(timeout=0)
+        exporter = BatchingSpanExporter(
+            send=lambda batch: _post_json(
+                endpoint=endpoint,
+                payload=_batch_payload(batch),
+                auth=otlp.auth,
+                compression=otlp.compression,
+            ),
+            batch_size=otlp.batch_size,
+            max_queue=otlp.max_queue,
+            flush_interval=otlp.flush_interval_ms / 1000,
+            on_give_up=lambda batch, err: _append_retry_batches(
+                project_root,
+                app_path,
+                endpoint=endpoint,
+                items=[{"error": str(err), "payload": _batch_payload(batch)}],
+            ),
+            prepare=_queued_spans,
+        )
+        _background[root.as_posix()] = (settings, exporter)
+        return exporter
+
+
+def _close_background_exporters() -> None:
+    with _background_lock:
+        exporters = [exporter for _, exporter in _background.values()]
+        _background.clear()
+    for exporter in exporters:
+        exporter.close(timeout=BACKGROUND_CLOSE_TIMEOUT_SECONDS)
+
+
+atexit.register(_close_background_exporters)
+
+
+def _continuous(otlp: OTLPConfig) -> bool:
+    return bool(otlp.continuous and otlp.endpoint.strip())
+
+
+def _queued_spans(items: list[tuple[str, dict[str, object]]]) -> list[dict[str, object]]:
+    return [_entry_span(run_id, entry) for run_id, entry in items]
+
+
+def _batch_payload(batch: list[dict[str, object]]) -> dict[str, object]:
+    return {"resource": {"service.name": "namel3ss"}, "spans": batch}
+
+
 def _select_runs(available: list[dict[str, object]], run_ids: list[str] | None) -> list[dict[str, object]]:
     if not run_ids:
         return sorted(available, key=lambda item: str(item.get("run_id", "")))
@@ -75,28 +202,39 @@ def _build_spans(
         if not run_id:
             continue
         entries = read_trace_entries(project_root, app_path, run_id)
-        for entry in entries:
-            span = {
-                "trace_id": run_id,
-                "span_id": str(entry.get("step_id", "")),
-                "name": str(entry.get("step_name", "")),
-                "kind": "internal",
-                "start_step": int(entry.get("timestamp", 0)),
-                "end_step": int(entry.get("timestamp", 0)),
-                "attributes": {
-                    "flow_name": str(entry.get("flow_name", "")),
-                    "duration_ms": float(entry.get("duration_ms", 0.0)),
-                    "memory_used": int(entry.get("memory_used", 0)),
-                },
-            }
-            spans.append(span)
+        spans.extend(_entry_span(run_id, entry) for entry in entries)
     spans.sort(key=lambda item: (str(item.get("trace_id", "")), int(item.get("start_step", 0)), str(item.get("span_id", ""))))
     return spans
 
 
-def _post_json(*, endpoint: str, payload: dict[str, object], auth: dict[str, object]) -> None:
+def _entry_span(run_id: str, entry: dict[str, object]) -> dict[str, object]:
+    return {
+        "trace_id": run_id,
+        "span_id": str(entry.get("step_id", "")),
+        "name": str(entry.get("step_name", "")),
+        "kind": "internal",
+        "start_step": int(entry.get("timestamp", 0)),
+        "end_step": int(entry.get("timestamp", 0)),
+        "attributes": {
+            "flow_name": str(entry.get("flow_name", "")),
+            "duration_ms": float(entry.get("duration_ms", 0.0)),
+            "memory_used": int(entry.get("memory_used", 0)),
+        },
+    }
+
+
+def _post_json(
+    *,
+    endpoint: str,
+    payload: dict[str, object],
+    auth: dict[str, object],
+    compression: str = "none",
+) -> None:
     body = canonical_json_dumps(payload, pretty=False, drop_run_keys=False).encode("utf-8")
     headers = {"Content-Type": "application/json"}
+    if compression == "gzip":
+        body = gzip.compress(body, mtime=0)
+        headers["Content-Encoding"] = "gzip"
     auth_headers = _auth_headers(auth)
     headers.update(auth_headers)
     request = Request(endpoint, data=body, headers=headers, method="POST")
@@ -157,4 +295,11 @@ def _missing_endpoint_message() -> str:
     )
 
 
-__all__ = ["OTLP_RETRY_FILENAME", "export_trace_runs"]
+__all__ = [
+    "OTLP_RETRY_FILENAME",
+    "background_export_stats",
+    "export_trace_runs",
+    "flush_background_exports",
+    "queue_trace_entries",
+    "queue_trace_run",
+]
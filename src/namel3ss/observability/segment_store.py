@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Iterable
+
+from namel3ss.determinism import canonical_json_dumps
+from namel3ss.utils.file_lock import locked_path
+
+
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+SEGMENT_RETAIN = 8
+RUN_RETAIN = 256
+SEGMENT_INDEX_FILENAME = "index.json"
+SEGMENT_INDEX_SCHEMA = 2
+RUN_INDEX_DIRNAME = "runs"
+
+_RUN_ID = re.compile(r"run:(\d+)")
+
+
+class SegmentStore:
+    """Append-only NDJSON records in size-rotated segment files, grouped into runs.
+
+    Each run has its own append-only range log, ``runs/run-<n>.ndjson``, with
+    one ``[segment, start, end, count]`` line per append, so one run (or one
+    page of it) is read by seeking to those ranges instead of parsing every
+    segment. Records appended with ``updates=True`` replace earlier ones with
+    the same ``id``; their line ends with the ids they carry
+    (``[segment, start, end, count, ids]``), so pages skip them and
+    `read_updates` reads only the ranges holding the ids it is asked for.
+    ``index.json`` holds only the current segment and run counters and is
+    rewritten when a run begins or a segment rotates, never per append. Only
+    the newest ``retain_segments`` segments and ``retain_runs`` runs are kept.
+    Bytes written before their range line (e.g. a crash mid-flush) are never
+    read. Writers share the store across processes under a lock file next to
+    ``index.json``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = SEGMENT_MAX_BYTES,
+        retain_segments: int = SEGMENT_RETAIN,
+        retain_runs: int = RUN_RETAIN,
+    ) -> None:
+        self.directory = Path(directory)
+        self._max_bytes = max(1, int(max_bytes))
+        self._retain_segments = max(1, int(retain_segments))
+        self._retain_runs = max(1, int(retain_runs))
+
+    def exists(self) -> bool:
+        return (self.directory / SEGMENT_INDEX_FILENAME).exists()
+
+    def begin_run(self) -> str:
+        with locked_path(self._index_path()):
+            index = self._load_index()
+            counter = _to_int(index.get("next_run"), 1)
+            run_id = f"run:{counter:06d}"
+            index["next_run"] = counter + 1
+            index["latest_run"] = run_id
+            path = self._run_path(run_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+            self._trim_runs()
+            self._write_index(index)
+        return run_id
+
+    def append(self, run_id: str, records: list[dict], *, updates: bool = False) -> None:
+        run_path = self._run_path(run_id)
+        if not records or run_path is None:
+            return
+        payload = "".join(canonical_json_dumps(record, pretty=False) + "\n" for record in records).encode("utf-8")
+        with locked_path(self._index_path()):
+            index = self._load_index()
+            segment = _to_int(index.get("segment"), 1)
+            path = self._segment_path(segment)
+            start = path.stat().st_size if path.exists() else 0
+            if start and start + len(payload) > self._max_bytes:
+                segment += 1
+                path = self._segment_path(segment)
+                start = 0
+                index["segment"] = segment
+                self._write_index(index)
+                self._drop_old_segments(segment)
+            with path.open("ab") as handle:
+                handle.write(payload)
+            entry: list = [segment, start, start + len(payload), len(records)]
+            if updates:
+                entry.append([str(record.get("id")) for record in records])
+            run_path.parent.mkdir(parents=True, exist_ok=True)
+            with run_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def latest_run(self) -> str | None:
+        latest = self._load_index().get("latest_run")
+        return latest if isinstance(latest, str) and latest else None
+
+    def read_run(
+        self,
+        run_id: str | None = None,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        updates: bool = False,
+    ) -> list[dict]:
+        """Records of ``run_id`` (default: latest run); ``updates`` reads the replacement records instead."""
+        skip = max(0, int(offset))
+        records: list[dict] = []
+        for item in self._run_ranges(run_id or self.latest_run()):
+            if limit is not None and len(records) >= limit:
+                break
+            if _is_update(item) != updates:
+                continue
+            segment, start, end, count = item[:4]
+            if skip >= count:
+                # Whole range is before the requested page; never read it.
+                skip -= count
+                continue
+            for record in self._read_records(segment, start, end)[skip:]:
+                if limit is not None and len(records) >= limit:
+                    break
+                records.append(record)
+            skip = 0
+        return records
+
+    def read_updates(self, run_id: str | None, ids: Iterable[object]) -> dict[str, dict]:
+        """Newest replacement record of each of ``ids``, reading only the update ranges that hold them."""
+        wanted = {str(item) for item in ids}
+        latest: dict[str, dict] = {}
+        for item in self._run_ranges(run_id or self.latest_run()):
+            if not _is_update(item) or wanted.isdisjoint(item[4]):
+                continue
+            for record in self._read_records(*item[:3]):
+                record_id = str(record.get("id"))
+                if record_id in wanted:
+                    latest[record_id] = record
+        return latest
+
+    def _run_ranges(self, run_id: object) -> list[list]:
+        path = self._run_path(run_id)
+        if path is None:
+            return []
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        ranges: list[list] = []
+        for line in lines:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if _valid_range(item):
+                ranges.append(item)
+        return ranges
+
+    def _read_records(self, segment: int, start: int, end: int) -> list[dict]:
+        records: list[dict] = []
+        for line in self._read_range(segment, start, end):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
+
+    def _read_range(self, segment: int, start: int, end: int) -> list[bytes]:
+        try:
+            with self._segment_path(segment).open("rb") as handle:
+                handle.seek(start)
+                data = handle.read(end - start)
+        except OSError:
+            return []
+        return data.splitlines()
+
+    def _index_path(self) -> Path:
+        return self.directory / SEGMENT_INDEX_FILENAME
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"segment-{segment:06d}.ndjson"
+
+    def _run_path(self, run_id: object) -> Path | None:
+        # Run ids come from API queries, so only ids this store hands out map to a file.
+        match = _RUN_ID.fullmatch(run_id) if isinstance(run_id, str) else None
+        if match is None:
+            return None
+        return self.directory / RUN_INDEX_DIRNAME / f"run-{match.group(1)}.ndjson"
+
+    def _run_paths(self) -> list[Path]:
+        return sorted((self.directory / RUN_INDEX_DIRNAME).glob("run-*.ndjson"))
+
+    def _drop_old_segments(self, segment: int) -> None:
+        # Rotation is rare, so it may read every kept run's range log.
+        oldest = segment - self._retain_segments + 1
+        for path in self._run_paths():
+            run_id = "run:" + path.stem.split("-", 1)[-1]
+            if any(item[0] < oldest for item in self._run_ranges(run_id)):
+                path.unlink(missing_ok=True)
+        for path in self.directory.glob("segment-*.ndjson"):
+            number = _to_int(path.stem.split("-", 1)[-1], oldest)
+            if number < oldest:
+                path.unlink(missing_ok=True)
+
+    def _trim_runs(self) -> None:
+        paths = self._run_paths()
+        for path in paths[: max(0, len(paths) - self._retain_runs)]:
+            path.unlink(missing_ok=True)
+
+    def _load_index(self) -> dict:
+        path = self._index_path()
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = None
+        if not isinstance(raw, dict) or raw.get("schema") != SEGMENT_INDEX_SCHEMA:
+            return {"schema": SEGMENT_INDEX_SCHEMA, "segment": 1, "next_run": 1, "latest_run": None}
+        return raw
+
+    def _write_index(self, index: dict) -> None:
+        data = json.dumps(index, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        with NamedTemporaryFile("w", delete=False, dir=str(self.directory), encoding="utf-8") as tmp:
+            tmp.write(data)
+            tmp_path = Path(tmp.name)
+        os.replace(tmp_path, self._index_path())
+
+
+def _valid_range(item: object) -> bool:
+    if not isinstance(item, list) or len(item) not in (4, 5):
+        return False
+    if not all(isinstance(value, int) for value in item[:4]):
+        return False
+    return len(item) == 4 or (isinstance(item[4], list) and all(isinstance(value, str) for value in item[4]))
+
+
+def _is_update(item: list) -> bool:
+    return len(item) == 5
+
+
+def _to_int(value: object, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+__all__ = ["RUN_RETAIN", "SEGMENT_MAX_BYTES", "SEGMENT_RETAIN", "SegmentStore"]
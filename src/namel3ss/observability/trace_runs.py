@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
 from namel3ss.determinism import canonical_json_dump, canonical_json_dumps
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
-from namel3ss.observability.config import load_observability_config
+from namel3ss.observability.config import ObservabilityConfig, load_observability_config
 from namel3ss.observability.scrub import scrub_payload
 from namel3ss.runtime.persistence_paths import resolve_persistence_root
 
@@ -105,7 +105,9 @@ def write_trace_run(
     flow_name: str,
     steps: Iterable[dict[str, object]],
     secret_values: Iterable[str] | None = None,
+    on_written: Callable[[str, list[dict[str, object]], ObservabilityConfig], object] | None = None,
 ) -> dict[str, object] | None:
+    """Write one run's entries and index it; ``on_written`` gets the run id, entries and loaded config."""
     root = trace_runs_root(project_root, app_path, allow_create=True)
     if root is None:
         return None
@@ -153,6 +155,8 @@ def write_trace_run(
         "runs": next_runs,
     }
     canonical_json_dump(root / TRACE_INDEX_FILENAME, next_index, pretty=True, drop_run_keys=False)
+    if on_written is not None:
+        on_written(run_id, entries, config)
     return summary
 
 
@@ -4,7 +4,7 @@ import json
 from pathlib import Path
 from typing import Callable
 
-from namel3ss.determinism import canonical_json_dump
+from namel3ss.observability.segment_store import SegmentStore
 from namel3ss.runtime.persistence_paths import resolve_persistence_root
 
 
@@ -19,6 +19,13 @@ def trace_path(project_root: str | Path | None, app_path: str | Path | None) ->
     return Path(root) / ".namel3ss" / "observability" / TRACE_DIRNAME / TRACE_FILENAME
 
 
+def trace_segments(project_root: str | Path | None, app_path: str | Path | None) -> SegmentStore | None:
+    path = trace_path(project_root, app_path)
+    if path is None:
+        return None
+    return SegmentStore(path.parent)
+
+
 def _legacy_trace_path(project_root: str | Path | None, app_path: str | Path | None) -> Path | None:
     root = resolve_persistence_root(project_root, app_path, allow_create=False)
     if root is None:
@@ -27,6 +34,13 @@ def _legacy_trace_path(project_root: str | Path | None, app_path: str | Path | N
 
 
 class TraceStore:
+    """Spans of one observability session.
+
+    ``flush`` appends only the spans started or ended since the previous flush to
+    the session's run in the trace segment store. Spans ended after an earlier
+    flush go in as updates, which readers apply over the span's first record.
+    """
+
     def __init__(
         self,
         *,
@@ -38,13 +52,21 @@ class TraceStore:
         self._app_path = app_path
         self._scrub = scrubber
         self._spans: list[dict] = []
+        self._positions: dict[str, int] = {}
         self._seq = 0
         self._stack: list[str] = []
+        self._run_id: str | None = None
+        self._flushed = 0
+        self._changed: set[int] = set()
 
     def reset(self) -> None:
         self._spans = []
+        self._positions = {}
         self._seq = 0
         self._stack = []
+        self._run_id = None
+        self._flushed = 0
+        self._changed = set()
 
     def current_span_id(self) -> str | None:
         return self._stack[-1] if self._stack else None
@@ -74,18 +96,22 @@ class TraceStore:
         scrubbed = self._scrub(span)
         if isinstance(scrubbed, dict):
             span = scrubbed
+        self._positions[span_id] = len(self._spans)
         self._spans.append(span)
         self._stack.append(span_id)
         return span_id
 
     def end_span(self, span_id: str, *, status: str, end_step: int) -> dict | None:
-        span = _find_span(self._spans, span_id)
-        if span is None:
+        position = self._positions.get(span_id)
+        if position is None:
             return None
+        span = self._spans[position]
         span["status"] = status
         span["end_step"] = int(end_step)
         duration = span["end_step"] - int(span.get("start_step", 0))
         span["duration_steps"] = max(0, duration)
+        if position < self._flushed:
+            self._changed.add(position)
         if self._stack and self._stack[-1] == span_id:
             self._stack.pop()
         return span
@@ -94,13 +120,40 @@ class TraceStore:
         return list(self._spans)
 
     def flush(self) -> None:
-        path = trace_path(self._project_root, self._app_path)
-        if path is None:
+        store = trace_segments(self._project_root, self._app_path)
+        if store is None:
             return
-        canonical_json_dump(path, self.snapshot(), pretty=True)
-
-
-def read_spans(project_root: str | Path | None, app_path: str | Path | None) -> list[dict]:
+        if self._run_id is None:
+            self._run_id = store.begin_run()
+        store.append(self._run_id, [self._spans[position] for position in sorted(self._changed)], updates=True)
+        store.append(self._run_id, self._spans[self._flushed :])
+        self._flushed = len(self._spans)
+        self._changed = set()
+
+
+def read_spans(
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    *,
+    run_id: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[dict]:
+    """Spans of the latest session (or ``run_id``), in start order; a page only reads the segment ranges it covers."""
+    store = trace_segments(project_root, app_path)
+    if store is None or not store.exists():
+        spans = _read_legacy(project_root, app_path)
+        start = max(0, int(offset))
+        return spans[start : start + limit if limit is not None else None]
+    run_id = run_id or store.latest_run()
+    spans = store.read_run(run_id, offset=offset, limit=limit)
+    if not spans:
+        return spans
+    latest = store.read_updates(run_id, [span.get("id") for span in spans])
+    return [latest.get(str(span.get("id")), span) for span in spans]
+
+
+def _read_legacy(project_root: str | Path | None, app_path: str | Path | None) -> list[dict]:
     path = trace_path(project_root, app_path)
     if path is None:
         return []
@@ -118,11 +171,4 @@ def read_spans(project_root: str | Path | None, app_path: str | Path | None) ->
     return [item for item in raw if isinstance(item, dict)]
 
 
-def _find_span(spans: list[dict], span_id: str) -> dict | None:
-    for span in reversed(spans):
-        if span.get("id") == span_id:
-            return span
-    return None
-
-
-__all__ = ["TraceStore", "read_spans", "trace_path"]
+__all__ = ["TraceStore", "read_spans", "trace_path", "trace_segments"]
@@ -21,6 +21,7 @@ from namel3ss.parser.expr.ops import (
     parse_primary,
 )
 from namel3ss.parser.expr.statepath import parse_state_path
+from namel3ss.parser.grammar_table import TopLevelRule, select_top_level_rule
 from namel3ss.parser.parse_program import parse_program
 from namel3ss.parser.sugar.lower import lower_program as lower_sugar_program
 from namel3ss.parser.stmt.common import (
@@ -105,6 +106,9 @@ class Parser(TokenStream):
     def _parse_program(self) -> ast.Program:
         return parse_program(self)
 
+    def _select_top_level_rule(self) -> TopLevelRule | None:
+        return select_top_level_rule(self)
+
     # Flow and blocks
     def _parse_flow(self) -> ast.Flow:
         return parse_flow(self)
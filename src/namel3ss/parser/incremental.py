@@ -1,14 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_right
+from decimal import Decimal
+from enum import Enum
+from dataclasses import dataclass, field, is_dataclass, replace
+from functools import partial
 
 from namel3ss.ast import nodes as ast
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.contract import build_error_entry
-from namel3ss.lexer.lexer import Lexer
+from namel3ss.lexer.lexer import Lexer, LineBlock, assemble_tokens
 from namel3ss.lexer.tokens import Token
 from namel3ss.parser.core import Parser
+from namel3ss.parser.grammar_table import TopLevelRule
 from namel3ss.parser.sugar.lower import lower_program as lower_sugar_program
+from namel3ss.parser.sugar.lowering.memo import LoweringMemo
+
+# Line breaks other than "\n" make character offsets and splitlines() disagree.
+_OTHER_LINE_BREAKS = ("\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+# Values copied as-is when shifting parsed nodes.
+_LEAVES = (str, int, float, bool, bytes, Decimal, Enum)
+# Tokens past the end of a declaration that its parse may have looked at.
+_LOOKAHEAD = 2
 
 
 @dataclass(frozen=True)
@@ -18,12 +31,30 @@ class IncrementalEdit:
     insert_text: str
 
 
+@dataclass(frozen=True)
+class ParsedUnit:
+    rule: str
+    tokens: tuple[Token, ...]
+    consumed: int
+    result: object
+
+
+@dataclass(frozen=True)
+class ParseCache:
+    options: tuple[bool, bool, bool, bool]
+    blocks: tuple[LineBlock, ...]
+    line_count: int
+    units: dict[int, ParsedUnit]
+    lowering: LoweringMemo | None
+
+
 @dataclass(frozen=True)
 class IncrementalState:
     source: str
     tokens: list[Token]
     program: ast.Program | None
     error: dict | None
+    cache: ParseCache | None = field(default=None, repr=False, compare=False)
 
 
 def full_parse_state(
@@ -34,28 +65,13 @@ def full_parse_state(
     require_spec: bool = True,
     lower_sugar: bool = True,
 ) -> IncrementalState:
+    options = (allow_legacy_type_aliases, allow_capsule, require_spec, lower_sugar)
+    lines = source.splitlines()
     try:
-        tokens = Lexer(source).tokenize()
+        blocks = tuple(Lexer(source).scan_blocks(lines))
     except Namel3ssError as err:
-        return IncrementalState(
-            source=source,
-            tokens=[],
-            program=None,
-            error=_error_entry(err),
-        )
-    program, error = _parse_tokens(
-        tokens,
-        allow_legacy_type_aliases=allow_legacy_type_aliases,
-        allow_capsule=allow_capsule,
-        require_spec=require_spec,
-        lower_sugar=lower_sugar,
-    )
-    return IncrementalState(
-        source=source,
-        tokens=tokens,
-        program=program,
-        error=error,
-    )
+        return IncrementalState(source=source, tokens=[], program=None, error=_error_entry(err))
+    return _parse_blocks(source, blocks, len(lines), options, previous=None)
 
 
 def incremental_parse(
@@ -67,38 +83,229 @@ def incremental_parse(
     require_spec: bool = True,
     lower_sugar: bool = True,
 ) -> IncrementalState:
+    """Parse ``prev_state.source`` with ``edit`` applied, redoing only what the edit touched.
+
+    Only the line blocks around the edit are scanned again, and only the top-level
+    declarations whose tokens changed are parsed again. Every other declaration
+    node is reused from the previous program. Edits that change the line count
+    shift the tokens and declaration nodes below them instead of parsing them again.
+    """
     next_source = _apply_edit(prev_state.source, edit)
-    return full_parse_state(
-        next_source,
-        allow_legacy_type_aliases=allow_legacy_type_aliases,
-        allow_capsule=allow_capsule,
-        require_spec=require_spec,
-        lower_sugar=lower_sugar,
-    )
+    options = (allow_legacy_type_aliases, allow_capsule, require_spec, lower_sugar)
+    cache = prev_state.cache
+    if cache is None or any(mark in next_source or mark in prev_state.source for mark in _OTHER_LINE_BREAKS):
+        return full_parse_state(
+            next_source,
+            allow_legacy_type_aliases=allow_legacy_type_aliases,
+            allow_capsule=allow_capsule,
+            require_spec=require_spec,
+            lower_sugar=lower_sugar,
+        )
+    lines = next_source.splitlines()
+    delta = len(lines) - cache.line_count
+    try:
+        blocks, moved = _rescan_blocks(prev_state.source, cache, lines, edit)
+    except Namel3ssError as err:
+        return IncrementalState(source=next_source, tokens=[], program=None, error=_error_entry(err))
+    previous = cache if cache.options == options else None
+    if previous is not None and moved:
+        previous = _shift_cache(previous, moved, delta)
+    return _parse_blocks(next_source, blocks, len(lines), options, previous=previous)
+
+
+class _ReusingParser(Parser):
+    """Parser that replays unchanged top-level declarations from an earlier parse."""
+
+    def __init__(self, tokens: list[Token], *, units: dict[int, ParsedUnit], **options) -> None:
+        super().__init__(tokens, **options)
+        self._previous_units = units
+        self.units: dict[int, ParsedUnit] = {}
+
+    def _select_top_level_rule(self) -> TopLevelRule | None:
+        start = self.position
+        unit = self._previous_units.get(id(self.tokens[start]))
+        if unit is not None and tuple(self.tokens[start : start + len(unit.tokens)]) == unit.tokens:
+            return TopLevelRule(unit.rule, unit.tokens[0].type, partial(self._replay, unit))
+        rule = super()._select_top_level_rule()
+        if rule is None:
+            return None
+        return replace(rule, parse=partial(self._parse_unit, rule))
 
+    def _replay(self, unit: ParsedUnit, parser: Parser) -> object:
+        self.position += unit.consumed
+        self.units[id(unit.tokens[0])] = unit
+        return unit.result
 
-def _parse_tokens(
-    tokens: list[Token],
+    def _parse_unit(self, rule: TopLevelRule, parser: Parser) -> object:
+        start = self.position
+        result = rule.parse(parser)
+        unit = ParsedUnit(
+            rule=rule.name,
+            tokens=tuple(self.tokens[start : self.position + _LOOKAHEAD]),
+            consumed=self.position - start,
+            result=result,
+        )
+        self.units[id(unit.tokens[0])] = unit
+        return result
+
+
+def _parse_blocks(
+    source: str,
+    blocks: tuple[LineBlock, ...],
+    line_count: int,
+    options: tuple[bool, bool, bool, bool],
     *,
-    allow_legacy_type_aliases: bool,
-    allow_capsule: bool,
-    require_spec: bool,
-    lower_sugar: bool,
-) -> tuple[ast.Program | None, dict | None]:
-    parser = Parser(
+    previous: ParseCache | None,
+) -> IncrementalState:
+    allow_legacy_type_aliases, allow_capsule, require_spec, lower_sugar = options
+    tokens = assemble_tokens(blocks, line_count)
+    parser = _ReusingParser(
         tokens,
+        units=previous.units if previous is not None else {},
         allow_legacy_type_aliases=allow_legacy_type_aliases,
         allow_capsule=allow_capsule,
         require_spec=require_spec,
     )
+    lowering = LoweringMemo(previous.lowering if previous is not None else None) if lower_sugar else None
+    error = None
     try:
         program = parser._parse_program()
-        if lower_sugar:
-            program = lower_sugar_program(program)
+        if lowering is not None:
+            program = lower_sugar_program(program, memo=lowering)
+            lowering.seal()
         parser._expect("EOF")
     except Namel3ssError as err:
-        return None, _error_entry(err)
-    return program, None
+        program, error = None, _error_entry(err)
+        # Keep the last good lowering so a fixed declaration can reuse it again.
+        lowering = previous.lowering if previous is not None else None
+    units = dict(parser.units)
+    if previous is not None and error is not None:
+        # Declarations after the error were not reached; keep those still in the file.
+        heads = {id(block.tokens[0]) for block in blocks if block.tokens}
+        units = {**{key: unit for key, unit in previous.units.items() if key in heads}, **units}
+    cache = ParseCache(options=options, blocks=blocks, line_count=line_count, units=units, lowering=lowering)
+    return IncrementalState(source=source, tokens=tokens, program=program, error=error, cache=cache)
+
+
+def _rescan_blocks(
+    previous_source: str,
+    cache: ParseCache,
+    lines: list[str],
+    edit: IncrementalEdit,
+) -> tuple[tuple[LineBlock, ...], dict[int, Token]]:
+    """Blocks of the edited source, and the line-shifted copy of every token moved below the edit."""
+    blocks = cache.blocks
+    starts = [block.start for block in blocks]
+    first_line = previous_source.count("\n", 0, edit.start)
+    last_line = previous_source.count("\n", 0, edit.start + edit.delete_len)
+    delta = len(lines) - cache.line_count
+    # The block before the edit is scanned too: an edit at the start of a line
+    # can indent it into that block.
+    first = max(bisect_right(starts, first_line) - 2, 0)
+    last = max(bisect_right(starts, last_line) - 1, first)
+
+    def resumes(line: int) -> bool:
+        old_line = line - delta
+        if old_line <= last_line:
+            return False
+        index = bisect_right(starts, old_line) - 1
+        return index > last and starts[index] == old_line
+
+    scanned = list(Lexer("").scan_blocks(lines, blocks[first].start, stop_at=resumes))
+    for offset, block in enumerate(scanned):
+        old = blocks[first + offset] if first + offset <= last else None
+        if old is not None and old.start == block.start and old.start + old.count <= first_line and old == block:
+            scanned[offset] = old
+    end = scanned[-1].start + scanned[-1].count
+    resume = bisect_right(starts, end - delta) - 1 if end < len(lines) else len(blocks)
+    moved: dict[int, Token] = {}
+    tail = blocks[resume:] if delta == 0 else tuple(_shift_block(block, delta, moved) for block in blocks[resume:])
+    return blocks[:first] + tuple(scanned) + tuple(tail), moved
+
+
+def _shift_block(block: LineBlock, delta: int, moved: dict[int, Token]) -> LineBlock:
+    tokens = tuple(_shift_token(tok, delta) for tok in block.tokens)
+    moved.update(zip(map(id, block.tokens), tokens))
+    return LineBlock(block.start + delta, block.count, tokens, block.depth)
+
+
+def _shift_token(tok: Token, delta: int) -> Token:
+    return Token(tok.type, tok.value, tok.line + delta, tok.column, tok.escaped)
+
+
+def _shift_cache(cache: ParseCache, moved: dict[int, Token], delta: int) -> ParseCache:
+    """Move the parsed declarations below an edit by ``delta`` lines so they can be replayed."""
+    units: dict[int, ParsedUnit] = {}
+    nodes: dict[int, object] = {}
+    shift = _LineShifter(delta)
+    for key, unit in cache.units.items():
+        head = moved.get(key)
+        if head is None:
+            units[key] = unit
+            continue
+        if not _shiftable(unit.result):
+            continue
+        result = shift(unit.result)
+        tokens = tuple(moved.get(id(tok)) or _shift_token(tok, delta) for tok in unit.tokens)
+        units[id(head)] = ParsedUnit(rule=unit.rule, tokens=tokens, consumed=unit.consumed, result=result)
+        nodes[id(unit.result)] = result
+    lowering = cache.lowering
+    if lowering is not None and nodes:
+        lowering = lowering.moved(nodes, shift)
+    return replace(cache, units=units, lowering=lowering)
+
+
+def _shiftable(result: object) -> bool:
+    # Settings declarations return bare (value, line, column) tuples; those are parsed again.
+    if isinstance(result, list):
+        return all(_shiftable(item) for item in result)
+    return result is None or isinstance(result, (ast.Node, str))
+
+
+class _LineShifter:
+    """Copies parsed nodes with every ``line`` / ``*_line`` field moved by ``delta``.
+
+    Objects shared between the copied trees (a lowered node reusing parsed parts)
+    are copied once and stay shared.
+    """
+
+    def __init__(self, delta: int) -> None:
+        self.delta = delta
+        self._copies: dict[int, object] = {}
+        self._originals: list[object] = []
+
+    def __call__(self, value: object) -> object:
+        if value is None or isinstance(value, _LEAVES):
+            return value
+        hit = self._copies.get(id(value))
+        if hit is not None:
+            return hit
+        if isinstance(value, list):
+            copied: object = self._remember(value, [])
+            copied.extend(self(item) for item in value)
+        elif isinstance(value, dict):
+            copied = self._remember(value, {})
+            copied.update((key, self(item)) for key, item in value.items())
+        elif isinstance(value, (tuple, set, frozenset)):
+            copied = self._remember(value, type(value)(self(item) for item in value))
+        elif is_dataclass(value) and hasattr(value, "__dict__"):
+            # Bypasses __setattr__, so frozen nodes and tokens are copied the same way.
+            copied = self._remember(value, object.__new__(type(value)))
+            copied.__dict__.update((name, self._field(name, item)) for name, item in vars(value).items())
+        else:
+            return value
+        return copied
+
+    def _field(self, name: str, value: object) -> object:
+        if type(value) is int and (name == "line" or name.endswith("_line")):
+            return value + self.delta
+        return self(value)
+
+    def _remember(self, original: object, copied: object) -> object:
+        self._copies[id(original)] = copied
+        # Keep originals alive so their ids are not reused during this shift.
+        self._originals.append(original)
+        return copied
 
 
 def _apply_edit(source: str, edit: IncrementalEdit) -> str:
@@ -113,4 +320,4 @@ def _error_entry(error: Namel3ssError) -> dict:
     return build_error_entry(error=error, error_payload=None, error_pack=None)
 
 
-__all__ = ["IncrementalEdit", "IncrementalState", "full_parse_state", "incremental_parse"]
+__all__ = ["IncrementalEdit", "IncrementalState", "ParseCache", "ParsedUnit", "full_parse_state", "incremental_parse"]
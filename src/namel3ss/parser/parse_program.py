@@ -5,7 +5,6 @@ from typing import List
 from namel3ss.ast import nodes as ast
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
-from namel3ss.parser.grammar_table import select_top_level_rule
 from namel3ss.ui.settings import default_ui_settings_with_meta
 
 def parse_program(parser) -> ast.Program:
@@ -55,7 +54,7 @@ def parse_program(parser) -> ast.Program:
         if parser._match("NEWLINE"):
             continue
         tok = parser._current()
-        rule = select_top_level_rule(parser)
+        rule = parser._select_top_level_rule()
         if rule is None:
             if parser.allow_capsule:
                 raise Namel3ssError(
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class LoweringMemo:
+    """Lowered declarations keyed by the parsed node they came from.
+
+    Lowering is pure, so a declaration node reused by incremental parsing lowers
+    to the same result. Each memo keeps only the entries its own pass touched;
+    entries from ``previous`` are looked up once and carried over.
+    """
+
+    def __init__(self, previous: "LoweringMemo | None" = None) -> None:
+        self._previous = previous._entries if previous is not None else {}
+        self._entries: dict[tuple[str, int], tuple[object, object]] = {}
+
+    def lower(self, node: T, lower: Callable[[T], R]) -> R:
+        key = (lower.__name__, id(node))
+        hit = self._entries.get(key) or self._previous.get(key)
+        if hit is None or hit[0] is not node:
+            hit = (node, lower(node))
+        self._entries[key] = hit
+        return hit[1]  # type: ignore[return-value]
+
+    def moved(self, nodes: dict[int, object], move: Callable[[object], object]) -> "LoweringMemo":
+        """Copy of this memo that also knows the moved copies of ``nodes``, keyed by original id.
+
+        Entries are visited in lowering order, so a node lowered from another lowered
+        node (an ai flow turned into a flow) follows its source along.
+        """
+        memo = LoweringMemo()
+        memo._entries = dict(self._entries)
+        targets = dict(nodes)
+        for (name, key), (_, lowered) in self._entries.items():
+            target = targets.get(key)
+            if target is None:
+                continue
+            moved = move(lowered)
+            memo._entries[(name, id(target))] = (target, moved)
+            targets[id(lowered)] = moved
+        return memo
+
+    def seal(self) -> None:
+        self._previous = {}
+
+
+__all__ = ["LoweringMemo"]
@@ -6,17 +6,19 @@ from namel3ss.parser.sugar.lowering.flow_steps import _lower_flow_steps
 from namel3ss.parser.sugar.lowering.statements import _lower_statements
 from namel3ss.parser.sugar.lowering.ai_flows import ai_flow_to_flow, lower_ai_flow
 from namel3ss.parser.sugar.lowering.crud import expand_crud_routes
+from namel3ss.parser.sugar.lowering.memo import LoweringMemo
 from namel3ss.parser.sugar.lowering.program_page_items import _lower_page_item
 
 
-def lower_program(program: ast.Program) -> ast.Program:
-    lowered_ai_flows = [lower_ai_flow(flow) for flow in getattr(program, "ai_flows", []) or []]
-    lowered_prompts = [_lower_prompt(prompt) for prompt in getattr(program, "prompts", []) or []]
-    lowered_crud = [_lower_crud(crud) for crud in getattr(program, "crud", []) or []]
+def lower_program(program: ast.Program, *, memo: LoweringMemo | None = None) -> ast.Program:
+    lower = memo.lower if memo is not None else _lower_now
+    lowered_ai_flows = [lower(flow, lower_ai_flow) for flow in getattr(program, "ai_flows", []) or []]
+    lowered_prompts = [lower(prompt, _lower_prompt) for prompt in getattr(program, "prompts", []) or []]
+    lowered_crud = [lower(crud, _lower_crud) for crud in getattr(program, "crud", []) or []]
     expanded_routes = list(getattr(program, "routes", []) or [])
     expanded_routes.extend(expand_crud_routes(lowered_crud))
-    expanded_flows = [_lower_flow(flow) for flow in program.flows]
-    expanded_flows.extend(ai_flow_to_flow(flow) for flow in lowered_ai_flows)
+    expanded_flows = [lower(flow, _lower_flow) for flow in program.flows]
+    expanded_flows.extend(lower(flow, ai_flow_to_flow) for flow in lowered_ai_flows)
     lowered = ast.Program(
         spec_version=program.spec_version,
         app_theme=program.app_theme,
@@ -31,18 +33,18 @@ def lower_program(program: ast.Program) -> ast.Program:
         if program.ui_active_page_rules
         else None,
         capabilities=list(getattr(program, "capabilities", []) or []),
-        records=[_lower_record(record) for record in program.records],
-        functions=[_lower_function(func) for func in getattr(program, "functions", [])],
-        contracts=[_lower_contract(contract) for contract in getattr(program, "contracts", [])],
+        records=[lower(record, _lower_record) for record in program.records],
+        functions=[lower(func, _lower_function) for func in getattr(program, "functions", [])],
+        contracts=[lower(contract, _lower_contract) for contract in getattr(program, "contracts", [])],
         flows=expanded_flows,
         routes=expanded_routes,
         crud=lowered_crud,
         prompts=lowered_prompts,
         ai_flows=lowered_ai_flows,
-        jobs=[_lower_job(job) for job in getattr(program, "jobs", [])],
-        pages=[_lower_page(page) for page in program.pages],
-        ui_packs=[_lower_ui_pack(pack) for pack in getattr(program, "ui_packs", [])],
-        ui_patterns=[_lower_ui_pattern(pattern) for pattern in getattr(program, "ui_patterns", [])],
+        jobs=[lower(job, _lower_job) for job in getattr(program, "jobs", [])],
+        pages=[lower(page, _lower_page) for page in program.pages],
+        ui_packs=[lower(pack, _lower_ui_pack) for pack in getattr(program, "ui_packs", [])],
+        ui_patterns=[lower(pattern, _lower_ui_pattern) for pattern in getattr(program, "ui_patterns", [])],
         ais=list(program.ais),
         tools=list(program.tools),
         agents=list(program.agents),
@@ -51,8 +53,8 @@ def lower_program(program: ast.Program) -> ast.Program:
         includes=list(getattr(program, "includes", []) or []),
         plugin_uses=list(getattr(program, "plugin_uses", []) or []),
         capsule=program.capsule,
-        identity=_lower_identity(program.identity) if program.identity else None,
-        policy=_lower_policy(program.policy) if program.policy else None,
+        identity=lower(program.identity, _lower_identity) if program.identity else None,
+        policy=lower(program.policy, _lower_policy) if program.policy else None,
         line=program.line,
         column=program.column,
     )
@@ -76,6 +78,10 @@ def lower_program(program: ast.Program) -> ast.Program:
     return lowered
 
 
+def _lower_now(node, lower):
+    return lower(node)
+
+
 def _lower_active_page_rules(rules: list[ast.ActivePageRule]) -> list[ast.ActivePageRule]:
     lowered: list[ast.ActivePageRule] = []
     for rule in rules:
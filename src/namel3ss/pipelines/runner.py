@@ -5,6 +5,7 @@ from types import SimpleNamespace
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.ingestion.api import run_ingestion_progressive
 from namel3ss.ingestion.api import _resolve_metadata  # internal helper
+from namel3ss.ingestion.segments import index_segments
 from namel3ss.pipelines.model import (
     PipelineRunResult,
     PipelineStepResult,
@@ -235,6 +236,9 @@ def _count_index_entries(state: dict, upload_id: str) -> int:
     chunks = index.get("chunks")
     if not isinstance(chunks, list):
         return 0
+    segments = index_segments(index, chunks)
+    if segments is not None:
+        return segments.get(upload_id, {}).get("count", 0)
     return sum(1 for entry in chunks if isinstance(entry, dict) and entry.get("upload_id") == upload_id)
 
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from copy import deepcopy
 
+from namel3ss.ingestion.store import drop_index
 from namel3ss.rag.determinism.json_policy import canonical_contract_hash
 from namel3ss.rag.determinism.id_policy import build_doc_id
 from namel3ss.rag.ingestion.connector_registry import ensure_connector_registry, list_connector_specs
@@ -208,9 +209,7 @@ def _delete_document(state: dict, *, doc_id: str) -> None:
     ingestion = state.get("ingestion")
     if isinstance(ingestion, dict):
         ingestion.pop(doc_id, None)
-    index = state.get("index")
-    if isinstance(index, dict) and isinstance(index.get("chunks"), list):
-        index["chunks"] = [entry for entry in index["chunks"] if _text(entry.get("upload_id")) != doc_id]
+    drop_index(state, upload_id=doc_id)
     remove_document_membership(state, document_id=doc_id)
 
 
@@ -156,6 +156,7 @@ def apply_retrieval_scope(
                     filtered_chunks.append(entry)
         scoped_index = dict(index)
         scoped_index["chunks"] = filtered_chunks
+        scoped_index.pop("segments", None)
         scoped_state["index"] = scoped_index
 
     return scoped_state, summary
@@ -3,7 +3,7 @@ from __future__ import annotations
 from namel3ss.config.model import AppConfig
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
-from namel3ss.ingestion.keywords import extract_keywords, keyword_matches, normalize_keywords
+from namel3ss.ingestion.keywords import extract_keywords, keyword_matches
 from namel3ss.ingestion.normalize import sanitize_text
 from namel3ss.ingestion.policy import (
     ACTION_RETRIEVAL_INCLUDE_WARN,
@@ -11,10 +11,19 @@ from namel3ss.ingestion.policy import (
     evaluate_ingestion_policy,
     load_ingestion_policy,
 )
+from namel3ss.ingestion.segments import index_segments
+from namel3ss.retrieval.chunk_fields import (
+    require_chunk_index,
+    require_ingestion_phase,
+    require_keywords,
+    require_page_number,
+    require_string_field,
+)
 from namel3ss.retrieval.embedding_plan import build_embedding_plan
 from namel3ss.retrieval.explain import RetrievalExplainBuilder
+from namel3ss.retrieval.keyword_index import candidate_scan
 from namel3ss.retrieval.keyword_overlap import safe_keyword_overlap
-from namel3ss.retrieval.ordering import coerce_int, ordering_label, rank_key, select_tier
+from namel3ss.retrieval.ordering import ordering_label, rank_key, select_tier
 from namel3ss.retrieval.readability_filter import should_skip_unreadable_chunk
 from namel3ss.retrieval.result_helpers import candidate_fields, normalize_tags
 from namel3ss.retrieval.tuning import read_tuning_from_state
@@ -68,7 +77,19 @@ def run_retrieval(
     pass_entries: list[tuple[dict, int]] = []
     warn_entries: list[tuple[dict, int]] = []
     blocked = 0
-    for index, entry in enumerate(entries):
+    # Explain output and empty queries account for every chunk, so they keep the full scan.
+    full_scan = not query_text or explain_builder is not None
+    scan = enumerate(entries)
+    if not full_scan:
+        scan, blocked = candidate_scan(
+            entries,
+            query_text,
+            query_keywords,
+            extra_chunk_ids=embedding_plan.candidate_ids,
+            is_blocked=lambda upload_id: _quality_for_upload(status_map, upload_id) == "block",
+            segments=index_segments(state.get("index"), entries),
+        )
+    for index, entry in scan:
         if not isinstance(entry, dict):
             continue
         upload_id = str(entry.get("upload_id") or "")
@@ -76,7 +97,8 @@ def run_retrieval(
         text = entry.get("text")
         text_value = text if isinstance(text, str) else ""
         if quality == "block":
-            blocked += 1
+            if full_scan:
+                blocked += 1
             if explain_builder is not None:
                 overlap = safe_keyword_overlap(
                     entry,
@@ -99,7 +121,7 @@ def run_retrieval(
                 )
             continue
         chunk_id = entry.get("chunk_id")
-        chunk_index = _require_chunk_index(entry)
+        chunk_index = require_chunk_index(entry)
         chunk_id_value = str(chunk_id or f"{upload_id}:{chunk_index}")
         embedding_score = embedding_plan.score_for(chunk_id_value)
         embedding_candidate = embedding_plan.is_candidate(chunk_id_value)
@@ -109,10 +131,10 @@ def run_retrieval(
             app_path=app_path,
             secret_values=secret_values,
         )
-        document_id = _require_string_field(entry, "document_id")
-        source_name = _require_string_field(entry, "source_name")
-        page_number = _require_page_number(entry)
-        ingestion_phase = _require_ingestion_phase(entry)
+        document_id = require_string_field(entry, "document_id")
+        source_name = require_string_field(entry, "source_name")
+        page_number = require_page_number(entry)
+        ingestion_phase = require_ingestion_phase(entry)
         if should_skip_unreadable_chunk(
             text=clean_text,
             explain_builder=explain_builder,
@@ -125,7 +147,7 @@ def run_retrieval(
             vector_score=embedding_score,
         ):
             continue
-        keywords, keyword_source = _require_keywords(entry, clean_text)
+        keywords, keyword_source = require_keywords(entry, clean_text)
         matches = keyword_matches(query_keywords, keywords)
         overlap = len(matches)
         if query_text:
@@ -424,71 +446,4 @@ def _tier_message(value: str) -> str:
     )
 
 
-def _missing_field_message(field: str) -> str:
-    return build_guidance_message(
-        what=f"Retrieval chunks are missing {field}.",
-        why="Retrieval requires page-level provenance, phase metadata, and keywords for deterministic ranking.",
-        fix="Re-run ingestion to rebuild the index with provenance.",
-        example='{"query":"invoice"}',
-    )
-
-
-def _invalid_phase_message(value: str) -> str:
-    return build_guidance_message(
-        what=f"Retrieval chunk has invalid ingestion_phase '{value}'.",
-        why="Ingestion phases must be quick or deep.",
-        fix="Re-run ingestion to rebuild the index with phase metadata.",
-        example='{"query":"invoice"}',
-    )
-
-def _invalid_keywords_message() -> str:
-    return build_guidance_message(
-        what="Retrieval chunk has invalid keywords.",
-        why="Keywords must be a list of non-empty text values.",
-        fix="Re-run ingestion to rebuild the index with keywords.",
-        example='{"query":"invoice"}',
-    )
-
-def _require_string_field(entry: dict, field: str) -> str:
-    value = entry.get(field)
-    if isinstance(value, str) and value.strip():
-        return value
-    raise Namel3ssError(_missing_field_message(field))
-
-
-def _require_page_number(entry: dict) -> int:
-    value = coerce_int(entry.get("page_number"))
-    if value is not None and value > 0:
-        return value
-    raise Namel3ssError(_missing_field_message("page_number"))
-
-
-def _require_chunk_index(entry: dict) -> int:
-    value = coerce_int(entry.get("chunk_index"))
-    if value is not None and value >= 0:
-        return value
-    raise Namel3ssError(_missing_field_message("chunk_index"))
-
-
-def _require_ingestion_phase(entry: dict) -> str:
-    value = entry.get("ingestion_phase")
-    if not isinstance(value, str) or not value.strip():
-        raise Namel3ssError(_missing_field_message("ingestion_phase"))
-    phase = value.strip().lower()
-    if phase in {"quick", "deep"}:
-        return phase
-    raise Namel3ssError(_invalid_phase_message(phase))
-
-
-def _require_keywords(entry: dict, text_value: str) -> tuple[list[str], str]:
-    if "keywords" not in entry:
-        if isinstance(text_value, str) and text_value:
-            return extract_keywords(text_value), "derived"
-        raise Namel3ssError(_missing_field_message("keywords"))
-    normalized = normalize_keywords(entry.get("keywords"))
-    if normalized is None:
-        raise Namel3ssError(_invalid_keywords_message())
-    return normalized, "stored"
-
-
 __all__ = ["run_retrieval"]
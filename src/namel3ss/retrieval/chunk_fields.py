@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.errors.guidance import build_guidance_message
+from namel3ss.ingestion.keywords import extract_keywords, normalize_keywords
+from namel3ss.retrieval.ordering import coerce_int
+
+
+def _missing_field_message(field: str) -> str:
+    return build_guidance_message(
+        what=f"Retrieval chunks are missing {field}.",
+        why="Retrieval requires page-level provenance, phase metadata, and keywords for deterministic ranking.",
+        fix="Re-run ingestion to rebuild the index with provenance.",
+        example='{"query":"invoice"}',
+    )
+
+
+def _invalid_phase_message(value: str) -> str:
+    return build_guidance_message(
+        what=f"Retrieval chunk has invalid ingestion_phase '{value}'.",
+        why="Ingestion phases must be quick or deep.",
+        fix="Re-run ingestion to rebuild the index with phase metadata.",
+        example='{"query":"invoice"}',
+    )
+
+
+def _invalid_keywords_message() -> str:
+    return build_guidance_message(
+        what="Retrieval chunk has invalid keywords.",
+        why="Keywords must be a list of non-empty text values.",
+        fix="Re-run ingestion to rebuild the index with keywords.",
+        example='{"query":"invoice"}',
+    )
+
+
+def require_string_field(entry: dict, field: str) -> str:
+    value = entry.get(field)
+    if isinstance(value, str) and value.strip():
+        return value
+    raise Namel3ssError(_missing_field_message(field))
+
+
+def require_page_number(entry: dict) -> int:
+    value = coerce_int(entry.get("page_number"))
+    if value is not None and value > 0:
+        return value
+    raise Namel3ssError(_missing_field_message("page_number"))
+
+
+def require_chunk_index(entry: dict) -> int:
+    value = coerce_int(entry.get("chunk_index"))
+    if value is not None and value >= 0:
+        return value
+    raise Namel3ssError(_missing_field_message("chunk_index"))
+
+
+def require_ingestion_phase(entry: dict) -> str:
+    value = entry.get("ingestion_phase")
+    if not isinstance(value, str) or not value.strip():
+        raise Namel3ssError(_missing_field_message("ingestion_phase"))
+    phase = value.strip().lower()
+    if phase in {"quick", "deep"}:
+        return phase
+    raise Namel3ssError(_invalid_phase_message(phase))
+
+
+def require_keywords(entry: dict, text_value: str) -> tuple[list[str], str]:
+    if "keywords" not in entry:
+        if isinstance(text_value, str) and text_value:
+            return extract_keywords(text_value), "derived"
+        raise Namel3ssError(_missing_field_message("keywords"))
+    normalized = normalize_keywords(entry.get("keywords"))
+    if normalized is None:
+        raise Namel3ssError(_invalid_keywords_message())
+    return normalized, "stored"
+
+
+__all__ = [
+    "require_chunk_index",
+    "require_ingestion_phase",
+    "require_keywords",
+    "require_page_number",
+    "require_string_field",
+]
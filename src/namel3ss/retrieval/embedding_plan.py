@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import threading
+from typing import Callable
 
 from namel3ss.config.loader import load_config
 from namel3ss.config.model import AppConfig
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
 from namel3ss.ingestion.hash import hash_chunk
+from namel3ss.runtime.embeddings.ann import search_ivf_index
 from namel3ss.runtime.embeddings.service import (
     embed_text,
     embedding_enabled,
     resolve_embedding_model,
     vector_is_zero,
-    vector_similarity,
 )
-from namel3ss.runtime.embeddings.store import EmbeddingRecord, get_embedding_store
+from namel3ss.runtime.embeddings.store import get_embedding_store
+from namel3ss.runtime.embeddings.vectors import VectorMatrix, round_scores
+from namel3ss.runtime.performance.cache import BoundedCache
 
 
 @dataclass(frozen=True)
@@ -24,20 +28,47 @@ class EmbeddingPlan:
     candidate_ids: frozenset[str]
     scores: dict[str, float]
     candidates: list[dict]
+    index: str = "exact"
+    scorer: Callable[[str], float | None] | None = field(default=None, repr=False, compare=False)
 
     def score_for(self, chunk_id: str) -> float | None:
-        return self.scores.get(chunk_id)
+        score = self.scores.get(chunk_id)
+        if score is None and self.scorer is not None:
+            # Index searches score only probed chunks; others are scored exactly on demand.
+            score = self.scorer(chunk_id)
+            if score is not None:
+                self.scores[chunk_id] = score
+        return score
 
     def is_candidate(self, chunk_id: str) -> bool:
         return chunk_id in self.candidate_ids
 
     def explain_payload(self) -> dict:
-        return {
+        payload = {
             "enabled": self.enabled,
             "model_id": self.model_id,
             "candidate_count": len(self.candidates),
             "candidates": list(self.candidates),
         }
+        if self.index != "exact":
+            payload["index"] = self.index
+        return payload
+
+
+@dataclass(frozen=True)
+class _CorpusView:
+    """Hash-to-chunk maps for one chunk list, valid while the matrix is unchanged."""
+
+    signature: tuple[object, ...]
+    matrix: VectorMatrix
+    matrix_size: int
+    scorable: dict[str, str]
+    hash_by_chunk_id: dict[str, str]
+
+
+_VIEW_LIMIT = 16
+_VIEWS = BoundedCache(max_entries=_VIEW_LIMIT)
+_VIEWS_LOCK = threading.Lock()
 
 
 def build_embedding_plan(
@@ -62,17 +93,97 @@ def build_embedding_plan(
     query_vector = embed_text(query_text, model)
     if vector_is_zero(query_vector):
         return EmbeddingPlan(True, model.model_id, frozenset(), {}, [])
-    lookup, hashes = _entry_hashes(entries)
-    records = store.get_records(model_id=model.model_id, chunk_hashes=hashes)
-    scores = _score_records(records, lookup, query_vector, model.precision, model.dims)
+    view = _corpus_view(store, model.model_id, model.dims, entries)
+    matrix = view.matrix
+    scorable = view.scorable
+    selected = None
+    if model.index == "ivf":
+        selected = search_ivf_index(
+            store,
+            model_id=model.model_id,
+            dims=model.dims,
+            allowed=scorable,
+            count=len(scorable),
+            query=query_vector,
+            probes=model.index_probes,
+            limit=model.candidate_limit,
+        )
+    if selected is None:
+        scores = _score_hashes(matrix, scorable, list(scorable), query_vector, model.precision)
+        candidates = _select_candidates(scores, model.candidate_limit)
+        candidate_ids = frozenset(item["chunk_id"] for item in candidates)
+        return EmbeddingPlan(
+            True,
+            model.model_id,
+            candidate_ids,
+            scores,
+            candidates,
+        )
+    scores = _score_hashes(matrix, scorable, selected, query_vector, model.precision)
     candidates = _select_candidates(scores, model.candidate_limit)
-    candidate_ids = frozenset(item["chunk_id"] for item in candidates)
+
+    def _score_chunk(chunk_id: str) -> float | None:
+        chunk_hash = view.hash_by_chunk_id.get(chunk_id)
+        if chunk_hash is None:
+            return None
+        return round_scores(matrix.dot([chunk_hash], query_vector), model.precision)[0]
+
     return EmbeddingPlan(
         True,
         model.model_id,
-        candidate_ids,
+        frozenset(item["chunk_id"] for item in candidates),
         scores,
         candidates,
+        index="ivf",
+        scorer=_score_chunk,
+    )
+
+
+def _corpus_view(
+    store: object,
+    model_id: str,
+    dims: int,
+    entries: list[dict],
+) -> _CorpusView:
+    key = f"{getattr(store, 'scope', id(store))}\x00{model_id}"
+    # Every chunk's identity is compared, so two chunk lists never share a view.
+    signature = tuple(_entry_identity(entry) for entry in entries)
+    with _VIEWS_LOCK:
+        cached = _VIEWS.get(key)
+    if isinstance(cached, _CorpusView) and cached.signature == signature:
+        # Embeddings stored since the view was built grow the matrix and invalidate it.
+        matrix = store.vector_matrix(model_id=model_id, chunk_hashes=[])  # type: ignore[attr-defined]
+        if matrix is cached.matrix and len(matrix) == cached.matrix_size:
+            return cached
+    lookup, hashes = _entry_hashes(entries)
+    matrix = store.vector_matrix(model_id=model_id, chunk_hashes=hashes)  # type: ignore[attr-defined]
+    scorable = _scorable_hashes(matrix, lookup, hashes, dims)
+    view = _CorpusView(
+        signature=signature,
+        matrix=matrix,
+        matrix_size=len(matrix),
+        scorable=scorable,
+        hash_by_chunk_id={chunk_id: chunk_hash for chunk_hash, chunk_id in scorable.items()},
+    )
+    with _VIEWS_LOCK:
+        _VIEWS.set(key, view)
+    return view
+
+
+def _entry_identity(entry: object) -> object:
+    if not isinstance(entry, dict):
+        return None
+    chunk_hash = entry.get("chunk_hash")
+    if isinstance(chunk_hash, str) and chunk_hash:
+        return (entry.get("chunk_id"), chunk_hash)
+    # Without a stored hash the chunk hash is derived from these fields.
+    return (
+        entry.get("chunk_id"),
+        entry.get("upload_id"),
+        entry.get("document_id"),
+        entry.get("page_number"),
+        entry.get("chunk_index"),
+        entry.get("text"),
     )
 
 
@@ -122,27 +233,37 @@ def _chunk_hash_for_entry(entry: dict) -> str | None:
     )
 
 
-def _score_records(
-    records: dict[str, EmbeddingRecord],
+def _scorable_hashes(
+    matrix: VectorMatrix,
     lookup: dict[str, str],
-    query_vector: list[float],
-    precision: int,
+    hashes: list[str],
     dims: int,
-) -> dict[str, float]:
-    scores: dict[str, float] = {}
-    for chunk_hash, record in records.items():
-        if record.status != "ok":
-            continue
-        if record.vector is None:
+) -> dict[str, str]:
+    scorable: dict[str, str] = {}
+    for chunk_hash in dict.fromkeys(hashes):
+        entry = matrix.get(chunk_hash)
+        if entry is None or entry.status != "ok":
             continue
-        if record.dims != dims:
-            raise Namel3ssError(_dims_mismatch_message(record.dims, dims))
+        if entry.dims != dims:
+            raise Namel3ssError(_dims_mismatch_message(entry.dims, dims))
+        if entry.row < 0 or entry.length != dims:
+            raise Namel3ssError(_dims_mismatch_message(entry.length, dims))
         chunk_id = lookup.get(chunk_hash)
         if not chunk_id:
             continue
-        score = vector_similarity(query_vector, record.vector, precision=precision)
-        scores[chunk_id] = score
-    return scores
+        scorable[chunk_hash] = chunk_id
+    return scorable
+
+
+def _score_hashes(
+    matrix: VectorMatrix,
+    scorable: dict[str, str],
+    hashes: list[str],
+    query_vector: list[float],
+    precision: int,
+) -> dict[str, float]:
+    scores = round_scores(matrix.dot(hashes, query_vector), precision)
+    return dict(zip((scorable[chunk_hash] for chunk_hash in hashes), scores))
 
 
 def _select_candidates(scores: dict[str, float], limit: int) -> list[dict]:
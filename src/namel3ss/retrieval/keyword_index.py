@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from namel3ss.ingestion.keywords import normalize_keywords
+from namel3ss.retrieval.ordering import coerce_int
+from namel3ss.runtime.performance.cache import BoundedCache
+
+
+_CACHE_LIMIT = 2
+_SEGMENT_CACHE_LIMIT = 4096
+_TEXT_SEPARATOR = "\x00"
+
+
+@dataclass(frozen=True)
+class KeywordIndex:
+    """Inverted keyword index over one list of indexed chunks.
+
+    Positions refer to the chunk list the index was built from. Entries that
+    retrieval cannot judge from stored metadata alone (missing keywords or
+    provenance) are listed in `always` so every query still inspects them.
+    """
+
+    signature: tuple[object, ...]
+    postings: dict[str, tuple[int, ...]]
+    always: tuple[int, ...]
+    upload_counts: dict[str, int]
+    positions_by_chunk_id: dict[str, tuple[int, ...]]
+    text: str
+    text_starts: tuple[int, ...]
+
+    def candidates(
+        self,
+        query_text: str,
+        query_keywords: list[str],
+        *,
+        extra_chunk_ids: Iterable[str] = (),
+    ) -> list[int]:
+        if _TEXT_SEPARATOR in query_text:
+            return list(range(len(self.signature)))
+        found: set[int] = set(self.always)
+        for keyword in query_keywords:
+            found.update(self.postings.get(keyword, ()))
+        found.update(self._text_matches(query_text))
+        for chunk_id in extra_chunk_ids:
+            found.update(self.positions_by_chunk_id.get(chunk_id, ()))
+        return sorted(found)
+
+    def blocked_count(self, is_blocked: Callable[[str], bool]) -> int:
+        return sum(count for upload_id, count in self.upload_counts.items() if is_blocked(upload_id))
+
+    def _text_matches(self, query_text: str) -> list[int]:
+        if not query_text:
+            return []
+        matches: list[int] = []
+        starts = self.text_starts
+        offset = self.text.find(query_text)
+        while offset >= 0:
+            position = bisect_right(starts, offset) - 1
+            matches.append(position)
+            if position + 1 >= len(starts):
+                break
+            offset = self.text.find(query_text, starts[position + 1])
+        return matches
+
+
+_cache: list[KeywordIndex] = []
+# One index per upload segment, keyed by upload id and checked by signature.
+_segment_cache = BoundedCache(max_entries=_SEGMENT_CACHE_LIMIT)
+_cache_lock = threading.Lock()
+
+
+def index_signature(entries: list) -> tuple[object, ...]:
+    return tuple(_entry_signature(entry) for entry in entries)
+
+
+def _entry_signature(entry: object) -> object:
+    if not isinstance(entry, dict):
+        return None
+    chunk_hash = entry.get("chunk_hash")
+    if isinstance(chunk_hash, str) and chunk_hash:
+        # Ingested chunks carry a content hash; chunk ids embed the upload checksum and position.
+        return (entry.get("chunk_id"), chunk_hash)
+    keywords = entry.get("keywords")
+    return (
+        entry.get("chunk_id"),
+        entry.get("upload_id"),
+        entry.get("chunk_index"),
+        entry.get("text"),
+        tuple(keywords) if isinstance(keywords, list) else keywords,
+    )
+
+
+def build_keyword_index(entries: list, *, signature: tuple[object, ...] | None = None) -> KeywordIndex:
+    postings: dict[str, list[int]] = {}
+    always: list[int] = []
+    upload_counts: dict[str, int] = {}
+    positions_by_chunk_id: dict[str, list[int]] = {}
+    texts: list[str] = []
+    text_starts: list[int] = []
+    cursor = 0
+    for position, entry in enumerate(entries):
+        text_starts.append(cursor)
+        if not isinstance(entry, dict):
+            texts.append(_TEXT_SEPARATOR)
+            cursor += 1
+            continue
+        upload_id = str(entry.get("upload_id") or "")
+        upload_counts[upload_id] = upload_counts.get(upload_id, 0) + 1
+        text = entry.get("text")
+        lowered = text.lower() if isinstance(text, str) else ""
+        texts.append(lowered + _TEXT_SEPARATOR)
+        cursor += len(lowered) + 1
+        chunk_index = coerce_int(entry.get("chunk_index"))
+        keywords = normalize_keywords(entry.get("keywords")) if "keywords" in entry else None
+        if chunk_index is None or chunk_index < 0 or keywords is None or not _has_provenance(entry):
+            always.append(position)
+            continue
+        chunk_id = str(entry.get("chunk_id") or f"{upload_id}:{chunk_index}")
+        positions_by_chunk_id.setdefault(chunk_id, []).append(position)
+        for keyword in keywords:
+            postings.setdefault(keyword, []).append(position)
+    return KeywordIndex(
+        signature=index_signature(entries) if signature is None else signature,
+        postings={keyword: tuple(positions) for keyword, positions in postings.items()},
+        always=tuple(always),
+        upload_counts=upload_counts,
+        positions_by_chunk_id={key: tuple(positions) for key, positions in positions_by_chunk_id.items()},
+        text="".join(texts),
+        text_starts=tuple(text_starts),
+    )
+
+
+def _has_provenance(entry: dict) -> bool:
+    # Chunks failing these checks make retrieval raise, so they must never be skipped.
+    for field in ("document_id", "source_name"):
+        value = entry.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return False
+    page_number = coerce_int(entry.get("page_number"))
+    if page_number is None or page_number <= 0:
+        return False
+    phase = entry.get("ingestion_phase")
+    return isinstance(phase, str) and phase.strip().lower() in {"quick", "deep"}
+
+
+def refresh_keyword_index(entries: list) -> KeywordIndex:
+    """Build the index for freshly ingested chunks and keep it for later queries."""
+    index = build_keyword_index(entries)
+    _remember(index)
+    return index
+
+
+def keyword_index_for(entries: list) -> KeywordIndex:
+    signature = index_signature(entries)
+    with _cache_lock:
+        for position, cached in enumerate(_cache):
+            if len(cached.signature) == len(signature) and cached.signature == signature:
+                _cache.append(_cache.pop(position))
+                return cached
+    index = build_keyword_index(entries, signature=signature)
+    _remember(index)
+    return index
+
+
+def refresh_segment_index(upload_id: str, entries: list) -> KeywordIndex:
+    """Build the index for one freshly ingested upload segment."""
+    index = build_keyword_index(entries)
+    with _cache_lock:
+        _segment_cache.set(upload_id, index)
+    return index
+
+
+def forget_segment_index(upload_id: str) -> None:
+    with _cache_lock:
+        _segment_cache.pop(upload_id)
+
+
+def segment_index_for(upload_id: str, entries: list) -> KeywordIndex:
+    signature = index_signature(entries)
+    with _cache_lock:
+        cached = _segment_cache.get(upload_id)
+    if isinstance(cached, KeywordIndex) and len(cached.signature) == len(signature) and cached.signature == signature:
+        return cached
+    index = build_keyword_index(entries, signature=signature)
+    with _cache_lock:
+        _segment_cache.set(upload_id, index)
+    return index
+
+
+def candidate_scan(
+    entries: list,
+    query_text: str,
+    query_keywords: list[str],
+    *,
+    extra_chunk_ids: Iterable[str],
+    is_blocked: Callable[[str], bool],
+    segments: dict[str, dict] | None = None,
+) -> tuple[Iterable[tuple[int, object]], int]:
+    """Return (position, entry) pairs worth ranking and the number of blocked chunks they skip.
+
+    With a validated segment manifest each upload keeps its own index, so ingesting
+    one document never rebuilds the others.
+    """
+    if segments is None:
+        index = keyword_index_for(entries)
+        candidates = index.candidates(query_text, query_keywords, extra_chunk_ids=extra_chunk_ids)
+        return ((position, entries[position]) for position in candidates), index.blocked_count(is_blocked)
+    extra_ids = list(extra_chunk_ids)
+    positions: list[int] = []
+    blocked = 0
+    for upload_id, span in segments.items():
+        start = span["start"]
+        segment = segment_index_for(upload_id, entries[start : start + span["count"]])
+        found = segment.candidates(query_text, query_keywords, extra_chunk_ids=extra_ids)
+        positions.extend(start + position for position in found)
+        blocked += segment.blocked_count(is_blocked)
+    return ((position, entries[position]) for position in positions), blocked
+
+
+def clear_keyword_index_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _segment_cache.clear()
+
+
+def _remember(index: KeywordIndex) -> None:
+    with _cache_lock:
+        _cache[:] = [cached for cached in _cache if cached.signature != index.signature]
+        _cache.append(index)
+        del _cache[:-_CACHE_LIMIT]
+
+
+__all__ = [
+    "KeywordIndex",
+    "build_keyword_index",
+    "candidate_scan",
+    "clear_keyword_index_cache",
+    "forget_segment_index",
+    "index_signature",
+    "keyword_index_for",
+    "refresh_keyword_index",
+    "refresh_segment_index",
+    "segment_index_for",
+]
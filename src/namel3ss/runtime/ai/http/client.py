@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
+import time
 from typing import Iterable
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.ai.http.metrics import record_provider_call
+from namel3ss.runtime.ai.http.pool import pooled_urlopen as urlopen
 from namel3ss.runtime.ai.providers._shared.errors import map_http_error
 from namel3ss.runtime.ai.providers._shared.parse import json_loads_or_error
 from namel3ss.security import guard_network
@@ -24,10 +27,16 @@ def post_json(
     data = json.dumps(payload).encode("utf-8")
     request = Request(url, data=data, headers=headers)
     guard_network(url, "POST")
+    started = time.monotonic()
+    reused = None
+    failed = True
     try:
         with open_url_with_tls_fallback(urlopen, request, timeout_seconds=timeout_seconds) as response:
+            reused = getattr(response, "connection_reused", None)
             body = response.read()
+        failed = False
     except HTTPError as err:
+        reused = getattr(err, "connection_reused", None)
         try:
             body = err.read()
         except Exception:
@@ -39,4 +48,6 @@ def post_json(
         if isinstance(err, Namel3ssError):
             raise
         raise map_http_error(provider_name, err, url=url, secret_values=secret_values) from err
+    finally:
+        record_provider_call(provider_name, time.monotonic() - started, reused=reused, failed=failed)
     return json_loads_or_error(provider_name, body)
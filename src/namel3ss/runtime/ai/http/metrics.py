@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import threading
+
+
+@dataclass
+class ProviderCallStats:
+    requests: int = 0
+    errors: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        average = self.latency_ms_total / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "latency_ms_avg": round(average, 3),
+            "latency_ms_max": round(self.latency_ms_max, 3),
+        }
+
+
+_LOCK = threading.Lock()
+_PROVIDERS: dict[str, ProviderCallStats] = {}
+
+
+def record_provider_call(provider_name: str, seconds: float, *, reused: bool | None, failed: bool) -> None:
+    """Count one provider HTTP call; ``reused`` is None when the opener did not say."""
+    latency_ms = max(0.0, seconds) * 1000.0
+    with _LOCK:
+        stats = _PROVIDERS.setdefault(provider_name, ProviderCallStats())
+        stats.requests += 1
+        stats.errors += 1 if failed else 0
+        if reused is True:
+            stats.connections_reused += 1
+        elif reused is False:
+            stats.connections_opened += 1
+        stats.latency_ms_total += latency_ms
+        stats.latency_ms_max = max(stats.latency_ms_max, latency_ms)
+
+
+def provider_call_stats() -> dict[str, dict[str, object]]:
+    with _LOCK:
+        return {name: _PROVIDERS[name].as_dict() for name in sorted(_PROVIDERS)}
+
+
+def reset_provider_call_stats() -> None:
+    with _LOCK:
+        _PROVIDERS.clear()
+
+
+__all__ = ["ProviderCallStats", "provider_call_stats", "record_provider_call", "reset_provider_call_stats"]
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import http.client
+import io
+import os
+import ssl
+import threading
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, proxy_bypass
+from urllib.request import urlopen as _urllib_urlopen
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_IDLE_TIMEOUT_SECONDS = 30.0
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_MAX_REQUESTS_PER_CONNECTION = 100
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    pool_size: int = DEFAULT_POOL_SIZE
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    max_requests_per_connection: int = DEFAULT_MAX_REQUESTS_PER_CONNECTION
+
+
+class PooledResponse:
+    """Fully read response, shaped like what urlopen returns."""
+
+    def __init__(self, *, url: str, status: int, reason: str, headers, body: bytes, connection_reused: bool) -> None:
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.connection_reused = connection_reused
+        self._body = io.BytesIO(body)
+
+    def read(self, amount: int = -1) -> bytes:
+        return self._body.read(amount)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def info(self):
+        return self.headers
+
+    def close(self) -> None:
+        self._body.close()
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _Connection:
+    def __init__(self, conn: http.client.HTTPConnection, now: float) -> None:
+        self.conn = conn
+        self.last_used = now
+        self.requests = 0
+
+
+class _HostPool:
+    def __init__(self, settings: PoolSettings) -> None:
+        self._settings = settings
+        self._cond = threading.Condition()
+        self._idle: list[_Connection] = []
+        self._in_flight = 0
+
+    def acquire(self, deadline: float | None, now) -> _Connection | None:
+        """Take an idle connection, or None when the caller should open one."""
+        with self._cond:
+            limit = self._settings.max_in_flight
+            while limit > 0 and self._in_flight >= limit:
+                remaining = None if deadline is None else deadline - now()
+                if remaining is not None and remaining <= 0:
+                    raise URLError(TimeoutError("Timed out waiting for a pooled connection"))
+                self._cond.wait(remaining)
+            self._in_flight += 1
+            stale = self._evict_idle(now())
+            entry = self._idle.pop() if self._idle else None
+        _close_all(stale)
+        return entry
+
+    def release(self, entry: _Connection | None, *, reusable: bool, now: float) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            keep = (
+                entry is not None
+                and reusable
+                and entry.requests < self._settings.max_requests_per_connection
+                and len(self._idle) < self._settings.pool_size
+            )
+            if keep:
+                entry.last_used = now
+                self._idle.append(entry)
+            self._cond.notify()
+        if entry is not None and not keep:
+            entry.conn.close()
+
+    def idle_count(self) -> int:
+        with self._cond:
+            return len(self._idle)
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+        _close_all(idle)
+
+    def _evict_idle(self, now: float) -> list[_Connection]:
+        cutoff = now - self._settings.idle_timeout
+        stale = [entry for entry in self._idle if entry.last_used <= cutoff]
+        if stale:
+            self._idle = [entry for entry in self._idle if entry.last_used > cutoff]
+        return stale
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections shared per (scheme, host, port, TLS context).
+
+    ``pool_size`` bounds the idle connections kept per host, ``max_in_flight``
+    bounds concurrent requests per host (callers wait for a slot), and a
+    connection is closed after ``max_requests_per_connection`` requests.
+    Connections idle for ``idle_timeout`` seconds are closed on the next use.
+    """
+
+    def __init__(self, settings: PoolSettings | None = None, *, clock=time.monotonic) -> None:
+        self.settings = settings or PoolSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hosts: dict[tuple, _HostPool] = {}
+        self._default_context: ssl.SSLContext | None = None
+        self._opened = 0
+        self._reused = 0
+
+    def urlopen(self, request: Request | str, data: bytes | None = None, timeout: float | None = None, *, context=None):
+        if not isinstance(request, Request):
+            request = Request(request, data=data)
+        elif data is not None:
+            request.data = data
+        parts = urlsplit(request.full_url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or _uses_proxy(scheme, parts.hostname or ""):
+            kwargs = {"context": context} if context is not None else {}
+            return _urllib_urlopen(request, timeout=timeout, **kwargs)
+        port = parts.port or (443 if scheme == "https" else 80)
+        if scheme == "https" and context is None:
+            context = self._tls_context()
+        key = (scheme, parts.hostname, port, id(context) if scheme == "https" else None)
+        host = self._host(key)
+        deadline = None if timeout is None else self._clock() + timeout
+        entry = host.acquire(deadline, self._clock)
+        try:
+            entry, raw, body, reused = self._exchange(request, parts, key, entry, context, timeout)
+        except BaseException:
+            host.release(entry, reusable=False, now=self._clock())
+            raise
+        entry.requests += 1
+        host.release(entry, reusable=not raw.will_close, now=self._clock())
+        url = request.full_url
+        if not 200 <= raw.status < 300:
+            error = HTTPError(url, raw.status, raw.reason, raw.headers, io.BytesIO(body))
+            error.connection_reused = reused
+            raise error
+        return PooledResponse(
+            url=url,
+            status=raw.status,
+            reason=raw.reason,
+            headers=raw.headers,
+            body=body,
+            connection_reused=reused,
+        )
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            hosts = list(self._hosts.values())
+            opened, reused = self._opened, self._reused
+        return {
+            "hosts": len(hosts),
+            "idle_connections": sum(host.idle_count() for host in hosts),
+            "connections_opened": opened,
+            "connections_reused": reused,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            hosts, self._hosts = list(self._hosts.values()), {}
+        for host in hosts:
+            host.close()
+
+    def _exchange(self, request: Request, parts, key: tuple, entry: _Connection | None, context, timeout):
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = dict(request.header_items())
+        while True:
+            reused = entry is not None
+            if entry is None:
+                entry = _Connection(self._connect(key, context, timeout), self._clock())
+            elif entry.conn.sock is not None:
+                entry.conn.sock.settimeout(timeout)
+            try:
+                entry.conn.request(request.get_method(), path, body=request.data, headers=headers)
+                raw = entry.conn.getresponse()
+                body = raw.read()
+            except (ConnectionError, http.client.BadStatusLine) as err:
+                entry.conn.close()
+                entry = None
+                if reused:
+                    # The server closed a kept-alive connection; retry once on a new one.
+                    continue
+                raise URLError(err) from err
+            except OSError as err:
+                entry.conn.close()
+                raise URLError(err) from err
+            with self._lock:
+                if reused:
+                    self._reused += 1
+                else:
+                    self._opened += 1
+            return entry, raw, body, reused
+
+    def _connect(self, key: tuple, context, timeout) -> http.client.HTTPConnection:
+        scheme, hostname, port, _ = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(hostname, port, timeout=timeout, context=context)
+        return http.client.HTTPConnection(hostname, port, timeout=timeout)
+
+    def _host(self, key: tuple) -> _HostPool:
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None:
+                host = _HostPool(self.settings)
+                self._hosts[key] = host
+            return host
+
+    def _tls_context(self) -> ssl.SSLContext:
+        with self._lock:
+            if self._default_context is None:
+                self._default_context = ssl.create_default_context()
+            return self._default_context
+
+
+def pool_settings_from_env() -> PoolSettings:
+    return PoolSettings(
+        pool_size=_env_number("N3_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE, int),
+        idle_timeout=_env_number("N3_HTTP_POOL_IDLE_SECONDS", DEFAULT_IDLE_TIMEOUT_SECONDS, float),
+        max_in_flight=_env_number("N3_HTTP_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT, int),
+        max_requests_per_connection=_env_number(
+            "N3_HTTP_MAX_REQUESTS_PER_CONNECTION", DEFAULT_MAX_REQUESTS_PER_CONNECTION, int
+        ),
+    )
+
+
+_SHARED_LOCK = threading.Lock()
+_SHARED: ConnectionPool | None = None
+
+
+def shared_pool() -> ConnectionPool:
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = ConnectionPool(pool_settings_from_env())
+        return _SHARED
+
+
+def configure_shared_pool(settings: PoolSettings | None = None) -> ConnectionPool:
+    """Replace the shared pool, closing the idle connections of the old one."""
+    global _SHARED
+    with _SHARED_LOCK:
+        previous, _SHARED = _SHARED, ConnectionPool(settings or pool_settings_from_env())
+        current = _SHARED
+    if previous is not None:
+        previous.close()
+    return current
+
+
+def pooled_urlopen(request: Request | str, data: bytes | None = None, timeout: float | None = None, *, context=None):
+    return shared_pool().urlopen(request, data, timeout, context=context)
+
+
+def _uses_proxy(scheme: str, hostname: str) -> bool:
+    return scheme in getproxies() and not proxy_bypass(hostname)
+
+
+def _env_number(name: str, default, cast):
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        return default
+    return max(0, value)
+
+
+def _close_all(entries: list[_Connection]) -> None:
+    for entry in entries:
+        entry.conn.close()
+
+
+__all__ = [
+    "ConnectionPool",
+    "PoolSettings",
+    "PooledResponse",
+    "configure_shared_pool",
+    "pool_settings_from_env",
+    "pooled_urlopen",
+    "shared_pool",
+]
@@ -6,6 +6,7 @@ from namel3ss.runtime.records.inspection import (
     DEFAULT_RECORD_LIMIT,
     build_record_effects,
     build_records_payload,
+    collect_record_preview,
     collect_record_rows,
 )
 from namel3ss.runtime.storage.base import Storage
@@ -19,8 +20,8 @@ def records_snapshot(
     identity: dict | None = None,
 ) -> list[dict]:
     identity = identity if identity is not None else _identity_defaults(config)
-    rows, errors = collect_record_rows(program.records, store, identity)
-    return build_records_payload(program.records, rows, errors, limit=DEFAULT_RECORD_LIMIT)
+    rows, counts, errors = collect_record_preview(program.records, store, identity, limit=DEFAULT_RECORD_LIMIT)
+    return build_records_payload(program.records, rows, errors, limit=DEFAULT_RECORD_LIMIT, counts=counts)
 
 
 def record_rows_snapshot(
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from array import array
+from bisect import bisect_left, insort
+from hashlib import sha256
+from operator import mul
+from typing import Container, Sequence
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.errors.guidance import build_guidance_message
+from namel3ss.runtime.embeddings.vectors import VectorMatrix, numpy_module
+
+
+MIN_INDEXED_VECTORS = 256
+_FORMAT = 1
+_TRAIN_ROUNDS = 5
+_TRAIN_PER_LIST = 40
+
+
+class IvfIndex:
+    """Inverted-file index: vectors grouped under the nearest of sqrt(n) centroids.
+
+    Builds are deterministic: items are ordered by chunk hash, centroids start at
+    evenly spaced items and ties always resolve to the lowest list number. Lists
+    stay sorted, and an index is never changed once built: additions return a
+    new index that shares every list they did not touch.
+    """
+
+    def __init__(
+        self,
+        *,
+        dims: int,
+        centroids: array,
+        lists: list[list[str]],
+        base_size: int,
+        build_id: str,
+        size: int | None = None,
+        seq: int = 0,
+    ) -> None:
+        self.dims = dims
+        self.centroids = centroids
+        self.lists = lists
+        self.base_size = base_size
+        self.build_id = build_id
+        self.size = sum(len(items) for items in lists) if size is None else size
+        # Last stored addition folded into this index; 0 for a freshly built one.
+        self.seq = seq
+
+    def __len__(self) -> int:
+        return self.size
+
+    def search(self, query: Sequence[float], *, probes: int, limit: int, allowed: Container[str]) -> list[str]:
+        """Return allowed hashes from the closest lists until `probes` lists and `limit` hits are covered."""
+        found: list[str] = []
+        for probed, position in enumerate(self._rank_lists(query)):
+            if probed >= probes and len(found) >= limit:
+                break
+            found.extend(chunk_hash for chunk_hash in self.lists[position] if chunk_hash in allowed)
+        return found
+
+    def assign(self, items: list[tuple[str, Sequence[float]]]) -> list[tuple[str, int]]:
+        """Nearest list for each item not indexed yet, ordered by chunk hash."""
+        ordered = sorted(dict(items).items())
+        nearest = _nearest_centroids(self.centroids, self.dims, [vector for _, vector in ordered])
+        return [
+            (chunk_hash, position)
+            for (chunk_hash, _), position in zip(ordered, nearest)
+            if not _holds(self.lists[position], chunk_hash)
+        ]
+
+    def with_assignments(self, assignments: list[tuple[str, int]], *, build_id: str | None = None, seq: int = 0) -> "IvfIndex":
+        lists = list(self.lists)
+        touched: set[int] = set()
+        added = 0
+        for chunk_hash, position in assignments:
+            if not 0 <= position < len(lists) or _holds(lists[position], chunk_hash):
+                continue
+            if position not in touched:
+                lists[position] = list(lists[position])
+                touched.add(position)
+            insort(lists[position], chunk_hash)
+            added += 1
+        return IvfIndex(
+            dims=self.dims,
+            centroids=self.centroids,
+            lists=lists,
+            base_size=self.base_size,
+            build_id=build_id or _chain_id(self.build_id, [chunk_hash for chunk_hash, _ in assignments]),
+            size=self.size + added,
+            seq=seq,
+        )
+
+    def to_payload(self) -> bytes:
+        payload = {
+            "format": _FORMAT,
+            "dims": self.dims,
+            "base_size": self.base_size,
+            "build_id": self.build_id,
+            "centroids": self.centroids.tolist(),
+            "lists": self.lists,
+        }
+        return _encode(payload)
+
+    @classmethod
+    def from_payload(cls, raw: bytes | bytearray | memoryview) -> "IvfIndex":
+        try:
+            payload = json.loads(bytes(raw).decode("utf-8"))
+            if payload.get("format") != _FORMAT:
+                raise ValueError("unknown format")
+            dims = int(payload["dims"])
+            centroids = array("d", [float(value) for value in payload["centroids"]])
+            lists = [[str(item) for item in items] for items in payload["lists"]]
+            if dims <= 0 or len(centroids) != dims * len(lists):
+                raise ValueError("centroid size does not match lists")
+            return cls(
+                dims=dims,
+                centroids=centroids,
+                lists=lists,
+                base_size=int(payload["base_size"]),
+                build_id=str(payload["build_id"]),
+            )
+        except Exception as err:
+            raise Namel3ssError(_payload_message(str(err))) from err
+
+    def _rank_lists(self, query: Sequence[float]) -> list[int]:
+        scores = _centroid_scores(self.centroids, self.dims, query)
+        return sorted(range(len(scores)), key=lambda position: (-scores[position], position))
+
+
+def build_ivf_index(items: list[tuple[str, Sequence[float]]], *, dims: int) -> IvfIndex:
+    ordered = sorted(items, key=lambda item: item[0])
+    total = len(ordered)
+    list_count = max(1, min(total, round(math.sqrt(total))))
+    centroids = array("d")
+    for position in range(list_count):
+        centroids.extend(ordered[(position * total) // list_count][1] if total else [0.0] * dims)
+    step = max(1, total // (list_count * _TRAIN_PER_LIST))
+    sample = [vector for _, vector in ordered[::step]]
+    for _ in range(_TRAIN_ROUNDS):
+        centroids = _recenter(centroids, dims, sample, _nearest_centroids(centroids, dims, sample))
+    lists: list[list[str]] = [[] for _ in range(list_count)]
+    nearest = _nearest_centroids(centroids, dims, [vector for _, vector in ordered])
+    for (chunk_hash, _), position in zip(ordered, nearest):
+        lists[position].append(chunk_hash)
+    return IvfIndex(
+        dims=dims,
+        centroids=centroids,
+        lists=lists,
+        base_size=total,
+        build_id=_chain_id("", [chunk_hash for chunk_hash, _ in ordered]),
+    )
+
+
+_loaded: dict[tuple[str, str], IvfIndex] = {}
+_loaded_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+
+
+def search_ivf_index(
+    store: object,
+    *,
+    model_id: str,
+    dims: int,
+    allowed: Container[str],
+    count: int,
+    query: Sequence[float],
+    probes: int,
+    limit: int,
+) -> list[str] | None:
+    """Return the hashes worth scoring exactly, or None when the exact scan should run instead.
+
+    Queries only read the index kept by `refresh_ivf_index`; a small corpus or a
+    model without a stored index scans exactly.
+    """
+    if count < max(MIN_INDEXED_VECTORS, 4 * limit):
+        return None
+    index = _current_index(store, model_id)
+    if index is None or index.dims != dims:
+        return None
+    return index.search(query, probes=probes, limit=limit, allowed=allowed)
+
+
+def refresh_ivf_index(store: object, *, model_id: str, dims: int, chunk_hashes: list[str]) -> IvfIndex | None:
+    """Index newly stored vectors, rebuilding once the corpus has doubled.
+
+    Between rebuilds only the new list assignments are stored, so an ingest
+    writes in proportion to what it added rather than to the corpus.
+    """
+    with _refresh_lock:
+        index = _current_index(store, model_id)
+        if index is not None and index.dims != dims:
+            index = None
+        if index is not None and _fits(index, len(index) + len(chunk_hashes)):
+            matrix = store.vector_matrix(model_id=model_id, chunk_hashes=chunk_hashes)  # type: ignore[attr-defined]
+            assignments = index.assign(_indexable(matrix, chunk_hashes, dims))
+            if not assignments:
+                return index
+            build_id = _chain_id(index.build_id, [chunk_hash for chunk_hash, _ in assignments])
+            payload = {"previous": index.build_id, "items": [list(item) for item in assignments]}
+            seq = store.append_ann_additions(model_id, build_id, _encode(payload))  # type: ignore[attr-defined]
+            index = index.with_assignments(assignments, build_id=build_id, seq=seq)
+        else:
+            every = store.model_chunk_hashes(model_id)  # type: ignore[attr-defined]
+            if len(every) < MIN_INDEXED_VECTORS:
+                return None
+            matrix = store.vector_matrix(model_id=model_id, chunk_hashes=every)  # type: ignore[attr-defined]
+            index = build_ivf_index(_indexable(matrix, every, dims), dims=dims)
+            # Writing a new base also discards the additions stored against the old one.
+            store.write_ann_index(model_id, index.build_id, index.to_payload())  # type: ignore[attr-defined]
+        with _loaded_lock:
+            _loaded[_index_key(store, model_id)] = index
+        return index
+
+
+def clear_ivf_cache() -> None:
+    with _loaded_lock:
+        _loaded.clear()
+
+
+def _current_index(store: object, model_id: str) -> IvfIndex | None:
+    # Cached indexes are never mutated; newer additions produce a new index that is swapped in.
+    key = _index_key(store, model_id)
+    stored_id = store.ann_build_id(model_id)  # type: ignore[attr-defined]
+    if stored_id is None:
+        return None
+    with _loaded_lock:
+        cached = _loaded.get(key)
+    if cached is not None and cached.build_id == stored_id:
+        return cached
+    index = _caught_up(store, model_id, cached) if cached is not None else None
+    if index is None or index.build_id != stored_id:
+        index = _load_stored(store, model_id)
+    if index is not None:
+        with _loaded_lock:
+            _loaded[key] = index
+    return index
+
+
+def _caught_up(store: object, model_id: str, index: IvfIndex) -> IvfIndex | None:
+    """Apply additions stored after ``index``; None when they do not chain from it."""
+    for seq, build_id, raw in store.read_ann_additions(model_id, after=index.seq):  # type: ignore[attr-defined]
+        addition = _decode_addition(raw)
+        if addition is None or addition[0] != index.build_id:
+            return None
+        index = index.with_assignments(addition[1], build_id=build_id, seq=seq)
+    return index
+
+
+def _index_key(store: object, model_id: str) -> tuple[str, str]:
+    return (str(getattr(store, "scope", id(store))), model_id)
+
+
+def _indexable(matrix: VectorMatrix, chunk_hashes: list[str], dims: int) -> list[tuple[str, Sequence[float]]]:
+    items: list[tuple[str, Sequence[float]]] = []
+    for chunk_hash in chunk_hashes:
+        vector = matrix.vector(chunk_hash)
+        if vector is not None and len(vector) == dims:
+            items.append((chunk_hash, vector))
+    return items
+
+
+def _holds(items: list[str], chunk_hash: str) -> bool:
+    position = bisect_left(items, chunk_hash)
+    return position < len(items) and items[position] == chunk_hash
+
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+
+
+def _decode_addition(raw: bytes | bytearray | memoryview) -> tuple[str, list[tuple[str, int]]] | None:
+    try:
+        payload = json.loads(bytes(raw).decode("utf-8"))
+        return str(payload["previous"]), [(str(chunk_hash), int(position)) for chunk_hash, position in payload["items"]]
+    except Exception:
+        return None
+
+
+def _load_stored(store: object, model_id: str) -> IvfIndex | None:
+    payload = store.read_ann_index(model_id)  # type: ignore[attr-defined]
+    if payload is None:
+        return None
+    try:
+        index = IvfIndex.from_payload(payload)
+    except Namel3ssError:
+        return None
+    # Additions from writers racing on one base still hold valid list numbers, so all are applied.
+    for seq, build_id, raw in store.read_ann_additions(model_id, after=0):  # type: ignore[attr-defined]
+        addition = _decode_addition(raw)
+        if addition is not None:
+            index = index.with_assignments(addition[1], build_id=build_id, seq=seq)
+    return index
+
+
+def _fits(index: IvfIndex, total: int) -> bool:
+    # Rebuild once the corpus has doubled since training so lists stay balanced.
+    return total <= index.base_size * 2
+
+
+def _chain_id(previous: str, chunk_hashes: list[str]) -> str:
+    digest = sha256(previous.encode("utf-8"))
+    for chunk_hash in chunk_hashes:
+        digest.update(b"\n" + chunk_hash.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _centroid_scores(centroids: array, dims: int, query: Sequence[float]) -> list[float]:
+    np = numpy_module()
+    if np is not None:
+        grid = np.frombuffer(centroids, dtype=np.float64).reshape(-1, dims)
+        return (grid @ np.asarray(query, dtype=np.float64)).tolist()
+    values = [float(value) for value in query]
+    return [math.fsum(map(mul, centroids[start : start + dims], values)) for start in range(0, len(centroids), dims)]
+
+
+def _nearest_centroids(centroids: array, dims: int, vectors: list[Sequence[float]]) -> list[int]:
+    if not vectors:
+        return []
+    np = numpy_module()
+    if np is not None:
+        grid = np.frombuffer(centroids, dtype=np.float64).reshape(-1, dims)
+        points = np.asarray([list(vector) for vector in vectors], dtype=np.float64)
+        return (points @ grid.T).argmax(axis=1).tolist()
+    nearest: list[int] = []
+    for vector in vectors:
+        scores = _centroid_scores(centroids, dims, vector)
+        nearest.append(max(range(len(scores)), key=lambda position: (scores[position], -position)))
+    return nearest
+
+
+def _recenter(centroids: array, dims: int, vectors: list[Sequence[float]], nearest: list[int]) -> array:
+    sums = [[0.0] * dims for _ in range(len(centroids) // dims)]
+    counts = [0] * len(sums)
+    for vector, position in zip(vectors, nearest):
+        counts[position] += 1
+        total = sums[position]
+        for offset, value in enumerate(vector):
+            total[offset] += value
+    updated = array("d")
+    for position, total in enumerate(sums):
+        norm = math.sqrt(math.fsum(value * value for value in total))
+        if not counts[position] or norm == 0.0:
+            updated.extend(centroids[position * dims : (position + 1) * dims])
+            continue
+        updated.extend(value / norm for value in total)
+    return updated
+
+
+def _payload_message(detail: str) -> str:
+    return build_guidance_message(
+        what="Stored embedding index is invalid.",
+        why=f"The IVF index payload could not be read: {detail}.",
+        fix="Delete the stored index; it is rebuilt on the next ingestion.",
+        example='[embedding]\nindex = "ivf"',
+    )
+
+
+__all__ = [
+    "IvfIndex",
+    "MIN_INDEXED_VECTORS",
+    "build_ivf_index",
+    "clear_ivf_cache",
+    "refresh_ivf_index",
+    "search_ivf_index",
+]
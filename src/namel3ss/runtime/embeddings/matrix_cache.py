@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+
+from namel3ss.runtime.embeddings.vectors import VectorMatrix
+from namel3ss.runtime.performance.cache import BoundedCache
+
+
+_SHARED_MATRIX_LIMIT = 16
+_SHARED_MATRIX_BYTES = 256 * 1024 * 1024
+
+# LRU over (scope, model) matrices, bounded by count and by packed vector bytes.
+_SHARED_MATRICES = BoundedCache(
+    max_entries=_SHARED_MATRIX_LIMIT,
+    max_weight=_SHARED_MATRIX_BYTES,
+    weigher=lambda matrix: matrix.nbytes,
+)
+_SHARED_MATRICES_LOCK = threading.Lock()
+
+
+def shared_matrix(store, scope: str, model_id: str, chunk_hashes: list[str]) -> VectorMatrix:
+    # Matrices outlive store connections so repeated queries skip both the database and decoding.
+    key = _matrix_key(scope, model_id)
+    with _SHARED_MATRICES_LOCK:
+        matrix = _SHARED_MATRICES.get(key)
+        if matrix is None:
+            matrix = VectorMatrix()
+            _SHARED_MATRICES.set(key, matrix)
+    missing = matrix.missing(chunk_hashes)
+    if missing:
+        for record in store.get_records(model_id=model_id, chunk_hashes=missing).values():
+            add_record_to_matrix(matrix, record)
+        with _SHARED_MATRICES_LOCK:
+            # Store the grown matrix again so its new size counts against the byte budget.
+            if _SHARED_MATRICES.peek(key) is matrix:
+                _SHARED_MATRICES.set(key, matrix)
+    return matrix
+
+
+def evict_shared_matrices(scope: str) -> None:
+    prefix = _matrix_key(scope, "")
+    with _SHARED_MATRICES_LOCK:
+        for key, _ in _SHARED_MATRICES.items():
+            if key.startswith(prefix):
+                _SHARED_MATRICES.pop(key)
+
+
+def shared_matrix_stats() -> dict[str, int]:
+    with _SHARED_MATRICES_LOCK:
+        return _SHARED_MATRICES.stats().as_dict()
+
+
+def add_record_to_matrix(matrix: VectorMatrix, record) -> None:
+    matrix.add(
+        chunk_hash=record.chunk_hash,
+        chunk_id=record.chunk_id,
+        dims=record.dims,
+        status=record.status,
+        vector=record.vector,
+    )
+
+
+def _matrix_key(scope: str, model_id: str) -> str:
+    return f"{scope}\x00{model_id}"
+
+
+__all__ = ["add_record_to_matrix", "evict_shared_matrices", "shared_matrix", "shared_matrix_stats"]
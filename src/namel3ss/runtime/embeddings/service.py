@@ -12,6 +12,7 @@ from namel3ss.errors.guidance import build_guidance_message
 
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+EMBEDDING_INDEX_KINDS = ("exact", "ivf")
 
 
 @dataclass(frozen=True)
@@ -22,6 +23,8 @@ class EmbeddingModel:
     dims: int
     precision: int
     candidate_limit: int
+    index: str = "exact"
+    index_probes: int = 8
 
     @property
     def model_id(self) -> str:
@@ -42,6 +45,8 @@ def resolve_embedding_model(config: AppConfig | None) -> EmbeddingModel:
     dims = _coerce_positive_int(cfg.embedding.dims)
     precision = _coerce_non_negative_int(cfg.embedding.precision)
     candidate_limit = _coerce_positive_int(cfg.embedding.candidate_limit)
+    index = _normalize_text(cfg.embedding.index).lower() or "exact"
+    index_probes = _coerce_positive_int(cfg.embedding.index_probes)
     if provider not in {"hash", "test"}:
         raise Namel3ssError(_provider_message(provider))
     if not model:
@@ -54,6 +59,10 @@ def resolve_embedding_model(config: AppConfig | None) -> EmbeddingModel:
         raise Namel3ssError(_precision_message())
     if candidate_limit <= 0:
         raise Namel3ssError(_candidate_limit_message())
+    if index not in EMBEDDING_INDEX_KINDS:
+        raise Namel3ssError(_index_message(index))
+    if index_probes <= 0:
+        raise Namel3ssError(_index_probes_message())
     if provider == "test" and dims < 2:
         raise Namel3ssError(_dims_message(minimum=2))
     return EmbeddingModel(
@@ -63,6 +72,8 @@ def resolve_embedding_model(config: AppConfig | None) -> EmbeddingModel:
         dims=dims,
         precision=precision,
         candidate_limit=candidate_limit,
+        index=index,
+        index_probes=index_probes,
     )
 
 
@@ -222,6 +233,24 @@ def _candidate_limit_message() -> str:
     )
 
 
+def _index_message(value: str) -> str:
+    return build_guidance_message(
+        what=f"Embedding index '{value}' is not supported.",
+        why="Embedding candidates are found by an exact scan or an IVF index.",
+        fix="Set embedding.index to exact or ivf.",
+        example='[embedding]\nindex = "ivf"',
+    )
+
+
+def _index_probes_message() -> str:
+    return build_guidance_message(
+        what="Embedding index_probes must be a positive integer.",
+        why="The IVF index searches a fixed number of lists per query.",
+        fix="Set embedding.index_probes to a positive integer.",
+        example='[embedding]\nindex_probes = 8',
+    )
+
+
 def _dims_mismatch_message(expected: int, found: int) -> str:
     return build_guidance_message(
         what=f"Embedding vector dims mismatch (expected {expected}, found {found}).",
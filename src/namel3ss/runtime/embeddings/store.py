@@ -4,14 +4,19 @@ from dataclasses import dataclass
 from hashlib import sha256
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from namel3ss.config.model import AppConfig
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
+from namel3ss.runtime.embeddings.matrix_cache import add_record_to_matrix, evict_shared_matrices, shared_matrix
+from namel3ss.runtime.embeddings.vectors import VectorMatrix, pack_vector, unpack_vector
 from namel3ss.runtime.persistence_paths import resolve_writable_path
 
 
+_QUERY_BATCH = 500
+
+
 @dataclass(frozen=True)
 class EmbeddingRecord:
     chunk_id: str
@@ -23,16 +28,53 @@ class EmbeddingRecord:
 
 
 class EmbeddingStore:
+    scope: str = ""
+
     def get_records(self, *, model_id: str, chunk_hashes: list[str]) -> dict[str, EmbeddingRecord]:
         raise NotImplementedError
 
     def write_records(self, records: list[EmbeddingRecord]) -> None:
         raise NotImplementedError
 
+    def vector_matrix(self, *, model_id: str, chunk_hashes: list[str]) -> VectorMatrix:
+        matrix = VectorMatrix()
+        for record in self.get_records(model_id=model_id, chunk_hashes=chunk_hashes).values():
+            add_record_to_matrix(matrix, record)
+        return matrix
+
+    def model_chunk_hashes(self, model_id: str) -> list[str]:
+        raise NotImplementedError
+
+    def ann_build_id(self, model_id: str) -> str | None:
+        """Build id of the newest addition, else of the stored index."""
+        raise NotImplementedError
+
+    def read_ann_index(self, model_id: str) -> bytes | None:
+        raise NotImplementedError
+
+    def write_ann_index(self, model_id: str, build_id: str, payload: bytes) -> None:
+        """Replace the stored index and drop the additions made to the previous one."""
+        raise NotImplementedError
+
+    def append_ann_additions(self, model_id: str, build_id: str, payload: bytes) -> int:
+        """Store list additions made since the index was written; returns their sequence number."""
+        raise NotImplementedError
+
+    def read_ann_additions(self, model_id: str, *, after: int) -> list[tuple[int, str, bytes]]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
 
 class MemoryEmbeddingStore(EmbeddingStore):
     def __init__(self) -> None:
         self._records: dict[tuple[str, str], EmbeddingRecord] = {}
+        self._matrices: dict[str, VectorMatrix] = {}
+        self._ann_indexes: dict[str, tuple[str, bytes]] = {}
+        self._ann_additions: dict[str, list[tuple[int, str, bytes]]] = {}
+        self._ann_seq = 0
+        self.scope = f"memory:{id(self)}"
 
     def get_records(self, *, model_id: str, chunk_hashes: list[str]) -> dict[str, EmbeddingRecord]:
         output: dict[str, EmbeddingRecord] = {}
@@ -49,6 +91,44 @@ class MemoryEmbeddingStore(EmbeddingStore):
                 continue
             self._records[key] = record
 
+    def vector_matrix(self, *, model_id: str, chunk_hashes: list[str]) -> VectorMatrix:
+        matrix = self._matrices.setdefault(model_id, VectorMatrix())
+        for chunk_hash in matrix.missing(chunk_hashes):
+            record = self._records.get((model_id, chunk_hash))
+            if record is not None:
+                add_record_to_matrix(matrix, record)
+        return matrix
+
+    def model_chunk_hashes(self, model_id: str) -> list[str]:
+        return [
+            chunk_hash
+            for (record_model, chunk_hash), record in self._records.items()
+            if record_model == model_id and record.status == "ok"
+        ]
+
+    def ann_build_id(self, model_id: str) -> str | None:
+        additions = self._ann_additions.get(model_id)
+        if additions:
+            return additions[-1][1]
+        entry = self._ann_indexes.get(model_id)
+        return entry[0] if entry else None
+
+    def read_ann_index(self, model_id: str) -> bytes | None:
+        entry = self._ann_indexes.get(model_id)
+        return entry[1] if entry else None
+
+    def write_ann_index(self, model_id: str, build_id: str, payload: bytes) -> None:
+        self._ann_indexes[model_id] = (build_id, payload)
+        self._ann_additions.pop(model_id, None)
+
+    def append_ann_additions(self, model_id: str, build_id: str, payload: bytes) -> int:
+        self._ann_seq += 1
+        self._ann_additions.setdefault(model_id, []).append((self._ann_seq, build_id, payload))
+        return self._ann_seq
+
+    def read_ann_additions(self, model_id: str, *, after: int) -> list[tuple[int, str, bytes]]:
+        return [entry for entry in self._ann_additions.get(model_id, []) if entry[0] > after]
+
 
 class SQLiteEmbeddingStore(EmbeddingStore):
     def __init__(self, db_path: Path) -> None:
@@ -60,6 +140,7 @@ class SQLiteEmbeddingStore(EmbeddingStore):
         except sqlite3.Error as err:
             raise Namel3ssError(f"Could not open SQLite embedding store: {err}") from err
         self.conn.row_factory = sqlite3.Row
+        self.scope = f"sqlite:{Path(db_path).resolve()}"
         self._ensure_table()
 
     def _ensure_table(self) -> None:
@@ -71,30 +152,40 @@ class SQLiteEmbeddingStore(EmbeddingStore):
             "dims INTEGER NOT NULL,"
             "vector TEXT,"
             "status TEXT NOT NULL,"
+            "vector_blob BLOB,"
             "PRIMARY KEY (chunk_hash, model_id)"
             ")"
         )
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(embedding_vectors)").fetchall()}
+        if "vector_blob" not in columns:
+            self.conn.execute("ALTER TABLE embedding_vectors ADD COLUMN vector_blob BLOB")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_ann_index ("
+            "model_id TEXT PRIMARY KEY,"
+            "build_id TEXT NOT NULL,"
+            "payload BLOB NOT NULL"
+            ")"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_ann_additions ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            "model_id TEXT NOT NULL,"
+            "build_id TEXT NOT NULL,"
+            "payload BLOB NOT NULL"
+            ")"
+        )
 
     def get_records(self, *, model_id: str, chunk_hashes: list[str]) -> dict[str, EmbeddingRecord]:
-        if not chunk_hashes:
-            return {}
-        placeholders = ",".join(["?"] * len(chunk_hashes))
-        sql = (
-            "SELECT chunk_hash, chunk_id, model_id, dims, vector, status "
-            "FROM embedding_vectors WHERE model_id = ? AND chunk_hash IN (" + placeholders + ")"
-        )
-        rows = self.conn.execute(sql, [model_id, *chunk_hashes]).fetchall()
         output: dict[str, EmbeddingRecord] = {}
-        for row in rows:
-            record = _decode_record(
-                chunk_hash=row["chunk_hash"],
-                chunk_id=row["chunk_id"],
-                model_id=row["model_id"],
-                dims=row["dims"],
-                vector=row["vector"],
-                status=row["status"],
+        for batch in _batches(chunk_hashes):
+            placeholders = ",".join(["?"] * len(batch))
+            sql = (
+                "SELECT chunk_hash, chunk_id, model_id, dims, vector, vector_blob, status "
+                "FROM embedding_vectors WHERE model_id = ? AND chunk_hash IN (" + placeholders + ")"
             )
-            output[record.chunk_hash] = record
+            for row in self.conn.execute(sql, [model_id, *batch]):
+                record = _decode_row(row)
+                output[record.chunk_hash] = record
         return output
 
     def write_records(self, records: list[EmbeddingRecord]) -> None:
@@ -102,21 +193,78 @@ class SQLiteEmbeddingStore(EmbeddingStore):
             return
         sql = (
             "INSERT OR IGNORE INTO embedding_vectors "
-            "(chunk_hash, model_id, chunk_id, dims, vector, status) VALUES (?, ?, ?, ?, ?, ?)"
+            "(chunk_hash, model_id, chunk_id, dims, vector, vector_blob, status) VALUES (?, ?, ?, ?, NULL, ?, ?)"
         )
-        for record in records:
-            vector_text = _encode_vector(record.vector)
-            self.conn.execute(
-                sql,
+        self.conn.executemany(
+            sql,
+            [
                 (
                     record.chunk_hash,
                     record.model_id,
                     record.chunk_id,
                     record.dims,
-                    vector_text,
+                    _encode_vector(record.vector),
                     record.status,
-                ),
+                )
+                for record in records
+            ],
+        )
+
+    def vector_matrix(self, *, model_id: str, chunk_hashes: list[str]) -> VectorMatrix:
+        return shared_matrix(self, self.scope, model_id, chunk_hashes)
+
+    def model_chunk_hashes(self, model_id: str) -> list[str]:
+        rows = self.conn.execute(
+            "SELECT chunk_hash FROM embedding_vectors WHERE model_id = ? AND status = 'ok'",
+            (model_id,),
+        )
+        return [str(row["chunk_hash"]) for row in rows]
+
+    def ann_build_id(self, model_id: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT build_id FROM embedding_ann_additions WHERE model_id = ? ORDER BY seq DESC LIMIT 1",
+            (model_id,),
+        ).fetchone()
+        if row is None:
+            row = self.conn.execute(
+                "SELECT build_id FROM embedding_ann_index WHERE model_id = ?", (model_id,)
+            ).fetchone()
+        return str(row["build_id"]) if row else None
+
+    def read_ann_index(self, model_id: str) -> bytes | None:
+        row = self.conn.execute("SELECT payload FROM embedding_ann_index WHERE model_id = ?", (model_id,)).fetchone()
+        return bytes(row["payload"]) if row else None
+
+    def write_ann_index(self, model_id: str, build_id: str, payload: bytes) -> None:
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO embedding_ann_index (model_id, build_id, payload) VALUES (?, ?, ?)",
+                (model_id, build_id, payload),
             )
+            self.conn.execute("DELETE FROM embedding_ann_additions WHERE model_id = ?", (model_id,))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def append_ann_additions(self, model_id: str, build_id: str, payload: bytes) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO embedding_ann_additions (model_id, build_id, payload) VALUES (?, ?, ?)",
+            (model_id, build_id, payload),
+        )
+        return int(cursor.lastrowid or 0)
+
+    def read_ann_additions(self, model_id: str, *, after: int) -> list[tuple[int, str, bytes]]:
+        rows = self.conn.execute(
+            "SELECT seq, build_id, payload FROM embedding_ann_additions WHERE model_id = ? AND seq > ? ORDER BY seq",
+            (model_id, after),
+        )
+        return [(int(row["seq"]), str(row["build_id"]), bytes(row["payload"])) for row in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+        evict_shared_matrices(self.scope)
 
 
 class PostgresEmbeddingStore(EmbeddingStore):
@@ -131,6 +279,7 @@ class PostgresEmbeddingStore(EmbeddingStore):
         except Exception as err:
             raise Namel3ssError("Could not open Postgres embedding store.") from err
         self.conn.autocommit = False
+        self.scope = f"postgres:{sha256(database_url.encode('utf-8')).hexdigest()[:16]}"
         self._ensure_table()
 
     def _ensure_table(self) -> None:
@@ -142,29 +291,39 @@ class PostgresEmbeddingStore(EmbeddingStore):
             "dims INTEGER NOT NULL,"
             "vector TEXT,"
             "status TEXT NOT NULL,"
+            "vector_blob BYTEA,"
             "PRIMARY KEY (chunk_hash, model_id)"
             ")"
         )
+        self.conn.execute("ALTER TABLE embedding_vectors ADD COLUMN IF NOT EXISTS vector_blob BYTEA")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_ann_index ("
+            "model_id TEXT PRIMARY KEY,"
+            "build_id TEXT NOT NULL,"
+            "payload BYTEA NOT NULL"
+            ")"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_ann_additions ("
+            "seq BIGSERIAL PRIMARY KEY,"
+            "model_id TEXT NOT NULL,"
+            "build_id TEXT NOT NULL,"
+            "payload BYTEA NOT NULL"
+            ")"
+        )
         self.conn.commit()
 
     def get_records(self, *, model_id: str, chunk_hashes: list[str]) -> dict[str, EmbeddingRecord]:
         if not chunk_hashes:
             return {}
         rows = self.conn.execute(
-            "SELECT chunk_hash, chunk_id, model_id, dims, vector, status "
+            "SELECT chunk_hash, chunk_id, model_id, dims, vector, vector_blob, status "
             "FROM embedding_vectors WHERE model_id = %s AND chunk_hash = ANY(%s)",
-            (model_id, chunk_hashes),
+            (model_id, list(chunk_hashes)),
         ).fetchall()
         output: dict[str, EmbeddingRecord] = {}
         for row in rows:
-            record = _decode_record(
-                chunk_hash=row["chunk_hash"],
-                chunk_id=row["chunk_id"],
-                model_id=row["model_id"],
-                dims=row["dims"],
-                vector=row["vector"],
-                status=row["status"],
-            )
+            record = _decode_row(row)
             output[record.chunk_hash] = record
         return output
 
@@ -172,23 +331,77 @@ class PostgresEmbeddingStore(EmbeddingStore):
         if not records:
             return
         sql = (
-            "INSERT INTO embedding_vectors (chunk_hash, model_id, chunk_id, dims, vector, status) "
-            "VALUES (%s, %s, %s, %s, %s, %s) ON CONFLICT (chunk_hash, model_id) DO NOTHING"
+            "INSERT INTO embedding_vectors (chunk_hash, model_id, chunk_id, dims, vector, vector_blob, status) "
+            "VALUES (%s, %s, %s, %s, NULL, %s, %s) ON CONFLICT (chunk_hash, model_id) DO NOTHING"
         )
-        for record in records:
-            vector_text = _encode_vector(record.vector)
-            self.conn.execute(
-                sql,
+        self.conn.cursor().executemany(
+            sql,
+            [
                 (
                     record.chunk_hash,
                     record.model_id,
                     record.chunk_id,
                     record.dims,
-                    vector_text,
+                    _encode_vector(record.vector),
                     record.status,
-                ),
-            )
+                )
+                for record in records
+            ],
+        )
+        self.conn.commit()
+
+    def vector_matrix(self, *, model_id: str, chunk_hashes: list[str]) -> VectorMatrix:
+        return shared_matrix(self, self.scope, model_id, chunk_hashes)
+
+    def model_chunk_hashes(self, model_id: str) -> list[str]:
+        rows = self.conn.execute(
+            "SELECT chunk_hash FROM embedding_vectors WHERE model_id = %s AND status = 'ok'",
+            (model_id,),
+        ).fetchall()
+        return [str(row["chunk_hash"]) for row in rows]
+
+    def ann_build_id(self, model_id: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT build_id FROM embedding_ann_additions WHERE model_id = %s ORDER BY seq DESC LIMIT 1",
+            (model_id,),
+        ).fetchone()
+        if row is None:
+            row = self.conn.execute(
+                "SELECT build_id FROM embedding_ann_index WHERE model_id = %s", (model_id,)
+            ).fetchone()
+        return str(row["build_id"]) if row else None
+
+    def read_ann_index(self, model_id: str) -> bytes | None:
+        row = self.conn.execute("SELECT payload FROM embedding_ann_index WHERE model_id = %s", (model_id,)).fetchone()
+        return bytes(row["payload"]) if row else None
+
+    def write_ann_index(self, model_id: str, build_id: str, payload: bytes) -> None:
+        self.conn.execute(
+            "INSERT INTO embedding_ann_index (model_id, build_id, payload) VALUES (%s, %s, %s) "
+            "ON CONFLICT (model_id) DO UPDATE SET build_id = EXCLUDED.build_id, payload = EXCLUDED.payload",
+            (model_id, build_id, payload),
+        )
+        self.conn.execute("DELETE FROM embedding_ann_additions WHERE model_id = %s", (model_id,))
+        self.conn.commit()
+
+    def append_ann_additions(self, model_id: str, build_id: str, payload: bytes) -> int:
+        row = self.conn.execute(
+            "INSERT INTO embedding_ann_additions (model_id, build_id, payload) VALUES (%s, %s, %s) RETURNING seq",
+            (model_id, build_id, payload),
+        ).fetchone()
         self.conn.commit()
+        return int(row["seq"])
+
+    def read_ann_additions(self, model_id: str, *, after: int) -> list[tuple[int, str, bytes]]:
+        rows = self.conn.execute(
+            "SELECT seq, build_id, payload FROM embedding_ann_additions WHERE model_id = %s AND seq > %s ORDER BY seq",
+            (model_id, after),
+        ).fetchall()
+        return [(int(row["seq"]), str(row["build_id"]), bytes(row["payload"])) for row in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+        evict_shared_matrices(self.scope)
 
 
 _MEMORY_STORES: dict[str, MemoryEmbeddingStore] = {}
@@ -220,10 +433,27 @@ def get_embedding_store(
     raise Namel3ssError(_unsupported_target_message(target))
 
 
-def _encode_vector(vector: list[float] | None) -> str | None:
+def _encode_vector(vector: list[float] | None) -> bytes | None:
     if vector is None:
         return None
-    return json.dumps([float(value) for value in vector], separators=(",", ":"), ensure_ascii=True)
+    return pack_vector(vector)
+
+
+def _decode_row(row: Any) -> EmbeddingRecord:
+    blob = row["vector_blob"]
+    return _decode_record(
+        chunk_hash=row["chunk_hash"],
+        chunk_id=row["chunk_id"],
+        model_id=row["model_id"],
+        dims=row["dims"],
+        vector=blob if blob is not None else row["vector"],
+        status=row["status"],
+    )
+
+
+def _batches(values: list[str]) -> Iterator[list[str]]:
+    for start in range(0, len(values), _QUERY_BATCH):
+        yield list(values[start : start + _QUERY_BATCH])
 
 
 def _decode_record(
@@ -257,6 +487,8 @@ def _decode_record(
 def _decode_vector(raw: Any) -> list[float]:
     if raw is None:
         raise Namel3ssError(_vector_message("missing vector data"))
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return unpack_vector(raw).tolist()
     try:
         parsed = json.loads(raw) if isinstance(raw, str) else raw
     except Exception as err:
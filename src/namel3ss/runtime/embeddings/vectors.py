@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+import sys
+import threading
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from operator import mul
+from typing import Sequence
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.errors.guidance import build_guidance_message
+
+
+# Stored vectors are packed little-endian float64 so values rounded to any precision round-trip exactly.
+_ITEM_SIZE = 8
+_NUMPY_UNSET = object()
+_numpy_module: object = _NUMPY_UNSET
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    packed = array("d", [float(value) for value in vector])
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_vector(raw: bytes | bytearray | memoryview) -> array:
+    data = bytes(raw)
+    if len(data) % _ITEM_SIZE:
+        raise Namel3ssError(_packed_length_message(len(data)))
+    values = array("d")
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+@dataclass(frozen=True)
+class VectorEntry:
+    chunk_id: str
+    dims: int
+    status: str
+    row: int
+    length: int
+
+
+class VectorMatrix:
+    """Packed vectors for one embedding model, addressed by chunk hash.
+
+    Rows are appended once and never rewritten: stored embeddings are keyed by
+    content hash and model id, so a cached row stays valid for the process.
+    """
+
+    def __init__(self) -> None:
+        self.dims: int | None = None
+        self._entries: dict[str, VectorEntry] = {}
+        self._data = array("d")
+        self._lock = threading.Lock()
+
+    def __contains__(self, chunk_hash: object) -> bool:
+        return chunk_hash in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def get(self, chunk_hash: str) -> VectorEntry | None:
+        return self._entries.get(chunk_hash)
+
+    def vector(self, chunk_hash: str) -> array | None:
+        entry = self._entries.get(chunk_hash)
+        if entry is None or entry.row < 0 or self.dims is None:
+            return None
+        start = entry.row * self.dims
+        with self._lock:
+            return self._data[start : start + self.dims]
+
+    def missing(self, chunk_hashes: Sequence[str]) -> list[str]:
+        return [chunk_hash for chunk_hash in chunk_hashes if chunk_hash not in self._entries]
+
+    def add(
+        self,
+        *,
+        chunk_hash: str,
+        chunk_id: str,
+        dims: int,
+        status: str,
+        vector: Sequence[float] | None,
+    ) -> None:
+        with self._lock:
+            if chunk_hash in self._entries:
+                return
+            row = -1
+            length = 0
+            if vector is not None:
+                length = len(vector)
+                if self.dims is None:
+                    self.dims = length
+                if length == self.dims:
+                    row = len(self._data) // self.dims if self.dims else 0
+                    self._data.extend(vector if isinstance(vector, array) else [float(value) for value in vector])
+            self._entries[chunk_hash] = VectorEntry(
+                chunk_id=chunk_id,
+                dims=int(dims),
+                status=status,
+                row=row,
+                length=length,
+            )
+
+    def dot(self, chunk_hashes: Sequence[str], query: Sequence[float]) -> list[float]:
+        """Return the raw dot product of each listed vector with the query, in one batch."""
+        if not chunk_hashes:
+            return []
+        entries = [self._entries[chunk_hash] for chunk_hash in chunk_hashes]
+        for entry in entries:
+            if entry.row < 0 or entry.length != len(query):
+                raise Namel3ssError(_dims_mismatch_message(len(query), entry.length))
+        dims = len(query)
+        if dims == 0:
+            return [0.0 for _ in entries]
+        rows = [entry.row for entry in entries]
+        with self._lock:
+            np = numpy_module()
+            if np is not None:
+                matrix = np.frombuffer(self._data, dtype=np.float64).reshape(-1, dims)
+                scores = (matrix[rows] @ np.asarray(query, dtype=np.float64)).tolist()
+                del matrix
+                return scores
+            data = self._data
+            query_values = [float(value) for value in query]
+            return [math.fsum(map(mul, data[row * dims : (row + 1) * dims], query_values)) for row in rows]
+
+
+def round_scores(scores: Sequence[float], precision: int) -> list[float]:
+    quant = Decimal("1").scaleb(-precision)
+    output: list[float] = []
+    for score in scores:
+        rounded = float(Decimal(str(score)).quantize(quant, rounding=ROUND_HALF_UP))
+        output.append(0.0 if rounded == 0.0 else rounded)
+    return output
+
+
+def numpy_module() -> object | None:
+    global _numpy_module
+    if _numpy_module is _NUMPY_UNSET:
+        try:
+            import numpy  # type: ignore
+        except Exception:
+            _numpy_module = None
+        else:
+            _numpy_module = numpy
+    return _numpy_module
+
+
+def _packed_length_message(length: int) -> str:
+    return build_guidance_message(
+        what="Embedding vector payload is invalid.",
+        why=f"Packed vectors hold 8-byte floats, but the payload has {length} bytes.",
+        fix="Re-run ingestion to rebuild embeddings.",
+        example='{"status":"ok","vector":[0.1,0.2]}',
+    )
+
+
+def _dims_mismatch_message(expected: int, found: int) -> str:
+    return build_guidance_message(
+        what=f"Embedding vector dims mismatch (expected {expected}, found {found}).",
+        why="Embeddings must be generated with a consistent model configuration.",
+        fix="Ensure embedding model config matches stored vectors.",
+        example='[embedding]\nmodel = "hash"\nversion = "v1"\ndims = 64',
+    )
+
+
+__all__ = ["VectorEntry", "VectorMatrix", "numpy_module", "pack_vector", "round_scores", "unpack_vector"]
@@ -8,6 +8,7 @@ from namel3ss.runtime.ai.trace import AITrace
 from namel3ss.runtime.executor.ai_runner import run_ai_with_tools
 from namel3ss.runtime.executor.ai_runner_support import flush_pending_tool_traces as _flush_pending_tool_traces
 from namel3ss.runtime.executor.context import ExecutionContext
+from namel3ss.runtime.executor.parallel.concurrent import count_agent_call
 from namel3ss.runtime.executor.parallel.isolation import ensure_agent_call_allowed
 from namel3ss.runtime.ai.input_format import prepare_ai_input
 import namel3ss.runtime.memory.api as memory_api
@@ -246,8 +247,7 @@ def run_agent_call(
     role: str | None = None,
 ):
     ensure_agent_call_allowed(ctx, agent_name, line=line, column=column)
-    ctx.agent_calls += 1
-    if ctx.agent_calls > 5:
+    if count_agent_call(ctx) > 5:
         raise Namel3ssError("Agent call limit exceeded in flow")
     if agent_name not in ctx.agents:
         raise Namel3ssError(f"Unknown agent '{agent_name}'", line=line, column=column)
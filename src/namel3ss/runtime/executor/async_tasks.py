@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 import copy
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
 
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.ir import nodes as ir
+from namel3ss.runtime.executor.parallel.concurrent import (
+    SerializedProxy,
+    SharedServices,
+    concurrency_limit,
+    fork_execution_context,
+    join_agent_calls,
+    splice_task_explain_log,
+    splice_task_steps,
+    splice_task_yields,
+)
+from namel3ss.runtime.executor.state_snapshot import snapshot_state
 
 
 @dataclass(frozen=True)
@@ -24,6 +35,9 @@ class AsyncTask:
     line: int | None
     column: int | None
     start_order: int
+    future: Future | None = None
+    context: object | None = None
+    settled: bool = False
 
 
 def launch_async_call(ctx, *, name: str, expression: ir.Expression, line: int | None, column: int | None) -> AsyncHandle:
@@ -44,9 +58,22 @@ def launch_async_call(ctx, *, name: str, expression: ir.Expression, line: int |
     ctx.async_tasks[task_id] = task
 
     locals_snapshot = _snapshot_locals(ctx, line=line, column=column)
-    state_snapshot = copy.deepcopy(ctx.state)
+    state_snapshot = snapshot_state(ctx.state)
     constants_snapshot = set(ctx.constants)
 
+    max_workers = concurrency_limit(ctx)
+    if max_workers > 1:
+        _launch_in_background(
+            ctx,
+            task,
+            expression,
+            locals_snapshot=locals_snapshot,
+            state_snapshot=state_snapshot,
+            constants_snapshot=constants_snapshot,
+            max_workers=max_workers,
+        )
+        return AsyncHandle(task_id=task_id, name=name)
+
     parent_locals = ctx.locals
     parent_state = ctx.state
     parent_constants = ctx.constants
@@ -55,19 +82,13 @@ def launch_async_call(ctx, *, name: str, expression: ir.Expression, line: int |
     parent_tool_source = getattr(ctx, "tool_call_source", None)
     task.status = "running"
     try:
-        from namel3ss.runtime.executor.expr_eval import evaluate_expression
-
         ctx.locals = locals_snapshot
         ctx.state = state_snapshot
         ctx.constants = constants_snapshot
         ctx.parallel_mode = False
         ctx.parallel_task = None
         ctx.tool_call_source = f"async:{name}"
-        task.result = evaluate_expression(ctx, expression)
-        task.status = "completed"
-    except Exception as err:  # pragma: no cover - defensive
-        task.error = err
-        task.status = "failed"
+        _evaluate(ctx, task, expression)
     finally:
         ctx.locals = parent_locals
         ctx.state = parent_state
@@ -75,11 +96,13 @@ def launch_async_call(ctx, *, name: str, expression: ir.Expression, line: int |
         ctx.parallel_mode = parent_parallel_mode
         ctx.parallel_task = parent_parallel_task
         ctx.tool_call_source = parent_tool_source
+        task.settled = True
     return AsyncHandle(task_id=task_id, name=name)
 
 
 def await_async_handle(ctx, handle: AsyncHandle, *, line: int | None, column: int | None) -> object:
     task = _require_task(ctx, handle, line=line, column=column)
+    _settle_task(ctx, task)
     if task.status == "failed":
         if task.error is not None:
             raise task.error
@@ -94,6 +117,117 @@ def is_async_handle(value: object) -> bool:
     return isinstance(value, AsyncHandle)
 
 
+def settle_async_tasks(ctx) -> None:
+    try:
+        for task in _tasks_in_start_order(ctx):
+            _settle_task(ctx, task)
+    finally:
+        _close_async_executor(ctx, cancel=False)
+
+
+def cancel_async_tasks(ctx) -> None:
+    """Drop background tasks that have not started and wait for the running ones.
+
+    Called when the flow fails, before the store is rolled back, so no task can
+    write afterwards. Output of cancelled tasks is discarded.
+    """
+    for task in _tasks_in_start_order(ctx):
+        if task.settled:
+            continue
+        task.settled = True
+        task.context = None
+        if task.future is not None and task.future.cancel():
+            task.status = "cancelled"
+    _close_async_executor(ctx, cancel=True)
+
+
+def _tasks_in_start_order(ctx) -> list[AsyncTask]:
+    tasks = [task for task in (getattr(ctx, "async_tasks", None) or {}).values() if isinstance(task, AsyncTask)]
+    return sorted(tasks, key=lambda item: item.start_order)
+
+
+def _close_async_executor(ctx, *, cancel: bool) -> None:
+    pool = getattr(ctx, "async_executor", None)
+    if isinstance(pool, ThreadPoolExecutor):
+        pool.shutdown(wait=True, cancel_futures=cancel)
+        ctx.async_executor = None
+    services = getattr(ctx, "async_services", None)
+    if isinstance(services, SharedServices):
+        ctx.async_services = None
+        services.release(ctx)
+
+
+def _evaluate(ctx, task: AsyncTask, expression: ir.Expression) -> None:
+    from namel3ss.runtime.executor.expr_eval import evaluate_expression
+
+    try:
+        task.result = evaluate_expression(ctx, expression)
+        task.status = "completed"
+    except Exception as err:
+        task.error = err
+        task.status = "failed"
+
+
+def _launch_in_background(
+    ctx,
+    task: AsyncTask,
+    expression: ir.Expression,
+    *,
+    locals_snapshot: dict[str, object],
+    state_snapshot: dict,
+    constants_snapshot: set[str],
+    max_workers: int,
+) -> None:
+    _share_services(ctx)
+    fork = fork_execution_context(ctx, store=ctx.store, memory_manager=ctx.memory_manager)
+    fork.locals = locals_snapshot
+    fork.state = state_snapshot
+    fork.constants = constants_snapshot
+    fork.traces = []
+    fork.last_value = None
+    fork.parallel_mode = False
+    fork.parallel_task = None
+    fork.tool_call_source = f"async:{task.name}"
+    pool = getattr(ctx, "async_executor", None)
+    if not isinstance(pool, ThreadPoolExecutor):
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="n3-async")
+        ctx.async_executor = pool
+    task.status = "running"
+    task.context = fork
+    task.future = pool.submit(_evaluate, fork, task, expression)
+
+
+def _share_services(ctx) -> None:
+    # The flow keeps running beside its background tasks, so both sides share one
+    # lock until the tasks are settled or cancelled.
+    if isinstance(ctx.store, SerializedProxy):
+        return
+    services = SharedServices(ctx)
+    ctx.async_services = services
+    ctx.store = services.store
+    ctx.memory_manager = services.memory_manager
+
+
+def _settle_task(ctx, task: AsyncTask) -> None:
+    if task.settled:
+        return
+    task.settled = True
+    if task.future is not None:
+        task.future.result()
+    fork = task.context
+    if fork is None:
+        return
+    # Background output joins the flow at the await point, in a fixed order.
+    ctx.traces.extend(fork.traces)
+    ctx.traces.extend(fork.pending_tool_traces)
+    splice_task_steps(ctx, fork.execution_steps)
+    splice_task_explain_log(ctx, fork.explain_log)
+    ctx.record_changes.extend(fork.record_changes)
+    splice_task_yields(ctx, fork.yield_messages)
+    join_agent_calls(ctx)
+    task.context = None
+
+
 def _require_task(ctx, handle: AsyncHandle, *, line: int | None, column: int | None) -> AsyncTask:
     task = ctx.async_tasks.get(handle.task_id)
     if isinstance(task, AsyncTask):
@@ -135,4 +269,12 @@ def _validate_launch_expression(expression: ir.Expression, *, line: int | None,
     )
 
 
-__all__ = ["AsyncHandle", "AsyncTask", "await_async_handle", "is_async_handle", "launch_async_call"]
+__all__ = [
+    "AsyncHandle",
+    "AsyncTask",
+    "await_async_handle",
+    "cancel_async_tasks",
+    "is_async_handle",
+    "launch_async_call",
+    "settle_async_tasks",
+]
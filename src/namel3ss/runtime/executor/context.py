@@ -109,6 +109,9 @@ class ExecutionContext:
     logical_time: int = 0
     async_tasks: dict[str, object] = field(default_factory=dict)
     async_launch_counter: int = 0
+    async_executor: object | None = None
+    async_services: object | None = None
+    shared_agent_calls: object | None = None
     yield_messages: list[dict] = field(default_factory=list)
     yield_sequence: int = 0
     performance_state: object | None = None
@@ -10,6 +10,7 @@ from namel3ss.ir import nodes as ir
 from namel3ss.runtime.ai.mock_provider import MockProvider
 from namel3ss.runtime.ai.provider import AIProvider
 from namel3ss.runtime.ai.model_manager import load_model_manager
+from namel3ss.runtime.executor.async_tasks import cancel_async_tasks, settle_async_tasks
 from namel3ss.runtime.executor.context import ExecutionContext
 from namel3ss.runtime.executor.records import _persist_execution_artifacts, _write_run_outcome, _write_tools_with_pack
 from namel3ss.runtime.executor.result import ExecutionResult
@@ -25,6 +26,7 @@ from namel3ss.runtime.backend.job_queue import initialize_job_triggers, run_job_
 from namel3ss.runtime.memory.api import MemoryManager
 from namel3ss.runtime.mutation_policy import requires_mentions_mutation
 from namel3ss.runtime.storage.factory import resolve_store
+from namel3ss.runtime.storage.state_entries import changed_state_keys, mark_state_saved, save_state_keys
 from namel3ss.schema.evolution import enforce_runtime_schema_compatibility
 from namel3ss.schema.identity import IdentitySchema
 from namel3ss.schema.records import RecordSchema
@@ -279,6 +281,7 @@ class Executor:
                         execute_statement(self.ctx, stmt)
             except _ReturnSignal as signal:
                 self.ctx.last_value = signal.value
+            settle_async_tasks(self.ctx)
             update_job_triggers(self.ctx)
             run_job_queue(self.ctx)
             if audit_before is not None:
@@ -295,7 +298,7 @@ class Executor:
                 )
             try:
                 state_save_attempted = True
-                self.ctx.store.save_state(self.ctx.state)
+                save_state_keys(self.ctx.store, self.ctx.state, changed_state_keys(self.ctx.state))
                 state_save_succeeded = True
             except Exception as err:
                 state_save_failed = True
@@ -304,6 +307,7 @@ class Executor:
             try:
                 self.ctx.store.commit()
                 store_committed = True
+                mark_state_saved(self.ctx.state)
             except Exception as err:
                 store_commit_failed = True
                 mark_boundary(err, "store", action="commit")
@@ -324,6 +328,7 @@ class Executor:
         except Exception as exc:
             error = exc
             _record_error_step(self.ctx, exc)
+            cancel_async_tasks(self.ctx)
             if store_started:
                 try:
                     self.ctx.store.rollback()
@@ -360,6 +365,7 @@ class Executor:
         finally:
             from namel3ss.runtime.executor.ai_runner import _flush_pending_tool_traces
 
+            cancel_async_tasks(self.ctx)
             _flush_pending_tool_traces(self.ctx)
             _record_flow_end(self.ctx, ok=error is None)
             _persist_execution_artifacts(self.ctx, ok=error is None, error=error)
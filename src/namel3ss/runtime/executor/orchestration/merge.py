@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from namel3ss.errors.base import Namel3ssError
 
@@ -12,6 +12,8 @@ class OrchestrationBranchResult:
     value: object | None
     error_type: str | None
     error_message: str | None
+    # Wall-clock time of the branch call; a volatile trace key, never compared.
+    duration_ms: int | None = field(default=None, compare=False)
 
 
 @dataclass(frozen=True)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.ir import nodes as ir
 from namel3ss.observability.scrub import scrub_text
@@ -9,6 +11,13 @@ from namel3ss.runtime.executor.orchestration.merge import (
     OrchestrationBranchResult,
     merge_branch_results,
 )
+from namel3ss.runtime.executor.parallel.concurrent import (
+    fan_out_limit,
+    run_tasks_concurrently,
+    splice_task_explain_log,
+    splice_task_steps,
+)
+from namel3ss.runtime.executor.state_snapshot import CowDict
 from namel3ss.runtime.executor.orchestration.traces import (
     build_orchestration_branch_finished_event,
     build_orchestration_branch_started_event,
@@ -19,6 +28,10 @@ from namel3ss.secrets import collect_secret_values, redact_text
 from namel3ss.utils.slugify import slugify_text
 
 
+_FLOW_CALL_PREFIX = "flow_call:"
+_MISSING = object()
+
+
 def execute_orchestration_block(ctx, stmt: ir.OrchestrationBlock, evaluate_expression) -> None:
     orchestration_id = _next_orchestration_id(ctx)
     branch_names = [branch.name for branch in stmt.branches]
@@ -30,72 +43,11 @@ def execute_orchestration_block(ctx, stmt: ir.OrchestrationBlock, evaluate_expre
         line=stmt.line,
         column=stmt.column,
     )
-    branch_results: list[OrchestrationBranchResult] = []
-    for idx, branch in enumerate(stmt.branches, start=1):
-        branch_id = _branch_id(ctx.flow.name, orchestration_id, branch.name, idx)
-        call_kind, call_target = _branch_call_info(branch.call_expr)
-        record_step(
-            ctx,
-            kind="orchestration_branch_start",
-            what=f"orchestration branch {branch.name} start",
-            data={
-                "orchestration_id": orchestration_id,
-                "branch_id": branch_id,
-                "branch_name": branch.name,
-                "call_kind": call_kind,
-                "call_target": call_target,
-            },
-            line=branch.line,
-            column=branch.column,
-        )
-        ctx.traces.append(
-            build_orchestration_branch_started_event(
-                branch_name=branch.name,
-                branch_id=branch_id,
-                call_kind=call_kind,
-                call_target=call_target,
-            )
-        )
-        status = "ok"
-        value = None
-        error_type = None
-        error_message = None
-        try:
-            value = evaluate_expression(ctx, branch.call_expr)
-        except Exception as err:
-            status = "error"
-            error_type = type(err).__name__
-            error_message = _safe_error_message(ctx, err)
-        branch_results.append(
-            OrchestrationBranchResult(
-                name=branch.name,
-                status=status,
-                value=value,
-                error_type=error_type,
-                error_message=error_message,
-            )
-        )
-        ctx.traces.append(
-            build_orchestration_branch_finished_event(
-                branch_id=branch_id,
-                result=branch_results[-1],
-                summary=_safe_summary(value),
-            )
-        )
-        record_step(
-            ctx,
-            kind="orchestration_branch_end",
-            what=f"orchestration branch {branch.name} end",
-            because=status,
-            data={
-                "orchestration_id": orchestration_id,
-                "branch_id": branch_id,
-                "branch_name": branch.name,
-                "status": status,
-            },
-            line=branch.line,
-            column=branch.column,
-        )
+    fan_out = fan_out_limit(ctx, len(stmt.branches))
+    if fan_out > 1:
+        branch_results = _run_branches_concurrently(ctx, stmt, orchestration_id, evaluate_expression, fan_out)
+    else:
+        branch_results = _run_branches_sequentially(ctx, stmt, orchestration_id, evaluate_expression)
     merge_id = _merge_id(ctx.flow.name, orchestration_id)
     record_step(
         ctx,
@@ -152,6 +104,189 @@ def execute_orchestration_block(ctx, stmt: ir.OrchestrationBlock, evaluate_expre
     ctx.last_value = outcome.output
 
 
+def _run_branches_sequentially(
+    ctx,
+    stmt: ir.OrchestrationBlock,
+    orchestration_id: int,
+    evaluate_expression,
+) -> list[OrchestrationBranchResult]:
+    branch_results: list[OrchestrationBranchResult] = []
+    for idx, branch in enumerate(stmt.branches, start=1):
+        branch_id = _branch_id(ctx.flow.name, orchestration_id, branch.name, idx)
+        _record_branch_start(ctx, branch, branch_id, orchestration_id)
+        result = _evaluate_branch(ctx, branch, evaluate_expression)
+        _record_branch_end(ctx, branch, branch_id, orchestration_id, result, concurrent=None)
+        branch_results.append(result)
+    return branch_results
+
+
+def _run_branches_concurrently(
+    ctx,
+    stmt: ir.OrchestrationBlock,
+    orchestration_id: int,
+    evaluate_expression,
+    fan_out: int,
+) -> list[OrchestrationBranchResult]:
+    branches = list(stmt.branches)
+    # Every branch forks from the same frozen state; merging must not move it.
+    base_state = dict(ctx.state)
+    base_flow_calls = int(getattr(ctx, "flow_call_counter", 0))
+    base_orchestrations = int(getattr(ctx, "orchestration_counter", 0))
+
+    def _prepare(branch_ctx, _branch: ir.OrchestrationBranch) -> None:
+        branch_ctx.state = CowDict(base_state)
+        branch_ctx.traces = []
+
+    def _run(branch_ctx, branch: ir.OrchestrationBranch) -> tuple[OrchestrationBranchResult, None]:
+        return _evaluate_branch(branch_ctx, branch, evaluate_expression), None
+
+    outcomes = run_tasks_concurrently(ctx, branches, max_workers=fan_out, run_task=_run, prepare=_prepare)
+    branch_results: list[OrchestrationBranchResult] = []
+    flow_call_offset = 0
+    nested_orchestrations = 0
+    for idx, (branch, outcome) in enumerate(zip(branches, outcomes), start=1):
+        branch_ctx = outcome.context
+        result = outcome.result
+        branch_id = _branch_id(ctx.flow.name, orchestration_id, branch.name, idx)
+        _record_branch_start(ctx, branch, branch_id, orchestration_id)
+        # Renumber flow calls so ids match the order a sequential run would assign.
+        branch_calls = int(getattr(branch_ctx, "flow_call_counter", 0)) - base_flow_calls
+        shift = _FlowCallShift(base=base_flow_calls, offset=flow_call_offset)
+        ctx.traces.extend(shift.apply(list(branch_ctx.traces) + list(branch_ctx.pending_tool_traces)))
+        splice_task_steps(ctx, shift.apply(outcome.steps))
+        splice_task_explain_log(ctx, outcome.explain_log)
+        ctx.record_changes.extend(branch_ctx.record_changes)
+        _merge_branch_state(ctx.state, base_state, branch_ctx.state)
+        flow_call_offset += max(0, branch_calls)
+        nested_orchestrations += max(0, int(getattr(branch_ctx, "orchestration_counter", 0)) - base_orchestrations)
+        _record_branch_end(ctx, branch, branch_id, orchestration_id, result, concurrent=True)
+        branch_results.append(result)
+    ctx.flow_call_counter = base_flow_calls + flow_call_offset
+    ctx.orchestration_counter = base_orchestrations + nested_orchestrations
+    return branch_results
+
+
+def _evaluate_branch(
+    ctx,
+    branch: ir.OrchestrationBranch,
+    evaluate_expression,
+) -> OrchestrationBranchResult:
+    status = "ok"
+    value = None
+    error_type = None
+    error_message = None
+    started = time.monotonic()
+    try:
+        value = evaluate_expression(ctx, branch.call_expr)
+    except Exception as err:
+        status = "error"
+        error_type = type(err).__name__
+        error_message = _safe_error_message(ctx, err)
+    return OrchestrationBranchResult(
+        name=branch.name,
+        status=status,
+        value=value,
+        error_type=error_type,
+        error_message=error_message,
+        duration_ms=int((time.monotonic() - started) * 1000),
+    )
+
+
+def _record_branch_start(ctx, branch: ir.OrchestrationBranch, branch_id: str, orchestration_id: int) -> None:
+    call_kind, call_target = _branch_call_info(branch.call_expr)
+    record_step(
+        ctx,
+        kind="orchestration_branch_start",
+        what=f"orchestration branch {branch.name} start",
+        data={
+            "orchestration_id": orchestration_id,
+            "branch_id": branch_id,
+            "branch_name": branch.name,
+            "call_kind": call_kind,
+            "call_target": call_target,
+        },
+        line=branch.line,
+        column=branch.column,
+    )
+    ctx.traces.append(
+        build_orchestration_branch_started_event(
+            branch_name=branch.name,
+            branch_id=branch_id,
+            call_kind=call_kind,
+            call_target=call_target,
+        )
+    )
+
+
+def _record_branch_end(
+    ctx,
+    branch: ir.OrchestrationBranch,
+    branch_id: str,
+    orchestration_id: int,
+    result: OrchestrationBranchResult,
+    *,
+    concurrent: bool | None,
+) -> None:
+    ctx.traces.append(
+        build_orchestration_branch_finished_event(
+            branch_id=branch_id,
+            result=result,
+            summary=_safe_summary(result.value),
+            duration_ms=result.duration_ms,
+            concurrent=concurrent,
+        )
+    )
+    record_step(
+        ctx,
+        kind="orchestration_branch_end",
+        what=f"orchestration branch {branch.name} end",
+        because=result.status,
+        data={
+            "orchestration_id": orchestration_id,
+            "branch_id": branch_id,
+            "branch_name": branch.name,
+            "status": result.status,
+        },
+        line=branch.line,
+        column=branch.column,
+    )
+
+
+def _merge_branch_state(state: dict, base: dict, branch_state: dict) -> None:
+    # Only keys the branch changed relative to the frozen base are applied, in
+    # declaration order, so later branches win on the same key.
+    for key in base:
+        if not dict.__contains__(branch_state, key):
+            state.pop(key, None)
+    for key, value in dict.items(branch_state):
+        previous = base.get(key, _MISSING)
+        if previous is value or previous == value:
+            continue
+        state[key] = value
+
+
+class _FlowCallShift:
+    def __init__(self, *, base: int, offset: int) -> None:
+        self._base = base
+        self._offset = offset
+
+    def apply(self, items: list) -> list:
+        if self._offset <= 0:
+            return items
+        return [self._shift(item) for item in items]
+
+    def _shift(self, value: object) -> object:
+        if isinstance(value, dict):
+            return {key: self._shift(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._shift(item) for item in value]
+        if isinstance(value, str) and value.startswith(_FLOW_CALL_PREFIX):
+            suffix = value[len(_FLOW_CALL_PREFIX) :]
+            if suffix.isdigit() and int(suffix) > self._base:
+                return f"{_FLOW_CALL_PREFIX}{int(suffix) + self._offset:04d}"
+        return value
+
+
 def _branch_call_info(expr: ir.Expression) -> tuple[str, str]:
     if isinstance(expr, ir.CallFlowExpr):
         return "flow", expr.flow_name
@@ -39,6 +39,8 @@ def build_orchestration_branch_finished_event(
     branch_id: str,
     result: OrchestrationBranchResult,
     summary: str,
+    duration_ms: int | None = None,
+    concurrent: bool | None = None,
 ) -> dict:
     if result.status == "ok":
         lines = [
@@ -51,6 +53,8 @@ def build_orchestration_branch_finished_event(
             status="ok",
             title="Orchestration branch finished",
             lines=[_sanitize(line) for line in lines],
+            duration_ms=duration_ms,
+            concurrent=concurrent,
         )
     lines = [
         f"Branch {result.name} failed.",
@@ -63,6 +67,8 @@ def build_orchestration_branch_finished_event(
         title="Orchestration branch finished",
         lines=[_sanitize(line) for line in lines],
         error_message=_sanitize(result.error_message or "Unknown error."),
+        duration_ms=duration_ms,
+        concurrent=concurrent,
     )
 
 
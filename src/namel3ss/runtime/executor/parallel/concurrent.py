@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from namel3ss.runtime.explainability.logger import logical_timestamp
+from namel3ss.runtime.performance.state import PerformanceRuntimeState
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ConcurrentTaskOutcome:
+    result: object
+    error: Exception | None
+    steps: list[dict]
+    explain_log: list[dict]
+    context: object
+    cancelled: bool = False
+
+
+class SharedCounter:
+    """Counter shared by a context and its forks, so per-flow limits hold across threads."""
+
+    def __init__(self, value: int = 0) -> None:
+        self._value = int(value)
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def increment(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class SerializedProxy:
+    """Route every method call on a shared runtime service through one lock."""
+
+    __slots__ = ("_target", "_lock")
+
+    def __init__(self, target: object, lock: threading.RLock) -> None:
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_lock", lock)
+
+    def __getattr__(self, name: str) -> object:
+        value = getattr(self._target, name)
+        if not callable(value):
+            return value
+        lock = self._lock
+
+        def _locked(*args, **kwargs):
+            with lock:
+                return value(*args, **kwargs)
+
+        return _locked
+
+    def __setattr__(self, name: str, value: object) -> None:
+        setattr(self._target, name, value)
+
+
+class SharedServices:
+    """The store and memory manager of one context, opened up to other threads.
+
+    Calls go through one lock for as long as the services are shared. The
+    store is allowed off its opening thread only until ``release`` runs.
+    """
+
+    def __init__(self, ctx) -> None:
+        lock = threading.RLock()
+        self.store = SerializedProxy(ctx.store, lock)
+        self.memory_manager = SerializedProxy(ctx.memory_manager, lock)
+        self._original = (ctx.store, ctx.memory_manager)
+        share = getattr(ctx.store, "share_across_threads", None)
+        self._unshare = share() if callable(share) else None
+
+    def release(self, ctx=None) -> None:
+        """Stop sharing; with ``ctx``, also put the unwrapped services back on it."""
+        if self._unshare is not None:
+            self._unshare()
+            self._unshare = None
+        if ctx is not None and ctx.store is self.store:
+            ctx.store, ctx.memory_manager = self._original
+
+
+def concurrency_limit(ctx) -> int:
+    state = getattr(ctx, "performance_state", None)
+    if not isinstance(state, PerformanceRuntimeState):
+        return 1
+    if not state.config.async_runtime:
+        return 1
+    # Observability spans nest on a single logical stack; keep those runs sequential.
+    if getattr(ctx, "observability", None) is not None:
+        return 1
+    return max(1, int(state.config.max_concurrency))
+
+
+def parallel_concurrency_limit(ctx, task_count: int) -> int:
+    if task_count <= 1:
+        return 1
+    return min(concurrency_limit(ctx), int(task_count))
+
+
+def fan_out_limit(ctx, branch_count: int) -> int:
+    if branch_count <= 1 or concurrency_limit(ctx) <= 1:
+        return 1
+    state = ctx.performance_state
+    return max(1, min(int(state.config.max_fan_out), int(branch_count)))
+
+
+def run_tasks_concurrently(
+    ctx,
+    tasks: list[T],
+    *,
+    max_workers: int,
+    run_task: Callable[[object, T], tuple[object, Exception | None]],
+    prepare: Callable[[object, T], None] | None = None,
+) -> list[ConcurrentTaskOutcome]:
+    services = SharedServices(ctx)
+    try:
+        return _run_forks(ctx, tasks, services, max_workers=max_workers, run_task=run_task, prepare=prepare)
+    finally:
+        services.release()
+
+
+def _run_forks(
+    ctx,
+    tasks: list[T],
+    services: SharedServices,
+    *,
+    max_workers: int,
+    run_task: Callable[[object, T], tuple[object, Exception | None]],
+    prepare: Callable[[object, T], None] | None,
+) -> list[ConcurrentTaskOutcome]:
+    base_flow_calls = int(getattr(ctx, "flow_call_counter", 0))
+    forks = [
+        fork_execution_context(ctx, store=services.store, memory_manager=services.memory_manager) for _ in tasks
+    ]
+    if prepare is not None:
+        for fork, task in zip(forks, tasks):
+            prepare(fork, task)
+    failed = threading.Event()
+
+    def _run(fork, task: T):
+        # A task that fails stops the ones that have not started yet.
+        if failed.is_set():
+            return _CANCELLED
+        result, error = run_task(fork, task)
+        if error is not None:
+            failed.set()
+        return result, error
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="n3-parallel") as pool:
+        futures = [pool.submit(_run, fork, task) for fork, task in zip(forks, tasks)]
+        # Collect in plan order so merge and trace ordering never depend on completion order.
+        completed = [future.result() for future in futures]
+    outcomes: list[ConcurrentTaskOutcome] = []
+    flow_calls = 0
+    for fork, done in zip(forks, completed):
+        flow_calls += max(0, int(getattr(fork, "flow_call_counter", 0)) - base_flow_calls)
+        result, error = (None, None) if done is _CANCELLED else done
+        outcomes.append(
+            ConcurrentTaskOutcome(
+                result=result,
+                error=error,
+                steps=list(fork.execution_steps),
+                explain_log=list(fork.explain_log),
+                context=fork,
+                cancelled=done is _CANCELLED,
+            )
+        )
+    ctx.flow_call_counter = base_flow_calls + flow_calls
+    join_agent_calls(ctx)
+    return outcomes
+
+
+def splice_task_steps(ctx, steps: list[dict]) -> None:
+    counter = int(getattr(ctx, "execution_step_counter", 0))
+    for step in steps:
+        counter += 1
+        entry = dict(step)
+        entry["id"] = f"step:{counter:04d}"
+        ctx.execution_steps.append(entry)
+    ctx.execution_step_counter = counter
+
+
+def splice_task_explain_log(ctx, entries: list[dict]) -> None:
+    if not entries:
+        return
+    sequence = int(getattr(ctx, "explain_sequence", 0))
+    for entry in entries:
+        sequence += 1
+        updated = dict(entry)
+        updated["event_index"] = sequence
+        updated["timestamp"] = logical_timestamp(sequence)
+        ctx.explain_log.append(updated)
+    ctx.explain_sequence = sequence
+
+
+def splice_task_yields(ctx, messages: list[dict]) -> None:
+    sequence = int(getattr(ctx, "yield_sequence", 0))
+    for entry in messages:
+        sequence += 1
+        message = dict(entry)
+        message["sequence"] = sequence
+        message.setdefault("flow_name", getattr(ctx.flow, "name", ""))
+        ctx.yield_messages.append(message)
+    ctx.yield_sequence = sequence
+
+
+def count_agent_call(ctx) -> int:
+    counter = getattr(ctx, "shared_agent_calls", None)
+    if isinstance(counter, SharedCounter):
+        ctx.agent_calls = counter.increment()
+    else:
+        ctx.agent_calls += 1
+    return ctx.agent_calls
+
+
+def join_agent_calls(ctx) -> None:
+    counter = getattr(ctx, "shared_agent_calls", None)
+    if isinstance(counter, SharedCounter):
+        ctx.agent_calls = counter.value
+
+
+def fork_execution_context(ctx, *, store: object, memory_manager: object):
+    if not isinstance(getattr(ctx, "shared_agent_calls", None), SharedCounter):
+        # Forks draw agent calls from the parent's budget instead of a copy of it.
+        ctx.shared_agent_calls = SharedCounter(int(getattr(ctx, "agent_calls", 0)))
+    fork = copy.copy(ctx)
+    fork.store = store
+    fork.memory_manager = memory_manager
+    fork.record_changes = []
+    fork.pending_tool_traces = []
+    fork.execution_steps = []
+    fork.execution_step_counter = int(getattr(ctx, "execution_step_counter", 0))
+    fork.explain_log = []
+    fork.explain_sequence = 0
+    fork.call_stack = list(ctx.call_stack)
+    fork.flow_stack = list(ctx.flow_stack)
+    fork.calc_assignment_index = dict(ctx.calc_assignment_index)
+    fork.provider_cache = dict(ctx.provider_cache)
+    fork.async_tasks = dict(ctx.async_tasks)
+    fork.async_services = None
+    fork.yield_messages = []
+    fork.yield_sequence = 0
+    return fork
+
+
+_CANCELLED = object()
+
+
+__all__ = [
+    "ConcurrentTaskOutcome",
+    "SerializedProxy",
+    "SharedCounter",
+    "SharedServices",
+    "concurrency_limit",
+    "count_agent_call",
+    "fan_out_limit",
+    "fork_execution_context",
+    "join_agent_calls",
+    "parallel_concurrency_limit",
+    "run_tasks_concurrently",
+    "splice_task_explain_log",
+    "splice_task_steps",
+    "splice_task_yields",
+]
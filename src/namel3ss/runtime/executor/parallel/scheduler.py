@@ -3,6 +3,13 @@ from __future__ import annotations
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.ir import nodes as ir
 from namel3ss.runtime.execution.recorder import record_step
+from namel3ss.runtime.executor.parallel.concurrent import (
+    parallel_concurrency_limit,
+    run_tasks_concurrently,
+    splice_task_explain_log,
+    splice_task_steps,
+    splice_task_yields,
+)
 from namel3ss.runtime.executor.parallel.isolation import validate_parallel_task
 from namel3ss.runtime.executor.parallel.merge import ParallelMergeResult, ParallelTaskResult, merge_task_results
 from namel3ss.runtime.executor.parallel.plan import build_parallel_plan
@@ -29,32 +36,11 @@ def execute_parallel_block(ctx, stmt: ir.ParallelBlock, execute_statement) -> No
 
     base_locals = dict(ctx.locals)
     base_constants = set(ctx.constants)
-    results: list[ParallelTaskResult] = []
-
-    for task in plan.tasks:
-        validate_parallel_task(ctx, task)
-        record_step(
-            ctx,
-            kind="parallel_task_start",
-            what=f"parallel task start {task.name}",
-            line=task.line,
-            column=task.column,
-        )
-        result, error = _run_task(ctx, task, execute_statement, base_locals, base_constants)
-        ctx.traces.extend(result.traces)
-        status = "ok" if error is None else "error"
-        ctx.traces.append(build_parallel_task_finished_event(result, status=status, error=error))
-        record_step(
-            ctx,
-            kind="parallel_task_end",
-            what=f"parallel task end {task.name}",
-            because="ok" if error is None else "error",
-            line=task.line,
-            column=task.column,
-        )
-        results.append(result)
-        if error is not None:
-            raise error
+    limit = parallel_concurrency_limit(ctx, len(plan.tasks))
+    if limit > 1:
+        results = _run_tasks_concurrently(ctx, plan.tasks, execute_statement, base_locals, base_constants, limit)
+    else:
+        results = _run_tasks_sequentially(ctx, plan.tasks, execute_statement, base_locals, base_constants)
 
     merge_policy = getattr(stmt, "merge", None)
     merge = _merge_results(ctx, base_locals, base_constants, results, policy=merge_policy)
@@ -68,6 +54,86 @@ def execute_parallel_block(ctx, stmt: ir.ParallelBlock, execute_statement) -> No
     )
 
 
+def _run_tasks_sequentially(
+    ctx,
+    tasks: list[ir.ParallelTask],
+    execute_statement,
+    base_locals: dict[str, object],
+    base_constants: set[str],
+) -> list[ParallelTaskResult]:
+    results: list[ParallelTaskResult] = []
+    for task in tasks:
+        validate_parallel_task(ctx, task)
+        _record_task_start(ctx, task)
+        result, error = _run_task(ctx, task, execute_statement, base_locals, base_constants)
+        _finish_task(ctx, task, result, error)
+        results.append(result)
+        if error is not None:
+            raise error
+    return results
+
+
+def _run_tasks_concurrently(
+    ctx,
+    tasks: list[ir.ParallelTask],
+    execute_statement,
+    base_locals: dict[str, object],
+    base_constants: set[str],
+    max_workers: int,
+) -> list[ParallelTaskResult]:
+    for task in tasks:
+        validate_parallel_task(ctx, task)
+
+    def _run_isolated(task_ctx, task: ir.ParallelTask) -> tuple[ParallelTaskResult, Exception | None]:
+        return _execute_task(task_ctx, task, execute_statement, base_locals, base_constants)
+
+    outcomes = run_tasks_concurrently(ctx, tasks, max_workers=max_workers, run_task=_run_isolated)
+    results: list[ParallelTaskResult] = []
+    for task, outcome in zip(tasks, outcomes):
+        if outcome.cancelled:
+            # A later task failed before this one started; report that failure.
+            raise _first_error(outcomes)
+        _record_task_start(ctx, task)
+        splice_task_steps(ctx, outcome.steps)
+        splice_task_explain_log(ctx, outcome.explain_log)
+        _finish_task(ctx, task, outcome.result, outcome.error)
+        results.append(outcome.result)
+        if outcome.error is not None:
+            raise outcome.error
+    return results
+
+
+def _first_error(outcomes: list) -> Exception:
+    for outcome in outcomes:
+        if outcome.error is not None:
+            return outcome.error
+    return Namel3ssError("Parallel task was cancelled")
+
+
+def _record_task_start(ctx, task: ir.ParallelTask) -> None:
+    record_step(
+        ctx,
+        kind="parallel_task_start",
+        what=f"parallel task start {task.name}",
+        line=task.line,
+        column=task.column,
+    )
+
+
+def _finish_task(ctx, task: ir.ParallelTask, result: ParallelTaskResult, error: Exception | None) -> None:
+    ctx.traces.extend(result.traces)
+    status = "ok" if error is None else "error"
+    ctx.traces.append(build_parallel_task_finished_event(result, status=status, error=error))
+    record_step(
+        ctx,
+        kind="parallel_task_end",
+        what=f"parallel task end {task.name}",
+        because="ok" if error is None else "error",
+        line=task.line,
+        column=task.column,
+    )
+
+
 def _merge_results(
     ctx,
     base_locals: dict[str, object],
@@ -86,7 +152,7 @@ def _merge_results(
     ctx.constants = merge.constants
     ctx.last_value = list(merge.values)
     if merge.yield_messages:
-        _append_parallel_yields(ctx, merge.yield_messages)
+        splice_task_yields(ctx, merge.yield_messages)
     return merge
 
 
@@ -109,6 +175,30 @@ def _run_task(
     parent_yields = getattr(ctx, "yield_messages", [])
     parent_yield_sequence = int(getattr(ctx, "yield_sequence", 0))
 
+    result, error = _execute_task(ctx, task, execute_statement, base_locals, base_constants)
+
+    ctx.locals = parent_locals
+    ctx.constants = parent_constants
+    ctx.traces = parent_traces
+    ctx.record_changes = parent_record_changes
+    ctx.pending_tool_traces = parent_pending
+    ctx.last_value = parent_last_value
+    ctx.tool_call_source = parent_tool_source
+    ctx.parallel_mode = parent_parallel
+    ctx.parallel_task = parent_task
+    ctx.yield_messages = parent_yields
+    ctx.yield_sequence = parent_yield_sequence
+
+    return result, error
+
+
+def _execute_task(
+    ctx,
+    task: ir.ParallelTask,
+    execute_statement,
+    base_locals: dict[str, object],
+    base_constants: set[str],
+) -> tuple[ParallelTaskResult, Exception | None]:
     ctx.locals = dict(base_locals)
     ctx.constants = set(base_constants)
     ctx.traces = []
@@ -147,18 +237,6 @@ def _run_task(
     if ctx.record_changes:
         error = error or Namel3ssError("Parallel tasks cannot write records", line=task.line, column=task.column)
 
-    ctx.locals = parent_locals
-    ctx.constants = parent_constants
-    ctx.traces = parent_traces
-    ctx.record_changes = parent_record_changes
-    ctx.pending_tool_traces = parent_pending
-    ctx.last_value = parent_last_value
-    ctx.tool_call_source = parent_tool_source
-    ctx.parallel_mode = parent_parallel
-    ctx.parallel_task = parent_task
-    ctx.yield_messages = parent_yields
-    ctx.yield_sequence = parent_yield_sequence
-
     return result, error
 
 
@@ -177,15 +255,4 @@ def _flush_pending_traces(ctx) -> None:
     ctx.pending_tool_traces = []
 
 
-def _append_parallel_yields(ctx, merged_yields: list[dict]) -> None:
-    sequence = int(getattr(ctx, "yield_sequence", 0))
-    for entry in merged_yields:
-        sequence += 1
-        message = dict(entry)
-        message["sequence"] = sequence
-        message.setdefault("flow_name", getattr(ctx.flow, "name", ""))
-        ctx.yield_messages.append(message)
-    ctx.yield_sequence = sequence
-
-
 __all__ = ["execute_parallel_block"]
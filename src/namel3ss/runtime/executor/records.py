@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
 
 from namel3ss.outcome.builder import build_outcome_pack
@@ -8,6 +9,7 @@ from namel3ss.runtime.execution.normalize import build_plain_text, write_last_ex
 from namel3ss.runtime.executor.context import ExecutionContext
 from namel3ss.runtime.executor.traces import _trace_summaries
 from namel3ss.runtime.explainability.logger import persist_explain_log
+from namel3ss.observability.otlp_exporter import queue_trace_entries
 from namel3ss.observability.trace_runs import write_trace_run
 from namel3ss.tools_with.api import build_tools_pack
 from namel3ss.schema.evolution import write_workspace_snapshot
@@ -34,6 +36,7 @@ def _persist_execution_artifacts(ctx: ExecutionContext, *, ok: bool, error: Exce
             flow_name=ctx.flow.name,
             steps=steps,
             secret_values=secret_values,
+            on_written=partial(queue_trace_entries, project_root=ctx.project_root, app_path=ctx.app_path),
         )
         if ok:
             write_workspace_snapshot(
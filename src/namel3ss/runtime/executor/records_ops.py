@@ -10,8 +10,15 @@ from namel3ss.runtime.executor.context import ExecutionContext
 from namel3ss.runtime.executor.expr_eval import evaluate_expression
 from namel3ss.runtime.executor.predicate_sql import compile_sql_predicate
 from namel3ss.runtime.ai.providers._shared.parse import normalize_ai_text
-from namel3ss.runtime.records.service import build_record_scope, save_record_or_raise, validate_record_values
+from namel3ss.runtime.records.service import (
+    RecordWriteBuffer,
+    build_record_scope,
+    save_record_or_raise,
+    validate_record_values,
+)
 from namel3ss.runtime.records.state_paths import get_state_record, record_state_path
+from namel3ss.runtime.storage.bulk import update_records
+from namel3ss.runtime.storage.pagination import iter_record_pages
 from namel3ss.runtime.storage.predicate import PredicatePlan
 from namel3ss.runtime.values.types import type_name_for_value
 from namel3ss.schema.records import RecordSchema
@@ -46,18 +53,10 @@ def handle_save(ctx: ExecutionContext, stmt: ir.Save, *, deterministic: bool = F
 
 
 def handle_create(ctx: ExecutionContext, stmt: ir.Create, *, deterministic: bool = False) -> None:
-    values = evaluate_expression(ctx, stmt.values)
-    if not isinstance(values, dict):
-        raise Namel3ssError(
-            _create_values_message(values),
-            line=stmt.line,
-            column=stmt.column,
-        )
-    schema = get_schema(ctx, stmt.record_name, stmt)
-    _coerce_text_fields(ctx, schema, values, line=stmt.line, column=stmt.column)
+    values = create_values(ctx, stmt)
     saved = save_record_or_raise(
         stmt.record_name,
-        dict(values),
+        values,
         ctx.schemas,
         ctx.state,
         ctx.store,
@@ -70,6 +69,28 @@ def handle_create(ctx: ExecutionContext, stmt: ir.Create, *, deterministic: bool
     ctx.last_value = saved
 
 
+def create_values(ctx: ExecutionContext, stmt: ir.Create) -> dict:
+    values = evaluate_expression(ctx, stmt.values)
+    if not isinstance(values, dict):
+        raise Namel3ssError(
+            _create_values_message(values),
+            line=stmt.line,
+            column=stmt.column,
+        )
+    schema = get_schema(ctx, stmt.record_name, stmt)
+    _coerce_text_fields(ctx, schema, values, line=stmt.line, column=stmt.column)
+    return dict(values)
+
+
+def flush_created_records(ctx: ExecutionContext, stmt: ir.Create, buffer: RecordWriteBuffer) -> None:
+    saved = buffer.flush(line=stmt.line, column=stmt.column)
+    for record in saved:
+        _record_change(ctx, stmt.record_name, record)
+    if saved:
+        ctx.locals[stmt.target] = saved[-1]
+        ctx.last_value = saved[-1]
+
+
 def handle_find(ctx: ExecutionContext, stmt: ir.Find) -> None:
     schema = get_schema(ctx, stmt.record_name, stmt)
     predicate = build_predicate_plan(ctx, schema, stmt.predicate, subject="Find", line=stmt.line, column=stmt.column)
@@ -78,7 +99,10 @@ def handle_find(ctx: ExecutionContext, stmt: ir.Find) -> None:
         scope = build_record_scope(schema, ctx.identity)
     except Namel3ssError as exc:
         raise Namel3ssError(str(exc), line=stmt.line, column=stmt.column) from exc
-    results = ctx.store.find(schema, predicate, scope=scope)
+    results: list[dict] = []
+    # Read in keyset pages so SQL stores never run one unbounded query.
+    for page in _stream_pages(ctx, schema, predicate, scope, deterministic=False):
+        results.extend(page)
     path = record_state_path(stmt.record_name)
     result_name = f"{'_'.join(path)}_results"
     ctx.locals[result_name] = results
@@ -112,23 +136,24 @@ def handle_update(ctx: ExecutionContext, stmt: ir.Update, *, deterministic: bool
             )
     predicate = build_predicate_plan(ctx, schema, stmt.predicate, subject="Update", line=stmt.line, column=stmt.column)
     scope = build_record_scope(schema, ctx.identity)
-    results = ctx.store.find(schema, predicate, scope=scope)
-    if deterministic:
-        results = _sorted_records(schema, results)
     updated = 0
-    for record in results:
-        updated_record = _apply_updates(ctx, record, stmt.updates)
-        _coerce_text_fields(ctx, schema, updated_record, line=stmt.line, column=stmt.column)
-        validate_record_values(
-            stmt.record_name,
-            updated_record,
-            ctx.schemas,
-            line=stmt.line,
-            column=stmt.column,
-        )
-        saved = ctx.store.update(schema, updated_record)
-        _record_change(ctx, stmt.record_name, saved)
-        updated += 1
+    for page in _stream_pages(ctx, schema, predicate, scope, deterministic=deterministic):
+        batch: list[dict] = []
+        for record in page:
+            updated_record = _apply_updates(ctx, record, stmt.updates)
+            _coerce_text_fields(ctx, schema, updated_record, line=stmt.line, column=stmt.column)
+            validate_record_values(
+                stmt.record_name,
+                updated_record,
+                ctx.schemas,
+                line=stmt.line,
+                column=stmt.column,
+            )
+            batch.append(updated_record)
+        # One bulk write per page instead of a statement round trip per record.
+        for saved in update_records(ctx.store, schema, batch):
+            _record_change(ctx, stmt.record_name, saved)
+            updated += 1
     ctx.last_value = updated
 
 
@@ -147,12 +172,9 @@ def handle_delete(ctx: ExecutionContext, stmt: ir.Delete, *, deterministic: bool
     schema = ctx.schemas[stmt.record_name]
     predicate = build_predicate_plan(ctx, schema, stmt.predicate, subject="Delete", line=stmt.line, column=stmt.column)
     scope = build_record_scope(schema, ctx.identity)
-    results = ctx.store.find(schema, predicate, scope=scope)
-    if deterministic:
-        results = _sorted_records(schema, results)
     deleted = 0
     id_col = "id" if "id" in schema.field_map else "_id"
-    for record in results:
+    for record in _stream_matches(ctx, schema, predicate, scope, deterministic=deterministic):
         record_id = record.get(id_col)
         if record_id is None:
             raise Namel3ssError(
@@ -326,5 +348,16 @@ def _apply_updates(ctx: ExecutionContext, record: dict, updates: list[ir.UpdateF
         ctx.locals = backup_locals
 
 
+def _stream_pages(ctx: ExecutionContext, schema: RecordSchema, predicate, scope, *, deterministic: bool):
+    # Keyset pages keep large tables out of memory; ids never change, so writes behind the cursor are safe.
+    for page in iter_record_pages(ctx.store, schema, predicate, scope):
+        yield _sorted_records(schema, page) if deterministic else page
+
+
+def _stream_matches(ctx: ExecutionContext, schema: RecordSchema, predicate, scope, *, deterministic: bool):
+    for page in _stream_pages(ctx, schema, predicate, scope, deterministic=deterministic):
+        yield from page
+
+
 def _sorted_records(schema: RecordSchema, records: list[dict]) -> list[dict]:
     return sort_records(schema, records)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+
+class _Lineage:
+    """Ownership token for one writer's view of shared state.
+
+    A writer may mutate a container in place only when the container carries
+    its token. Every snapshot hands out fresh tokens, so containers reachable
+    from both sides are copied on their next read instead of being mutated.
+    """
+
+    __slots__ = ()
+
+
+class CowDict(dict):
+    __slots__ = ("_lineage",)
+
+    def __init__(self, base: dict | None = None, *, lineage: _Lineage | None = None) -> None:
+        super().__init__(base or {})
+        self._lineage = lineage or _Lineage()
+
+    def __getitem__(self, key):
+        return self._claim(key, super().__getitem__(key))
+
+    def get(self, key, default=None):
+        if not super().__contains__(key):
+            return default
+        return self[key]
+
+    def __iter__(self):
+        # Overriding __iter__ also routes dict(view) and ** unpacking through __getitem__.
+        return iter(super().keys())
+
+    def values(self):
+        self._claim_all()
+        return super().values()
+
+    def items(self):
+        self._claim_all()
+        return super().items()
+
+    def popitem(self):
+        key, value = super().popitem()
+        return key, _detach(value, self._lineage)
+
+    def __or__(self, other):
+        self._claim_all()
+        return super().__or__(other)
+
+    def __ror__(self, other):
+        self._claim_all()
+        return super().__ror__(other)
+
+    def setdefault(self, key, default=None):
+        if not super().__contains__(key):
+            super().__setitem__(key, default)
+        return self[key]
+
+    def pop(self, key, *args):
+        value = super().pop(key, *args)
+        return _detach(value, self._lineage)
+
+    def copy(self) -> "CowDict":
+        return CowDict(self, lineage=_Lineage())
+
+    def __reduce__(self):
+        self._claim_all()
+        return (dict, (dict(super().items()),))
+
+    def _claim(self, key, value):
+        if not isinstance(value, (dict, list)) or _owned(value, self._lineage):
+            return value
+        claimed = _detach(value, self._lineage)
+        super().__setitem__(key, claimed)
+        return claimed
+
+    def _claim_all(self) -> None:
+        for key, value in list(super().items()):
+            self._claim(key, value)
+
+
+class CowList(list):
+    __slots__ = ("_lineage",)
+
+    def __init__(self, base: list | None = None, *, lineage: _Lineage | None = None) -> None:
+        super().__init__(base or [])
+        self._lineage = lineage or _Lineage()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._claim(index, super().__getitem__(index))
+
+    def __iter__(self):
+        self._claim_all()
+        return super().__iter__()
+
+    def __reversed__(self):
+        self._claim_all()
+        return super().__reversed__()
+
+    def __add__(self, other):
+        self._claim_all()
+        return super().__add__(other)
+
+    def __mul__(self, count):
+        self._claim_all()
+        return super().__mul__(count)
+
+    __rmul__ = __mul__
+
+    def pop(self, index: int = -1):
+        value = super().pop(index)
+        return _detach(value, self._lineage)
+
+    def copy(self) -> "CowList":
+        return CowList(self, lineage=_Lineage())
+
+    def __reduce__(self):
+        self._claim_all()
+        return (list, (list(super().__iter__()),))
+
+    def _claim_all(self) -> None:
+        for index in range(len(self)):
+            self._claim(index, super().__getitem__(index))
+
+    def _claim(self, index, value):
+        if not isinstance(value, (dict, list)) or _owned(value, self._lineage):
+            return value
+        claimed = _detach(value, self._lineage)
+        super().__setitem__(index, claimed)
+        return claimed
+
+
+def snapshot_state(state: dict) -> dict:
+    """Return a structurally shared, copy-on-write snapshot of flow state.
+
+    The snapshot copies only the top-level mapping. Nested containers stay
+    shared until either side reaches them by key or index, at which point that
+    one container is shallow-copied. The live state is sealed in place so later
+    writes from the running flow never leak into the snapshot. Every accessor
+    that hands out nested containers (iteration, values(), items(), get(),
+    slicing, concatenation) claims them first.
+    """
+    snapshot = CowDict(state)
+    _seal(state)
+    return snapshot
+
+
+def _seal(state: dict) -> None:
+    if isinstance(state, CowDict):
+        state._lineage = _Lineage()
+        return
+    lineage = _Lineage()
+    for key, value in list(dict.items(state)):
+        if isinstance(value, (dict, list)):
+            dict.__setitem__(state, key, _detach(value, lineage))
+
+
+def _owned(value: object, lineage: _Lineage) -> bool:
+    return isinstance(value, (CowDict, CowList)) and value._lineage is lineage
+
+
+def _detach(value: object, lineage: _Lineage) -> object:
+    if isinstance(value, dict):
+        return CowDict(dict(dict.items(value)), lineage=lineage)
+    if isinstance(value, list):
+        return CowList(list(list.__iter__(value)), lineage=lineage)
+    return value
+
+
+__all__ = ["CowDict", "CowList", "snapshot_state"]
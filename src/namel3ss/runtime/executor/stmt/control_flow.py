@@ -8,6 +8,7 @@ from namel3ss.runtime.execution.recorder import record_step
 from namel3ss.runtime.executor.expr_eval import evaluate_expression
 from namel3ss.runtime.executor.parallel.scheduler import execute_parallel_block
 from namel3ss.runtime.executor.orchestration.scheduler import execute_orchestration_block
+from namel3ss.runtime.executor.stmt.records import buffered_create, execute_buffered_creates
 from namel3ss.utils.numbers import decimal_is_int, is_number, to_decimal
 
 
@@ -199,10 +200,14 @@ def execute_for_each(ctx, stmt: ir.ForEach, execute_statement) -> None:
             column=stmt.column,
         )
         return
-    for item in iterable_value:
-        ctx.locals[stmt.name] = item
-        for child in stmt.body:
-            execute_statement(ctx, child)
+    create = buffered_create(stmt)
+    if create is not None:
+        execute_buffered_creates(ctx, stmt, create, iterable_value)
+    else:
+        for item in iterable_value:
+            ctx.locals[stmt.name] = item
+            for child in stmt.body:
+                execute_statement(ctx, child)
     record_step(
         ctx,
         kind="branch_taken",
@@ -3,10 +3,20 @@ from __future__ import annotations
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.ir import nodes as ir
 from namel3ss.runtime.execution.recorder import record_step
-from namel3ss.runtime.executor.records_ops import handle_create, handle_delete, handle_find, handle_save, handle_update
+from namel3ss.runtime.executor.records_ops import (
+    create_values,
+    flush_created_records,
+    handle_create,
+    handle_delete,
+    handle_find,
+    handle_save,
+    handle_update,
+)
 from namel3ss.runtime.flow.ids import flow_step_id
 from namel3ss.runtime.mutation_policy import evaluate_mutation_policy
 from namel3ss.runtime.records.ordering import normalize_record_id, sorted_record_ids
+from namel3ss.runtime.records.service import RecordWriteBuffer
+from namel3ss.runtime.storage.base import DEFAULT_PAGE_SIZE
 from namel3ss.runtime.purity import require_effect_allowed
 from namel3ss.traces.schema import TraceEventType
 
@@ -40,7 +50,93 @@ def execute_delete(ctx, stmt: ir.Delete, *, deterministic: bool = False) -> None
     _run_record_write(ctx, stmt, handle_delete, kind="statement_delete", verb="deleted", deterministic=deterministic)
 
 
+def buffered_create(loop: ir.ForEach) -> ir.Create | None:
+    """The lone create in a loop body whose rows can be written in batches.
+
+    The loop may not read back what it creates: the values must be plain
+    expressions that do not mention the created record.
+    """
+    if len(loop.body) != 1 or not isinstance(loop.body[0], ir.Create):
+        return None
+    create = loop.body[0]
+    hidden = None if create.target == loop.name else create.target
+    return create if _plain_expression(create.values, hidden) else None
+
+
+def execute_buffered_creates(ctx, loop: ir.ForEach, create: ir.Create, items: list) -> None:
+    # Rows are validated as the loop runs and written one bulk call per page;
+    # changes, steps and the bound target come out as if each row was saved alone.
+    buffer = RecordWriteBuffer(create.record_name, ctx.schemas, ctx.store, identity=ctx.identity)
+    try:
+        for item in items:
+            ctx.locals[loop.name] = item
+            _authorize_write(ctx, create)
+            buffer.add(create_values(ctx, create), line=create.line, column=create.column)
+            if len(buffer) >= DEFAULT_PAGE_SIZE:
+                _flush_creates(ctx, create, buffer)
+    except Exception as err:
+        # Rows before the failing one are still written, as a row-by-row loop would.
+        try:
+            _flush_creates(ctx, create, buffer)
+        except Exception:
+            # The loop's error is the one to report; the flush failure stays as its context.
+            raise err
+        raise
+    _flush_creates(ctx, create, buffer)
+
+
+def _flush_creates(ctx, stmt: ir.Create, buffer: RecordWriteBuffer) -> None:
+    changes_start = len(ctx.record_changes)
+    flush_created_records(ctx, stmt, buffer)
+    for change in ctx.record_changes[changes_start:]:
+        record_ids = _record_ids_for_step(stmt, [change])
+        record_step(
+            ctx,
+            kind="statement_create",
+            what=f"created {stmt.record_name}",
+            data=_record_step_data("create", stmt.record_name, record_ids),
+            line=stmt.line,
+            column=stmt.column,
+        )
+
+
+def _plain_expression(expr: ir.Expression, hidden: str | None) -> bool:
+    if isinstance(expr, (ir.Literal, ir.StatePath)):
+        return True
+    if isinstance(expr, ir.VarReference):
+        return expr.name != hidden
+    if isinstance(expr, ir.AttrAccess):
+        return expr.base != hidden
+    if isinstance(expr, ir.UnaryOp):
+        return _plain_expression(expr.operand, hidden)
+    if isinstance(expr, (ir.BinaryOp, ir.Comparison)):
+        return _plain_expression(expr.left, hidden) and _plain_expression(expr.right, hidden)
+    if isinstance(expr, ir.ListExpr):
+        return all(_plain_expression(item, hidden) for item in expr.items)
+    if isinstance(expr, ir.MapExpr):
+        return all(
+            _plain_expression(entry.key, hidden) and _plain_expression(entry.value, hidden) for entry in expr.entries
+        )
+    return False
+
+
 def _run_record_write(ctx, stmt: ir.Statement, handler, *, kind: str, verb: str, deterministic: bool = False) -> None:
+    _authorize_write(ctx, stmt)
+    action = _mutation_action(stmt)
+    changes_start = len(getattr(ctx, "record_changes", []) or [])
+    handler(ctx, stmt, deterministic=deterministic)
+    record_ids = _record_ids_for_step(stmt, ctx.record_changes[changes_start:])
+    record_step(
+        ctx,
+        kind=kind,
+        what=f"{verb} {stmt.record_name}",
+        data=_record_step_data(action, stmt.record_name, record_ids),
+        line=stmt.line,
+        column=stmt.column,
+    )
+
+
+def _authorize_write(ctx, stmt: ir.Statement) -> None:
     if getattr(ctx, "parallel_mode", False):
         raise Namel3ssError("Parallel tasks cannot write records", line=stmt.line, column=stmt.column)
     if getattr(ctx, "call_stack", []):
@@ -71,17 +167,6 @@ def _run_record_write(ctx, stmt: ir.Statement, handler, *, kind: str, verb: str,
             },
         )
     _record_mutation_allowed(ctx, stmt, action, step_id)
-    changes_start = len(getattr(ctx, "record_changes", []) or [])
-    handler(ctx, stmt, deterministic=deterministic)
-    record_ids = _record_ids_for_step(stmt, ctx.record_changes[changes_start:])
-    record_step(
-        ctx,
-        kind=kind,
-        what=f"{verb} {stmt.record_name}",
-        data=_record_step_data(action, stmt.record_name, record_ids),
-        line=stmt.line,
-        column=stmt.column,
-    )
 
 
 def _mutation_action(stmt: ir.Statement) -> str:
@@ -162,4 +247,12 @@ def _record_step_data(action: str, record_name: str, record_ids: list[object]) -
     return data
 
 
-__all__ = ["execute_create", "execute_delete", "execute_find", "execute_save", "execute_update"]
+__all__ = [
+    "buffered_create",
+    "execute_buffered_creates",
+    "execute_create",
+    "execute_delete",
+    "execute_find",
+    "execute_save",
+    "execute_update",
+]
@@ -55,6 +55,7 @@ class MemoryManager(
         self._agreement_defaults: AgreementDefaults | None = None
         self._restore_state = "pending"
         self._restore_error: Namel3ssError | None = None
+        self._persist_journal = None
         self._startup_events: list[dict] = []
         self._default_project_root = project_root
         self._default_app_path = app_path
@@ -15,7 +15,8 @@ from namel3ss.runtime.memory_persist import (
     build_restore_failed_event,
     build_wake_up_report_event,
     read_snapshot,
-    write_snapshot,
+    seed_journal_state,
+    write_changes,
 )
 from namel3ss.runtime.memory_rules.model import RULE_STATUS_ACTIVE
 from namel3ss.runtime.memory_rules.store import is_rule_item
@@ -39,7 +40,7 @@ class MemoryManagerRestoreMixin:
     ) -> None:
         project_root, app_path = self._resolve_root(project_root, app_path)
         self._ensure_packs(project_root=project_root, app_path=app_path)
-        write_snapshot(
+        write_changes(
             self,
             project_root=project_root,
             app_path=app_path,
@@ -100,6 +101,12 @@ class MemoryManagerRestoreMixin:
             )
             return
         self._apply_snapshot(snapshot)
+        self._persist_journal = seed_journal_state(
+            self,
+            snapshot.get("journal"),
+            project_root=project_root,
+            app_path=app_path,
+        )
         self._apply_pack_setup(project_root=project_root, app_path=app_path)
         self._restore_state = "ready"
         self._startup_events.append(
@@ -258,12 +265,14 @@ def _apply_items(
                 short_term._messages.setdefault(store_key, {}).setdefault(phase_id, []).append(item)
             for item in summaries:
                 short_term._summaries.setdefault(store_key, {})[phase_id] = item
+            short_term.revisions.touch(store_key)
             for item in phase.get("semantic") or []:
-                semantic._snippets.setdefault(store_key, []).append(item)
+                semantic.restore_item(store_key, item)
             for item in phase.get("profile") or []:
                 key = item.meta.get("key") if hasattr(item, "meta") else None
                 if key:
                     profile._facts.setdefault(store_key, {})[key] = item
+            profile.revisions.touch(store_key)
 
 
 def _apply_agreements(store: ProposalStore, payload: dict) -> None:
@@ -275,6 +284,7 @@ def _apply_agreements(store: ProposalStore, payload: dict) -> None:
         store._pending_by_id[proposal.proposal_id] = proposal
         store._pending_by_team.setdefault(proposal.team_id, {}).setdefault(proposal.phase_id, []).append(proposal)
     store._history = payload.get("history", {})
+    store.revisions.touch()
 
 
 def _apply_handoffs(store: HandoffStore, payload: dict) -> None:
@@ -285,6 +295,7 @@ def _apply_handoffs(store: HandoffStore, payload: dict) -> None:
     for packet in payload.get("packets") or []:
         store._by_id[packet.packet_id] = packet
         store._by_team.setdefault(packet.team_id, {}).setdefault(packet.phase_id, []).append(packet)
+    store.revisions.touch()
 
 
 def _decode_cache_versions(entries: list[dict]) -> dict[tuple[str, str], int]:
@@ -301,15 +312,14 @@ def _decode_cache_versions(entries: list[dict]) -> dict[tuple[str, str], int]:
 
 
 def _apply_cache(cache: MemoryCacheStore, payload: dict) -> None:
-    cache._max_entries = int(payload.get("max_entries", 0))
-    cache._counter = int(payload.get("counter", 0))
-    cache._entries = {}
+    entries = []
     for entry in payload.get("entries") or []:
         key = entry.get("key")
         cache_entry = entry.get("cache_entry")
         if not key or not isinstance(cache_entry, CacheEntry):
             continue
-        cache._entries[str(key)] = cache_entry
+        entries.append((str(key), cache_entry))
+    cache.restore(entries, max_entries=int(payload.get("max_entries", 0)), counter=int(payload.get("counter", 0)))
 
 
 __all__ = ["MemoryManagerRestoreMixin"]
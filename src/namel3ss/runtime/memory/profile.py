@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 from namel3ss.runtime.memory.contract import MemoryItem, MemoryItemFactory, MemoryKind
 from namel3ss.runtime.memory_policy.defaults import DEFAULT_AUTHORITY_ORDER
 from namel3ss.runtime.memory_policy.evaluation import ConflictDecision, apply_retention, resolve_conflict
+from namel3ss.runtime.performance.revisions import StoreRevisions
 
 
 class ProfileMemory:
@@ -13,6 +14,7 @@ class ProfileMemory:
         self._factory = factory
         self._facts: Dict[str, Dict[str, MemoryItem]] = {}
         self._history: Dict[str, List[MemoryItem]] = {}
+        self.revisions = StoreRevisions()
 
     def set_fact(
         self,
@@ -64,15 +66,18 @@ class ProfileMemory:
             conflict = resolve_conflict(existing, item, authority_order or list(DEFAULT_AUTHORITY_ORDER))
             if conflict.winner.id == item.id:
                 facts[key] = item
+                self.revisions.touch(store_key)
                 return item, conflict, existing
             return existing, conflict, None
         facts[key] = item
+        self.revisions.touch(store_key)
         return item, None, None
 
     def delete_fact(self, store_key: str, key: str) -> bool:
         facts = self._facts.get(store_key, {})
         if key in facts:
             del facts[key]
+            self.revisions.touch(store_key)
             return True
         return False
 
@@ -132,6 +137,7 @@ class ProfileMemory:
         for key, item in list(facts.items()):
             if item.id not in kept_ids:
                 del facts[key]
+                self.revisions.touch(store_key)
         return forgotten
 
     def delete_item(self, store_key: str, memory_id: str) -> MemoryItem | None:
@@ -139,6 +145,7 @@ class ProfileMemory:
         for key, item in list(facts.items()):
             if item.id == memory_id:
                 del facts[key]
+                self.revisions.touch(store_key)
                 return item
         return None
 
@@ -155,6 +162,7 @@ class ProfileMemory:
             if item.id == memory_id:
                 updated = updater(item)
                 facts[key] = updated
+                self.revisions.touch(store_key)
                 return updated
         return None
 
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from namel3ss.runtime.memory.contract import MemoryItem
+from namel3ss.runtime.memory.events import normalize_text
+
+
+@dataclass(frozen=True)
+class IndexedItem:
+    item: MemoryItem
+    seq: int
+    norm: str
+    tokens: frozenset[str]
+    dedup_key: object
+    group: tuple[object, int]
+
+
+class SemanticStoreIndex:
+    """Token, dedup and recency lookups for one semantic store.
+
+    The snippet list in SemanticMemory stays the source of truth. Every write
+    goes through SemanticMemory, which keeps this index in step, so recall only
+    scores items that can still reach the top results.
+    """
+
+    def __init__(self, items: Iterable[MemoryItem] = ()) -> None:
+        self._entries: Dict[str, IndexedItem] = {}
+        self._postings: Dict[str, set[str]] = {}
+        self._dedup: Dict[object, list[tuple[int, str]]] = {}
+        # (phase_id, importance bonus) -> [(-created_at, id)], newest first.
+        self._groups: Dict[tuple[object, int], list[tuple[int, str]]] = {}
+        self._seq = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, item_id: str) -> MemoryItem | None:
+        entry = self._entries.get(item_id)
+        return entry.item if entry is not None else None
+
+    def active(self, dedup_key: object) -> MemoryItem | None:
+        ordered = self._dedup.get(dedup_key)
+        if not ordered:
+            return None
+        return self._entries[ordered[0][1]].item
+
+    def add(self, item: MemoryItem, *, seq: int | None = None) -> None:
+        self.remove(item.id)
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+        norm = normalize_text(item.text)
+        entry = IndexedItem(
+            item=item,
+            seq=seq,
+            norm=norm,
+            tokens=frozenset(norm.split()),
+            dedup_key=item.meta.get("dedup_key"),
+            group=(item.meta.get("phase_id"), importance_bonus(item.importance)),
+        )
+        self._entries[item.id] = entry
+        for token in entry.tokens:
+            self._postings.setdefault(token, set()).add(item.id)
+        if entry.dedup_key:
+            insort(self._dedup.setdefault(entry.dedup_key, []), (seq, item.id))
+        insort(self._groups.setdefault(entry.group, []), (-item.created_at, item.id))
+
+    def remove(self, item_id: str) -> MemoryItem | None:
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return None
+        for token in entry.tokens:
+            ids = self._postings.get(token)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._postings[token]
+        if entry.dedup_key:
+            _discard(self._dedup, entry.dedup_key, (entry.seq, item_id))
+        _discard(self._groups, entry.group, (-entry.item.created_at, item_id))
+        return entry.item
+
+    def replace(self, item_id: str, item: MemoryItem) -> None:
+        """Swap an item in place, keeping its position for dedup ordering."""
+        entry = self._entries.get(item_id)
+        self.remove(item_id)
+        self.add(item, seq=entry.seq if entry is not None else None)
+
+    def matching(self, q_norm: str) -> Dict[str, int]:
+        """Similarity score per item id: 2 for a substring match, 1 for token overlap."""
+        if not q_norm:
+            return {}
+        q_tokens = q_norm.split()
+        found: Dict[str, int] = {}
+        for token in set(q_tokens):
+            for item_id in self._postings.get(token, ()):
+                found[item_id] = 1
+        for item_id in self._substring_pool(q_tokens):
+            if q_norm in self._entries[item_id].norm:
+                found[item_id] = 2
+        return found
+
+    def rank(
+        self,
+        q_norm: str,
+        *,
+        limit: int | None,
+        phase_ids: list[str] | None = None,
+    ) -> List[tuple[MemoryItem, int, list[str]]]:
+        if phase_ids is None:
+            allowed = None
+            tiers = [list(self._groups)]
+        else:
+            allowed = set(phase_ids)
+            phase_rank = {phase_id: idx for idx, phase_id in enumerate(phase_ids)}
+            keys = [key for key in self._groups if key[0] in allowed]
+            if len(phase_rank) > 1:
+                # Earlier phases always rank first, so each phase is ranked on its own.
+                tiers = [[key for key in keys if key[0] == phase_id] for phase_id in sorted(allowed, key=phase_rank.get)]
+            else:
+                tiers = [keys]
+        group_keys = [key for tier in tiers for key in tier]
+        if not group_keys:
+            return []
+        now_tick = max(-self._groups[key][0][0] for key in group_keys)
+        matched = {
+            item_id: sim
+            for item_id, sim in self.matching(q_norm).items()
+            if allowed is None or self._entries[item_id].group[0] in allowed
+        }
+        ranked: list[tuple[MemoryItem, int, list[str]]] = []
+        for tier in tiers:
+            remaining = None if limit is None else limit - len(ranked)
+            if remaining is not None and remaining <= 0:
+                break
+            phases = {key[0] for key in tier}
+            candidates = {item_id for item_id in matched if self._entries[item_id].group[0] in phases}
+            for key in tier:
+                # Unmatched items in a group score by recency alone, so the newest ones are enough.
+                taken = 0
+                for _, item_id in self._groups[key]:
+                    if remaining is not None and taken >= remaining:
+                        break
+                    if item_id in matched:
+                        continue
+                    candidates.add(item_id)
+                    taken += 1
+            scored = []
+            for item_id in candidates:
+                item = self._entries[item_id].item
+                score, reasons = score_item(item, matched.get(item_id, 0), now_tick)
+                scored.append((-score, -item.created_at, item_id, score, reasons))
+            if remaining is None:
+                scored.sort()
+            else:
+                scored = heapq.nsmallest(remaining, scored)
+            ranked.extend((self._entries[entry[2]].item, entry[3], entry[4]) for entry in scored)
+        return ranked
+
+    def _substring_pool(self, q_tokens: list[str]) -> Iterable[str]:
+        # A normalized query can only sit inside a text where its inner tokens are whole
+        # tokens and its first token ends one of them.
+        if len(q_tokens) > 2:
+            return self._postings.get(q_tokens[1], ())
+        first = q_tokens[0]
+        if len(q_tokens) == 1:
+            tokens = [token for token in self._postings if first in token]
+        else:
+            tokens = [token for token in self._postings if token.endswith(first)]
+        pool: set[str] = set()
+        for token in tokens:
+            pool.update(self._postings[token])
+        return pool
+
+
+def score_item(item: MemoryItem, sim_score: int, now_tick: int) -> tuple[int, list[str]]:
+    reasons: list[str] = []
+    if sim_score > 0:
+        reasons.append("matches_query")
+    age = max(now_tick - item.created_at, 0)
+    recency_bonus = 2 if age <= 2 else 1 if age <= 5 else 0
+    if recency_bonus:
+        reasons.append("recency")
+    bonus = importance_bonus(item.importance)
+    if bonus:
+        reasons.append("importance")
+    score = sim_score + recency_bonus + bonus
+    if not reasons:
+        reasons.append("active_rule")
+    return score, reasons
+
+
+def importance_bonus(importance: int) -> int:
+    return 2 if importance >= 4 else 1 if importance >= 2 else 0
+
+
+def _discard(buckets: Dict, key: object, value: tuple[int, str]) -> None:
+    ordered: Optional[list] = buckets.get(key)
+    if not ordered:
+        return
+    idx = bisect_left(ordered, value)
+    if idx < len(ordered) and ordered[idx] == value:
+        del ordered[idx]
+    if not ordered:
+        del buckets[key]
+
+
+__all__ = ["IndexedItem", "SemanticStoreIndex", "importance_bonus", "score_item"]
@@ -9,6 +9,7 @@ from namel3ss.runtime.memory_lanes.model import ensure_lane_meta
 from namel3ss.runtime.memory.importance import importance_for_event
 from namel3ss.runtime.memory.summarizer import summarize_items
 from namel3ss.runtime.memory_policy.model import AUTHORITY_SYSTEM
+from namel3ss.runtime.performance.revisions import StoreRevisions
 
 
 class ShortTermMemory:
@@ -16,6 +17,7 @@ class ShortTermMemory:
         self._factory = factory
         self._messages: Dict[str, Dict[str, List[MemoryItem]]] = {}
         self._summaries: Dict[str, Dict[str, MemoryItem]] = {}
+        self.revisions = StoreRevisions()
 
     def record(
         self,
@@ -41,6 +43,7 @@ class ShortTermMemory:
         phase_id = _phase_id_for(item)
         messages = self._messages.setdefault(store_key, {}).setdefault(phase_id, [])
         messages.append(item)
+        self.revisions.touch(store_key)
 
     def summarize_if_needed(
         self,
@@ -59,6 +62,7 @@ class ShortTermMemory:
         if not evicted:
             return None, [], None
         self._messages.setdefault(store_key, {})[phase_id] = messages[-max_turns:]
+        self.revisions.touch(store_key)
         prior = self._summaries.get(store_key, {}).get(phase_id)
         summary_text = summarize_items(evicted, prior_summary=prior.text if prior else None)
         summary_of: list[str] = []
@@ -123,6 +127,7 @@ class ShortTermMemory:
             for idx, item in enumerate(items):
                 if item.id == memory_id:
                     removed = items.pop(idx)
+                    self.revisions.touch(store_key)
                     summary = self._summaries.get(store_key, {}).get(phase_id)
                     if summary and summary.id == memory_id:
                         self._summaries.get(store_key, {}).pop(phase_id, None)
@@ -131,6 +136,7 @@ class ShortTermMemory:
         for phase_id, summary in list(summaries.items()):
             if summary.id == memory_id:
                 summaries.pop(phase_id, None)
+                self.revisions.touch(store_key)
                 return summary
         return None
 
@@ -158,12 +164,14 @@ class ShortTermMemory:
                 if item.id == memory_id:
                     updated = updater(item)
                     items[idx] = updated
+                    self.revisions.touch(store_key)
                     return updated
         summaries = self._summaries.get(store_key, {})
         for phase_id, summary in list(summaries.items()):
             if summary.id == memory_id:
                 updated = updater(summary)
                 summaries[phase_id] = updated
+                self.revisions.touch(store_key)
                 return updated
         return None
 
@@ -10,6 +10,7 @@ from namel3ss.runtime.memory_agreement.model import (
     AgreementCounts,
     Proposal,
 )
+from namel3ss.runtime.performance.revisions import StoreRevisions
 
 
 @dataclass(frozen=True)
@@ -24,6 +25,7 @@ class ProposalStore:
     def __init__(self) -> None:
         self._counter = 0
         self._tick = 0
+        self.revisions = StoreRevisions()
         self._pending_by_team: dict[str, dict[str, list[Proposal]]] = {}
         self._pending_by_id: dict[str, Proposal] = {}
         self._history: dict[str, list[_AgreementRecord]] = {}
@@ -90,6 +92,7 @@ class ProposalStore:
         updated = replace(proposal, approvals=approvals)
         self._pending_by_id[proposal_id] = updated
         self._replace_pending(updated)
+        self.revisions.touch()
         return updated, True
 
     def approve(self, proposal_id: str, *, phase_id: str) -> Proposal | None:
@@ -167,6 +170,7 @@ class ProposalStore:
 
     def _next_tick(self) -> int:
         self._tick += 1
+        self.revisions.touch()
         return self._tick
 
 
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable
+
+from namel3ss.runtime.performance.cache import BoundedCache, CacheStats
+from namel3ss.runtime.performance.revisions import StoreRevisions
 
 
 @dataclass
@@ -13,44 +16,53 @@ class CacheEntry:
 
 class MemoryCacheStore:
     def __init__(self, *, max_entries: int) -> None:
-        self._max_entries = max(0, int(max_entries))
-        self._entries: dict[str, CacheEntry] = {}
+        # Recall results are evicted in insertion order; hits do not promote.
+        self._cache = BoundedCache(max_entries=max_entries, promote_on_hit=False)
         self._counter = 0
+        self.revisions = StoreRevisions()
+
+    @property
+    def max_entries(self) -> int:
+        return self._cache.max_entries
+
+    @property
+    def counter(self) -> int:
+        return self._counter
 
     def get(self, key: str, *, version: object) -> Any | None:
-        entry = self._entries.get(key)
+        entry = self._cache.get(key, accept=lambda entry: entry.version == version)
         if entry is None:
             return None
-        if entry.version != version:
-            return None
         return entry.value
 
     def set(self, key: str, value: Any, *, version: object) -> None:
         self._counter += 1
-        self._entries[key] = CacheEntry(value=value, inserted_at=self._counter, version=version)
-        self._evict_if_needed()
+        self._cache.set(key, CacheEntry(value=value, inserted_at=self._counter, version=version))
+        self.revisions.touch()
+
+    def entries(self) -> list[tuple[str, CacheEntry]]:
+        return self._cache.items()
+
+    def restore(self, entries: Iterable[tuple[str, CacheEntry]], *, max_entries: int, counter: int) -> None:
+        ordered = sorted(entries, key=lambda item: (item[1].inserted_at, item[0]))
+        self._cache.set_max_entries(max_entries)
+        self._cache.restore(ordered)
+        self._counter = int(counter)
+        self.revisions.touch()
 
     def clear(self) -> None:
-        self._entries = {}
+        self._cache.clear()
+        self.revisions.touch()
 
     def set_max_entries(self, max_entries: int) -> None:
-        self._max_entries = max(0, int(max_entries))
-        self._evict_if_needed()
+        self._cache.set_max_entries(max_entries)
+        self.revisions.touch()
 
     def size(self) -> int:
-        return len(self._entries)
-
-    def _evict_if_needed(self) -> None:
-        if self._max_entries <= 0:
-            self._entries = {}
-            return
-        if len(self._entries) <= self._max_entries:
-            return
-        ordered = sorted(self._entries.items(), key=lambda item: (item[1].inserted_at, item[0]))
-        excess = len(self._entries) - self._max_entries
-        for idx in range(excess):
-            key, _entry = ordered[idx]
-            self._entries.pop(key, None)
+        return self._cache.size()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
 
 
 __all__ = ["CacheEntry", "MemoryCacheStore"]
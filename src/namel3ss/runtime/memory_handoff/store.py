@@ -9,12 +9,14 @@ from namel3ss.runtime.memory_handoff.model import (
     HANDOFF_STATUS_REJECTED,
     HandoffPacket,
 )
+from namel3ss.runtime.performance.revisions import StoreRevisions
 
 
 class HandoffStore:
     def __init__(self) -> None:
         self._counter = 0
         self._tick = 0
+        self.revisions = StoreRevisions()
         self._by_id: dict[str, HandoffPacket] = {}
         self._by_team: dict[str, dict[str, list[HandoffPacket]]] = {}
 
@@ -90,6 +92,7 @@ class HandoffStore:
             else:
                 replaced.append(entry)
         team_phases[packet.phase_id] = replaced
+        self.revisions.touch()
 
     def _next_id(self) -> str:
         self._counter += 1
@@ -97,6 +100,7 @@ class HandoffStore:
 
     def _next_tick(self) -> int:
         self._tick += 1
+        self.revisions.touch()
         return self._tick
 
 
@@ -1,30 +1,38 @@
 from namel3ss.runtime.memory_persist.paths import (
     CHECKSUM_FILENAME,
+    JOURNAL_FILENAME,
     MEMORY_DIR_NAME,
     SNAPSHOT_FILENAME,
     checksum_path,
+    journal_path,
     memory_dir,
     resolve_project_root,
     snapshot_path,
     snapshot_paths,
 )
+from namel3ss.runtime.memory_persist.journal import JournalState, seed_journal_state, write_changes
 from namel3ss.runtime.memory_persist.reader import read_snapshot
 from namel3ss.runtime.memory_persist.traces import build_restore_failed_event, build_wake_up_report_event
 from namel3ss.runtime.memory_persist.writer import build_snapshot_payload, serialize_snapshot, write_snapshot
 
 __all__ = [
     "CHECKSUM_FILENAME",
+    "JOURNAL_FILENAME",
+    "JournalState",
     "MEMORY_DIR_NAME",
     "SNAPSHOT_FILENAME",
     "build_restore_failed_event",
     "build_snapshot_payload",
     "build_wake_up_report_event",
     "checksum_path",
+    "journal_path",
     "memory_dir",
     "read_snapshot",
     "resolve_project_root",
+    "seed_journal_state",
     "serialize_snapshot",
     "snapshot_path",
     "snapshot_paths",
+    "write_changes",
     "write_snapshot",
 ]
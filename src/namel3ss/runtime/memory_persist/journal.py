@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Callable
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.memory_persist.paths import JOURNAL_FILENAME, snapshot_paths
+from namel3ss.runtime.memory_persist.writer import (
+    _sorted_map,
+    collect_store_keys,
+    encode_ledger_order,
+    encode_phase_group,
+    encode_phase_snapshot,
+    serialize_snapshot,
+    split_store_key,
+    state_section_encoders,
+    store_phase_groups,
+    write_snapshot,
+)
+from namel3ss.utils.file_lock import append_durable, locked_path
+
+JOURNAL_COMPACT_ENTRIES = 64
+JOURNAL_MIN_COMPACT_BYTES = 64 * 1024
+
+# Units are replayed in this order so stores exist before their phases.
+_UNIT_ORDER = {"section": 0, "store": 1, "phase": 2, "ledger_store": 3, "ledger": 4}
+
+# Sections fingerprinted by the revisions of the stores they are encoded from.
+_TRACKED_SECTIONS = {
+    "agreements": ("agreements",),
+    "handoffs": ("handoffs",),
+    "cache": ("_cache",),
+    "rules": ("semantic", "agreements"),
+}
+_ITEM_STORES = ("short_term", "semantic", "profile")
+
+
+@dataclass
+class JournalState:
+    base: str
+    entries: int = 0
+    size: int = 0
+    snapshot_size: int = 0
+    fingerprints: dict = field(default_factory=dict)
+    stores: dict = field(default_factory=dict)
+    needs_compaction: bool = False
+
+
+@dataclass(frozen=True)
+class JournalReplay:
+    base: str
+    entries: int
+    size: int
+    snapshot_size: int
+    needs_compaction: bool
+
+
+def write_changes(
+    manager,
+    *,
+    project_root: str | None,
+    app_path: str | None,
+    secret_values: list[str] | None = None,
+) -> Path | None:
+    """Append what changed since the last persist, compacting into a full snapshot when due."""
+    snapshot_path, checksum_path = snapshot_paths(project_root=project_root, app_path=app_path, for_write=True)
+    if snapshot_path is None or checksum_path is None:
+        return None
+    state = getattr(manager, "_persist_journal", None)
+    units, stores = journal_units(
+        manager,
+        project_root=project_root,
+        app_path=app_path,
+        secret_values=secret_values,
+        previous=state,
+    )
+    path = snapshot_path.parent / JOURNAL_FILENAME
+    # Other processes sharing the project append to and compact the same journal.
+    with locked_path(path):
+        if state is None or not _sync_tail(state, path) or _compaction_due(state, checksum_path):
+            return _compact(
+                manager,
+                units,
+                stores,
+                project_root=project_root,
+                app_path=app_path,
+                secret_values=secret_values,
+            )
+        ops = _diff_ops(state.fingerprints, units)
+        if ops:
+            line = encode_journal_entry(base=state.base, seq=state.entries, ops=ops)
+            append_durable(path, line)
+            state.entries += 1
+            state.size += len(line)
+    state.fingerprints = {key: fingerprint for key, (fingerprint, _) in units.items()}
+    state.stores = stores
+    return snapshot_path
+
+
+def seed_journal_state(
+    manager,
+    replay: JournalReplay | None,
+    *,
+    project_root: str | None,
+    app_path: str | None,
+) -> JournalState | None:
+    if replay is None:
+        return None
+    units, stores = journal_units(manager, project_root=project_root, app_path=app_path)
+    return JournalState(
+        base=replay.base,
+        entries=replay.entries,
+        size=replay.size,
+        snapshot_size=replay.snapshot_size,
+        fingerprints={key: fingerprint for key, (fingerprint, _) in units.items()},
+        stores=stores,
+        needs_compaction=replay.needs_compaction,
+    )
+
+
+def journal_units(
+    manager,
+    *,
+    project_root: str | None,
+    app_path: str | None,
+    secret_values: list[str] | None = None,
+    previous: JournalState | None = None,
+) -> tuple[dict[tuple, tuple[object, Callable[[], object]]], dict[str, tuple[object, dict]]]:
+    """Fingerprint and lazy encoder for every journaled unit of memory state.
+
+    Memory items are frozen, so item fingerprints are tuples of the live objects. Stores whose
+    revisions did not move since ``previous`` reuse their units without being grouped again.
+    """
+    units: dict[tuple, tuple[object, Callable[[], object]]] = {}
+    stores: dict[str, tuple[object, dict]] = {}
+    known = previous.stores if previous is not None else {}
+    for store_key in collect_store_keys(manager):
+        revision = _store_revision(manager, store_key)
+        cached = known.get(store_key)
+        if revision is not None and cached is not None and cached[0] == revision:
+            store_units = cached[1]
+        else:
+            store_units = _store_units(manager, store_key, secret_values=secret_values)
+        stores[store_key] = (revision, store_units)
+        units.update(store_units)
+    ledger = getattr(manager, "_ledger")
+    for store_key, by_phase in getattr(ledger, "_snapshots", {}).items():
+        units[("ledger_store", store_key)] = (True, partial(dict))
+        for phase_id, snapshot in by_phase.items():
+            fingerprint = (snapshot.phase_id, snapshot.phase_index, dict(snapshot.items), dict(snapshot.dedupe_map))
+            units[("ledger", store_key, phase_id)] = (fingerprint, partial(encode_phase_snapshot, snapshot))
+    encoders = state_section_encoders(
+        manager,
+        project_root=project_root,
+        app_path=app_path,
+        secret_values=secret_values,
+    )
+    encoders["ledger_order"] = partial(encode_ledger_order, ledger)
+    for name, encode in encoders.items():
+        revision = _section_revision(manager, name)
+        if revision is None:
+            value = encode()
+            units[("section", name)] = (value, partial(_identity, value))
+        else:
+            units[("section", name)] = (revision, encode)
+    return units, stores
+
+
+def encode_journal_entry(*, base: str, seq: int, ops: list[dict]) -> str:
+    body = serialize_snapshot({"base": base, "seq": seq, "ops": ops})
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return f"{digest} {body}\n"
+
+
+def replay_journal(payload: dict, path: Path, *, base: str, snapshot_size: int) -> JournalReplay:
+    """Apply journal entries written against ``base`` to a raw snapshot payload."""
+    entries = 0
+    size = 0
+    needs_compaction = False
+    if path.exists():
+        text = path.read_text(encoding="utf-8")
+        size = len(text)
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        else:
+            needs_compaction = bool(text)
+        for idx, line in enumerate(lines):
+            record = _parse_entry(line)
+            if record is None:
+                if idx == len(lines) - 1:
+                    # A write cut short by a crash; the next persist rewrites the snapshot.
+                    needs_compaction = True
+                    break
+                raise Namel3ssError("Memory journal is corrupted.")
+            if record.get("base") != base:
+                needs_compaction = True
+                continue
+            if record.get("seq") != entries:
+                raise Namel3ssError("Memory journal entries are out of order.")
+            apply_journal_ops(payload, record.get("ops") or [])
+            entries += 1
+    return JournalReplay(
+        base=base,
+        entries=entries,
+        size=size,
+        snapshot_size=snapshot_size,
+        needs_compaction=needs_compaction,
+    )
+
+
+def apply_journal_ops(payload: dict, ops: list[dict]) -> None:
+    stores = {store["store_key"]: store for store in payload["items"]["stores"]}
+    phases = {key: {phase["phase_id"]: phase for phase in store["phases"]} for key, store in stores.items()}
+    snapshots = payload["ledger"]["snapshots"]
+    for op in ops:
+        kind, *rest = op.get("unit") or [None]
+        value = op.get("value")
+        drop = op.get("op") == "drop"
+        if kind == "section":
+            if rest[0] == "ledger_order":
+                payload["ledger"]["order"] = value
+            else:
+                payload[rest[0]] = value
+        elif kind == "store":
+            if drop:
+                stores.pop(rest[0], None)
+                phases.pop(rest[0], None)
+            else:
+                stores.setdefault(rest[0], dict(value))
+                phases.setdefault(rest[0], {})
+        elif kind == "phase":
+            if drop:
+                phases.get(rest[0], {}).pop(rest[1], None)
+            else:
+                phases.setdefault(rest[0], {})[rest[1]] = value
+        elif kind == "ledger_store":
+            if drop:
+                snapshots.pop(rest[0], None)
+            else:
+                snapshots.setdefault(rest[0], {})
+        elif kind == "ledger":
+            if drop:
+                snapshots.get(rest[0], {}).pop(rest[1], None)
+            else:
+                snapshots.setdefault(rest[0], {})[rest[1]] = value
+        else:
+            raise Namel3ssError(f"Memory journal has an unknown entry: {kind}.")
+    payload["items"]["stores"] = [
+        {**stores[key], "phases": [phases[key][phase_id] for phase_id in sorted(phases.get(key, {}))]}
+        for key in sorted(stores)
+        if key in phases
+    ]
+    payload["ledger"]["snapshots"] = _sorted_map({key: _sorted_map(value) for key, value in snapshots.items()})
+
+
+def _compact(
+    manager,
+    units: dict,
+    stores: dict,
+    *,
+    project_root: str | None,
+    app_path: str | None,
+    secret_values,
+) -> Path | None:
+    written = write_snapshot(manager, project_root=project_root, app_path=app_path, secret_values=secret_values)
+    _, checksum_path = snapshot_paths(project_root=project_root, app_path=app_path, for_write=True)
+    if written is None or checksum_path is None:
+        return written
+    manager._persist_journal = JournalState(
+        base=checksum_path.read_text(encoding="utf-8").strip(),
+        snapshot_size=written.stat().st_size,
+        fingerprints={key: fingerprint for key, (fingerprint, _) in units.items()},
+        stores=stores,
+    )
+    return written
+
+
+def _store_units(manager, store_key: str, *, secret_values) -> dict:
+    space, owner, lane = split_store_key(store_key)
+    store = {"store_key": store_key, "space": space, "owner": owner, "lane": lane}
+    units = {("store", store_key): (store, partial(dict, store))}
+    for phase_id, group in store_phase_groups(manager, store_key).items():
+        fingerprint = (group["messages"], group["summaries"], tuple(group["semantic"]), tuple(group["profile"]))
+        encode = partial(encode_phase_group, group, secret_values=secret_values)
+        units[("phase", store_key, phase_id)] = (fingerprint, encode)
+    return units
+
+
+def _store_revision(manager, store_key: str) -> tuple | None:
+    marks = []
+    for name in _ITEM_STORES:
+        store = getattr(manager, name, None)
+        revisions = getattr(store, "revisions", None)
+        if store is not None and revisions is None:
+            return None
+        marks.append((id(store), revisions.of(store_key) if revisions is not None else 0))
+    return tuple(marks)
+
+
+def _section_revision(manager, name: str) -> tuple | None:
+    if name not in _TRACKED_SECTIONS:
+        return None
+    marks = []
+    for attr in _TRACKED_SECTIONS[name]:
+        store = getattr(manager, attr, None)
+        revisions = getattr(store, "revisions", None)
+        if store is not None and revisions is None:
+            return None
+        marks.append((id(store), revisions.current if revisions is not None else 0))
+    return ("revision", tuple(marks))
+
+
+def _compaction_due(state: JournalState, checksum_path: Path) -> bool:
+    if state.needs_compaction or state.entries >= JOURNAL_COMPACT_ENTRIES:
+        return True
+    if state.size >= max(state.snapshot_size, JOURNAL_MIN_COMPACT_BYTES):
+        return True
+    # Someone else rewrote the snapshot, so entries against our base would be dropped.
+    try:
+        return checksum_path.read_text(encoding="utf-8").strip() != state.base
+    except OSError:
+        return True
+
+
+def _sync_tail(state: JournalState, path: Path) -> bool:
+    """Catch ``state`` up with entries other processes appended; False when the tail needs compaction."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        size = 0
+    except OSError:
+        return False
+    if size == state.size:
+        return True
+    try:
+        text = path.read_text(encoding="utf-8") if size else ""
+    except OSError:
+        return False
+    if text and not text.endswith("\n"):
+        return False
+    entries = 0
+    for line in text.splitlines():
+        record = _parse_entry(line)
+        if record is None:
+            return False
+        if record.get("base") != state.base:
+            continue
+        if record.get("seq") != entries:
+            return False
+        entries += 1
+    state.entries = entries
+    state.size = len(text)
+    return True
+
+
+def _diff_ops(previous: dict, units: dict) -> list[dict]:
+    ops: list[dict] = []
+    for key in sorted(units, key=_unit_sort_key):
+        fingerprint, encode = units[key]
+        if key in previous and previous[key] == fingerprint:
+            continue
+        ops.append({"op": "put", "unit": list(key), "value": encode()})
+    for key in sorted(previous.keys() - units.keys(), key=_unit_sort_key, reverse=True):
+        ops.append({"op": "drop", "unit": list(key)})
+    return ops
+
+
+def _parse_entry(line: str) -> dict | None:
+    digest, _, body = line.partition(" ")
+    if hashlib.sha256(body.encode("utf-8")).hexdigest() != digest:
+        return None
+    try:
+        record = json.loads(body)
+    except JSONDecodeError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _unit_sort_key(key: tuple) -> tuple:
+    return (_UNIT_ORDER[key[0]], tuple(str(part) for part in key[1:]))
+
+
+def _identity(value: object) -> object:
+    return value
+
+
+__all__ = [
+    "JOURNAL_COMPACT_ENTRIES",
+    "JournalReplay",
+    "JournalState",
+    "apply_journal_ops",
+    "encode_journal_entry",
+    "journal_units",
+    "replay_journal",
+    "seed_journal_state",
+    "write_changes",
+]
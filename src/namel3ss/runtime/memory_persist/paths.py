@@ -11,6 +11,7 @@ from namel3ss.runtime.persistence_paths import (
 MEMORY_DIR_NAME = ".namel3ss/memory"
 SNAPSHOT_FILENAME = "memory_snapshot.json"
 CHECKSUM_FILENAME = "memory_snapshot.sha256"
+JOURNAL_FILENAME = "memory_journal.jsonl"
 
 
 def resolve_project_root(*, project_root: str | Path | None, app_path: str | Path | None) -> Path | None:
@@ -71,6 +72,24 @@ def checksum_path(
     return root / CHECKSUM_FILENAME
 
 
+def journal_path(
+    *,
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    for_write: bool = False,
+    allow_create: bool | None = None,
+) -> Path | None:
+    root = memory_dir(
+        project_root=project_root,
+        app_path=app_path,
+        for_write=for_write,
+        allow_create=allow_create,
+    )
+    if root is None:
+        return None
+    return root / JOURNAL_FILENAME
+
+
 def snapshot_paths(
     *,
     project_root: str | Path | None,
@@ -96,9 +115,11 @@ def snapshot_paths(
 
 __all__ = [
     "CHECKSUM_FILENAME",
+    "JOURNAL_FILENAME",
     "MEMORY_DIR_NAME",
     "SNAPSHOT_FILENAME",
     "checksum_path",
+    "journal_path",
     "memory_dir",
     "resolve_project_root",
     "snapshot_path",
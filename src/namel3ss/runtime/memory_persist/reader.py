@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from contextlib import nullcontext
 from json import JSONDecodeError
 from pathlib import Path
 
@@ -14,11 +15,13 @@ from namel3ss.runtime.memory_persist.format import (
     decode_snapshot_item,
     decode_trust_rules,
 )
-from namel3ss.runtime.memory_persist.paths import snapshot_paths
+from namel3ss.runtime.memory_persist.journal import replay_journal
+from namel3ss.runtime.memory_persist.paths import JOURNAL_FILENAME, snapshot_paths
 from namel3ss.runtime.memory_persist.verify import verify_checksum, verify_snapshot_payload
 from namel3ss.runtime.memory_agreement.store import _AgreementRecord
 from namel3ss.runtime.memory_cache.store import CacheEntry
 from namel3ss.runtime.memory_timeline.snapshot import PhaseSnapshot
+from namel3ss.utils.file_lock import locked_path
 
 
 def read_snapshot(
@@ -26,19 +29,34 @@ def read_snapshot(
     project_root: str | None,
     app_path: str | None,
 ) -> dict | None:
-    snapshot_path, checksum_path = _locate_snapshot(project_root=project_root, app_path=app_path)
+    snapshot_path, checksum_path, writable = _locate_snapshot(project_root=project_root, app_path=app_path)
     if snapshot_path is None or checksum_path is None:
         return None
-    verify_checksum(snapshot_path, checksum_path)
-    try:
-        payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
-    except JSONDecodeError as err:
-        raise Namel3ssError(f"Snapshot could not be parsed: {err.msg}.") from err
-    verify_snapshot_payload(payload)
-    return _decode_snapshot_payload(payload)
+    journal = snapshot_path.parent / JOURNAL_FILENAME
+    # Writers append and compact under the same lock, so the snapshot and journal agree.
+    with locked_path(journal) if writable else nullcontext():
+        verify_checksum(snapshot_path, checksum_path)
+        text = snapshot_path.read_text(encoding="utf-8")
+        try:
+            payload = json.loads(text)
+        except JSONDecodeError as err:
+            raise Namel3ssError(f"Snapshot could not be parsed: {err.msg}.") from err
+        verify_snapshot_payload(payload)
+        replay = replay_journal(
+            payload,
+            journal,
+            base=checksum_path.read_text(encoding="utf-8").strip(),
+            snapshot_size=len(text),
+        )
+    if replay.entries:
+        verify_snapshot_payload(payload)
+    decoded = _decode_snapshot_payload(payload)
+    # Only a snapshot in the write location can take further journal entries.
+    decoded["journal"] = replay if writable else None
+    return decoded
 
 
-def _locate_snapshot(*, project_root: str | None, app_path: str | None) -> tuple[Path | None, Path | None]:
+def _locate_snapshot(*, project_root: str | None, app_path: str | None) -> tuple[Path | None, Path | None, bool]:
     candidates = [
         snapshot_paths(
             project_root=project_root,
@@ -52,12 +70,12 @@ def _locate_snapshot(*, project_root: str | None, app_path: str | None) -> tuple
             for_write=False,
         ),
     ]
-    for snapshot_path, checksum_path in candidates:
+    for idx, (snapshot_path, checksum_path) in enumerate(candidates):
         if snapshot_path is None or checksum_path is None:
             continue
         if snapshot_path.exists():
-            return snapshot_path, checksum_path
-    return None, None
+            return snapshot_path, checksum_path, idx == 0
+    return None, None, False
 
 
 def _decode_snapshot_payload(payload: dict) -> dict:
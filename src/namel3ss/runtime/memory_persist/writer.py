@@ -3,8 +3,10 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+from functools import partial
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from typing import Callable
 
 from namel3ss.runtime.memory.contract import MemoryItem
 from namel3ss.runtime.memory_persist.format import (
@@ -18,7 +20,7 @@ from namel3ss.runtime.memory_persist.format import (
     encode_snapshot_item,
     encode_trust_rules,
 )
-from namel3ss.runtime.memory_persist.paths import memory_dir, snapshot_paths
+from namel3ss.runtime.memory_persist.paths import JOURNAL_FILENAME, memory_dir, snapshot_paths
 from namel3ss.runtime.memory_persist.verify import verify_snapshot_payload
 from namel3ss.runtime.memory_rules.model import RULE_STATUS_ACTIVE
 from namel3ss.runtime.memory_rules.store import is_rule_item
@@ -52,6 +54,8 @@ def write_snapshot(
     _atomic_write(snapshot_path, data)
     checksum = hashlib.sha256(data.encode("utf-8")).hexdigest()
     _atomic_write(checksum_path, f"{checksum}\n")
+    # Journal entries were written against the previous snapshot.
+    (target_dir / JOURNAL_FILENAME).unlink(missing_ok=True)
     return snapshot_path
 
 
@@ -62,28 +66,56 @@ def build_snapshot_payload(
     app_path: str | None,
     secret_values: list[str] | None = None,
 ) -> dict:
-    project_id = _project_id(project_root=project_root, app_path=app_path)
-    budgets = [encode_budget_config(cfg) for cfg in list(getattr(manager, "_budgets", []))]
+    payload = encode_state_sections(
+        manager,
+        project_root=project_root,
+        app_path=app_path,
+        secret_values=secret_values,
+    )
+    payload["ledger"] = _encode_phase_ledger(getattr(manager, "_ledger"))
+    payload["items"] = _encode_items(manager, secret_values=secret_values)
+    return payload
+
+
+def encode_state_sections(
+    manager,
+    *,
+    project_root: str | None,
+    app_path: str | None,
+    secret_values: list[str] | None = None,
+) -> dict:
+    """Every snapshot section except items and the phase ledger."""
+    encoders = state_section_encoders(
+        manager,
+        project_root=project_root,
+        app_path=app_path,
+        secret_values=secret_values,
+    )
+    return {name: encode() for name, encode in encoders.items()}
+
+
+def state_section_encoders(
+    manager,
+    *,
+    project_root: str | None,
+    app_path: str | None,
+    secret_values: list[str] | None = None,
+) -> dict[str, Callable[[], object]]:
+    """One lazy encoder per snapshot section, so callers can skip sections that did not change."""
     trust_rules = getattr(manager, "_trust_rules", None)
-    if isinstance(trust_rules, TrustRules):
-        trust_payload = encode_trust_rules(trust_rules)
-    else:
-        trust_payload = None
     return {
-        "version": MEMORY_STORE_VERSION,
-        "project_id": project_id,
-        "clock": {"tick": int(getattr(manager, "_clock").current())},
-        "ids": {"counters": _encode_id_counters(getattr(manager, "_ids"))},
-        "phases": _encode_phase_registry(getattr(manager, "_phases")),
-        "ledger": _encode_phase_ledger(getattr(manager, "_ledger")),
-        "items": _encode_items(manager, secret_values=secret_values),
-        "agreements": _encode_agreements(manager, secret_values=secret_values),
-        "handoffs": _encode_handoffs(manager),
-        "budgets": budgets,
-        "cache": _encode_cache(manager, secret_values=secret_values),
-        "cache_versions": _encode_cache_versions(manager),
-        "rules": _encode_rules(manager),
-        "trust": trust_payload,
+        "version": partial(_constant, MEMORY_STORE_VERSION),
+        "project_id": partial(_project_id, project_root=project_root, app_path=app_path),
+        "clock": lambda: {"tick": int(getattr(manager, "_clock").current())},
+        "ids": lambda: {"counters": _encode_id_counters(getattr(manager, "_ids"))},
+        "phases": lambda: _encode_phase_registry(getattr(manager, "_phases")),
+        "agreements": partial(_encode_agreements, manager, secret_values=secret_values),
+        "handoffs": partial(_encode_handoffs, manager),
+        "budgets": lambda: [encode_budget_config(cfg) for cfg in list(getattr(manager, "_budgets", []))],
+        "cache": partial(_encode_cache, manager, secret_values=secret_values),
+        "cache_versions": partial(_encode_cache_versions, manager),
+        "rules": partial(_encode_rules, manager),
+        "trust": lambda: encode_trust_rules(trust_rules) if isinstance(trust_rules, TrustRules) else None,
     }
 
 
@@ -130,12 +162,15 @@ def _encode_phase_ledger(ledger) -> dict:
     for store_key, by_phase in getattr(ledger, "_snapshots", {}).items():
         snapshots[store_key] = {}
         for phase_id, snapshot in by_phase.items():
-            snapshots[store_key][phase_id] = _encode_phase_snapshot(snapshot)
-    order = {key: list(values) for key, values in getattr(ledger, "_order", {}).items()}
-    return {"snapshots": _sorted_map(snapshots), "order": _sorted_map(order)}
+            snapshots[store_key][phase_id] = encode_phase_snapshot(snapshot)
+    return {"snapshots": _sorted_map(snapshots), "order": encode_ledger_order(ledger)}
+
 
+def encode_ledger_order(ledger) -> dict:
+    return _sorted_map({key: list(values) for key, values in getattr(ledger, "_order", {}).items()})
 
-def _encode_phase_snapshot(snapshot: PhaseSnapshot) -> dict:
+
+def encode_phase_snapshot(snapshot: PhaseSnapshot) -> dict:
     items = {key: encode_snapshot_item(value) for key, value in snapshot.items.items()}
     dedupe_map = dict(snapshot.dedupe_map)
     return {
@@ -148,9 +183,9 @@ def _encode_phase_snapshot(snapshot: PhaseSnapshot) -> dict:
 
 def _encode_items(manager, *, secret_values: list[str] | None) -> dict:
     stores = []
-    store_keys = _collect_store_keys(manager)
+    store_keys = collect_store_keys(manager)
     for store_key in sorted(store_keys):
-        space, owner, lane = _split_store_key(store_key)
+        space, owner, lane = split_store_key(store_key)
         phases = _encode_store_phases(manager, store_key, secret_values=secret_values)
         stores.append(
             {
@@ -165,37 +200,47 @@ def _encode_items(manager, *, secret_values: list[str] | None) -> dict:
 
 
 def _encode_store_phases(manager, store_key: str, *, secret_values: list[str] | None) -> list[dict]:
+    groups = store_phase_groups(manager, store_key)
+    return [encode_phase_group(groups[phase_id], secret_values=secret_values) for phase_id in sorted(groups.keys())]
+
+
+def store_phase_groups(manager, store_key: str) -> dict[str, dict]:
     phase_map: dict[str, dict] = {}
     short_term = getattr(manager, "short_term", None)
     if short_term is not None:
         messages_by_phase = getattr(short_term, "_messages", {}).get(store_key, {})
         for phase_id, items in messages_by_phase.items():
             entry = _phase_entry(phase_map, phase_id)
-            entry["short_term"]["messages"] = [
-                encode_memory_item(item, secret_values=secret_values) for item in list(items)
-            ]
+            entry["messages"] = tuple(items)
         summaries_by_phase = getattr(short_term, "_summaries", {}).get(store_key, {})
         for phase_id, summary in summaries_by_phase.items():
             entry = _phase_entry(phase_map, phase_id)
-            entry["short_term"]["summaries"] = [encode_memory_item(summary, secret_values=secret_values)]
+            entry["summaries"] = (summary,)
     semantic = getattr(manager, "semantic", None)
     if semantic is not None:
         for item in getattr(semantic, "_snippets", {}).get(store_key, []):
-            phase_id = _phase_id_for_item(item)
-            entry = _phase_entry(phase_map, phase_id)
-            entry["semantic"].append(encode_memory_item(item, secret_values=secret_values))
+            entry = _phase_entry(phase_map, _phase_id_for_item(item))
+            entry["semantic"].append(item)
     profile = getattr(manager, "profile", None)
     if profile is not None:
         facts = getattr(profile, "_facts", {}).get(store_key, {})
         for key in sorted(facts.keys()):
             item = facts[key]
-            phase_id = _phase_id_for_item(item)
-            entry = _phase_entry(phase_map, phase_id)
-            entry["profile"].append(encode_memory_item(item, secret_values=secret_values))
-    phases = []
-    for phase_id in sorted(phase_map.keys()):
-        phases.append(phase_map[phase_id])
-    return phases
+            entry = _phase_entry(phase_map, _phase_id_for_item(item))
+            entry["profile"].append(item)
+    return phase_map
+
+
+def encode_phase_group(group: dict, *, secret_values: list[str] | None) -> dict:
+    return {
+        "phase_id": group["phase_id"],
+        "short_term": {
+            "messages": [encode_memory_item(item, secret_values=secret_values) for item in group["messages"]],
+            "summaries": [encode_memory_item(item, secret_values=secret_values) for item in group["summaries"]],
+        },
+        "semantic": [encode_memory_item(item, secret_values=secret_values) for item in group["semantic"]],
+        "profile": [encode_memory_item(item, secret_values=secret_values) for item in group["profile"]],
+    }
 
 
 def _encode_agreements(manager, *, secret_values: list[str] | None) -> dict:
@@ -244,8 +289,7 @@ def _encode_cache(manager, *, secret_values: list[str] | None) -> dict:
     if cache is None:
         return {"max_entries": 0, "counter": 0, "entries": []}
     entries = []
-    raw_entries = getattr(cache, "_entries", {})
-    for key, entry in raw_entries.items():
+    for key, entry in cache.entries():
         version = entry.version
         if isinstance(version, tuple):
             version = list(version)
@@ -259,8 +303,8 @@ def _encode_cache(manager, *, secret_values: list[str] | None) -> dict:
         )
     entries.sort(key=lambda entry: (entry.get("inserted_at", 0), entry.get("key", "")))
     return {
-        "max_entries": int(getattr(cache, "_max_entries", 0)),
-        "counter": int(getattr(cache, "_counter", 0)),
+        "max_entries": int(cache.max_entries),
+        "counter": int(cache.counter),
         "entries": entries,
     }
 
@@ -297,7 +341,7 @@ def _encode_rules(manager) -> dict:
     }
 
 
-def _collect_store_keys(manager) -> set[str]:
+def collect_store_keys(manager) -> set[str]:
     keys = set()
     short_term = getattr(manager, "short_term", None)
     if short_term is not None:
@@ -312,7 +356,7 @@ def _collect_store_keys(manager) -> set[str]:
     return keys
 
 
-def _split_store_key(store_key: str) -> tuple[str, str, str]:
+def split_store_key(store_key: str) -> tuple[str, str, str]:
     parts = store_key.split(":")
     if len(parts) < 3:
         return "unknown", "unknown", "unknown"
@@ -325,12 +369,7 @@ def _split_store_key(store_key: str) -> tuple[str, str, str]:
 def _phase_entry(phase_map: dict[str, dict], phase_id: str) -> dict:
     entry = phase_map.get(phase_id)
     if entry is None:
-        entry = {
-            "phase_id": phase_id,
-            "short_term": {"messages": [], "summaries": []},
-            "semantic": [],
-            "profile": [],
-        }
+        entry = {"phase_id": phase_id, "messages": (), "summaries": (), "semantic": [], "profile": []}
         phase_map[phase_id] = entry
     return entry
 
@@ -341,6 +380,10 @@ def _phase_id_for_item(item: MemoryItem) -> str:
     return str(value) if value else "phase-unknown"
 
 
+def _constant(value: object) -> object:
+    return value
+
+
 def _sorted_map(value: dict) -> dict:
     return {key: value[key] for key in sorted(value.keys(), key=lambda entry: str(entry))}
 
@@ -1,37 +1,67 @@
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
+from urllib.parse import parse_qs
 
 from namel3ss.config.loader import load_config
 from namel3ss.observability.enablement import observability_enabled
 from namel3ss.observability.log_store import read_logs
 from namel3ss.observability.metrics_store import read_metrics
+from namel3ss.observability.otlp_exporter import background_export_stats
 from namel3ss.observability.scrub import scrub_payload
 from namel3ss.observability.trace_store import read_spans
 from namel3ss.observability.trace_runs import latest_trace_run_id, list_trace_runs, read_trace_entries
+from namel3ss.runtime.ai.http.metrics import provider_call_stats
+from namel3ss.runtime.ai.http.pool import shared_pool
 from namel3ss.secrets import collect_secret_values
 
 
-def get_logs_payload(project_root: str | Path | None, app_path: str | Path | None) -> dict:
+_PAGE_PARAMS = ("run_id", "offset", "limit")
+
+
+def get_logs_payload(
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    *,
+    run_id: str | None = None,
+    offset: object = 0,
+    limit: object = None,
+) -> dict:
     if not observability_enabled():
         return {"ok": True, "count": 0, "logs": []}
+    page = _page(offset, limit)
+    if page is None:
+        return _page_error()
     scrub = _scrubber(project_root, app_path)
-    logs = [scrub(item) for item in read_logs(project_root, app_path)]
+    records = read_logs(project_root, app_path, run_id=run_id or None, offset=page[0], limit=page[1])
+    logs = [scrub(item) for item in records]
     logs = [item for item in logs if isinstance(item, dict)]
     return {"ok": True, "count": len(logs), "logs": logs}
 
 
-def get_trace_payload(project_root: str | Path | None, app_path: str | Path | None) -> dict:
+def get_trace_payload(
+    project_root: str | Path | None,
+    app_path: str | Path | None,
+    *,
+    run_id: str | None = None,
+    offset: object = 0,
+    limit: object = None,
+) -> dict:
     if not observability_enabled():
         return {"ok": True, "count": 0, "spans": []}
+    page = _page(offset, limit)
+    if page is None:
+        return _page_error()
     scrub = _scrubber(project_root, app_path)
-    spans = [scrub(item) for item in read_spans(project_root, app_path)]
+    records = read_spans(project_root, app_path, run_id=run_id or None, offset=page[0], limit=page[1])
+    spans = [scrub(item) for item in records]
     spans = [item for item in spans if isinstance(item, dict)]
     return {"ok": True, "count": len(spans), "spans": spans}
 
 
-def get_traces_payload(project_root: str | Path | None, app_path: str | Path | None) -> dict:
-    return get_trace_payload(project_root, app_path)
+def get_traces_payload(project_root: str | Path | None, app_path: str | Path | None, **page: object) -> dict:
+    return get_trace_payload(project_root, app_path, **page)
 
 
 def get_trace_runs_payload(project_root: str | Path | None, app_path: str | Path | None) -> dict:
@@ -69,10 +99,46 @@ def get_metrics_payload(project_root: str | Path | None, app_path: str | Path |
         cleaned = {"counters": [], "timings": []}
     cleaned.setdefault("counters", [])
     cleaned.setdefault("timings", [])
+    exporter = background_export_stats(project_root, app_path)
+    if exporter is not None:
+        cleaned["otlp_exporter"] = exporter
+    providers = provider_call_stats()
+    if providers:
+        cleaned["http_transport"] = {"pool": shared_pool().stats(), "providers": providers}
     cleaned["ok"] = True
     return cleaned
 
 
+def observability_builder(kind: str, query: str | None = None):
+    """Payload builder for ``kind`` with the request's ``run_id`` / ``offset`` / ``limit`` query bound."""
+    builders = {
+        "logs": get_logs_payload,
+        "trace": get_trace_payload,
+        "traces": get_traces_payload,
+        "metrics": get_metrics_payload,
+    }
+    builder = builders.get(kind)
+    if builder is None or kind == "metrics":
+        return builder
+    params = parse_qs(query or "")
+    return partial(builder, **{name: params[name][-1] for name in _PAGE_PARAMS if params.get(name)})
+
+
+def _page(offset: object, limit: object) -> tuple[int, int | None] | None:
+    try:
+        start = int(offset or 0)
+        count = None if limit is None or limit == "" else int(limit)
+    except (TypeError, ValueError):
+        return None
+    if start < 0 or (count is not None and count < 0):
+        return None
+    return start, count
+
+
+def _page_error() -> dict:
+    return {"ok": False, "error": "offset and limit must be non-negative integers.", "kind": "engine"}
+
+
 def _scrubber(project_root: str | Path | None, app_path: str | Path | None):
     config = None
     try:
@@ -95,4 +161,5 @@ __all__ = [
     "get_trace_run_payload",
     "get_trace_runs_payload",
     "get_traces_payload",
+    "observability_builder",
 ]
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from dataclasses import dataclass
+import json
+import threading
+from typing import Callable, Iterable
 
 
 @dataclass(frozen=True)
@@ -10,45 +13,240 @@ class CacheEntry:
     value: object
     created_at: int
     expires_at: int | None = None
+    weight: int = 1
 
 
-class DeterministicLruCache:
-    def __init__(self, *, max_entries: int) -> None:
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    weight: int
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": self.entries,
+            "weight": self.weight,
+        }
+
+
+class BoundedCache:
+    """Deterministic bounded cache with O(1) insert and eviction.
+
+    Entries are kept in an ordered dict. With ``promote_on_hit`` a hit moves the
+    entry to the end (LRU); without it eviction is first-in-first-out. The
+    logical clock advances once per ``set`` (or ``advance``), and ``ttl_ticks``
+    expires an entry that many ticks after it was stored. ``max_weight`` bounds
+    the summed ``weigher`` result of all entries, e.g. bytes of cached text.
+    Every method holds an internal lock, so one cache can be shared by threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_weight: int | None = None,
+        ttl_ticks: int | None = None,
+        promote_on_hit: bool = True,
+        weigher: Callable[[object], int] | None = None,
+    ) -> None:
         self._max_entries = max(0, int(max_entries))
+        self._max_weight = _optional_limit(max_weight)
+        self._ttl_ticks = _optional_limit(ttl_ticks)
+        self._promote_on_hit = promote_on_hit
+        self._weigher = weigher or estimate_weight
         self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
         self._clock = 0
+        self._weight = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.RLock()
+
+    @property
+    def clock(self) -> int:
+        return self._clock
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
 
-    def get(self, key: str) -> object | None:
-        entry = self._entries.get(key)
-        if entry is None:
-            return None
-        # Promote deterministically on hit.
-        self._entries.move_to_end(key, last=True)
-        return entry.value
-
-    def set(self, key: str, value: object) -> None:
-        self._clock += 1
-        entry = CacheEntry(key=key, value=value, created_at=self._clock, expires_at=None)
-        self._entries[key] = entry
-        self._entries.move_to_end(key, last=True)
-        self._evict_if_needed()
+    def get(self, key: str, default: object | None = None, *, accept: Callable[[object], bool] | None = None) -> object | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._drop(key)
+                self._expirations += 1
+                entry = None
+            if entry is None or (accept is not None and not accept(entry.value)):
+                self._misses += 1
+                return default
+            self._hits += 1
+            if self._promote_on_hit:
+                # Promote deterministically on hit.
+                self._entries.move_to_end(key, last=True)
+            return entry.value
+
+    def peek(self, key: str) -> object | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                return None
+            return entry.value
+
+    def set(self, key: str, value: object, *, ttl_ticks: int | None = None) -> None:
+        # Weighing can serialize the value, so it runs before the lock is taken.
+        weight = max(0, int(self._weigher(value))) if self._max_weight is not None else 1
+        with self._lock:
+            self._clock += 1
+            self._drop(key)
+            if self._max_weight is not None and weight > self._max_weight:
+                # Larger than the whole budget; storing it would only flush everything else.
+                self._evictions += 1
+                return
+            ttl = _optional_limit(ttl_ticks) if ttl_ticks is not None else self._ttl_ticks
+            expires_at = self._clock + ttl if ttl is not None else None
+            self._entries[key] = CacheEntry(
+                key=key, value=value, created_at=self._clock, expires_at=expires_at, weight=weight
+            )
+            self._weight += weight
+            self._evict_if_needed()
+
+    def restore(self, entries: Iterable[tuple[str, object]], *, clock: int = 0) -> None:
+        """Reload entries oldest first without touching stats."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+            self._clock = max(0, int(clock))
+            for key, value in entries:
+                weight = max(0, int(self._weigher(value))) if self._max_weight is not None else 1
+                self._entries[key] = CacheEntry(key=key, value=value, created_at=self._clock, weight=weight)
+                self._weight += weight
+            self._evict_if_needed(count=False)
+
+    def advance(self, ticks: int = 1) -> None:
+        with self._lock:
+            self._clock += max(0, int(ticks))
+
+    def pop(self, key: str) -> object | None:
+        with self._lock:
+            entry = self._drop(key)
+        return None if entry is None else entry.value
+
+    def items(self) -> list[tuple[str, object]]:
+        """Live entries in eviction order, oldest first."""
+        with self._lock:
+            return [(key, entry.value) for key, entry in self._entries.items() if not self._expired(entry)]
 
     def clear(self) -> None:
-        self._entries.clear()
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
 
     def size(self) -> int:
         return len(self._entries)
 
+    def __len__(self) -> int:
+        return len(self._entries)
+
     def set_max_entries(self, max_entries: int) -> None:
-        self._max_entries = max(0, int(max_entries))
-        self._evict_if_needed()
+        with self._lock:
+            self._max_entries = max(0, int(max_entries))
+            self._evict_if_needed()
+
+    def set_max_weight(self, max_weight: int | None) -> None:
+        with self._lock:
+            self._max_weight = _optional_limit(max_weight)
+            if self._max_weight is not None:
+                entries = list(self._entries.values())
+                self._entries.clear()
+                self._weight = 0
+                for entry in entries:
+                    weight = max(0, int(self._weigher(entry.value)))
+                    self._entries[entry.key] = CacheEntry(
+                        key=entry.key,
+                        value=entry.value,
+                        created_at=entry.created_at,
+                        expires_at=entry.expires_at,
+                        weight=weight,
+                    )
+                    self._weight += weight
+            self._evict_if_needed()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._entries),
+                weight=self._weight,
+            )
 
-    def _evict_if_needed(self) -> None:
+    def _expired(self, entry: CacheEntry) -> bool:
+        return entry.expires_at is not None and self._clock >= entry.expires_at
+
+    def _drop(self, key: str) -> CacheEntry | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= entry.weight
+        return entry
+
+    def _evict_if_needed(self, *, count: bool = True) -> None:
         if self._max_entries <= 0:
-            self._entries.clear()
+            self.clear()
             return
-        while len(self._entries) > self._max_entries:
+        while self._entries:
+            _, oldest = next(iter(self._entries.items()))
+            expired = self._expired(oldest)
+            if not expired and len(self._entries) <= self._max_entries and not self._over_weight():
+                return
             self._entries.popitem(last=False)
+            self._weight -= oldest.weight
+            if not count:
+                continue
+            if expired:
+                self._expirations += 1
+            else:
+                self._evictions += 1
+
+    def _over_weight(self) -> bool:
+        return self._max_weight is not None and self._weight > self._max_weight
+
+
+class DeterministicLruCache(BoundedCache):
+    """Entry-count bounded LRU cache."""
+
+    def __init__(self, *, max_entries: int) -> None:
+        super().__init__(max_entries=max_entries)
+
+
+def estimate_weight(value: object) -> int:
+    """Deterministic size estimate in bytes of the value's canonical JSON form."""
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    try:
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        encoded = repr(value)
+    return len(encoded.encode("utf-8"))
+
+
+def _optional_limit(value: int | None) -> int | None:
+    if value is None:
+        return None
+    value = int(value)
+    return value if value > 0 else None
 
 
-__all__ = ["CacheEntry", "DeterministicLruCache"]
+__all__ = ["BoundedCache", "CacheEntry", "CacheStats", "DeterministicLruCache", "estimate_weight"]
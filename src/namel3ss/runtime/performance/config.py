@@ -13,6 +13,8 @@ class PerformanceRuntimeConfig:
     cache_size: int
     enable_batching: bool
     metrics_endpoint: str
+    max_fan_out: int = 4
+    cache_max_bytes: int = 0
 
 
 def normalize_performance_runtime_config(config: AppConfig | None) -> PerformanceRuntimeConfig:
@@ -20,7 +22,9 @@ def normalize_performance_runtime_config(config: AppConfig | None) -> Performanc
     perf = cfg.performance if isinstance(getattr(cfg, "performance", None), PerformanceConfig) else PerformanceConfig()
     defaults = PerformanceConfig()
     max_concurrency = _max_one(int(getattr(perf, "max_concurrency", defaults.max_concurrency)))
+    max_fan_out = _max_one(int(getattr(perf, "max_fan_out", defaults.max_fan_out)))
     cache_size = _max_zero(int(getattr(perf, "cache_size", defaults.cache_size)))
+    cache_max_bytes = _max_zero(int(getattr(perf, "cache_max_bytes", defaults.cache_max_bytes)))
     async_runtime = bool(getattr(perf, "async_runtime", defaults.async_runtime))
     enable_batching = bool(getattr(perf, "enable_batching", defaults.enable_batching))
     metrics_endpoint = str(getattr(perf, "metrics_endpoint", defaults.metrics_endpoint) or defaults.metrics_endpoint)
@@ -28,6 +32,7 @@ def normalize_performance_runtime_config(config: AppConfig | None) -> Performanc
         async_runtime
         or enable_batching
         or max_concurrency != defaults.max_concurrency
+        or max_fan_out != defaults.max_fan_out
         or cache_size != defaults.cache_size
     )
     return PerformanceRuntimeConfig(
@@ -37,6 +42,8 @@ def normalize_performance_runtime_config(config: AppConfig | None) -> Performanc
         cache_size=cache_size,
         enable_batching=enable_batching,
         metrics_endpoint=metrics_endpoint,
+        max_fan_out=max_fan_out,
+        cache_max_bytes=cache_max_bytes,
     )
 
 
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import itertools
+import threading
+
+
+_COUNTER = itertools.count(1)
+_COUNTER_LOCK = threading.Lock()
+
+
+def next_revision() -> int:
+    """Process-wide increasing number, so revisions of replaced stores never repeat."""
+    with _COUNTER_LOCK:
+        return next(_COUNTER)
+
+
+class StoreRevisions:
+    """Revision of a whole store and of each key in it, bumped on every write."""
+
+    def __init__(self) -> None:
+        self.current = 0
+        self._by_key: dict[str, int] = {}
+
+    def touch(self, key: str | None = None) -> None:
+        revision = next_revision()
+        self.current = revision
+        if key is not None:
+            self._by_key[key] = revision
+
+    def of(self, key: str) -> int:
+        return self._by_key.get(key, 0)
+
+
+__all__ = ["StoreRevisions", "next_revision"]
@@ -8,7 +8,7 @@ from typing import Callable
 
 from namel3ss.config.model import AppConfig
 from namel3ss.runtime.explainability.logger import append_performance_entry
-from namel3ss.runtime.performance.cache import DeterministicLruCache
+from namel3ss.runtime.performance.cache import BoundedCache
 from namel3ss.runtime.performance.config import PerformanceRuntimeConfig, normalize_performance_runtime_config
 from namel3ss.runtime.performance.guard import require_performance_capability
 from namel3ss.runtime.performance.scheduler import DeterministicTaskScheduler
@@ -18,13 +18,15 @@ from namel3ss.runtime.performance.scheduler import DeterministicTaskScheduler
 class PerformanceRuntimeState:
     config: PerformanceRuntimeConfig
     scheduler: DeterministicTaskScheduler
-    ai_cache: DeterministicLruCache
+    ai_cache: BoundedCache
 
     def refresh(self, runtime_config: PerformanceRuntimeConfig) -> None:
         if runtime_config.max_concurrency != self.config.max_concurrency:
             self.scheduler = DeterministicTaskScheduler(max_concurrency=runtime_config.max_concurrency)
         if runtime_config.cache_size != self.config.cache_size:
             self.ai_cache.set_max_entries(runtime_config.cache_size)
+        if runtime_config.cache_max_bytes != self.config.cache_max_bytes:
+            self.ai_cache.set_max_weight(runtime_config.cache_max_bytes)
         self.config = runtime_config
 
 
@@ -54,7 +56,10 @@ def build_or_get_performance_state(
             state = PerformanceRuntimeState(
                 config=runtime_config,
                 scheduler=DeterministicTaskScheduler(max_concurrency=runtime_config.max_concurrency),
-                ai_cache=DeterministicLruCache(max_entries=runtime_config.cache_size),
+                ai_cache=BoundedCache(
+                    max_entries=runtime_config.cache_size,
+                    max_weight=runtime_config.cache_max_bytes,
+                ),
             )
             _STATE_BY_SCOPE[scope] = state
             return state
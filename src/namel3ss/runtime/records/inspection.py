@@ -7,6 +7,7 @@ from namel3ss.errors.base import Namel3ssError
 from namel3ss.runtime.records.ordering import normalize_record_id, record_id_field, sort_records, sorted_record_ids
 from namel3ss.runtime.records.service import build_record_scope
 from namel3ss.runtime.storage.base import Storage
+from namel3ss.runtime.storage.pagination import iter_record_pages
 from namel3ss.schema.records import RecordSchema
 
 
@@ -31,16 +32,46 @@ def collect_record_rows(
     return rows, errors
 
 
+def collect_record_preview(
+    schemas: Iterable[RecordSchema],
+    store: Storage,
+    identity: dict | None,
+    *,
+    limit: int = DEFAULT_RECORD_LIMIT,
+) -> tuple[dict[str, list[dict]], dict[str, int], dict[str, str]]:
+    rows: dict[str, list[dict]] = {}
+    counts: dict[str, int] = {}
+    errors: dict[str, str] = {}
+    for schema in schemas:
+        kept: list[dict] = []
+        count = 0
+        try:
+            scope = build_record_scope(schema, identity)
+            # Pages stream past the preview so only the row count survives for the rest of the table.
+            for page in iter_record_pages(store, schema, _match_all, scope):
+                count += len(page)
+                if len(kept) < limit:
+                    kept.extend(page[: limit - len(kept)])
+            rows[schema.name] = sort_records(schema, kept)
+            counts[schema.name] = count
+        except Namel3ssError as exc:
+            rows[schema.name] = []
+            errors[schema.name] = str(exc)
+    return rows, counts, errors
+
+
 def build_records_payload(
     schemas: Iterable[RecordSchema],
     rows: dict[str, list[dict]],
     errors: dict[str, str] | None = None,
     *,
     limit: int | None = DEFAULT_RECORD_LIMIT,
+    counts: dict[str, int] | None = None,
 ) -> list[dict]:
     payload: list[dict] = []
     for schema in schemas:
         data_rows = list(rows.get(schema.name, []))
+        count = counts.get(schema.name, len(data_rows)) if counts else len(data_rows)
         if limit is None:
             entry_rows = data_rows
         else:
@@ -49,12 +80,12 @@ def build_records_payload(
             "name": schema.name,
             "id_field": record_id_field(schema),
             "fields": [{"name": field.name, "type": field.type_name} for field in schema.fields],
-            "count": len(data_rows),
+            "count": count,
             "rows": entry_rows,
         }
         if errors and schema.name in errors:
             entry["error"] = errors[schema.name]
-        if limit is not None and len(data_rows) > len(entry_rows):
+        if limit is not None and count > len(entry_rows):
             entry["limit"] = len(entry_rows)
             entry["truncated"] = True
         payload.append(entry)
@@ -99,6 +130,10 @@ def _diff_records(schema: RecordSchema, before: list[dict], after: list[dict]) -
     return effects
 
 
+def _match_all(_record: dict) -> bool:
+    return True
+
+
 def _index_records(rows: list[dict], id_field: str) -> dict[object, dict]:
     index: dict[object, dict] = {}
     for row in rows:
@@ -123,5 +158,6 @@ __all__ = [
     "DEFAULT_RECORD_LIMIT",
     "build_record_effects",
     "build_records_payload",
+    "collect_record_preview",
     "collect_record_rows",
 ]
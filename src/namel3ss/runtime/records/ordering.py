@@ -41,6 +41,10 @@ def normalize_record_id(value: object) -> object:
     return str(value)
 
 
+def record_id_sort_key(value: object) -> tuple[int, int, object]:
+    return _value_sort_key(value)
+
+
 def _record_sort_key(record: object, id_field: str) -> tuple[int, int, object]:
     value = record_id_value(record, id_field)
     if value is not None:
@@ -64,6 +68,7 @@ def _value_sort_key(value: object) -> tuple[int, int, object]:
 __all__ = [
     "normalize_record_id",
     "record_id_field",
+    "record_id_sort_key",
     "record_id_value",
     "sort_records",
     "sorted_record_ids",
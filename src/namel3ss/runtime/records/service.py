@@ -11,6 +11,7 @@ from namel3ss.runtime.safe_expression import (
     evaluate_safe_expression,
 )
 from namel3ss.runtime.storage.base import Storage
+from namel3ss.runtime.storage.bulk import save_records
 from namel3ss.runtime.validators.constraints import collect_validation_errors
 from namel3ss.schema.records import (
     EXPIRES_AT_FIELD,
@@ -65,12 +66,109 @@ def save_record_with_errors(
     identity: dict | None = None,
 ) -> Tuple[Optional[dict], List[Dict[str, str]]]:
     schema = _get_schema(record_name, schemas)
+    prepared, errors = _prepare_record(record_name, schema, values, store, identity)
+    if errors:
+        return None, errors
+    try:
+        saved = store.save(schema, prepared)
+        return strip_system_fields(saved), []
+    except Namel3ssError as exc:
+        # Fallback for any residual unique enforcement
+        return None, [
+            {
+                "field": "",
+                "code": "unique",
+                "message": str(exc),
+            }
+        ]
+
+
+def save_records_or_raise(
+    record_name: str,
+    values_list: List[Dict[str, object]],
+    schemas: Dict[str, RecordSchema],
+    state: Dict[str, object],
+    store: Storage,
+    identity: dict | None = None,
+    line: int | None = None,
+    column: int | None = None,
+) -> List[dict]:
+    buffer = RecordWriteBuffer(record_name, schemas, store, identity=identity)
+    for values in values_list:
+        buffer.add(values, line=line, column=column)
+    return buffer.flush(line=line, column=column)
+
+
+class RecordWriteBuffer:
+    """Validated new records of one schema, written together by ``flush``.
+
+    Each row is checked as it is added, against the store and the rows already
+    buffered, so a bad row fails at the same point a direct save would.
+    """
+
+    def __init__(
+        self,
+        record_name: str,
+        schemas: Dict[str, RecordSchema],
+        store: Storage,
+        identity: dict | None = None,
+    ) -> None:
+        self.record_name = record_name
+        self.schema = _get_schema(record_name, schemas)
+        self._store = store
+        self._identity = identity
+        self._rows: List[dict] = []
+        self._unique_keys: set[tuple] = set()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, values: Dict[str, object], *, line: int | None = None, column: int | None = None) -> None:
+        prepared, errors = _prepare_record(self.record_name, self.schema, values, self._store, self._identity)
+        if errors:
+            raise Namel3ssError(errors[0]["message"], line=line, column=column)
+        # The store only sees buffered rows once they land, so check them here too.
+        keys: list[tuple] = []
+        for field in self.schema.unique_fields:
+            value = prepared.get(field)
+            if value is None:
+                continue
+            key = (field, prepared.get(TENANT_KEY_FIELD), value)
+            if key in self._unique_keys or key in keys:
+                raise Namel3ssError(
+                    f"Field '{field}' in record '{self.record_name}' must be unique",
+                    line=line,
+                    column=column,
+                )
+            keys.append(key)
+        self._unique_keys.update(keys)
+        self._rows.append(prepared)
+
+    def flush(self, *, line: int | None = None, column: int | None = None) -> List[dict]:
+        rows, self._rows = self._rows, []
+        self._unique_keys.clear()
+        if not rows:
+            return []
+        try:
+            saved = save_records(self._store, self.schema, rows)
+        except Namel3ssError as exc:
+            raise Namel3ssError(str(exc), line=line, column=column) from exc
+        return [strip_system_fields(record) for record in saved]
+
+
+def _prepare_record(
+    record_name: str,
+    schema: RecordSchema,
+    values: Dict[str, object],
+    store: Storage,
+    identity: dict | None,
+) -> Tuple[dict, List[Dict[str, str]]]:
     prepared = dict(values)
     try:
         scope = build_record_scope(schema, identity)
         _apply_system_fields(schema, prepared, scope)
     except Namel3ssError as exc:
-        return None, [
+        return prepared, [
             {
                 "field": "tenant_key",
                 "code": "tenant",
@@ -79,33 +177,22 @@ def save_record_with_errors(
         ]
     type_errors = _type_errors(schema, values)
     if type_errors:
-        return None, type_errors
+        return prepared, type_errors
 
     constraint_errors = collect_validation_errors(schema, values, _literal_eval)
     if constraint_errors:
-        return None, constraint_errors
+        return prepared, constraint_errors
 
     conflict_field = store.check_unique(schema, prepared, scope=scope)
     if conflict_field:
-        return None, [
+        return prepared, [
             {
                 "field": conflict_field,
                 "code": "unique",
                 "message": f"Field '{conflict_field}' in record '{record_name}' must be unique",
             }
         ]
-    try:
-        saved = store.save(schema, prepared)
-        return strip_system_fields(saved), []
-    except Namel3ssError as exc:
-        # Fallback for any residual unique enforcement
-        return None, [
-            {
-                "field": conflict_field or "",
-                "code": "unique",
-                "message": str(exc),
-            }
-        ]
+    return prepared, []
 
 
 def _type_errors(schema: RecordSchema, data: Dict[str, object]) -> List[Dict[str, str]]:
@@ -12,6 +12,11 @@ from namel3ss.runtime.router.chat.thread_state import (
     save_thread_snapshot,
 )
 from namel3ss.runtime.router.request import read_json_body
+from namel3ss.runtime.storage.state_entries import load_state_keys, save_state_keys
+
+
+# Thread routes only read and rewrite the chat subtree of app state.
+_CHAT_STATE_KEYS = ("chat",)
 
 
 @dataclass(frozen=True)
@@ -51,7 +56,7 @@ def dispatch_chat_thread_route(
             },
             "ok": True,
         }
-        store.save_state(state)
+        _save_state(store, state)
         return ChatThreadRoutePayload(
             response=response,
             status=200,
@@ -85,7 +90,7 @@ def _load_thread_route(
     activate = _query_bool(query_values, "activate", default=activate_default)
     thread, snapshot = load_thread_snapshot(state, thread_id=thread_id, activate=activate)
     chat = ensure_thread_snapshot_state(state)[0]
-    store.save_state(state)
+    _save_state(store, state)
     response = {
         "chat": {
             "active_thread_id": str(chat.get("active_thread_id") or ""),
@@ -120,7 +125,7 @@ def _save_thread_route(
     activate = _query_bool(query_values, "activate", default=False)
     thread, snapshot = save_thread_snapshot(state, thread_id=thread_id, payload=payload, activate=activate)
     chat = ensure_thread_snapshot_state(state)[0]
-    store.save_state(state)
+    _save_state(store, state)
     response = {
         "chat": {
             "active_thread_id": str(chat.get("active_thread_id") or ""),
@@ -170,12 +175,16 @@ def _event(event_type: str, *, output: dict) -> dict:
 
 
 def _load_state(store) -> dict:
-    value = store.load_state()
+    value = load_state_keys(store, _CHAT_STATE_KEYS)
     if isinstance(value, dict):
         return value
     return {}
 
 
+def _save_state(store, state: dict) -> None:
+    save_state_keys(store, state, _CHAT_STATE_KEYS)
+
+
 def _segments(path: str) -> tuple[str, ...]:
     return tuple(part for part in str(path or "").strip("/").split("/") if part)
 
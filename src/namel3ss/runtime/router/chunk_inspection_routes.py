@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.rag.indexing.chunk_inspector_service import build_chunk_inspection_payload
 from namel3ss.runtime.conventions.errors import build_error_envelope
+from namel3ss.runtime.storage.state_entries import load_state_keys
 
 
 @dataclass(frozen=True)
@@ -113,7 +114,7 @@ def _has_state_store(store) -> bool:
 
 
 def _load_state(store) -> dict:
-    value = store.load_state()
+    value = load_state_keys(store, ("index", "ingestion"))
     if isinstance(value, dict):
         return value
     return {}
@@ -4,11 +4,14 @@ from functools import wraps
 import hashlib
 from pathlib import Path
 import threading
+import weakref
 
 from namel3ss.config.dotenv import apply_dotenv, load_dotenv_for_path
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.module_loader import load_project
 from namel3ss.module_loader.source_io import ParseCache
+from namel3ss.runtime.server.concurrency import compiled_cache_enabled
+from namel3ss.runtime.watch import SourceWatcher
 from namel3ss.secrets import set_audit_root
 
 
@@ -22,20 +25,28 @@ def _locked(method):
 
 
 class ProgramState:
-    def __init__(self, app_path: Path) -> None:
+    def __init__(self, app_path: Path, *, watch_sources: bool = True) -> None:
         self.app_path = Path(app_path).resolve()
         self.project_root = self.app_path.parent
         self.program = None
         self.sources: dict[Path, str] = {}
         self.revision = ""
         self.error: Namel3ssError | None = None
-        self._watch_snapshot: dict[Path, tuple[int, int]] = {}
+        self._watcher = SourceWatcher(self.project_root) if watch_sources else None
+        if self._watcher is not None:
+            weakref.finalize(self, self._watcher.close)
+        self._loaded_revision = 0
         self._lock = threading.RLock()
         self.parse_cache: ParseCache = {}
         self._load_program()
 
-    @_locked
     def refresh_if_needed(self) -> bool:
+        if not self._should_reload():
+            return False
+        return self._reload()
+
+    @_locked
+    def _reload(self) -> bool:
         if not self._should_reload():
             return False
         try:
@@ -47,53 +58,32 @@ class ProgramState:
 
     @_locked
     def _load_program(self) -> None:
-        apply_dotenv(load_dotenv_for_path(str(self.app_path)))
-        project = load_project(self.app_path, parse_cache=self.parse_cache)
-        self.program = project.program
-        self.sources = project.sources
-        self.revision = _compute_revision(project.sources)
-        self._watch_snapshot = _snapshot_paths(list(project.sources.keys()))
-        set_audit_root(project.app_path.parent)
-        self.error = None
+        if self._watcher is not None:
+            self._watcher.start()
+            # A failed load also waits for the next change before trying again.
+            self._loaded_revision = self._watcher.revision
+        try:
+            apply_dotenv(load_dotenv_for_path(str(self.app_path)))
+            project = load_project(
+                self.app_path,
+                parse_cache=self.parse_cache,
+                compiled_cache=compiled_cache_enabled(app_path=self.app_path),
+            )
+            self.program = project.program
+            self.sources = project.sources
+            self.revision = compute_revision(project.sources)
+            set_audit_root(project.app_path.parent)
+            self.error = None
+        finally:
+            if self._watcher is not None:
+                self._watcher.track(self.sources.keys())
 
     def _should_reload(self) -> bool:
-        watch_paths = self._watch_paths()
-        snapshot = _snapshot_paths(watch_paths)
-        if not self._watch_snapshot:
-            self._watch_snapshot = snapshot
-            return True
-        if snapshot != self._watch_snapshot:
-            self._watch_snapshot = snapshot
-            return True
-        return False
+        # Only an integer comparison; the watcher thread does the file system work.
+        return self._watcher is not None and self._watcher.revision != self._loaded_revision
 
-    def _watch_paths(self) -> list[Path]:
-        if self.sources:
-            return sorted(self.sources.keys(), key=lambda p: p.as_posix())
-        return _scan_project_sources(self.project_root)
 
-
-def _scan_project_sources(project_root: Path) -> list[Path]:
-    paths: list[Path] = []
-    for path in sorted(project_root.rglob("*.ai"), key=lambda p: p.as_posix()):
-        if ".namel3ss" in path.parts:
-            continue
-        paths.append(path)
-    return paths or [project_root / "app.ai"]
-
-
-def _snapshot_paths(paths: list[Path]) -> dict[Path, tuple[int, int]]:
-    snapshot: dict[Path, tuple[int, int]] = {}
-    for path in paths:
-        try:
-            stat = path.stat()
-            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
-        except FileNotFoundError:
-            snapshot[path] = (-1, -1)
-    return snapshot
-
-
-def _compute_revision(sources: dict[Path, str]) -> str:
+def compute_revision(sources: dict[Path, str]) -> str:
     digest = hashlib.sha256()
     for path, text in sorted(sources.items(), key=lambda item: item[0].as_posix()):
         digest.update(path.as_posix().encode("utf-8"))
@@ -101,4 +91,12 @@ def _compute_revision(sources: dict[Path, str]) -> str:
     return digest.hexdigest()[:12]
 
 
-__all__ = ["ProgramState"]
+def read_revision(paths: list[Path]) -> str | None:
+    """Revision of the files on disk now, or None when one can no longer be read."""
+    try:
+        return compute_revision({path: path.read_text(encoding="utf-8") for path in paths})
+    except OSError:
+        return None
+
+
+__all__ = ["ProgramState", "compute_revision", "read_revision"]
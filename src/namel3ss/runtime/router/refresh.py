@@ -17,6 +17,9 @@ def refresh_routes(
     revision: str | None,
     logger: Callable[[str], None] | None = None,
 ) -> dict[str, list[str]]:
+    if revision is not None and registry.revision == revision:
+        # The route table is already built for this program revision; skip config reads and definition writes.
+        return {"added": [], "removed": [], "updated": []}
     routes = getattr(program, "routes", []) or []
     permissions = load_route_permissions(getattr(program, "project_root", None), getattr(program, "app_path", None))
     route_version_meta = {}
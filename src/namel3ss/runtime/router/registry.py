@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import threading
 from typing import Iterable
 
@@ -8,6 +8,7 @@ from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
 from namel3ss.ir import nodes as ir
 from namel3ss.runtime.auth.route_permissions import RouteRequirement
+from namel3ss.runtime.router.route_trie import RouteTrie, path_params, split_path
 from namel3ss.versioning.semver import version_sort_key
 
 
@@ -37,11 +38,18 @@ class RouteMatch:
     path_params: dict[str, str]
 
 
+@dataclass(frozen=True)
+class _RouteTable:
+    routes: tuple[RouteEntry, ...] = ()
+    signatures: dict[str, tuple] = field(default_factory=dict)
+    revision: str | None = None
+    trie: RouteTrie = field(default_factory=lambda: RouteTrie(()))
+
+
 class RouteRegistry:
     def __init__(self) -> None:
-        self._routes: list[RouteEntry] = []
-        self._signatures: dict[str, tuple] = {}
-        self._revision: str | None = None
+        # Lookups read the current table without locking; update() builds a new one and swaps it in.
+        self._table = _RouteTable()
         self._lock = threading.RLock()
 
     def update(
@@ -53,56 +61,59 @@ class RouteRegistry:
         route_version_meta: dict[str, dict[str, object]] | None = None,
     ) -> dict[str, list[str]]:
         with self._lock:
-            if revision is not None and revision == self._revision:
+            table = self._table
+            if revision is not None and revision == table.revision:
                 return {"added": [], "removed": [], "updated": []}
             new_entries = _build_entries(
                 routes,
                 requirements=requirements or {},
                 route_version_meta=route_version_meta or {},
             )
-            diff = _diff_routes(self._signatures, new_entries)
-            self._routes = new_entries
-            self._signatures = {entry.name: _signature(entry) for entry in new_entries}
-            self._revision = revision
+            diff = _diff_routes(table.signatures, new_entries)
+            self._table = _RouteTable(
+                routes=tuple(new_entries),
+                signatures={entry.name: _signature(entry) for entry in new_entries},
+                revision=revision,
+                trie=RouteTrie(new_entries),
+            )
             return diff
 
     def match(self, method: str, path: str, *, requested_version: str | None = None) -> RouteMatch | None:
-        with self._lock:
-            if not self._routes:
-                return None
-            normalized = _normalize_path(path)
-            candidates: list[RouteMatch] = []
-            for entry in self._routes:
-                if entry.method != method:
-                    continue
-                match = _match_entry(entry, normalized)
-                if match is not None:
-                    candidates.append(match)
-            if not candidates:
-                return None
-            selected = _select_match(candidates, requested_version=requested_version)
-            return selected
+        table = self._table
+        if not table.routes:
+            return None
+        parts = split_path(_normalize_path(path))
+        candidates = [
+            RouteMatch(entry=entry, path_params=path_params(entry, parts))
+            for entry in table.trie.lookup(method, parts)
+        ]
+        if not candidates:
+            return None
+        return _select_match(candidates, requested_version=requested_version)
 
     def removed_version(self, method: str, path: str, requested_version: str) -> RouteEntry | None:
-        with self._lock:
-            if not self._routes:
-                return None
-            normalized = _normalize_path(path)
-            for entry in self._routes:
-                if entry.method != method:
-                    continue
-                if entry.status != "removed":
-                    continue
-                if (entry.version or "") != requested_version:
-                    continue
-                if _match_entry(entry, normalized) is not None:
-                    return entry
+        table = self._table
+        if not table.routes:
             return None
+        parts = split_path(_normalize_path(path))
+        for entry in sorted(table.trie.lookup(method, parts), key=_entry_order):
+            if entry.status != "removed":
+                continue
+            if (entry.version or "") != requested_version:
+                continue
+            return entry
+        return None
+
+    def lookup_stats(self) -> dict[str, int]:
+        return self._table.trie.stats().as_dict()
+
+    @property
+    def revision(self) -> str | None:
+        return self._table.revision
 
     @property
     def routes(self) -> list[RouteEntry]:
-        with self._lock:
-            return list(self._routes)
+        return list(self._table.routes)
 
 
 def _build_entries(
@@ -184,16 +195,11 @@ def _build_entries(
                 requires=requirement,
             )
         )
-    return sorted(
-        entries,
-        key=lambda entry: (
-            entry.method,
-            entry.path,
-            entry.entity_name,
-            entry.version or "",
-            entry.name,
-        ),
-    )
+    return sorted(entries, key=_entry_order)
+
+
+def _entry_order(entry: RouteEntry) -> tuple:
+    return (entry.method, entry.path, entry.entity_name, entry.version or "", entry.name)
 
 
 def _normalize_path(path: str) -> str:
@@ -215,21 +221,6 @@ def _compile_path(path: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
     return segments, tuple(params)
 
 
-def _match_entry(entry: RouteEntry, path: str) -> RouteMatch | None:
-    parts = tuple(seg for seg in path.split("/") if seg)
-    if len(parts) != len(entry.segments):
-        return None
-    params: dict[str, str] = {}
-    for expected, actual in zip(entry.segments, parts):
-        if expected.startswith("{") and expected.endswith("}"):
-            key = expected[1:-1].strip()
-            params[key] = actual
-            continue
-        if expected != actual:
-            return None
-    return RouteMatch(entry=entry, path_params=params)
-
-
 def _signature(entry: RouteEntry) -> tuple:
     return (
         entry.entity_name,
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from namel3ss.runtime.router.registry import RouteEntry
+
+
+@dataclass
+class _TrieNode:
+    static: dict[str, "_TrieNode"] = field(default_factory=dict)
+    param: "_TrieNode | None" = None
+    entries: list["RouteEntry"] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class RouteLookupStats:
+    lookups: int
+    nodes_visited: int
+    candidates: int
+
+    def as_dict(self) -> dict[str, int]:
+        return {"lookups": self.lookups, "nodes_visited": self.nodes_visited, "candidates": self.candidates}
+
+
+class RouteTrie:
+    """Segment trie over route paths, one root per HTTP method.
+
+    A lookup walks the request path once; static segments are tried before
+    ``{param}`` segments and every branch that reaches a route is returned, so
+    callers can still choose between versions of the same path.
+    """
+
+    def __init__(self, entries: Iterable["RouteEntry"]) -> None:
+        self._roots: dict[str, _TrieNode] = {}
+        for entry in entries:
+            node = self._roots.setdefault(entry.method, _TrieNode())
+            for segment in entry.segments:
+                if _is_param(segment):
+                    if node.param is None:
+                        node.param = _TrieNode()
+                    node = node.param
+                else:
+                    node = node.static.setdefault(segment, _TrieNode())
+            node.entries.append(entry)
+        self._stats_lock = threading.Lock()
+        self._lookups = 0
+        self._nodes_visited = 0
+        self._candidates = 0
+
+    def lookup(self, method: str, parts: tuple[str, ...]) -> list["RouteEntry"]:
+        root = self._roots.get(method)
+        found: list[RouteEntry] = []
+        visited = 0
+        if root is not None:
+            stack: list[tuple[_TrieNode, int]] = [(root, 0)]
+            while stack:
+                node, depth = stack.pop()
+                visited += 1
+                if depth == len(parts):
+                    found.extend(node.entries)
+                    continue
+                # Pushed last, so static children are explored first.
+                if node.param is not None:
+                    stack.append((node.param, depth + 1))
+                child = node.static.get(parts[depth])
+                if child is not None:
+                    stack.append((child, depth + 1))
+        with self._stats_lock:
+            self._lookups += 1
+            self._nodes_visited += visited
+            self._candidates += len(found)
+        return found
+
+    def stats(self) -> RouteLookupStats:
+        with self._stats_lock:
+            return RouteLookupStats(
+                lookups=self._lookups,
+                nodes_visited=self._nodes_visited,
+                candidates=self._candidates,
+            )
+
+
+def split_path(path: str) -> tuple[str, ...]:
+    return tuple(seg for seg in path.split("/") if seg)
+
+
+def path_params(entry: "RouteEntry", parts: tuple[str, ...]) -> dict[str, str]:
+    params: dict[str, str] = {}
+    for expected, actual in zip(entry.segments, parts):
+        if _is_param(expected):
+            params[expected[1:-1].strip()] = actual
+    return params
+
+
+def _is_param(segment: str) -> bool:
+    return segment.startswith("{") and segment.endswith("}")
+
+
+__all__ = ["RouteLookupStats", "RouteTrie", "path_params", "split_path"]
@@ -26,6 +26,7 @@ class ConcurrencyConfig:
     worker_processes: int
     require_free_threaded: bool
     compiled_cache_enabled: bool
+    watch_sources: bool
     python_version: str
     gil_enabled: bool | None
 
@@ -41,6 +42,7 @@ class ConcurrencyConfig:
             "require_free_threaded": bool(self.require_free_threaded),
             "free_threaded": bool(self.free_threaded),
             "compiled_cache_enabled": bool(self.compiled_cache_enabled),
+            "watch_sources": bool(self.watch_sources),
             "python_version": self.python_version,
         }
         if self.gil_enabled is None:
@@ -112,6 +114,12 @@ def load_concurrency_config(
         default=True,
         field_name="compiled_cache_enabled",
     )
+    watch_sources = _bool_value(
+        payload.get("watch_sources"),
+        env_name="N3_WATCH_SOURCES",
+        default=True,
+        field_name="watch_sources",
+    )
 
     gil_enabled = _detect_gil_enabled()
     if require_free_threaded and gil_enabled is not False:
@@ -130,11 +138,24 @@ def load_concurrency_config(
         worker_processes=worker_processes,
         require_free_threaded=require_free_threaded,
         compiled_cache_enabled=compiled_cache_enabled,
+        watch_sources=watch_sources,
         python_version=f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
         gil_enabled=gil_enabled,
     )
 
 
+def compiled_cache_enabled(*, project_root: Path | None = None, app_path: Path | None = None) -> bool:
+    # Commands that never start a server read only this flag and ignore other settings.
+    # An unreadable concurrency.yaml or flag value raises, like load_concurrency_config.
+    payload = _read_payload(_config_path(project_root=project_root, app_path=app_path))
+    return _bool_value(
+        payload.get("compiled_cache_enabled"),
+        env_name="N3_COMPILED_CACHE",
+        default=True,
+        field_name="compiled_cache_enabled",
+    )
+
+
 def create_runtime_http_server(
     host: str,
     port: int,
@@ -275,6 +296,7 @@ __all__ = [
     "DEFAULT_WORKER_PROCESSES",
     "ConcurrencyConfig",
     "DeterministicThreadingHTTPServer",
+    "compiled_cache_enabled",
     "create_runtime_http_server",
     "load_concurrency_config",
 ]
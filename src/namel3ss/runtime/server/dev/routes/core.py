@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlparse
 
 from namel3ss.determinism import canonical_json_dumps
 from namel3ss.errors.payload import build_error_payload
@@ -129,7 +130,7 @@ def observability_payload(handler: Any, kind: str) -> dict:
         return build_error_payload("Program not loaded.", kind="engine")
     if not _observability_enabled():
         return _empty_observability_payload(kind)
-    builder = _load_observability_builder(kind)
+    builder = _load_observability_builder(kind, urlparse(handler.path).query)
     if builder is None:
         return _empty_observability_payload(kind)
     return builder(getattr(program, "project_root", None), getattr(program, "app_path", None))
@@ -171,16 +172,10 @@ def _runtime_web_root() -> Path:
     return package_root() / "runtime" / "web"
 
 
-def _load_observability_builder(kind: str):
+def _load_observability_builder(kind: str, query: str | None = None):
     from namel3ss.runtime import observability_api
 
-    mapping = {
-        "logs": observability_api.get_logs_payload,
-        "trace": observability_api.get_trace_payload,
-        "traces": observability_api.get_traces_payload,
-        "metrics": observability_api.get_metrics_payload,
-    }
-    return mapping.get(kind)
+    return observability_api.observability_builder(kind, query)
 
 
 def _observability_enabled() -> bool:
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from namel3ss.determinism import canonical_json_dumps
+from namel3ss.runtime.auth.identity_model import normalize_identity
+from namel3ss.runtime.performance.cache import BoundedCache, CacheStats
+
+
+MANIFEST_CACHE_LIMIT = 128
+MANIFEST_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ManifestCache:
+    """Bounded LRU of manifests keyed by identity; the lock only covers the O(1) entry update."""
+
+    def __init__(self, *, max_entries: int = MANIFEST_CACHE_LIMIT, max_bytes: int | None = MANIFEST_CACHE_MAX_BYTES) -> None:
+        self._entries = BoundedCache(max_entries=max_entries, max_weight=max_bytes)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            value = self._entries.get(key)
+        return value if isinstance(value, dict) else None
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries.set(key, value)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._entries.stats()
+
+    def __len__(self) -> int:
+        return self._entries.size()
+
+
+@dataclass(frozen=True)
+class AppSnapshot:
+    """Everything a read request needs, replaced as a whole on reload."""
+
+    program: object | None = None
+    sources: dict[Path, str] = field(default_factory=dict)
+    revision: str = ""
+    error_payload: dict | None = None
+    config: object | None = None
+    watch_revision: int = -1
+    manifests: ManifestCache = field(default_factory=ManifestCache)
+    manifest_errors: ManifestCache = field(default_factory=ManifestCache)
+
+
+def manifest_cache_key(
+    identity: dict | None,
+    auth_context: object | None = None,
+    runtime_errors: list[dict[str, str]] | None = None,
+) -> str:
+    normalized = normalize_identity(identity if isinstance(identity, dict) else {})
+    payload_map: dict[str, object] = {"identity": normalized}
+    if auth_context is not None:
+        error = getattr(auth_context, "error", None)
+        authenticated = getattr(auth_context, "authenticated", None)
+        if error is not None:
+            payload_map["auth_error"] = error
+        if isinstance(authenticated, bool):
+            payload_map["authenticated"] = authenticated
+    if isinstance(runtime_errors, list) and runtime_errors:
+        payload_map["runtime_errors"] = runtime_errors
+    payload = canonical_json_dumps(payload_map, pretty=False, drop_run_keys=False)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return digest[:12]
+
+
+def read_source_fallback(app_path: Path) -> dict[Path, str]:
+    try:
+        return {app_path: app_path.read_text(encoding="utf-8")}
+    except OSError:
+        return {}
+
+
+__all__ = [
+    "AppSnapshot",
+    "MANIFEST_CACHE_LIMIT",
+    "ManifestCache",
+    "manifest_cache_key",
+    "read_source_fallback",
+]
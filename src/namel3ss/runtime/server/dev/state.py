@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from functools import wraps
-import hashlib
 import json
 import os
 from pathlib import Path
 import threading
+import weakref
 
 from namel3ss.diagnostics_mode import parse_diagnostics_flag
 from namel3ss.config.dotenv import apply_dotenv, load_dotenv_for_path
@@ -37,6 +38,14 @@ from namel3ss.ui.manifest.display_mode import DISPLAY_MODE_PRODUCTION, DISPLAY_M
 from namel3ss.ui.settings import UI_ALLOWED_VALUES, UI_DEFAULTS
 from namel3ss.validation import ValidationMode, ValidationWarning
 from namel3ss.runtime.server.dev.errors import error_from_exception
+from namel3ss.runtime.server.dev.snapshot import (
+    AppSnapshot,
+    ManifestCache,
+    manifest_cache_key,
+    read_source_fallback,
+)
+from namel3ss.runtime.router.program_state import compute_revision
+from namel3ss.runtime.watch import SourceWatcher
 
 def _locked(method):
     @wraps(method)
@@ -69,73 +78,90 @@ class BrowserAppState:
         self.diagnostics_enabled = env_diagnostics if diagnostics_enabled is None else bool(diagnostics_enabled)
         self.source_overrides = source_overrides or {}
         self.watch_sources = watch_sources
+        self._watcher = SourceWatcher(self.project_root) if watch_sources else None
+        if self._watcher is not None:
+            weakref.finalize(self, self._watcher.close)
         self.parse_cache: ParseCache = {}
         self.session = SessionState()
-        self.program = None
-        self.sources: dict[Path, str] = {}
-        self.manifest_cache: dict[str, dict] = {}
-        self.manifest_errors: dict[str, dict] = {}
-        self.error_payload: dict | None = None
-        self.revision = ""
-        self._watch_snapshot: dict[Path, tuple[int, int]] = {}
+        # Readers take the current snapshot without locking; reloads and writers swap it under _lock.
+        self._snapshot = AppSnapshot()
         self._lock = threading.RLock()
         set_audit_root(self.project_root)
         set_engine_target(engine_target)
 
-    @_locked
+    @property
+    def program(self):
+        return self._snapshot.program
+
+    @property
+    def sources(self) -> dict[Path, str]:
+        return self._snapshot.sources
+
+    @property
+    def revision(self) -> str:
+        return self._snapshot.revision
+
+    @property
+    def error_payload(self) -> dict | None:
+        return self._snapshot.error_payload
+
     def manifest_payload(self, *, identity: dict | None = None, auth_context: object | None = None) -> dict:
-        self._refresh_if_needed()
-        if self.error_payload:
-            return self.error_payload
-        if self.program is None:
+        snapshot = self._refresh_if_needed()
+        if snapshot.error_payload:
+            return snapshot.error_payload
+        if snapshot.program is None:
             return {}
         config = load_config(app_path=self.app_path)
+        if config is not snapshot.config:
+            snapshot = self._bind_config(config)
         warnings: list[ValidationWarning] = []
         resolved_identity = dict(identity) if isinstance(identity, dict) else None
         if resolved_identity is None:
             resolved_identity = resolve_identity(
                 config,
-                getattr(self.program, "identity", None),
+                getattr(snapshot.program, "identity", None),
                 mode=ValidationMode.RUNTIME,
                 warnings=warnings,
             )
         resolved_identity = normalize_identity(resolved_identity)
         runtime_errors = self._current_runtime_errors(config)
-        cache_key = self._identity_cache_key(
+        cache_key = manifest_cache_key(
             resolved_identity,
             auth_context=auth_context,
             runtime_errors=runtime_errors,
         )
-        cached = self.manifest_cache.get(cache_key)
+        cached = snapshot.manifests.get(cache_key) or snapshot.manifest_errors.get(cache_key)
         if cached is not None:
             return cached
-        cached_error = self.manifest_errors.get(cache_key)
-        if cached_error is not None:
-            return cached_error
-        try:
-            manifest = self._build_manifest(
-                self.program,
-                config=config,
-                identity=resolved_identity,
-                warnings=warnings,
-                auth_context=auth_context,
-            )
-            manifest, capability_errors = attach_capability_manifest_fields(
-                manifest,
-                program_ir=self.program,
-                config=config,
-            )
-            runtime_errors = merge_runtime_errors(runtime_errors, capability_errors)
-            if runtime_errors:
-                inject_runtime_error_elements(manifest, runtime_errors)
-            if warnings:
-                manifest["warnings"] = [warning.to_dict() for warning in warnings]
-            self.manifest_cache[cache_key] = manifest
-            return manifest
-        except Namel3ssError as err:
-            payload = self._build_error_payload(err)
-            self.manifest_errors[cache_key] = payload
-            return payload
+        # Building reads and updates session state, so only cache misses serialize.
+        with self._lock:
+            cached = snapshot.manifests.get(cache_key)
+            if cached is not None:
+                return cached
+            try:
+                manifest = self._build_manifest(
+                    snapshot.program,
+                    config=config,
+                    identity=resolved_identity,
+                    warnings=warnings,
+                    auth_context=auth_context,
+                )
+                manifest, capability_errors = attach_capability_manifest_fields(
+                    manifest,
+                    program_ir=snapshot.program,
+                    config=config,
+                )
+                runtime_errors = merge_runtime_errors(runtime_errors, capability_errors)
+                if runtime_errors:
+                    inject_runtime_error_elements(manifest, runtime_errors)
+                if warnings:
+                    manifest["warnings"] = [warning.to_dict() for warning in warnings]
+                snapshot.manifests.set(cache_key, manifest)
+                return manifest
+            except Namel3ssError as err:
+                payload = self._build_error_payload(err)
+                snapshot.manifest_errors.set(cache_key, payload)
+                return payload
 
     @_locked
     def state_payload(self, *, identity: dict | None = None) -> dict:
@@ -157,18 +183,17 @@ class BrowserAppState:
             payload["effects"] = self.session.data_effects
         return payload
 
-    @_locked
     def status_payload(self) -> dict:
-        self._refresh_if_needed()
-        if self.error_payload:
+        snapshot = self._refresh_if_needed()
+        if snapshot.error_payload:
             payload = {
                 "ok": False,
-                "revision": self.revision,
-                "error": self.error_payload,
-                "overlay": self.error_payload.get("overlay") if isinstance(self.error_payload, dict) else None,
+                "revision": snapshot.revision,
+                "error": snapshot.error_payload,
+                "overlay": snapshot.error_payload.get("overlay") if isinstance(snapshot.error_payload, dict) else None,
             }
             return payload
-        return {"ok": True, "revision": self.revision}
+        return {"ok": True, "revision": snapshot.revision}
 
     @_locked
     def run_action(
@@ -198,7 +223,7 @@ class BrowserAppState:
                 mode=ValidationMode.RUNTIME,
             )
         identity_value = normalize_identity(identity_value)
-        cache_key = self._identity_cache_key(
+        cache_key = manifest_cache_key(
             identity_value,
             auth_context=auth_context,
             runtime_errors=merge_runtime_errors(self.session.runtime_errors, guardrails),
@@ -308,13 +333,13 @@ class BrowserAppState:
                     audit_bundle=response.get("audit_bundle"),
                     audit_policy_status=response.get("audit_policy_status"),
                 )
-            resolved_cache_key = self._identity_cache_key(
+            resolved_cache_key = manifest_cache_key(
                 identity_value,
                 auth_context=auth_context,
                 runtime_errors=response.get("runtime_errors") if isinstance(response, dict) else None,
             )
-            self.manifest_cache[resolved_cache_key] = ui_payload
-            self.manifest_errors.pop(cache_key, None)
+            self._snapshot.manifests.set(resolved_cache_key, ui_payload)
+            self._snapshot.manifest_errors.pop(cache_key)
             theme_current = (ui_payload.get("theme") or {}).get("current")
             if isinstance(theme_current, str) and theme_current:
                 self.session.runtime_theme = theme_current
@@ -331,46 +356,65 @@ class BrowserAppState:
             return response
         return {"ok": False, "error": "Action failed.", "state": self._state_snapshot(), "revision": self.revision}
 
-    @_locked
-    def _refresh_if_needed(self) -> None:
-        if not self._should_reload():
-            return
+    def _refresh_if_needed(self) -> AppSnapshot:
+        snapshot = self._snapshot
+        if not self._should_reload(snapshot):
+            return snapshot
+        with self._lock:
+            if self._should_reload(self._snapshot):
+                self._reload(self._snapshot)
+            return self._snapshot
+
+    def _reload(self, current: AppSnapshot) -> None:
+        watch_revision = 0
+        if self._watcher is not None:
+            # Watching starts before the first load so edits made while it runs are not lost.
+            self._watcher.start()
+            watch_revision = self._watcher.revision
         try:
             program, sources = self._load_program()
-            self.program = program
-            self.sources = sources
-            self.revision = _compute_revision(sources)
-            self._watch_snapshot = _snapshot_paths(list(sources.keys()))
-            self.manifest_cache = {}
-            self.manifest_errors = {}
-            self.error_payload = None
-            self.session.runtime_errors = []
         except Namel3ssError as err:
-            self.error_payload = self._build_error_payload(err)
+            error_payload = self._build_error_payload(err)
+            self._snapshot = replace(current, error_payload=error_payload, watch_revision=watch_revision)
+            self._track(current.sources)
+            return
         except Exception as err:  # pragma: no cover - defensive guard
-            self.error_payload = build_error_payload(str(err), kind="internal")
+            error_payload = build_error_payload(str(err), kind="internal")
             if self.mode == "dev":
-                self.error_payload["overlay"] = build_dev_overlay_payload(self.error_payload, debug=self.debug)
+                error_payload["overlay"] = build_dev_overlay_payload(error_payload, debug=self.debug)
+            self._snapshot = replace(current, error_payload=error_payload, watch_revision=watch_revision)
+            self._track(current.sources)
+            return
+        self._snapshot = AppSnapshot(
+            program=program,
+            sources=sources,
+            revision=compute_revision(sources),
+            watch_revision=watch_revision,
+        )
+        self._track(sources)
+        self.session.runtime_errors = []
 
-    def _should_reload(self) -> bool:
-        if not self.watch_sources:
-            return self.program is None
-        watch_paths = self._watch_paths()
-        snapshot = _snapshot_paths(watch_paths)
-        if not self._watch_snapshot:
-            self._watch_snapshot = snapshot
-            return True
-        if snapshot != self._watch_snapshot:
-            self._watch_snapshot = snapshot
-            return True
-        return False
+    def _track(self, sources: dict[Path, str]) -> None:
+        if self._watcher is not None:
+            self._watcher.track(sources.keys())
 
-    def _watch_paths(self) -> list[Path]:
-        if not self.watch_sources:
-            return []
-        if self.sources:
-            return sorted(self.sources.keys(), key=lambda p: p.as_posix())
-        return _scan_project_sources(self.project_root)
+    def _bind_config(self, config) -> AppSnapshot:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot.config is config:
+                return snapshot
+            if snapshot.config is None:
+                snapshot = replace(snapshot, config=config)
+            else:
+                # Manifests depend on config, so a changed config starts empty caches.
+                snapshot = replace(snapshot, config=config, manifests=ManifestCache(), manifest_errors=ManifestCache())
+            self._snapshot = snapshot
+            return snapshot
+
+    def _should_reload(self, snapshot: AppSnapshot) -> bool:
+        if self._watcher is None:
+            return snapshot.program is None
+        return snapshot.watch_revision != self._watcher.revision
 
     def _load_program(self) -> tuple[object, dict[Path, str]]:
         apply_dotenv(load_dotenv_for_path(str(self.app_path)))
@@ -414,27 +458,6 @@ class BrowserAppState:
         )
         return manifest
 
-    def _identity_cache_key(
-        self,
-        identity: dict | None,
-        auth_context: object | None = None,
-        runtime_errors: list[dict[str, str]] | None = None,
-    ) -> str:
-        normalized = normalize_identity(identity if isinstance(identity, dict) else {})
-        payload_map: dict[str, object] = {"identity": normalized}
-        if auth_context is not None:
-            error = getattr(auth_context, "error", None)
-            authenticated = getattr(auth_context, "authenticated", None)
-            if error is not None:
-                payload_map["auth_error"] = error
-            if isinstance(authenticated, bool):
-                payload_map["authenticated"] = authenticated
-        if isinstance(runtime_errors, list) and runtime_errors:
-            payload_map["runtime_errors"] = runtime_errors
-        payload = canonical_json_dumps(payload_map, pretty=False, drop_run_keys=False)
-        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-        return digest[:12]
-
     def _current_runtime_errors(self, config) -> list[dict[str, str]]:
         guardrails = provider_guardrail_diagnostics(config) if self.ui_mode == DISPLAY_MODE_STUDIO else []
         return merge_runtime_errors(self.session.runtime_errors, guardrails)
@@ -451,7 +474,7 @@ class BrowserAppState:
     def _source_payload(self) -> dict:
         if self.sources:
             return dict(self.sources)
-        return _read_source_fallback(self.app_path)
+        return read_source_fallback(self.app_path)
 
     def _main_source(self) -> str | None:
         if self.sources and self.app_path in self.sources:
@@ -467,34 +490,4 @@ class BrowserAppState:
         except Exception:
             return {}
 
-def _scan_project_sources(project_root: Path) -> list[Path]:
-    paths: list[Path] = []
-    for path in sorted(project_root.rglob("*.ai"), key=lambda p: p.as_posix()):
-        if ".namel3ss" in path.parts:
-            continue
-        paths.append(path)
-    return paths or [project_root / "app.ai"]
-
-def _snapshot_paths(paths: list[Path]) -> dict[Path, tuple[int, int]]:
-    snapshot: dict[Path, tuple[int, int]] = {}
-    for path in paths:
-        try:
-            stat = path.stat()
-            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
-        except FileNotFoundError:
-            snapshot[path] = (-1, -1)
-    return snapshot
-
-def _compute_revision(sources: dict[Path, str]) -> str:
-    digest = hashlib.sha256()
-    for path, text in sorted(sources.items(), key=lambda item: item[0].as_posix()):
-        digest.update(path.as_posix().encode("utf-8"))
-        digest.update(text.encode("utf-8"))
-    return digest.hexdigest()[:12]
-
-def _read_source_fallback(app_path: Path) -> dict[Path, str]:
-    try:
-        return {app_path: app_path.read_text(encoding="utf-8")}
-    except OSError:
-        return {}
 __all__ = ["BrowserAppState"]
@@ -226,19 +226,19 @@ class ServiceRequestHandler(BaseHTTPRequestHandler):
             self._respond_json(response, status=status, sort_keys=True)
             return
         if normalized == "/api/logs":
-            response, status = self._handle_observability("logs")
+            response, status = self._handle_observability("logs", parsed.query)
             self._respond_json(response, status=status, sort_keys=True)
             return
         if normalized == "/api/traces":
-            response, status = self._handle_observability("traces")
+            response, status = self._handle_observability("traces", parsed.query)
             self._respond_json(response, status=status, sort_keys=True)
             return
         if normalized == "/api/trace":
-            response, status = self._handle_observability("trace")
+            response, status = self._handle_observability("trace", parsed.query)
             self._respond_json(response, status=status, sort_keys=True)
             return
         if normalized == "/api/metrics":
-            response, status = self._handle_observability("metrics")
+            response, status = self._handle_observability("metrics", parsed.query)
             self._respond_json(response, status=status, sort_keys=True)
             return
         if normalized == "/api/build":
@@ -386,13 +386,13 @@ class ServiceRequestHandler(BaseHTTPRequestHandler):
         except Exception as err:  # pragma: no cover - defensive
             return build_error_payload(str(err), kind="internal"), 500
 
-    def _handle_observability(self, kind: str) -> tuple[dict, int]:
+    def _handle_observability(self, kind: str, query: str = "") -> tuple[dict, int]:
         program_ir = self._program()
         if program_ir is None:
             return build_error_payload("Program not loaded", kind="engine"), 500
         if not observability_enabled():
             return empty_observability_payload(kind), 200
-        builder = load_observability_builder(kind)
+        builder = load_observability_builder(kind, query)
         if builder is None:
             return empty_observability_payload(kind), 200
         payload = builder(getattr(program_ir, "project_root", None), getattr(program_ir, "app_path", None))
@@ -1,16 +1,10 @@
 from __future__ import annotations
 
 
-def load_observability_builder(kind: str):
+def load_observability_builder(kind: str, query: str | None = None):
     from namel3ss.runtime import observability_api
 
-    mapping = {
-        "logs": observability_api.get_logs_payload,
-        "trace": observability_api.get_trace_payload,
-        "traces": observability_api.get_traces_payload,
-        "metrics": observability_api.get_metrics_payload,
-    }
-    return mapping.get(kind)
+    return observability_api.observability_builder(kind, query)
 
 
 def observability_enabled() -> bool:
@@ -91,19 +91,19 @@ class ProductionRequestHandler(BaseHTTPRequestHandler):
         if documents.handle_documents_get(self, raw_path):
             return
         if path == "/api/logs":
-            payload, status = self._handle_observability("logs")
+            payload, status = self._handle_observability("logs", urlparse(raw_path).query)
             respond_json(self, payload, status=status, sort_keys=True)
             return
         if path == "/api/traces":
-            payload, status = self._handle_observability("traces")
+            payload, status = self._handle_observability("traces", urlparse(raw_path).query)
             respond_json(self, payload, status=status, sort_keys=True)
             return
         if path == "/api/trace":
-            payload, status = self._handle_observability("trace")
+            payload, status = self._handle_observability("trace", urlparse(raw_path).query)
             respond_json(self, payload, status=status, sort_keys=True)
             return
         if path == "/api/metrics":
-            payload, status = self._handle_observability("metrics")
+            payload, status = self._handle_observability("metrics", urlparse(raw_path).query)
             respond_json(self, payload, status=status, sort_keys=True)
             return
         if path == "/api/build":
@@ -314,14 +314,14 @@ class ProductionRequestHandler(BaseHTTPRequestHandler):
         except Exception as err:  # pragma: no cover - defensive guard rail
             payload = build_error_payload(str(err), kind="internal")
             return payload, 500
-    def _handle_observability(self, kind: str) -> tuple[dict, int]:
+    def _handle_observability(self, kind: str, query: str = "") -> tuple[dict, int]:
         program = getattr(self._state(), "program", None)
         if program is None:
             return build_error_payload("Program not loaded.", kind="engine"), 500
         if not observability_enabled():
             payload = empty_observability_payload(kind)
             return payload, 200
-        builder = load_observability_builder(kind)
+        builder = load_observability_builder(kind, query)
         if builder is None:
             payload = empty_observability_payload(kind)
             return payload, 200
@@ -92,7 +92,7 @@ class ServiceRunner:
         self.concurrency = load_concurrency_config(app_path=self.app_path)
 
     def start(self, *, background: bool = False) -> None:
-        program_state = ProgramState(self.app_path)
+        program_state = ProgramState(self.app_path, watch_sources=self.concurrency.watch_sources)
         program_ir = program_state.program
         if program_ir is None:
             raise Namel3ssError("Program failed to load.")
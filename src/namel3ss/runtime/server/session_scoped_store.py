@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import re
 from copy import deepcopy
+from typing import Iterable
 
-from namel3ss.runtime.storage.base import RecordScope
+from namel3ss.runtime.storage.base import DEFAULT_PAGE_SIZE, RecordPage, RecordScope
+from namel3ss.runtime.storage.bulk import save_records, update_records
 from namel3ss.schema.records import RecordSchema
 
 
@@ -21,6 +23,10 @@ class SessionScopedStore:
         self._schema_cache: dict[str, RecordSchema] = {}
         self._state_checkpoint: dict | None = None
 
+    @property
+    def dialect(self) -> str | None:
+        return getattr(self._base_store, "dialect", None)
+
     def begin(self) -> None:
         self._state_checkpoint = deepcopy(self._state)
         self._base_store.begin()
@@ -38,17 +44,47 @@ class SessionScopedStore:
     def save(self, schema: RecordSchema, record: dict) -> dict:
         return self._base_store.save(self._scoped_schema(schema), record)
 
+    def save_many(self, schema: RecordSchema, records: list[dict]) -> list[dict]:
+        return save_records(self._base_store, self._scoped_schema(schema), records)
+
     def update(self, schema: RecordSchema, record: dict) -> dict:
         return self._base_store.update(self._scoped_schema(schema), record)
 
+    def update_many(self, schema: RecordSchema, records: list[dict]) -> list[dict]:
+        return update_records(self._base_store, self._scoped_schema(schema), records)
+
     def delete(self, schema: RecordSchema, record_id: object) -> bool:
         return self._base_store.delete(self._scoped_schema(schema), record_id)
 
     def find(self, schema: RecordSchema, predicate, scope: RecordScope | None = None) -> list[dict]:
         return self._base_store.find(self._scoped_schema(schema), predicate, scope=scope)
 
-    def list_records(self, schema: RecordSchema, limit: int = 20, scope: RecordScope | None = None) -> list[dict]:
-        return self._base_store.list_records(self._scoped_schema(schema), limit=limit, scope=scope)
+    def find_page(
+        self,
+        schema: RecordSchema,
+        predicate,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> RecordPage:
+        return self._base_store.find_page(
+            self._scoped_schema(schema),
+            predicate,
+            scope=scope,
+            after_id=after_id,
+            limit=limit,
+        )
+
+    def list_records(
+        self,
+        schema: RecordSchema,
+        limit: int = 20,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+    ) -> list[dict]:
+        return self._base_store.list_records(self._scoped_schema(schema), limit=limit, scope=scope, after_id=after_id)
 
     def check_unique(self, schema: RecordSchema, record: dict, scope: RecordScope | None = None) -> str | None:
         return self._base_store.check_unique(self._scoped_schema(schema), record, scope=scope)
@@ -56,11 +92,20 @@ class SessionScopedStore:
     def clear(self) -> None:
         self._state.clear()
 
-    def load_state(self) -> dict:
-        return deepcopy(self._state)
-
-    def save_state(self, state: dict) -> None:
-        self._state = deepcopy(state or {})
+    def load_state(self, keys: Iterable[str] | None = None) -> dict:
+        if keys is None:
+            return deepcopy(self._state)
+        return {key: deepcopy(self._state[key]) for key in dict.fromkeys(keys) if key in self._state}
+
+    def save_state(self, state: dict, *, keys: Iterable[str] | None = None) -> None:
+        if keys is None:
+            self._state = deepcopy(state or {})
+            return
+        for key in dict.fromkeys(keys):
+            if key in (state or {}):
+                self._state[key] = deepcopy(state[key])
+            else:
+                self._state.pop(key, None)
 
     def get_metadata(self):
         return self._base_store.get_metadata()
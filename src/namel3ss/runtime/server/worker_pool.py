@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from concurrent.futures import ProcessPoolExecutor, TimeoutError
+import logging
 import multiprocessing
 from pathlib import Path
 import threading
@@ -9,10 +10,17 @@ from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
 from namel3ss.lang.capabilities import normalize_builtin_capability
 from namel3ss.module_loader import load_project
+from namel3ss.module_loader.source_io import ParseCache
 from namel3ss.runtime.executor import execute_program_flow
+from namel3ss.runtime.router.program_state import compute_revision, read_revision
+from namel3ss.runtime.server.concurrency import compiled_cache_enabled
+from namel3ss.runtime.watch import SourceWatcher
 from namel3ss.ui.actions.dispatch import dispatch_ui_action
 
 
+_LOGGER = logging.getLogger(__name__)
+
+
 class ServiceActionWorkerPool:
     def __init__(self, *, app_path: Path, workers: int, ui_mode: str, diagnostics_enabled: bool = False) -> None:
         self.app_path = Path(app_path).resolve()
@@ -21,7 +29,7 @@ class ServiceActionWorkerPool:
         self.diagnostics_enabled = bool(diagnostics_enabled)
         self._lock = threading.RLock()
         self._pending = 0
-        self._executor = _create_executor(self.workers)
+        self._executor = self._start_executor()
 
     def run_action(self, action_id: str, payload: dict, *, timeout_seconds: float = 30.0) -> dict:
         future = self._submit(
@@ -89,12 +97,19 @@ class ServiceActionWorkerPool:
                 return
             self._executor.shutdown(wait=True, cancel_futures=True)
             self.workers = target
-            self._executor = _create_executor(self.workers)
+            self._executor = self._start_executor()
 
     def shutdown(self) -> None:
         with self._lock:
             self._executor.shutdown(wait=True, cancel_futures=True)
 
+    def _start_executor(self) -> ProcessPoolExecutor:
+        executor = _create_executor(self.workers, self.app_path.as_posix())
+        # One no-op task per worker spawns every process now, so each compiles before the first request.
+        for _ in range(self.workers):
+            executor.submit(_worker_ready)
+        return executor
+
     def _submit(self, fn, *args):
         with self._lock:
             self._pending += 1
@@ -123,9 +138,76 @@ class _WorkerFlowResult:
         self.yield_messages = yield_messages
 
 
-def _create_executor(workers: int) -> ProcessPoolExecutor:
+def _create_executor(workers: int, app_path: str) -> ProcessPoolExecutor:
     context = multiprocessing.get_context("spawn")
-    return ProcessPoolExecutor(max_workers=max(1, int(workers)), mp_context=context)
+    return ProcessPoolExecutor(
+        max_workers=max(1, int(workers)),
+        mp_context=context,
+        initializer=_warm_worker,
+        initargs=(app_path,),
+    )
+
+
+class _CompiledProgram:
+    """The lowered program for one app, kept for the life of a worker process.
+
+    A source watcher flags file changes; the program is rebuilt only when the
+    content revision of the project sources changes.
+    """
+
+    def __init__(self, app_path: Path) -> None:
+        self.app_path = app_path
+        self.program = None
+        self.revision = ""
+        self.parse_cache: ParseCache = {}
+        self._paths: list[Path] = []
+        self._watcher = SourceWatcher(app_path.parent)
+        self._watcher.start()
+        self._seen_revision = -1
+
+    def current(self):
+        seen = self._watcher.revision
+        if self.program is not None:
+            if seen == self._seen_revision:
+                return self.program
+            if read_revision(self._paths) == self.revision:
+                self._seen_revision = seen
+                return self.program
+        project = load_project(
+            self.app_path,
+            parse_cache=self.parse_cache,
+            compiled_cache=compiled_cache_enabled(app_path=self.app_path),
+        )
+        self.program = project.program
+        self.revision = compute_revision(project.sources)
+        self._paths = list(project.sources.keys())
+        self._watcher.track(self._paths)
+        self._seen_revision = seen
+        return self.program
+
+
+_compiled_programs: dict[Path, _CompiledProgram] = {}
+
+
+def _worker_program(app_path: str):
+    app_file = Path(app_path).resolve()
+    compiled = _compiled_programs.get(app_file)
+    if compiled is None:
+        compiled = _CompiledProgram(app_file)
+        _compiled_programs[app_file] = compiled
+    return compiled.current()
+
+
+def _warm_worker(app_path: str) -> None:
+    try:
+        _worker_program(app_path)
+    except Exception:
+        # Compile errors surface again on the first request; a failed initializer would break the pool.
+        _LOGGER.warning("Worker could not precompile %s", app_path, exc_info=True)
+
+
+def _worker_ready() -> bool:
+    return True
 
 
 def _run_action_worker(
@@ -135,11 +217,8 @@ def _run_action_worker(
     ui_mode: str,
     diagnostics_enabled: bool,
 ) -> dict:
-    app_file = Path(app_path).resolve()
-    source = app_file.read_text(encoding="utf-8")
-    project = load_project(app_file, source_overrides={app_file: source})
     response = dispatch_ui_action(
-        project.program,
+        _worker_program(app_path),
         action_id=action_id,
         payload=payload,
         ui_mode=ui_mode,
@@ -158,11 +237,8 @@ def _run_action_worker(
 
 
 def _run_flow_worker(app_path: str, flow_name: str, payload: dict, identity: dict, route_name: str) -> dict:
-    app_file = Path(app_path).resolve()
-    source = app_file.read_text(encoding="utf-8")
-    project = load_project(app_file, source_overrides={app_file: source})
     result = execute_program_flow(
-        project.program,
+        _worker_program(app_path),
         flow_name,
         input=dict(payload or {}),
         identity=dict(identity or {}),
@@ -2,34 +2,61 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Protocol
+from typing import Iterable, Protocol
 
 from namel3ss.runtime.storage.metadata import PersistenceMetadata
 
 from namel3ss.schema.records import RecordSchema
 
 
+DEFAULT_PAGE_SIZE = 500
+
+
 @dataclass(frozen=True)
 class RecordScope:
     tenant_value: str | None = None
     now: Decimal | None = None
 
 
+@dataclass(frozen=True)
+class RecordPage:
+    records: list[dict]
+    next_after_id: object | None = None
+
+
 class Storage(Protocol):
     def begin(self) -> None: ...
     def commit(self) -> None: ...
     def rollback(self) -> None: ...
 
     def save(self, schema: RecordSchema, record: dict) -> dict: ...
+    def save_many(self, schema: RecordSchema, records: list[dict]) -> list[dict]: ...
     def update(self, schema: RecordSchema, record: dict) -> dict: ...
+    def update_many(self, schema: RecordSchema, records: list[dict]) -> list[dict]: ...
     def delete(self, schema: RecordSchema, record_id: object) -> bool: ...
     def find(self, schema: RecordSchema, predicate, scope: RecordScope | None = None) -> list[dict]: ...
-    def list_records(self, schema: RecordSchema, limit: int = 20, scope: RecordScope | None = None) -> list[dict]: ...
+    def find_page(
+        self,
+        schema: RecordSchema,
+        predicate,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> RecordPage: ...
+    def list_records(
+        self,
+        schema: RecordSchema,
+        limit: int = 20,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+    ) -> list[dict]: ...
     def check_unique(
         self, schema: RecordSchema, record: dict, scope: RecordScope | None = None
     ) -> str | None: ...
     def clear(self) -> None: ...
 
-    def load_state(self) -> dict: ...
-    def save_state(self, state: dict) -> None: ...
+    def load_state(self, keys: Iterable[str] | None = None) -> dict: ...
+    def save_state(self, state: dict, *, keys: Iterable[str] | None = None) -> None: ...
     def get_metadata(self) -> PersistenceMetadata: ...
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from namel3ss.runtime.storage.base import Storage
+from namel3ss.schema.records import RecordSchema
+
+
+def save_records(store: Storage, schema: RecordSchema, records: list[dict]) -> list[dict]:
+    save_many = getattr(store, "save_many", None)
+    if callable(save_many):
+        return list(save_many(schema, records))
+    return [store.save(schema, record) for record in records]
+
+
+def update_records(store: Storage, schema: RecordSchema, records: list[dict]) -> list[dict]:
+    update_many = getattr(store, "update_many", None)
+    if callable(update_many):
+        return list(update_many(schema, records))
+    return [store.update(schema, record) for record in records]
+
+
+__all__ = ["save_records", "update_records"]
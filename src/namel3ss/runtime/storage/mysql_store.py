@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import json
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Dict, Iterable
 
 from namel3ss.errors.base import Namel3ssError
-from namel3ss.schema.records import EXPIRES_AT_FIELD, TENANT_KEY_FIELD, RecordSchema
+from namel3ss.schema.records import TENANT_KEY_FIELD, RecordSchema
 from namel3ss.runtime.data.mysql_backend import (
     mysql_missing_driver_message,
     normalize_mysql_error,
@@ -14,19 +14,24 @@ from namel3ss.runtime.data.mysql_backend import (
     redact_mysql_url,
 )
 from namel3ss.runtime.storage.metadata import PersistenceMetadata
-from namel3ss.runtime.store.memory_store import Contains
-from namel3ss.runtime.storage.base import RecordScope
-from namel3ss.runtime.storage.predicate import PredicatePlan
-from namel3ss.runtime.storage.sql_helpers import escape_like, slug_identifier
-from namel3ss.runtime.storage.state_codec import decode_state, encode_state
+from namel3ss.runtime.storage.mysql_queries import MySQLRecordQueryMixin
+from namel3ss.runtime.storage.mysql_writes import MySQLRecordWriteMixin
+from namel3ss.runtime.storage.sql_helpers import schema_fingerprint, slug_identifier
+from namel3ss.runtime.storage.state_entries import (
+    StateBaseline,
+    encode_state_value,
+    segment_key_prefixes,
+    split_state_document,
+    stored_state_entries,
+)
 from namel3ss.utils.json_tools import dumps as json_dumps
 from namel3ss.utils.numbers import decimal_is_int, is_number, to_decimal
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 
-class MySQLStore:
+class MySQLStore(MySQLRecordQueryMixin, MySQLRecordWriteMixin):
     def __init__(self, database_url: str) -> None:
         try:
             import pymysql
@@ -43,6 +48,9 @@ class MySQLStore:
         self.conn.autocommit(False)
         self._prepared_tables: set[str] = set()
         self._prepared_indexes: Dict[str, set[str]] = {}
+        self._statements: Dict[tuple, str] = {}
+        self._schema_fingerprints: Dict[str, tuple] = {}
+        self._state_baseline = StateBaseline()
         self._ensure_schema_version()
 
     def begin(self) -> None:
@@ -53,6 +61,8 @@ class MySQLStore:
 
     def rollback(self) -> None:
         self.conn.rollback()
+        # DDL issued inside the transaction may have been undone; prepare schemas again on next use.
+        self._schema_fingerprints.clear()
 
     def clear(self) -> None:
         tables = self._list_tables()
@@ -61,6 +71,9 @@ class MySQLStore:
         self.conn.commit()
         self._prepared_tables.clear()
         self._prepared_indexes.clear()
+        self._statements.clear()
+        self._schema_fingerprints.clear()
+        self._state_baseline.clear()
         self._ensure_schema_version()
 
     def _ensure_schema_version(self) -> None:
@@ -75,21 +88,47 @@ class MySQLStore:
             raise Namel3ssError(
                 f"Unsupported schema version {row['version']} in MySQL store. Expected {SCHEMA_VERSION}."
             )
+        self._create_state_entries()
+        self.conn.commit()
+
+    def _create_state_entries(self) -> None:
         self._execute(
-            "CREATE TABLE IF NOT EXISTS app_state (id INTEGER PRIMARY KEY, payload LONGTEXT NOT NULL)"
+            "CREATE TABLE IF NOT EXISTS app_state_entries ("
+            "state_key VARCHAR(255) PRIMARY KEY, payload LONGTEXT NOT NULL, revision BIGINT NOT NULL, ordinal INTEGER NOT NULL)"
         )
-        self.conn.commit()
 
     def _migrate(self, current_version: int) -> None:
         if current_version < 1 or current_version > SCHEMA_VERSION:
             raise Namel3ssError(
                 f"Cannot migrate unknown schema version {current_version} (target {SCHEMA_VERSION})."
             )
+        if current_version == 1:
+            self._migrate_v1_to_v2()
         self._execute("UPDATE schema_version SET version = %s", (SCHEMA_VERSION,))
         self.conn.commit()
 
+    def _migrate_v1_to_v2(self) -> None:
+        # The single app_state document is the v1 source of truth; split it into one row per key.
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS app_state (id INTEGER PRIMARY KEY, payload LONGTEXT NOT NULL)"
+        )
+        self._create_state_entries()
+        row = self._fetchone("SELECT payload FROM app_state WHERE id = 1")
+        if row is None:
+            return
+        values = split_state_document(row["payload"])
+        self._execute("DELETE FROM app_state_entries")
+        self._executemany(
+            "INSERT INTO app_state_entries (state_key, payload, revision, ordinal) VALUES (%s, %s, 1, %s)",
+            [(str(key), encode_state_value(value), ordinal) for ordinal, (key, value) in enumerate(values.items())],
+        )
+        self._execute("DELETE FROM app_state WHERE id = 1")
+
     def _ensure_table(self, schema: RecordSchema) -> None:
         table = slug_identifier(schema.name)
+        fingerprint = schema_fingerprint(schema)
+        if self._schema_fingerprints.get(table) == fingerprint:
+            return
         if table not in self._prepared_tables:
             id_col = "id" if "id" in schema.field_map else "_id"
             columns = [f"{quote_mysql_identifier(id_col)} BIGINT PRIMARY KEY AUTO_INCREMENT"]
@@ -103,6 +142,7 @@ class MySQLStore:
             self._prepared_tables.add(table)
         self._ensure_columns(schema)
         self._ensure_indexes(schema)
+        self._schema_fingerprints[table] = fingerprint
         self.conn.commit()
 
     def _ensure_columns(self, schema: RecordSchema) -> None:
@@ -225,221 +265,32 @@ class MySQLStore:
             data[id_col] = row[id_col]
         return data
 
-    def save(self, schema: RecordSchema, record: dict) -> dict:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        col_names = []
-        values = []
-        for field in schema.storage_fields():
-            if field.name == id_col:
-                continue
-            col_names.append(quote_mysql_identifier(slug_identifier(field.name)))
-            values.append(self._serialize_value(field.type_name, record.get(field.name)))
-        columns_clause = ", ".join(col_names)
-        placeholders = ", ".join(["%s"] * len(values))
-        stmt = f"INSERT INTO {quote_mysql_identifier(slug_identifier(schema.name))} ({columns_clause}) VALUES ({placeholders})"
-        cursor = self._execute(stmt, values)
-        rec = dict(record)
-        rec[id_col] = cursor.lastrowid
-        cursor.close()
-        if not self.conn.get_autocommit():
-            self.conn.commit()
-        return rec
-
-    def update(self, schema: RecordSchema, record: dict) -> dict:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        if id_col not in record:
-            raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
-        assignments = []
-        values = []
-        for field in schema.fields:
-            if field.name == id_col:
-                continue
-            assignments.append(f"{quote_mysql_identifier(slug_identifier(field.name))} = %s")
-            values.append(self._serialize_value(field.type_name, record.get(field.name)))
-        values.append(record[id_col])
-        stmt = (
-            f"UPDATE {quote_mysql_identifier(slug_identifier(schema.name))} SET {', '.join(assignments)} "
-            f"WHERE {quote_mysql_identifier(id_col)} = %s"
-        )
-        cursor = self._execute(stmt, values)
-        if cursor.rowcount == 0:
-            cursor.close()
-            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
-        cursor.close()
-        if not self.conn.get_autocommit():
-            self.conn.commit()
-        return record
-
-    def delete(self, schema: RecordSchema, record_id: object) -> bool:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        stmt = f"DELETE FROM {quote_mysql_identifier(slug_identifier(schema.name))} WHERE {quote_mysql_identifier(id_col)} = %s"
-        cursor = self._execute(stmt, [record_id])
-        deleted = cursor.rowcount > 0
-        cursor.close()
-        if not self.conn.get_autocommit():
-            self.conn.commit()
-        return deleted
-
-    def find(self, schema: RecordSchema, predicate, scope: RecordScope | None = None) -> List[dict]:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        if isinstance(predicate, PredicatePlan):
-            if predicate.sql:
-                scope_clause, scope_params = self._scope_where(schema, scope)
-                clauses = [clause for clause in [scope_clause, predicate.sql.clause] if clause]
-                sql = f"SELECT * FROM {quote_mysql_identifier(slug_identifier(schema.name))}"
-                if clauses:
-                    sql += " WHERE " + " AND ".join(clauses)
-                sql += f" ORDER BY {quote_mysql_identifier(id_col)} ASC"
-                rows = self._fetchall(sql, [*scope_params, *predicate.sql.params])
-                return [self._deserialize_row(schema, row) for row in rows]
-            predicate = predicate.predicate
-        if isinstance(predicate, dict):
-            return self._find_by_filters(schema, predicate, scope)
-        where_clause, params = self._scope_where(schema, scope)
-        sql = f"SELECT * FROM {quote_mysql_identifier(slug_identifier(schema.name))}"
-        if where_clause:
-            sql += f" WHERE {where_clause}"
-        sql += f" ORDER BY {quote_mysql_identifier(id_col)} ASC"
-        rows = self._fetchall(sql, params)
-        results: List[dict] = []
-        for row in rows:
-            rec = self._deserialize_row(schema, row)
-            if predicate(rec):
-                results.append(rec)
-        return results
-
-    def list_records(self, schema: RecordSchema, limit: int = 20, scope: RecordScope | None = None) -> List[dict]:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        where_clause, params = self._scope_where(schema, scope)
-        sql = (
-            f"SELECT * FROM {quote_mysql_identifier(slug_identifier(schema.name))} "
-            f"ORDER BY {quote_mysql_identifier(id_col)} ASC LIMIT %s"
-        )
-        params = list(params) + [limit]
-        if where_clause:
-            sql = (
-                f"SELECT * FROM {quote_mysql_identifier(slug_identifier(schema.name))} "
-                f"WHERE {where_clause} ORDER BY {quote_mysql_identifier(id_col)} ASC LIMIT %s"
+    def load_state(self, keys: Iterable[str] | None = None) -> dict:
+        sql = "SELECT state_key, payload, revision FROM app_state_entries"
+        params: list[str] = []
+        if keys is not None:
+            params = [str(key) for key in dict.fromkeys(keys)]
+            if not params:
+                return {}
+            prefixes = segment_key_prefixes(params)
+            sql += f" WHERE state_key IN ({', '.join('%s' for _ in params)})"
+            sql += "".join(" OR state_key LIKE %s" for _ in prefixes)
+            params += [f"{prefix}%" for prefix in prefixes]
+        return self._state_baseline.restore(self._fetchall(f"{sql} ORDER BY ordinal, state_key", params))
+
+    def save_state(self, state: dict, *, keys: Iterable[str] | None = None) -> None:
+        rows = self._fetchall("SELECT state_key, revision, ordinal FROM app_state_entries")
+        plan = self._state_baseline.plan(state, stored_state_entries(rows), keys=keys)
+        if plan.writes:
+            self._executemany(
+                "INSERT INTO app_state_entries (state_key, payload, revision, ordinal) VALUES (%s, %s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE payload = VALUES(payload), revision = revision + 1",
+                [(write.key, write.payload, write.revision, write.ordinal) for write in plan.writes],
             )
-        rows = self._fetchall(sql, params)
-        return [self._deserialize_row(schema, row) for row in rows]
-
-    def check_unique(self, schema: RecordSchema, record: dict, scope: RecordScope | None = None) -> str | None:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        tenant_value = record.get(TENANT_KEY_FIELD)
-        for field in schema.unique_fields:
-            val = record.get(field)
-            if val is None:
-                continue
-            col = slug_identifier(field)
-            clauses = [f"{quote_mysql_identifier(col)} = %s"]
-            params = [self._serialize_value(schema.field_map[field].type_name, val)]
-            if schema.tenant_key:
-                tenant_col = slug_identifier(TENANT_KEY_FIELD)
-                clauses.append(f"{quote_mysql_identifier(tenant_col)} = %s")
-                params.append(tenant_value)
-            ttl_clause, ttl_params = self._ttl_clause(schema, scope)
-            if ttl_clause:
-                clauses.append(ttl_clause)
-                params.extend(ttl_params)
-            where_clause = " AND ".join(clauses)
-            rows = self._fetchall(
-                f"SELECT 1 FROM {quote_mysql_identifier(slug_identifier(schema.name))} WHERE {where_clause} LIMIT 1",
-                params,
-            )
-            if rows:
-                return field
-        return None
-
-    def _find_by_filters(self, schema: RecordSchema, filters: dict[str, Any], scope: RecordScope) -> List[dict]:
-        scope_clause, scope_params = self._scope_where(schema, scope)
-        where_clause, params = self._build_where_clause(schema, filters)
-        table = quote_mysql_identifier(slug_identifier(schema.name))
-        id_col = "id" if "id" in schema.field_map else "_id"
-        clauses = [clause for clause in [scope_clause, where_clause] if clause]
-        sql = f"SELECT * FROM {table}"
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
-        sql += f" ORDER BY {quote_mysql_identifier(id_col)} ASC"
-        rows = self._fetchall(sql, [*scope_params, *params])
-        return [self._deserialize_row(schema, row) for row in rows]
-
-    def _build_where_clause(self, schema: RecordSchema, filters: dict[str, Any]) -> tuple[str, list[Any]]:
-        parts: list[str] = []
-        params: list[Any] = []
-        for field, expected in filters.items():
-            col = slug_identifier(field)
-            field_schema = schema.field_map.get(field)
-            if field_schema is None:
-                raise Namel3ssError(f"Unknown field '{field}' for record '{schema.name}'")
-            if isinstance(expected, Contains):
-                parts.append(f"{quote_mysql_identifier(col)} LIKE %s ESCAPE '\\\\'")
-                params.append(f"%{escape_like(expected.value)}%")
-                continue
-            parts.append(f"{quote_mysql_identifier(col)} = %s")
-            params.append(self._serialize_value(field_schema.type_name if field_schema else "text", expected))
-        return " AND ".join(parts), params
-
-    def _scope_where(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
-        clauses: list[str] = []
-        params: list[Any] = []
-        if schema.tenant_key and scope.tenant_value is not None:
-            tenant_col = slug_identifier(TENANT_KEY_FIELD)
-            clauses.append(f"{quote_mysql_identifier(tenant_col)} = %s")
-            params.append(scope.tenant_value)
-        ttl_clause, ttl_params = self._ttl_clause(schema, scope)
-        if ttl_clause:
-            clauses.append(ttl_clause)
-            params.extend(ttl_params)
-        return " AND ".join(clauses), params
-
-    def _ttl_clause(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
-        if schema.ttl_hours is None or scope.now is None:
-            return "", []
-        col = quote_mysql_identifier(slug_identifier(EXPIRES_AT_FIELD))
-        return f"{col} IS NOT NULL AND {col} > %s", [scope.now]
-
-    def _cleanup_expired(self, schema: RecordSchema, scope: RecordScope) -> None:
-        if schema.ttl_hours is None or scope.now is None:
-            return
-        table = quote_mysql_identifier(slug_identifier(schema.name))
-        col = quote_mysql_identifier(slug_identifier(EXPIRES_AT_FIELD))
-        self._execute(
-            f"DELETE FROM {table} WHERE {col} IS NULL OR {col} <= %s",
-            (scope.now,),
-        )
-        if not self.conn.get_autocommit():
-            self.conn.commit()
-
-    def load_state(self) -> dict:
-        row = self._fetchone("SELECT payload FROM app_state WHERE id = 1")
-        if row is None:
-            return {}
-        try:
-            decoded = json.loads(row["payload"])
-            return decode_state(decoded)
-        except Exception:
-            return {}
-
-    def save_state(self, state: dict) -> None:
-        payload = json.dumps(encode_state(state))
-        self._execute(
-            "INSERT INTO app_state (id, payload) VALUES (1, %s) "
-            "ON DUPLICATE KEY UPDATE payload = VALUES(payload)",
-            (payload,),
-        )
+        if plan.deletes:
+            self._executemany("DELETE FROM app_state_entries WHERE state_key = %s", [(key,) for key in plan.deletes])
         self.conn.commit()
+        self._state_baseline.apply(plan)
 
     def close(self) -> None:
         try:
@@ -486,4 +337,17 @@ class MySQLStore:
             message = normalize_mysql_error(err)
             raise Namel3ssError(message) from err
 
+    def _executemany(self, sql: str, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        cursor = self.conn.cursor()
+        try:
+            cursor.executemany(sql, rows)
+        except Exception as err:
+            message = normalize_mysql_error(err)
+            raise Namel3ssError(message) from err
+        finally:
+            cursor.close()
+
+
 __all__ = ["MySQLStore", "SCHEMA_VERSION"]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import List
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.schema.records import RecordSchema
+from namel3ss.runtime.data.mysql_backend import normalize_mysql_error, quote_mysql_identifier
+from namel3ss.runtime.storage.sql_helpers import field_signature, slug_identifier
+
+
+class MySQLRecordWriteMixin:
+    def save(self, schema: RecordSchema, record: dict) -> dict:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        cursor = self._execute(self._insert_statement(schema), self._insert_values(schema, record))
+        rec = dict(record)
+        rec[id_col] = cursor.lastrowid
+        cursor.close()
+        if not self.conn.get_autocommit():
+            self.conn.commit()
+        return rec
+
+    def save_many(self, schema: RecordSchema, records: list[dict]) -> List[dict]:
+        records = list(records)
+        if not records:
+            return []
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        sql = self._insert_statement(schema)
+        saved: List[dict] = []
+        cursor = self.conn.cursor()
+        try:
+            # Row-at-a-time on one cursor: lastrowid is the only portable id source across batch rewrites.
+            for record in records:
+                cursor.execute(sql, self._insert_values(schema, record))
+                rec = dict(record)
+                rec[id_col] = cursor.lastrowid
+                saved.append(rec)
+        except Exception as err:
+            if not self.conn.get_autocommit():
+                self.conn.rollback()
+            raise Namel3ssError(normalize_mysql_error(err)) from err
+        finally:
+            cursor.close()
+        if not self.conn.get_autocommit():
+            self.conn.commit()
+        return saved
+
+    def update(self, schema: RecordSchema, record: dict) -> dict:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        if id_col not in record:
+            raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
+        cursor = self._execute(self._update_statement(schema), self._update_values(schema, record))
+        if cursor.rowcount == 0:
+            cursor.close()
+            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
+        cursor.close()
+        if not self.conn.get_autocommit():
+            self.conn.commit()
+        return record
+
+    def update_many(self, schema: RecordSchema, records: list[dict]) -> List[dict]:
+        records = list(records)
+        if not records:
+            return []
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        for record in records:
+            if id_col not in record:
+                raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
+        sql = self._update_statement(schema)
+        cursor = self.conn.cursor()
+        try:
+            for record in records:
+                try:
+                    cursor.execute(sql, self._update_values(schema, record))
+                except Exception as err:
+                    raise Namel3ssError(normalize_mysql_error(err)) from err
+                if cursor.rowcount == 0:
+                    raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
+        except Namel3ssError:
+            if not self.conn.get_autocommit():
+                self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        if not self.conn.get_autocommit():
+            self.conn.commit()
+        return records
+
+    def _insert_statement(self, schema: RecordSchema) -> str:
+        key = ("insert", schema.name, field_signature(schema.storage_fields()))
+        cached = self._statements.get(key)
+        if cached is not None:
+            return cached
+        id_col = "id" if "id" in schema.field_map else "_id"
+        col_names = [
+            quote_mysql_identifier(slug_identifier(field.name))
+            for field in schema.storage_fields()
+            if field.name != id_col
+        ]
+        placeholders = ", ".join(["%s"] * len(col_names))
+        stmt = (
+            f"INSERT INTO {quote_mysql_identifier(slug_identifier(schema.name))} "
+            f"({', '.join(col_names)}) VALUES ({placeholders})"
+        )
+        self._statements[key] = stmt
+        return stmt
+
+    def _insert_values(self, schema: RecordSchema, record: dict) -> list:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        return [
+            self._serialize_value(field.type_name, record.get(field.name))
+            for field in schema.storage_fields()
+            if field.name != id_col
+        ]
+
+    def _update_statement(self, schema: RecordSchema) -> str:
+        key = ("update", schema.name, field_signature(schema.fields))
+        cached = self._statements.get(key)
+        if cached is not None:
+            return cached
+        id_col = "id" if "id" in schema.field_map else "_id"
+        assignments = [
+            f"{quote_mysql_identifier(slug_identifier(field.name))} = %s"
+            for field in schema.fields
+            if field.name != id_col
+        ]
+        stmt = (
+            f"UPDATE {quote_mysql_identifier(slug_identifier(schema.name))} SET {', '.join(assignments)} "
+            f"WHERE {quote_mysql_identifier(id_col)} = %s"
+        )
+        self._statements[key] = stmt
+        return stmt
+
+    def _update_values(self, schema: RecordSchema, record: dict) -> list:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        values = [
+            self._serialize_value(field.type_name, record.get(field.name))
+            for field in schema.fields
+            if field.name != id_col
+        ]
+        values.append(record[id_col])
+        return values
+
+    def delete(self, schema: RecordSchema, record_id: object) -> bool:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        stmt = f"DELETE FROM {quote_mysql_identifier(slug_identifier(schema.name))} WHERE {quote_mysql_identifier(id_col)} = %s"
+        cursor = self._execute(stmt, [record_id])
+        deleted = cursor.rowcount > 0
+        cursor.close()
+        if not self.conn.get_autocommit():
+            self.conn.commit()
+        return deleted
+
+
+__all__ = ["MySQLRecordWriteMixin"]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Callable, Iterator
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.storage.base import DEFAULT_PAGE_SIZE, RecordPage, RecordScope, Storage
+from namel3ss.schema.records import RecordSchema
+
+
+def collect_page(
+    fetch_rows: Callable[[object | None, int], list[dict]],
+    *,
+    id_field: str,
+    after_id: object | None,
+    limit: int,
+    row_filter: Callable[[dict], bool] | None = None,
+) -> RecordPage:
+    """Fill one keyset page from rows fetched in ascending id order.
+
+    ``fetch_rows(after_id, count)`` returns at most ``count`` rows whose id is
+    greater than ``after_id``. Rows rejected by ``row_filter`` are skipped and
+    scanning resumes after the last id seen, so no query ever loads the table.
+    """
+    limit = _require_limit(limit)
+    records: list[dict] = []
+    cursor = after_id
+    while True:
+        rows = fetch_rows(cursor, limit)
+        for row in rows:
+            cursor = row.get(id_field)
+            if row_filter is not None and not row_filter(row):
+                continue
+            records.append(row)
+            if len(records) >= limit:
+                return RecordPage(records=records, next_after_id=cursor)
+        if len(rows) < limit:
+            return RecordPage(records=records, next_after_id=None)
+
+
+def iter_record_pages(
+    store: Storage,
+    schema: RecordSchema,
+    predicate,
+    scope: RecordScope | None = None,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[list[dict]]:
+    page_size = _require_limit(page_size)
+    find_page = getattr(store, "find_page", None)
+    if getattr(store, "dialect", None) is None or not callable(find_page):
+        # In-memory stores already hold every row, so a single pass is cheapest.
+        records = store.find(schema, predicate, scope=scope)
+        for start in range(0, len(records), page_size):
+            yield records[start : start + page_size]
+        return
+    after_id = None
+    while True:
+        page = find_page(schema, predicate, scope, after_id=after_id, limit=page_size)
+        if page.records:
+            yield list(page.records)
+        if page.next_after_id is None:
+            return
+        after_id = page.next_after_id
+
+
+def iter_records(
+    store: Storage,
+    schema: RecordSchema,
+    predicate,
+    scope: RecordScope | None = None,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[dict]:
+    for page in iter_record_pages(store, schema, predicate, scope, page_size=page_size):
+        yield from page
+
+
+def _require_limit(limit: int) -> int:
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        raise Namel3ssError("Record page limit must be a positive integer")
+    return limit
+
+
+__all__ = ["collect_page", "iter_record_pages", "iter_records"]
@@ -2,27 +2,31 @@ from __future__ import annotations
 
 import json
 from decimal import Decimal
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Dict, Iterable
 from urllib.parse import urlsplit, urlunsplit
 
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.errors.guidance import build_guidance_message
-from namel3ss.schema.records import EXPIRES_AT_FIELD, TENANT_KEY_FIELD, RecordSchema
+from namel3ss.schema.records import TENANT_KEY_FIELD, RecordSchema
 from namel3ss.runtime.storage.metadata import PersistenceMetadata
-from namel3ss.runtime.store.memory_store import Contains
-from namel3ss.runtime.storage.state_codec import decode_state, encode_state
-from namel3ss.runtime.storage.base import RecordScope
-from namel3ss.runtime.storage.predicate import PredicatePlan
-from namel3ss.runtime.storage.sql_helpers import escape_like, quote_identifier, slug_identifier
+from namel3ss.runtime.storage.postgres_queries import PostgresRecordQueryMixin
+from namel3ss.runtime.storage.postgres_writes import PostgresRecordWriteMixin
+from namel3ss.runtime.storage.sql_helpers import quote_identifier, schema_fingerprint, slug_identifier
+from namel3ss.runtime.storage.state_entries import (
+    StateBaseline,
+    encode_state_value,
+    segment_key_prefixes,
+    split_state_document,
+    stored_state_entries,
+)
 from namel3ss.utils.json_tools import dumps as json_dumps
 from namel3ss.utils.numbers import decimal_is_int, is_number, to_decimal
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 
-class PostgresStore:
+class PostgresStore(PostgresRecordQueryMixin, PostgresRecordWriteMixin):
     def __init__(self, database_url: str) -> None:
         try:
             import psycopg
@@ -38,6 +42,9 @@ class PostgresStore:
         self.database_url = database_url
         self._prepared_tables: set[str] = set()
         self._prepared_indexes: Dict[str, set[str]] = {}
+        self._statements: Dict[tuple, str] = {}
+        self._schema_fingerprints: Dict[str, tuple] = {}
+        self._state_baseline = StateBaseline()
         self._apply_settings()
         self._ensure_schema_version()
 
@@ -49,6 +56,8 @@ class PostgresStore:
 
     def rollback(self) -> None:
         self.conn.rollback()
+        # DDL issued inside the transaction may have been undone; prepare schemas again on next use.
+        self._schema_fingerprints.clear()
 
     def clear(self) -> None:
         tables = self._list_tables()
@@ -57,6 +66,9 @@ class PostgresStore:
         self.conn.commit()
         self._prepared_tables.clear()
         self._prepared_indexes.clear()
+        self._statements.clear()
+        self._schema_fingerprints.clear()
+        self._state_baseline.clear()
         self._ensure_schema_version()
 
     def _apply_settings(self) -> None:
@@ -77,21 +89,47 @@ class PostgresStore:
             raise Namel3ssError(
                 f"Unsupported schema version {row['version']} in Postgres store. Expected {SCHEMA_VERSION}."
             )
+        self._create_state_entries()
+        self.conn.commit()
+
+    def _create_state_entries(self) -> None:
         self.conn.execute(
-            "CREATE TABLE IF NOT EXISTS app_state (id INTEGER PRIMARY KEY CHECK (id = 1), payload TEXT NOT NULL)"
+            "CREATE TABLE IF NOT EXISTS app_state_entries ("
+            "state_key TEXT PRIMARY KEY, payload TEXT NOT NULL, revision BIGINT NOT NULL, ordinal INTEGER NOT NULL)"
         )
-        self.conn.commit()
 
     def _migrate(self, current_version: int) -> None:
         if current_version < 1 or current_version > SCHEMA_VERSION:
             raise Namel3ssError(
                 f"Cannot migrate unknown schema version {current_version} (target {SCHEMA_VERSION})."
             )
+        if current_version == 1:
+            self._migrate_v1_to_v2()
         self.conn.execute("UPDATE schema_version SET version = %s", (SCHEMA_VERSION,))
         self.conn.commit()
 
+    def _migrate_v1_to_v2(self) -> None:
+        # The single app_state document is the v1 source of truth; split it into one row per key.
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS app_state (id INTEGER PRIMARY KEY CHECK (id = 1), payload TEXT NOT NULL)"
+        )
+        self._create_state_entries()
+        row = self.conn.execute("SELECT payload FROM app_state WHERE id = 1").fetchone()
+        if row is None:
+            return
+        values = split_state_document(row["payload"])
+        self.conn.execute("DELETE FROM app_state_entries")
+        self.conn.cursor().executemany(
+            "INSERT INTO app_state_entries (state_key, payload, revision, ordinal) VALUES (%s, %s, 1, %s)",
+            [(str(key), encode_state_value(value), ordinal) for ordinal, (key, value) in enumerate(values.items())],
+        )
+        self.conn.execute("DELETE FROM app_state WHERE id = 1")
+
     def _ensure_table(self, schema: RecordSchema) -> None:
         table = slug_identifier(schema.name)
+        fingerprint = schema_fingerprint(schema)
+        if self._schema_fingerprints.get(table) == fingerprint:
+            return
         if table not in self._prepared_tables:
             id_col = "id" if "id" in schema.field_map else "_id"
             columns = [f"{quote_identifier(id_col)} BIGSERIAL PRIMARY KEY"]
@@ -106,6 +144,7 @@ class PostgresStore:
             self._prepared_tables.add(table)
         self._ensure_columns(schema)
         self._ensure_indexes(schema)
+        self._schema_fingerprints[table] = fingerprint
         self.conn.commit()
 
     def _ensure_columns(self, schema: RecordSchema) -> None:
@@ -229,228 +268,35 @@ class PostgresStore:
             data[id_col] = row[id_col]
         return data
 
-    def save(self, schema: RecordSchema, record: dict) -> dict:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        col_names = []
-        values = []
-        for field in schema.storage_fields():
-            if field.name == id_col:
-                continue
-            col_names.append(quote_identifier(slug_identifier(field.name)))
-            values.append(self._serialize_value(field.type_name, record.get(field.name)))
-        columns_clause = ", ".join(col_names)
-        placeholders = ", ".join(["%s"] * len(values))
-        stmt = (
-            f"INSERT INTO {quote_identifier(slug_identifier(schema.name))} ({columns_clause}) "
-            f"VALUES ({placeholders}) RETURNING {quote_identifier(id_col)}"
-        )
-        try:
-            cursor = self.conn.execute(stmt, values)
-        except Exception as err:
-            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
-        rec = dict(record)
-        row = cursor.fetchone()
-        if row is not None:
-            rec[id_col] = row[id_col]
-        if not self.conn.autocommit:
-            self.conn.commit()
-        return rec
-
-    def update(self, schema: RecordSchema, record: dict) -> dict:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        if id_col not in record:
-            raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
-        assignments = []
-        values = []
-        for field in schema.fields:
-            if field.name == id_col:
-                continue
-            assignments.append(f"{quote_identifier(slug_identifier(field.name))} = %s")
-            values.append(self._serialize_value(field.type_name, record.get(field.name)))
-        values.append(record[id_col])
-        stmt = (
-            f"UPDATE {quote_identifier(slug_identifier(schema.name))} SET {', '.join(assignments)} "
-            f"WHERE {quote_identifier(id_col)} = %s"
-        )
-        try:
-            cursor = self.conn.execute(stmt, values)
-        except Exception as err:
-            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
-        if cursor.rowcount == 0:
-            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
-        if not self.conn.autocommit:
-            self.conn.commit()
-        return record
-
-    def delete(self, schema: RecordSchema, record_id: object) -> bool:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        stmt = f"DELETE FROM {quote_identifier(slug_identifier(schema.name))} WHERE {quote_identifier(id_col)} = %s"
-        cursor = self.conn.execute(stmt, [record_id])
-        if not self.conn.autocommit:
-            self.conn.commit()
-        return cursor.rowcount > 0
-
-    def find(self, schema: RecordSchema, predicate, scope: RecordScope | None = None) -> List[dict]:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        if isinstance(predicate, PredicatePlan):
-            if predicate.sql:
-                scope_clause, scope_params = self._scope_where(schema, scope)
-                clauses = [clause for clause in [scope_clause, predicate.sql.clause] if clause]
-                sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
-                if clauses:
-                    sql += " WHERE " + " AND ".join(clauses)
-                sql += f" ORDER BY {quote_identifier(id_col)} ASC"
-                cursor = self.conn.execute(sql, [*scope_params, *predicate.sql.params])
-                return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
-            predicate = predicate.predicate
-        if isinstance(predicate, dict):
-            return self._find_by_filters(schema, predicate, scope)
-        where_clause, params = self._scope_where(schema, scope)
-        sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
-        if where_clause:
-            sql += f" WHERE {where_clause}"
-        sql += f" ORDER BY {quote_identifier(id_col)} ASC"
-        cursor = self.conn.execute(sql, params)
-        rows = cursor.fetchall()
-        results: List[dict] = []
-        for row in rows:
-            rec = self._deserialize_row(schema, row)
-            if predicate(rec):
-                results.append(rec)
-        return results
-
-    def list_records(self, schema: RecordSchema, limit: int = 20, scope: RecordScope | None = None) -> List[dict]:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        where_clause, params = self._scope_where(schema, scope)
-        sql = (
-            f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))} "
-            f"ORDER BY {quote_identifier(id_col)} ASC LIMIT %s"
-        )
-        params = list(params) + [limit]
-        if where_clause:
-            sql = (
-                f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))} "
-                f"WHERE {where_clause} ORDER BY {quote_identifier(id_col)} ASC LIMIT %s"
-            )
-        cursor = self.conn.execute(sql, params)
-        return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
-
-    def check_unique(self, schema: RecordSchema, record: dict, scope: RecordScope | None = None) -> str | None:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        tenant_value = record.get(TENANT_KEY_FIELD)
-        for field in schema.unique_fields:
-            val = record.get(field)
-            if val is None:
-                continue
-            col = slug_identifier(field)
-            clauses = [f"{quote_identifier(col)} = %s"]
-            params = [self._serialize_value(schema.field_map[field].type_name, val)]
-            if schema.tenant_key:
-                tenant_col = slug_identifier(TENANT_KEY_FIELD)
-                clauses.append(f"{quote_identifier(tenant_col)} = %s")
-                params.append(tenant_value)
-            ttl_clause, ttl_params = self._ttl_clause(schema, scope)
-            if ttl_clause:
-                clauses.append(ttl_clause)
-                params.extend(ttl_params)
-            where_clause = " AND ".join(clauses)
-            cursor = self.conn.execute(
-                f"SELECT 1 FROM {quote_identifier(slug_identifier(schema.name))} WHERE {where_clause} LIMIT 1",
-                params,
+    def load_state(self, keys: Iterable[str] | None = None) -> dict:
+        sql = "SELECT state_key, payload, revision FROM app_state_entries"
+        params: list[object] | None = None
+        if keys is not None:
+            names = [str(key) for key in dict.fromkeys(keys)]
+            if not names:
+                return {}
+            prefixes = segment_key_prefixes(names)
+            sql += " WHERE state_key = ANY(%s)"
+            sql += "".join(" OR state_key LIKE %s" for _ in prefixes)
+            params = [names, *(f"{prefix}%" for prefix in prefixes)]
+        rows = self.conn.execute(f"{sql} ORDER BY ordinal, state_key", params)
+        return self._state_baseline.restore(rows.fetchall())
+
+    def save_state(self, state: dict, *, keys: Iterable[str] | None = None) -> None:
+        rows = self.conn.execute("SELECT state_key, revision, ordinal FROM app_state_entries").fetchall()
+        plan = self._state_baseline.plan(state, stored_state_entries(rows), keys=keys)
+        cursor = self.conn.cursor()
+        if plan.writes:
+            cursor.executemany(
+                "INSERT INTO app_state_entries (state_key, payload, revision, ordinal) VALUES (%s, %s, %s, %s) "
+                "ON CONFLICT (state_key) DO UPDATE SET payload = EXCLUDED.payload, "
+                "revision = app_state_entries.revision + 1",
+                [(write.key, write.payload, write.revision, write.ordinal) for write in plan.writes],
             )
-            if cursor.fetchone():
-                return field
-        return None
-
-    def _find_by_filters(self, schema: RecordSchema, filters: dict[str, Any], scope: RecordScope) -> List[dict]:
-        scope_clause, scope_params = self._scope_where(schema, scope)
-        where_clause, params = self._build_where_clause(schema, filters)
-        table = quote_identifier(slug_identifier(schema.name))
-        id_col = "id" if "id" in schema.field_map else "_id"
-        clauses = [clause for clause in [scope_clause, where_clause] if clause]
-        sql = f"SELECT * FROM {table}"
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
-        sql += f" ORDER BY {quote_identifier(id_col)} ASC"
-        cursor = self.conn.execute(sql, [*scope_params, *params])
-        return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
-
-    def _build_where_clause(self, schema: RecordSchema, filters: dict[str, Any]) -> tuple[str, list[Any]]:
-        parts: list[str] = []
-        params: list[Any] = []
-        for field, expected in filters.items():
-            col = slug_identifier(field)
-            field_schema = schema.field_map.get(field)
-            if field_schema is None:
-                raise Namel3ssError(f"Unknown field '{field}' for record '{schema.name}'")
-            if isinstance(expected, Contains):
-                parts.append(f"{quote_identifier(col)} LIKE %s ESCAPE '\\\\'")
-                params.append(f"%{escape_like(expected.value)}%")
-                continue
-            parts.append(f"{quote_identifier(col)} = %s")
-            params.append(self._serialize_value(field_schema.type_name if field_schema else "text", expected))
-        return " AND ".join(parts), params
-
-    def _scope_where(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
-        clauses: list[str] = []
-        params: list[Any] = []
-        if schema.tenant_key and scope.tenant_value is not None:
-            tenant_col = slug_identifier(TENANT_KEY_FIELD)
-            clauses.append(f"{quote_identifier(tenant_col)} = %s")
-            params.append(scope.tenant_value)
-        ttl_clause, ttl_params = self._ttl_clause(schema, scope)
-        if ttl_clause:
-            clauses.append(ttl_clause)
-            params.extend(ttl_params)
-        return " AND ".join(clauses), params
-
-    def _ttl_clause(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
-        if schema.ttl_hours is None or scope.now is None:
-            return "", []
-        col = quote_identifier(slug_identifier(EXPIRES_AT_FIELD))
-        return f"{col} IS NOT NULL AND {col} > %s", [scope.now]
-
-    def _cleanup_expired(self, schema: RecordSchema, scope: RecordScope) -> None:
-        if schema.ttl_hours is None or scope.now is None:
-            return
-        table = quote_identifier(slug_identifier(schema.name))
-        col = quote_identifier(slug_identifier(EXPIRES_AT_FIELD))
-        self.conn.execute(
-            f"DELETE FROM {table} WHERE {col} IS NULL OR {col} <= %s",
-            (scope.now,),
-        )
-        if not self.conn.autocommit:
-            self.conn.commit()
-
-    def load_state(self) -> dict:
-        row = self.conn.execute("SELECT payload FROM app_state WHERE id = 1").fetchone()
-        if row is None:
-            return {}
-        try:
-            decoded = json.loads(row["payload"])
-            return decode_state(decoded)
-        except Exception:
-            return {}
-
-    def save_state(self, state: dict) -> None:
-        payload = json.dumps(encode_state(state))
-        self.conn.execute(
-            "INSERT INTO app_state (id, payload) VALUES (1, %s) "
-            "ON CONFLICT (id) DO UPDATE SET payload = EXCLUDED.payload",
-            (payload,),
-        )
+        if plan.deletes:
+            cursor.execute("DELETE FROM app_state_entries WHERE state_key = ANY(%s)", (plan.deletes,))
         self.conn.commit()
+        self._state_baseline.apply(plan)
 
     def close(self) -> None:
         try:
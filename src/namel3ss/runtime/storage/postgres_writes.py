@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from typing import Any, List
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.schema.records import RecordSchema
+from namel3ss.runtime.storage.sql_helpers import field_signature, quote_identifier, slug_identifier
+
+
+_INSERT_BATCH_ROWS = 500
+
+
+class PostgresRecordWriteMixin:
+    def save(self, schema: RecordSchema, record: dict) -> dict:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        try:
+            cursor = self.conn.execute(self._insert_statement(schema, 1), self._insert_values(schema, record))
+        except Exception as err:
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        rec = dict(record)
+        row = cursor.fetchone()
+        if row is not None:
+            rec[id_col] = row[id_col]
+        if not self.conn.autocommit:
+            self.conn.commit()
+        return rec
+
+    def save_many(self, schema: RecordSchema, records: list[dict]) -> List[dict]:
+        records = list(records)
+        if not records:
+            return []
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        saved: List[dict] = []
+        try:
+            for start in range(0, len(records), _INSERT_BATCH_ROWS):
+                chunk = records[start : start + _INSERT_BATCH_ROWS]
+                values: list[Any] = []
+                for record in chunk:
+                    values.extend(self._insert_values(schema, record))
+                cursor = self.conn.execute(self._insert_statement(schema, len(chunk)), values)
+                # A multi-row VALUES insert returns ids in row order.
+                rows = cursor.fetchall()
+                for record, row in zip(chunk, rows):
+                    rec = dict(record)
+                    rec[id_col] = row[id_col]
+                    saved.append(rec)
+        except Exception as err:
+            if not self.conn.autocommit:
+                self.conn.rollback()
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        if not self.conn.autocommit:
+            self.conn.commit()
+        return saved
+
+    def update(self, schema: RecordSchema, record: dict) -> dict:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        if id_col not in record:
+            raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
+        try:
+            cursor = self.conn.execute(self._update_statement(schema), self._update_values(schema, record))
+        except Exception as err:
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        if cursor.rowcount == 0:
+            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
+        if not self.conn.autocommit:
+            self.conn.commit()
+        return record
+
+    def update_many(self, schema: RecordSchema, records: list[dict]) -> List[dict]:
+        records = list(records)
+        if not records:
+            return []
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        for record in records:
+            if id_col not in record:
+                raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                self._update_statement(schema),
+                [self._update_values(schema, record) for record in records],
+            )
+        except Exception as err:
+            if not self.conn.autocommit:
+                self.conn.rollback()
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        if cursor.rowcount < len(records):
+            missing = self._missing_id(schema, [record[id_col] for record in records])
+            if not self.conn.autocommit:
+                self.conn.rollback()
+            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={missing} was not found")
+        if not self.conn.autocommit:
+            self.conn.commit()
+        return records
+
+    def _insert_statement(self, schema: RecordSchema, row_count: int) -> str:
+        key = ("insert", schema.name, row_count, field_signature(schema.storage_fields()))
+        cached = self._statements.get(key)
+        if cached is not None:
+            return cached
+        id_col = "id" if "id" in schema.field_map else "_id"
+        col_names = [
+            quote_identifier(slug_identifier(field.name))
+            for field in schema.storage_fields()
+            if field.name != id_col
+        ]
+        row = "(" + ", ".join(["%s"] * len(col_names)) + ")"
+        stmt = (
+            f"INSERT INTO {quote_identifier(slug_identifier(schema.name))} ({', '.join(col_names)}) "
+            f"VALUES {', '.join([row] * row_count)} RETURNING {quote_identifier(id_col)}"
+        )
+        self._statements[key] = stmt
+        return stmt
+
+    def _insert_values(self, schema: RecordSchema, record: dict) -> list:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        return [
+            self._serialize_value(field.type_name, record.get(field.name))
+            for field in schema.storage_fields()
+            if field.name != id_col
+        ]
+
+    def _update_statement(self, schema: RecordSchema) -> str:
+        key = ("update", schema.name, field_signature(schema.fields))
+        cached = self._statements.get(key)
+        if cached is not None:
+            return cached
+        id_col = "id" if "id" in schema.field_map else "_id"
+        assignments = [
+            f"{quote_identifier(slug_identifier(field.name))} = %s"
+            for field in schema.fields
+            if field.name != id_col
+        ]
+        stmt = (
+            f"UPDATE {quote_identifier(slug_identifier(schema.name))} SET {', '.join(assignments)} "
+            f"WHERE {quote_identifier(id_col)} = %s"
+        )
+        self._statements[key] = stmt
+        return stmt
+
+    def _update_values(self, schema: RecordSchema, record: dict) -> list:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        values = [
+            self._serialize_value(field.type_name, record.get(field.name))
+            for field in schema.fields
+            if field.name != id_col
+        ]
+        values.append(record[id_col])
+        return values
+
+    def _missing_id(self, schema: RecordSchema, record_ids: list[object]) -> object:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        sql = (
+            f"SELECT 1 FROM {quote_identifier(slug_identifier(schema.name))} "
+            f"WHERE {quote_identifier(id_col)} = %s LIMIT 1"
+        )
+        for record_id in record_ids:
+            if self.conn.execute(sql, [record_id]).fetchone() is None:
+                return record_id
+        return record_ids[-1]
+
+    def delete(self, schema: RecordSchema, record_id: object) -> bool:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        stmt = f"DELETE FROM {quote_identifier(slug_identifier(schema.name))} WHERE {quote_identifier(id_col)} = %s"
+        cursor = self.conn.execute(stmt, [record_id])
+        if not self.conn.autocommit:
+            self.conn.commit()
+        return cursor.rowcount > 0
+
+
+__all__ = ["PostgresRecordWriteMixin"]
@@ -18,4 +18,19 @@ def escape_like(value: str) -> str:
     return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
-__all__ = ["escape_like", "quote_identifier", "slug_identifier"]
+def field_signature(fields) -> tuple:
+    return tuple((field.name, field.type_name) for field in fields)
+
+
+def schema_fingerprint(schema) -> tuple:
+    """Everything the table DDL depends on: columns, unique indexes, and tenancy."""
+    id_col = "id" if "id" in schema.field_map else "_id"
+    return (
+        id_col,
+        field_signature(schema.storage_fields()),
+        tuple(sorted(schema.unique_fields)),
+        tuple(schema.tenant_key or ()),
+    )
+
+
+__all__ = ["escape_like", "field_signature", "quote_identifier", "schema_fingerprint", "slug_identifier"]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.schema.records import EXPIRES_AT_FIELD, TENANT_KEY_FIELD, RecordSchema
+from namel3ss.runtime.store.memory_store import Contains
+from namel3ss.runtime.records.ordering import normalize_record_id
+from namel3ss.runtime.storage.base import DEFAULT_PAGE_SIZE, RecordPage, RecordScope
+from namel3ss.runtime.storage.pagination import collect_page
+from namel3ss.runtime.storage.predicate import PredicatePlan
+from namel3ss.runtime.storage.sql_helpers import escape_like, quote_identifier, slug_identifier
+
+
+class SQLiteRecordQueryMixin:
+    def find(self, schema: RecordSchema, predicate, scope: RecordScope | None = None) -> List[dict]:
+        scope = scope or RecordScope()
+        self._ensure_table(schema)
+        self._cleanup_expired(schema, scope)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        if isinstance(predicate, PredicatePlan):
+            if predicate.sql:
+                scope_clause, scope_params = self._scope_where(schema, scope)
+                clauses = [clause for clause in [scope_clause, predicate.sql.clause] if clause]
+                sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
+                if clauses:
+                    sql += " WHERE " + " AND ".join(clauses)
+                sql += f" ORDER BY {quote_identifier(id_col)} ASC"
+                cursor = self.conn.execute(sql, [*scope_params, *predicate.sql.params])
+                return [self._deserialize_row(schema, row) for row in cursor]
+            predicate = predicate.predicate
+        if isinstance(predicate, dict):
+            return self._find_by_filters(schema, predicate, scope)
+        where_clause, params = self._scope_where(schema, scope)
+        sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
+        if where_clause:
+            sql += f" WHERE {where_clause}"
+        sql += f" ORDER BY {quote_identifier(id_col)} ASC"
+        cursor = self.conn.execute(sql, params)
+        results: List[dict] = []
+        # Step the cursor so rows the predicate rejects are never held in memory together.
+        for row in cursor:
+            rec = self._deserialize_row(schema, row)
+            if predicate(rec):
+                results.append(rec)
+        return results
+
+    def list_records(
+        self,
+        schema: RecordSchema,
+        limit: int = 20,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+    ) -> List[dict]:
+        scope = scope or RecordScope()
+        self._ensure_table(schema)
+        self._cleanup_expired(schema, scope)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        where_clause, params = self._scope_where(schema, scope)
+        clauses = [where_clause] if where_clause else []
+        params = list(params)
+        if after_id is not None:
+            clauses.append(f"{quote_identifier(id_col)} > ?")
+            params.append(normalize_record_id(after_id))
+        sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {quote_identifier(id_col)} ASC LIMIT ?"
+        params.append(limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        return [self._deserialize_row(schema, row) for row in rows]
+
+    def find_page(
+        self,
+        schema: RecordSchema,
+        predicate,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> RecordPage:
+        scope = scope or RecordScope()
+        self._ensure_table(schema)
+        self._cleanup_expired(schema, scope)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        base_clauses, base_params, row_filter = self._page_filters(schema, predicate, scope)
+        table = quote_identifier(slug_identifier(schema.name))
+        id_ref = quote_identifier(id_col)
+
+        def _fetch(cursor_id: object | None, count: int) -> List[dict]:
+            page_clauses = list(base_clauses)
+            page_params = list(base_params)
+            if cursor_id is not None:
+                page_clauses.append(f"{id_ref} > ?")
+                page_params.append(normalize_record_id(cursor_id))
+            sql = f"SELECT * FROM {table}"
+            if page_clauses:
+                sql += " WHERE " + " AND ".join(page_clauses)
+            sql += f" ORDER BY {id_ref} ASC LIMIT ?"
+            params = [*page_params, count]
+            rows = self.conn.execute(sql, params).fetchall()
+            return [self._deserialize_row(schema, row) for row in rows]
+
+        return collect_page(_fetch, id_field=id_col, after_id=after_id, limit=limit, row_filter=row_filter)
+
+    def _page_filters(
+        self, schema: RecordSchema, predicate, scope: RecordScope
+    ) -> tuple[list[str], list[Any], Callable[[dict], bool] | None]:
+        scope_clause, scope_params = self._scope_where(schema, scope)
+        clauses = [scope_clause] if scope_clause else []
+        params = list(scope_params)
+        if isinstance(predicate, PredicatePlan):
+            if predicate.sql is None:
+                return clauses, params, predicate.predicate
+            if predicate.sql.clause:
+                clauses.append(predicate.sql.clause)
+                params.extend(predicate.sql.params)
+            return clauses, params, None
+        if isinstance(predicate, dict):
+            where_clause, filter_params = self._build_where_clause(schema, predicate)
+            if where_clause:
+                clauses.append(where_clause)
+                params.extend(filter_params)
+            return clauses, params, None
+        return clauses, params, predicate
+
+    def check_unique(self, schema: RecordSchema, record: dict, scope: RecordScope | None = None) -> str | None:
+        scope = scope or RecordScope()
+        self._ensure_table(schema)
+        self._cleanup_expired(schema, scope)
+        tenant_value = record.get(TENANT_KEY_FIELD)
+        for field in schema.unique_fields:
+            val = record.get(field)
+            if val is None:
+                continue
+            col = slug_identifier(field)
+            clauses = [f"{quote_identifier(col)} = ?"]
+            params = [self._serialize_value(schema.field_map[field].type_name, val)]
+            if schema.tenant_key:
+                tenant_col = slug_identifier(TENANT_KEY_FIELD)
+                clauses.append(f"{quote_identifier(tenant_col)} = ?")
+                params.append(tenant_value)
+            ttl_clause, ttl_params = self._ttl_clause(schema, scope)
+            if ttl_clause:
+                clauses.append(ttl_clause)
+                params.extend(ttl_params)
+            where_clause = " AND ".join(clauses)
+            cursor = self.conn.execute(
+                f"SELECT 1 FROM {quote_identifier(slug_identifier(schema.name))} WHERE {where_clause} LIMIT 1",
+                params,
+            )
+            if cursor.fetchone():
+                return field
+        return None
+
+    def _find_by_filters(self, schema: RecordSchema, filters: dict[str, Any], scope: RecordScope) -> List[dict]:
+        scope_clause, scope_params = self._scope_where(schema, scope)
+        where_clause, params = self._build_where_clause(schema, filters)
+        table = quote_identifier(slug_identifier(schema.name))
+        id_col = "id" if "id" in schema.field_map else "_id"
+        clauses = [clause for clause in [scope_clause, where_clause] if clause]
+        sql = f"SELECT * FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {quote_identifier(id_col)} ASC"
+        cursor = self.conn.execute(sql, [*scope_params, *params])
+        return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
+
+    def _build_where_clause(self, schema: RecordSchema, filters: dict[str, Any]) -> tuple[str, list[Any]]:
+        parts: list[str] = []
+        params: list[Any] = []
+        for field, expected in filters.items():
+            col = slug_identifier(field)
+            field_schema = schema.field_map.get(field)
+            if field_schema is None:
+                raise Namel3ssError(f"Unknown field '{field}' for record '{schema.name}'")
+            if isinstance(expected, Contains):
+                parts.append(f"{quote_identifier(col)} LIKE ? ESCAPE '\\'")
+                params.append(f"%{escape_like(expected.value)}%")
+                continue
+            parts.append(f"{quote_identifier(col)} = ?")
+            params.append(self._serialize_value(field_schema.type_name if field_schema else "text", expected))
+        return " AND ".join(parts), params
+
+    def _scope_where(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if schema.tenant_key and scope.tenant_value is not None:
+            tenant_col = slug_identifier(TENANT_KEY_FIELD)
+            clauses.append(f"{quote_identifier(tenant_col)} = ?")
+            params.append(scope.tenant_value)
+        ttl_clause, ttl_params = self._ttl_clause(schema, scope)
+        if ttl_clause:
+            clauses.append(ttl_clause)
+            params.extend(ttl_params)
+        return " AND ".join(clauses), params
+
+    def _ttl_clause(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
+        if schema.ttl_hours is None or scope.now is None:
+            return "", []
+        col = quote_identifier(slug_identifier(EXPIRES_AT_FIELD))
+        return f"{col} IS NOT NULL AND CAST({col} AS REAL) > ?", [float(scope.now)]
+
+    def _cleanup_expired(self, schema: RecordSchema, scope: RecordScope) -> None:
+        if schema.ttl_hours is None or scope.now is None:
+            return
+        table = quote_identifier(slug_identifier(schema.name))
+        col = quote_identifier(slug_identifier(EXPIRES_AT_FIELD))
+        self.conn.execute(
+            f"DELETE FROM {table} WHERE {col} IS NULL OR CAST({col} AS REAL) <= ?",
+            (float(scope.now),),
+        )
+        if not self.conn.in_transaction:
+            self.conn.commit()
+
+
+__all__ = ["SQLiteRecordQueryMixin"]
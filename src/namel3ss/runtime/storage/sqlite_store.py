@@ -4,46 +4,61 @@ import json
 import sqlite3
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Callable, Dict, Iterable
 
 from namel3ss.errors.base import Namel3ssError
-from namel3ss.schema.records import EXPIRES_AT_FIELD, TENANT_KEY_FIELD, RecordSchema
+from namel3ss.schema.records import TENANT_KEY_FIELD, RecordSchema
 from namel3ss.runtime.storage.metadata import PersistenceMetadata
-from namel3ss.runtime.store.memory_store import Contains
-from namel3ss.runtime.storage.base import RecordScope
-from namel3ss.runtime.storage.predicate import PredicatePlan
-from namel3ss.runtime.storage.sql_helpers import escape_like, quote_identifier, slug_identifier
-from namel3ss.runtime.storage.state_codec import decode_state, encode_state
+from namel3ss.runtime.storage.sqlite_queries import SQLiteRecordQueryMixin
+from namel3ss.runtime.storage.sqlite_threads import ThreadBoundConnection
+from namel3ss.runtime.storage.sqlite_writes import SQLiteRecordWriteMixin
+from namel3ss.runtime.storage.sql_helpers import quote_identifier, schema_fingerprint, slug_identifier
+from namel3ss.runtime.storage.state_entries import (
+    StateBaseline,
+    encode_state_value,
+    segment_key_prefixes,
+    split_state_document,
+    stored_state_entries,
+)
 from namel3ss.utils.json_tools import dumps as json_dumps
 from namel3ss.utils.numbers import decimal_is_int, decimal_to_str, is_number, to_decimal
 
 
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = 3
 
 
-class SQLiteStore:
+class SQLiteStore(SQLiteRecordQueryMixin, SQLiteRecordWriteMixin):
     def __init__(self, db_path: str | Path) -> None:
         self.db_path = Path(db_path)
         self.dialect = "sqlite"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
         except sqlite3.Error as err:
             raise Namel3ssError(f"Could not open SQLite store at {self.db_path}: {err}") from err
-        self.conn.row_factory = sqlite3.Row
+        conn.row_factory = sqlite3.Row
+        self.conn = ThreadBoundConnection(conn)
         self._prepared_tables: set[str] = set()
         self._prepared_indexes: Dict[str, set[str]] = {}
+        self._statements: Dict[tuple, str] = {}
+        self._schema_fingerprints: Dict[str, tuple] = {}
+        self._state_baseline = StateBaseline()
         self._apply_pragmas()
         self._ensure_schema_version()
 
     def begin(self) -> None:
         self.conn.execute("BEGIN")
 
+    def share_across_threads(self) -> Callable[[], None]:
+        return self.conn.share()
+
     def commit(self) -> None:
         self.conn.commit()
 
     def rollback(self) -> None:
         self.conn.rollback()
+        # DDL issued inside the transaction may have been undone; prepare schemas again on next use.
+        self._schema_fingerprints.clear()
 
     def clear(self) -> None:
         cursor = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -53,6 +68,9 @@ class SQLiteStore:
         self.conn.commit()
         self._prepared_tables.clear()
         self._prepared_indexes.clear()
+        self._statements.clear()
+        self._schema_fingerprints.clear()
+        self._state_baseline.clear()
         self._ensure_schema_version()
 
     def _apply_pragmas(self) -> None:
@@ -79,10 +97,14 @@ class SQLiteStore:
                 f"Unsupported schema version {row['version']} in {self.db_path}. Expected {SCHEMA_VERSION}."
             )
 
+        self._create_state_entries()
+        self.conn.commit()
+
+    def _create_state_entries(self) -> None:
         self.conn.execute(
-            "CREATE TABLE IF NOT EXISTS app_state (id INTEGER PRIMARY KEY CHECK (id = 1), payload TEXT NOT NULL)"
+            "CREATE TABLE IF NOT EXISTS app_state_entries ("
+            "state_key TEXT PRIMARY KEY, payload TEXT NOT NULL, revision INTEGER NOT NULL, ordinal INTEGER NOT NULL)"
         )
-        self.conn.commit()
 
     def _migrate(self, current_version: int) -> None:
         if current_version < 1 or current_version > SCHEMA_VERSION:
@@ -91,6 +113,8 @@ class SQLiteStore:
             )
         if current_version == 1:
             self._migrate_v1_to_v2()
+        if current_version <= 2:
+            self._migrate_v2_to_v3()
         self.conn.execute("UPDATE schema_version SET version = ?", (SCHEMA_VERSION,))
         self.conn.commit()
 
@@ -99,8 +123,25 @@ class SQLiteStore:
             "CREATE TABLE IF NOT EXISTS app_state (id INTEGER PRIMARY KEY CHECK (id = 1), payload TEXT NOT NULL)"
         )
 
+    def _migrate_v2_to_v3(self) -> None:
+        # The single app_state document is the v2 source of truth; split it into one row per key.
+        self._create_state_entries()
+        row = self.conn.execute("SELECT payload FROM app_state WHERE id = 1").fetchone()
+        if row is None:
+            return
+        values = split_state_document(row["payload"])
+        self.conn.execute("DELETE FROM app_state_entries")
+        self.conn.executemany(
+            "INSERT INTO app_state_entries (state_key, payload, revision, ordinal) VALUES (?, ?, 1, ?)",
+            [(str(key), encode_state_value(value), ordinal) for ordinal, (key, value) in enumerate(values.items())],
+        )
+        self.conn.execute("DELETE FROM app_state WHERE id = 1")
+
     def _ensure_table(self, schema: RecordSchema) -> None:
         table = slug_identifier(schema.name)
+        fingerprint = schema_fingerprint(schema)
+        if self._schema_fingerprints.get(table) == fingerprint:
+            return
         if table in self._prepared_tables and not self._table_exists(table):
             self._prepared_tables.discard(table)
             self._prepared_indexes.pop(table, None)
@@ -118,6 +159,7 @@ class SQLiteStore:
             self._prepared_tables.add(table)
         self._ensure_columns(schema)
         self._ensure_indexes(schema)
+        self._schema_fingerprints[table] = fingerprint
         if not self.conn.in_transaction:
             self.conn.commit()
 
@@ -242,230 +284,45 @@ class SQLiteStore:
             data[id_col] = row[id_col]
         return data
 
-    def save(self, schema: RecordSchema, record: dict) -> dict:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        explicit_id = record.get(id_col) if id_col in schema.field_map else None
-        col_names = []
-        values = []
-        if explicit_id is not None and id_col in schema.field_map:
-            id_field = schema.field_map[id_col]
-            col_names.append(quote_identifier(id_col))
-            values.append(self._serialize_value(id_field.type_name, explicit_id))
-        for field in schema.storage_fields():
-            if field.name == id_col:
-                continue
-            col_names.append(quote_identifier(slug_identifier(field.name)))
-            values.append(self._serialize_value(field.type_name, record.get(field.name)))
-        columns_clause = ", ".join(col_names)
-        placeholders = ", ".join(["?"] * len(values))
-        stmt = f"INSERT INTO {quote_identifier(slug_identifier(schema.name))} ({columns_clause}) VALUES ({placeholders})"
-        try:
-            self.conn.execute(stmt, values)
-            if not self.conn.in_transaction:
-                self.conn.commit()
-        except sqlite3.IntegrityError as err:
-            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
-        rec = dict(record)
-        if explicit_id is not None:
-            rec[id_col] = explicit_id
-        else:
-            rec[id_col] = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-        return rec
-
-    def update(self, schema: RecordSchema, record: dict) -> dict:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        if id_col not in record:
-            raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
-        assignments = []
-        values = []
-        for field in schema.fields:
-            if field.name == id_col:
-                continue
-            assignments.append(f"{quote_identifier(slug_identifier(field.name))} = ?")
-            values.append(self._serialize_value(field.type_name, record.get(field.name)))
-        values.append(record[id_col])
-        stmt = (
-            f"UPDATE {quote_identifier(slug_identifier(schema.name))} SET {', '.join(assignments)} "
-            f"WHERE {quote_identifier(id_col)} = ?"
-        )
-        try:
-            cursor = self.conn.execute(stmt, values)
-            if not self.conn.in_transaction:
-                self.conn.commit()
-        except sqlite3.IntegrityError as err:
-            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
-        if cursor.rowcount == 0:
-            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
-        return record
-
-    def delete(self, schema: RecordSchema, record_id: object) -> bool:
-        self._ensure_table(schema)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        stmt = f"DELETE FROM {quote_identifier(slug_identifier(schema.name))} WHERE {quote_identifier(id_col)} = ?"
-        cursor = self.conn.execute(stmt, [record_id])
-        if not self.conn.in_transaction:
-            self.conn.commit()
-        return cursor.rowcount > 0
-
-    def find(self, schema: RecordSchema, predicate, scope: RecordScope | None = None) -> List[dict]:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        if isinstance(predicate, PredicatePlan):
-            if predicate.sql:
-                scope_clause, scope_params = self._scope_where(schema, scope)
-                clauses = [clause for clause in [scope_clause, predicate.sql.clause] if clause]
-                sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
-                if clauses:
-                    sql += " WHERE " + " AND ".join(clauses)
-                sql += f" ORDER BY {quote_identifier(id_col)} ASC"
-                cursor = self.conn.execute(sql, [*scope_params, *predicate.sql.params])
-                return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
-            predicate = predicate.predicate
-        if isinstance(predicate, dict):
-            return self._find_by_filters(schema, predicate, scope)
-        where_clause, params = self._scope_where(schema, scope)
-        sql = f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))}"
-        if where_clause:
-            sql += f" WHERE {where_clause}"
-        sql += f" ORDER BY {quote_identifier(id_col)} ASC"
-        cursor = self.conn.execute(sql, params)
-        rows = cursor.fetchall()
-        results: List[dict] = []
-        for row in rows:
-            rec = self._deserialize_row(schema, row)
-            if predicate(rec):
-                results.append(rec)
-        return results
-
-    def list_records(self, schema: RecordSchema, limit: int = 20, scope: RecordScope | None = None) -> List[dict]:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        id_col = "id" if "id" in schema.field_map else "_id"
-        where_clause, params = self._scope_where(schema, scope)
-        sql = (
-            f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))} "
-            f"ORDER BY {quote_identifier(id_col)} ASC LIMIT ?"
-        )
-        params = list(params) + [limit]
-        if where_clause:
-            sql = (
-                f"SELECT * FROM {quote_identifier(slug_identifier(schema.name))} "
-                f"WHERE {where_clause} ORDER BY {quote_identifier(id_col)} ASC LIMIT ?"
-            )
-        cursor = self.conn.execute(sql, params)
-        return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
-
-    def check_unique(self, schema: RecordSchema, record: dict, scope: RecordScope | None = None) -> str | None:
-        scope = scope or RecordScope()
-        self._ensure_table(schema)
-        self._cleanup_expired(schema, scope)
-        tenant_value = record.get(TENANT_KEY_FIELD)
-        for field in schema.unique_fields:
-            val = record.get(field)
-            if val is None:
-                continue
-            col = slug_identifier(field)
-            clauses = [f"{quote_identifier(col)} = ?"]
-            params = [self._serialize_value(schema.field_map[field].type_name, val)]
-            if schema.tenant_key:
-                tenant_col = slug_identifier(TENANT_KEY_FIELD)
-                clauses.append(f"{quote_identifier(tenant_col)} = ?")
-                params.append(tenant_value)
-            ttl_clause, ttl_params = self._ttl_clause(schema, scope)
-            if ttl_clause:
-                clauses.append(ttl_clause)
-                params.extend(ttl_params)
-            where_clause = " AND ".join(clauses)
-            cursor = self.conn.execute(
-                f"SELECT 1 FROM {quote_identifier(slug_identifier(schema.name))} WHERE {where_clause} LIMIT 1",
-                params,
-            )
-            if cursor.fetchone():
-                return field
-        return None
-
-    def _find_by_filters(self, schema: RecordSchema, filters: dict[str, Any], scope: RecordScope) -> List[dict]:
-        scope_clause, scope_params = self._scope_where(schema, scope)
-        where_clause, params = self._build_where_clause(schema, filters)
-        table = quote_identifier(slug_identifier(schema.name))
-        id_col = "id" if "id" in schema.field_map else "_id"
-        clauses = [clause for clause in [scope_clause, where_clause] if clause]
-        sql = f"SELECT * FROM {table}"
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
-        sql += f" ORDER BY {quote_identifier(id_col)} ASC"
-        cursor = self.conn.execute(sql, [*scope_params, *params])
-        return [self._deserialize_row(schema, row) for row in cursor.fetchall()]
-
-    def _build_where_clause(self, schema: RecordSchema, filters: dict[str, Any]) -> tuple[str, list[Any]]:
-        parts: list[str] = []
-        params: list[Any] = []
-        for field, expected in filters.items():
-            col = slug_identifier(field)
-            field_schema = schema.field_map.get(field)
-            if field_schema is None:
-                raise Namel3ssError(f"Unknown field '{field}' for record '{schema.name}'")
-            if isinstance(expected, Contains):
-                parts.append(f"{quote_identifier(col)} LIKE ? ESCAPE '\\'")
-                params.append(f"%{escape_like(expected.value)}%")
-                continue
-            parts.append(f"{quote_identifier(col)} = ?")
-            params.append(self._serialize_value(field_schema.type_name if field_schema else "text", expected))
-        return " AND ".join(parts), params
-
-    def _scope_where(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
-        clauses: list[str] = []
-        params: list[Any] = []
-        if schema.tenant_key and scope.tenant_value is not None:
-            tenant_col = slug_identifier(TENANT_KEY_FIELD)
-            clauses.append(f"{quote_identifier(tenant_col)} = ?")
-            params.append(scope.tenant_value)
-        ttl_clause, ttl_params = self._ttl_clause(schema, scope)
-        if ttl_clause:
-            clauses.append(ttl_clause)
-            params.extend(ttl_params)
-        return " AND ".join(clauses), params
-
-    def _ttl_clause(self, schema: RecordSchema, scope: RecordScope) -> tuple[str, list[Any]]:
-        if schema.ttl_hours is None or scope.now is None:
-            return "", []
-        col = quote_identifier(slug_identifier(EXPIRES_AT_FIELD))
-        return f"{col} IS NOT NULL AND CAST({col} AS REAL) > ?", [float(scope.now)]
-
-    def _cleanup_expired(self, schema: RecordSchema, scope: RecordScope) -> None:
-        if schema.ttl_hours is None or scope.now is None:
-            return
-        table = quote_identifier(slug_identifier(schema.name))
-        col = quote_identifier(slug_identifier(EXPIRES_AT_FIELD))
-        self.conn.execute(
-            f"DELETE FROM {table} WHERE {col} IS NULL OR CAST({col} AS REAL) <= ?",
-            (float(scope.now),),
-        )
-        if not self.conn.in_transaction:
-            self.conn.commit()
-
-    def load_state(self) -> dict:
-        row = self.conn.execute("SELECT payload FROM app_state WHERE id = 1").fetchone()
-        if row is None:
-            return {}
+    def load_state(self, keys: Iterable[str] | None = None) -> dict:
+        sql = "SELECT state_key, payload, revision FROM app_state_entries"
+        params: list[str] = []
+        if keys is not None:
+            params = [str(key) for key in dict.fromkeys(keys)]
+            if not params:
+                return {}
+            prefixes = segment_key_prefixes(params)
+            sql += f" WHERE state_key IN ({', '.join('?' for _ in params)})"
+            sql += "".join(" OR state_key LIKE ?" for _ in prefixes)
+            params += [f"{prefix}%" for prefix in prefixes]
+        rows = self.conn.execute(f"{sql} ORDER BY ordinal, state_key", params)
+        return self._state_baseline.restore(rows)
+
+    def save_state(self, state: dict, *, keys: Iterable[str] | None = None) -> None:
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            self.conn.execute("BEGIN")
         try:
-            decoded = json.loads(row["payload"])
-            return decode_state(decoded)
+            rows = self.conn.execute("SELECT state_key, revision, ordinal FROM app_state_entries")
+            plan = self._state_baseline.plan(state, stored_state_entries(rows), keys=keys)
+            if plan.writes:
+                self.conn.executemany(
+                    "INSERT INTO app_state_entries (state_key, payload, revision, ordinal) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(state_key) DO UPDATE SET payload=excluded.payload, "
+                    "revision=app_state_entries.revision + 1",
+                    [(write.key, write.payload, write.revision, write.ordinal) for write in plan.writes],
+                )
+            if plan.deletes:
+                self.conn.executemany(
+                    "DELETE FROM app_state_entries WHERE state_key = ?",
+                    [(key,) for key in plan.deletes],
+                )
         except Exception:
-            return {}
-
-    def save_state(self, state: dict) -> None:
-        payload = json.dumps(encode_state(state))
-        self.conn.execute(
-            "INSERT INTO app_state (id, payload) VALUES (1, ?) ON CONFLICT(id) DO UPDATE SET payload=excluded.payload",
-            (payload,),
-        )
+            if owns_transaction:
+                self.conn.rollback()
+            raise
         self.conn.commit()
+        self._state_baseline.apply(plan)
 
     def close(self) -> None:
         try:
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Callable
+
+
+class ThreadBoundConnection:
+    """SQLite connection that stays on its opening thread unless sharing is switched on.
+
+    The connection is opened without sqlite3's own same-thread check so a flow
+    can hand it to background tasks for a while. Outside those windows any use
+    from another thread fails the way sqlite3 would fail on its own.
+    """
+
+    __slots__ = ("_conn", "_owner", "_shared", "_lock")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_owner", threading.get_ident())
+        object.__setattr__(self, "_shared", 0)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def __getattr__(self, name: str) -> object:
+        if self._shared == 0 and threading.get_ident() != self._owner:
+            raise sqlite3.ProgrammingError(
+                "SQLite objects created in a thread can only be used in that same thread."
+            )
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        setattr(self._conn, name, value)
+
+    def share(self) -> Callable[[], None]:
+        """Allow other threads until the returned release callable runs."""
+        with self._lock:
+            object.__setattr__(self, "_shared", self._shared + 1)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with self._lock:
+                if released:
+                    return
+                released = True
+                object.__setattr__(self, "_shared", self._shared - 1)
+
+        return release
+
+
+__all__ = ["ThreadBoundConnection"]
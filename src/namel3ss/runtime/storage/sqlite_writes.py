@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.schema.records import RecordSchema
+from namel3ss.runtime.storage.sql_helpers import field_signature, quote_identifier, slug_identifier
+
+
+class SQLiteRecordWriteMixin:
+    def save(self, schema: RecordSchema, record: dict) -> dict:
+        self._ensure_table(schema)
+        try:
+            rec = self._insert_record(self.conn.cursor(), schema, record)
+            if not self.conn.in_transaction:
+                self.conn.commit()
+        except sqlite3.IntegrityError as err:
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        return rec
+
+    def save_many(self, schema: RecordSchema, records: list[dict]) -> List[dict]:
+        records = list(records)
+        if not records:
+            return []
+        self._ensure_table(schema)
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            self.conn.execute("BEGIN")
+        try:
+            # Row by row inside one transaction: each id comes from its own insert.
+            cursor = self.conn.cursor()
+            saved = [self._insert_record(cursor, schema, record) for record in records]
+            if owns_transaction:
+                self.conn.commit()
+        except sqlite3.IntegrityError as err:
+            if owns_transaction:
+                self.conn.rollback()
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        except Exception:
+            if owns_transaction:
+                self.conn.rollback()
+            raise
+        return saved
+
+    def update(self, schema: RecordSchema, record: dict) -> dict:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        if id_col not in record:
+            raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
+        try:
+            cursor = self.conn.execute(self._update_statement(schema), self._update_values(schema, record))
+            if not self.conn.in_transaction:
+                self.conn.commit()
+        except sqlite3.IntegrityError as err:
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        if cursor.rowcount == 0:
+            raise Namel3ssError(f"Record '{schema.name}' with {id_col}={record[id_col]} was not found")
+        return record
+
+    def update_many(self, schema: RecordSchema, records: list[dict]) -> List[dict]:
+        records = list(records)
+        if not records:
+            return []
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        for record in records:
+            if id_col not in record:
+                raise Namel3ssError(f"Record '{schema.name}' update requires {id_col}")
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            self.conn.execute("BEGIN")
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                self._update_statement(schema),
+                [self._update_values(schema, record) for record in records],
+            )
+            if cursor.rowcount < len(records):
+                missing = self._missing_id(schema, [record[id_col] for record in records])
+                raise Namel3ssError(f"Record '{schema.name}' with {id_col}={missing} was not found")
+            if owns_transaction:
+                self.conn.commit()
+        except sqlite3.IntegrityError as err:
+            if owns_transaction:
+                self.conn.rollback()
+            raise Namel3ssError(f"Record '{schema.name}' violates constraints: {err}") from err
+        except Exception:
+            if owns_transaction:
+                self.conn.rollback()
+            raise
+        return records
+
+    def _insert_record(self, cursor: sqlite3.Cursor, schema: RecordSchema, record: dict) -> dict:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        explicit_id = self._explicit_id(schema, record)
+        cursor.execute(
+            self._insert_statement(schema, explicit_id=explicit_id is not None),
+            self._insert_values(schema, record, explicit_id),
+        )
+        rec = dict(record)
+        rec[id_col] = explicit_id if explicit_id is not None else cursor.lastrowid
+        return rec
+
+    def _explicit_id(self, schema: RecordSchema, record: dict) -> object | None:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        return record.get(id_col) if id_col in schema.field_map else None
+
+    def _insert_statement(self, schema: RecordSchema, *, explicit_id: bool) -> str:
+        key = ("insert", schema.name, explicit_id, field_signature(schema.storage_fields()))
+        cached = self._statements.get(key)
+        if cached is not None:
+            return cached
+        id_col = "id" if "id" in schema.field_map else "_id"
+        col_names = [quote_identifier(id_col)] if explicit_id else []
+        for field in schema.storage_fields():
+            if field.name == id_col:
+                continue
+            col_names.append(quote_identifier(slug_identifier(field.name)))
+        placeholders = ", ".join(["?"] * len(col_names))
+        stmt = (
+            f"INSERT INTO {quote_identifier(slug_identifier(schema.name))} "
+            f"({', '.join(col_names)}) VALUES ({placeholders})"
+        )
+        self._statements[key] = stmt
+        return stmt
+
+    def _insert_values(self, schema: RecordSchema, record: dict, explicit_id: object | None) -> list:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        values = []
+        if explicit_id is not None:
+            values.append(self._serialize_value(schema.field_map[id_col].type_name, explicit_id))
+        for field in schema.storage_fields():
+            if field.name == id_col:
+                continue
+            values.append(self._serialize_value(field.type_name, record.get(field.name)))
+        return values
+
+    def _update_statement(self, schema: RecordSchema) -> str:
+        key = ("update", schema.name, field_signature(schema.fields))
+        cached = self._statements.get(key)
+        if cached is not None:
+            return cached
+        id_col = "id" if "id" in schema.field_map else "_id"
+        assignments = [
+            f"{quote_identifier(slug_identifier(field.name))} = ?"
+            for field in schema.fields
+            if field.name != id_col
+        ]
+        stmt = (
+            f"UPDATE {quote_identifier(slug_identifier(schema.name))} SET {', '.join(assignments)} "
+            f"WHERE {quote_identifier(id_col)} = ?"
+        )
+        self._statements[key] = stmt
+        return stmt
+
+    def _update_values(self, schema: RecordSchema, record: dict) -> list:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        values = [
+            self._serialize_value(field.type_name, record.get(field.name))
+            for field in schema.fields
+            if field.name != id_col
+        ]
+        values.append(record[id_col])
+        return values
+
+    def _missing_id(self, schema: RecordSchema, record_ids: list[object]) -> object:
+        id_col = "id" if "id" in schema.field_map else "_id"
+        sql = (
+            f"SELECT 1 FROM {quote_identifier(slug_identifier(schema.name))} "
+            f"WHERE {quote_identifier(id_col)} = ? LIMIT 1"
+        )
+        for record_id in record_ids:
+            if self.conn.execute(sql, [record_id]).fetchone() is None:
+                return record_id
+        return record_ids[-1]
+
+    def delete(self, schema: RecordSchema, record_id: object) -> bool:
+        self._ensure_table(schema)
+        id_col = "id" if "id" in schema.field_map else "_id"
+        stmt = f"DELETE FROM {quote_identifier(slug_identifier(schema.name))} WHERE {quote_identifier(id_col)} = ?"
+        cursor = self.conn.execute(stmt, [record_id])
+        if not self.conn.in_transaction:
+            self.conn.commit()
+        return cursor.rowcount > 0
+
+
+__all__ = ["SQLiteRecordWriteMixin"]
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import inspect
+import json
+from dataclasses import dataclass, field
+from itertools import count
+from operator import is_
+from typing import Callable, Iterable
+
+from namel3ss.runtime.storage.state_codec import decode_state, encode_state
+
+
+STATE_ENTRIES_TABLE = "app_state_entries"
+INDEX_STATE_KEY = "index"
+# Each upload's chunks in state.index are stored in a row of their own under this prefix.
+INDEX_SEGMENT_PREFIX = "index/"
+
+
+@dataclass(frozen=True)
+class StoredStateEntry:
+    revision: int
+    ordinal: int
+
+
+@dataclass(frozen=True)
+class StateWrite:
+    key: str
+    payload: str
+    revision: int
+    ordinal: int
+
+
+@dataclass
+class StatePlan:
+    writes: list[StateWrite] = field(default_factory=list)
+    deletes: list[str] = field(default_factory=list)
+    segment_chunks: dict[str, tuple] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not self.writes and not self.deletes
+
+
+class TrackedState(dict):
+    """Loaded state that remembers which top-level keys may have changed.
+
+    Assigning or removing a key marks it, and so does handing out a nested
+    container, since the caller may change it in place. Saving only the marked
+    keys then costs what the flow touched rather than the whole state.
+    """
+
+    __slots__ = ("dirty",)
+
+    def __init__(self, base: dict | None = None) -> None:
+        super().__init__(base or {})
+        self.dirty: set = set()
+
+    def __setitem__(self, key, value) -> None:
+        self.dirty.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key) -> None:
+        self.dirty.add(key)
+        super().__delitem__(key)
+
+    def __getitem__(self, key):
+        return self._touch(key, super().__getitem__(key))
+
+    def get(self, key, default=None):
+        if not super().__contains__(key):
+            return default
+        return self[key]
+
+    def setdefault(self, key, default=None):
+        if not super().__contains__(key):
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *args):
+        self.dirty.add(key)
+        return super().pop(key, *args)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.dirty.add(key)
+        return key, value
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        self.dirty.update(super().keys())
+        super().clear()
+
+    def values(self):
+        self._touch_all()
+        return super().values()
+
+    def items(self):
+        self._touch_all()
+        return super().items()
+
+    def copy(self) -> dict:
+        self._touch_all()
+        return dict(super().items())
+
+    def __or__(self, other):
+        self._touch_all()
+        return super().__or__(other)
+
+    def __reduce__(self):
+        return (dict, (dict(super().items()),))
+
+    def _touch(self, key, value):
+        if isinstance(value, (dict, list)):
+            self.dirty.add(key)
+        return value
+
+    def _touch_all(self) -> None:
+        for key, value in super().items():
+            self._touch(key, value)
+
+
+def changed_state_keys(state: dict) -> tuple[str, ...] | None:
+    """Keys a save must look at, or None when every key has to be compared."""
+    if isinstance(state, TrackedState):
+        return tuple(str(key) for key in state.dirty)
+    return None
+
+
+def mark_state_saved(state: dict) -> None:
+    if isinstance(state, TrackedState):
+        state.dirty.clear()
+
+
+class StateBaseline:
+    """Last persisted payload and revision of each top-level state key.
+
+    Saves encode the keys they are asked about and write only those whose
+    payload changed, or whose stored revision moved because another writer
+    touched it.
+
+    ``state.index`` with a valid segment manifest is stored as one row for the
+    manifest and one row per upload. An upload row is encoded again only when
+    its chunks are no longer the very chunk objects last saved or loaded:
+    ingestion replaces an upload's chunks with new dicts and flows can only
+    assign state paths, so the same objects mean the same chunks. Code that
+    edits a stored chunk dict in place must replace the dict to have it saved.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[int, str]] = {}
+        self._segment_chunks: dict[str, tuple] = {}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._segment_chunks.clear()
+
+    def remember(self, key: str, revision: int, payload: str) -> None:
+        self._entries[key] = (int(revision), payload)
+
+    def plan(
+        self,
+        state: dict,
+        stored: dict[str, StoredStateEntry],
+        *,
+        keys: Iterable[object] | None = None,
+    ) -> StatePlan:
+        source = state or {}
+        if keys is None:
+            live = {str(key): value for key, value in dict.items(source)}
+            selected = list(live)
+        else:
+            selected = list(dict.fromkeys(str(key) for key in keys))
+            live = {key: dict.__getitem__(source, key) for key in selected if dict.__contains__(source, key)}
+        plan = StatePlan()
+        ordinals = count(max((entry.ordinal for entry in stored.values()), default=-1) + 1)
+
+        def _write(key: str, payload: str) -> None:
+            current = stored.get(key)
+            if current is not None and self._entries.get(key) == (current.revision, payload):
+                return
+            if current is None:
+                revision, ordinal = 1, next(ordinals)
+            else:
+                revision, ordinal = current.revision + 1, current.ordinal
+            plan.writes.append(StateWrite(key, payload, revision, ordinal))
+
+        segment_keys: set[str] = set()
+        for key, value in live.items():
+            if key == INDEX_STATE_KEY:
+                value = self._plan_index_segments(value, stored, plan, _write, segment_keys)
+            _write(key, encode_state_value(value))
+        candidates = stored if keys is None else [key for key in selected if key in stored]
+        deletes = {key for key in candidates if key not in live and not _is_segment_key(key)}
+        if keys is None or INDEX_STATE_KEY in selected:
+            deletes.update(key for key in stored if _is_segment_key(key) and key not in segment_keys)
+        plan.deletes = sorted(deletes)
+        return plan
+
+    def _plan_index_segments(
+        self,
+        value: object,
+        stored: dict[str, StoredStateEntry],
+        plan: StatePlan,
+        write: Callable[[str, str], None],
+        segment_keys: set[str],
+    ) -> object:
+        """Plan the upload rows of ``value`` and return what the state.index row itself holds."""
+        parts = index_segment_parts(value)
+        if parts is None:
+            return value
+        head, segments = parts
+        for upload_id, chunks in segments.items():
+            key = index_segment_key(upload_id)
+            segment_keys.add(key)
+            current = stored.get(key)
+            remembered = self._segment_chunks.get(key)
+            if (
+                current is not None
+                and remembered is not None
+                and self._entries.get(key, (None,))[0] == current.revision
+                and _same_objects(remembered, chunks)
+            ):
+                continue
+            write(key, encode_state_value(chunks))
+            plan.segment_chunks[key] = tuple(chunks)
+        return head
+
+    def restore(self, rows: Iterable[dict]) -> TrackedState:
+        state = TrackedState()
+        segments: dict[str, object] = {}
+        for row in rows:
+            ok, value = decode_state_value(row["payload"])
+            if not ok:
+                continue
+            key = str(row["state_key"])
+            self.remember(key, int(row["revision"]), str(row["payload"]))
+            if _is_segment_key(key):
+                segments[key] = value
+                continue
+            dict.__setitem__(state, key, value)
+        index = dict.get(state, INDEX_STATE_KEY)
+        chunks = join_index_segments(index, segments)
+        if chunks is not None:
+            index["chunks"] = chunks
+            for key, value in segments.items():
+                self._segment_chunks[key] = tuple(value)
+        return state
+
+    def apply(self, plan: StatePlan) -> None:
+        for write in plan.writes:
+            self.remember(write.key, write.revision, write.payload)
+        self._segment_chunks.update(plan.segment_chunks)
+        for key in plan.deletes:
+            self._entries.pop(key, None)
+            self._segment_chunks.pop(key, None)
+
+
+def index_segment_key(upload_id: str) -> str:
+    return f"{INDEX_SEGMENT_PREFIX}{upload_id}"
+
+
+def segment_key_prefixes(keys: Iterable[str]) -> list[str]:
+    """Row key prefixes a load of ``keys`` must also read, beyond the keys themselves."""
+    return [INDEX_SEGMENT_PREFIX] if INDEX_STATE_KEY in keys else []
+
+
+def index_segment_parts(index: object) -> tuple[dict, dict[str, list]] | None:
+    """Split state.index into its row without chunks and each upload's chunks, or None to keep it whole."""
+    # Imported here: the ingestion package imports the record stores, which import this module.
+    from namel3ss.ingestion.segments import index_segments
+
+    if not isinstance(index, dict):
+        return None
+    entries = dict.get(index, "chunks")
+    spans = index_segments(index, entries)
+    if spans is None:
+        return None
+    head = {key: value for key, value in dict.items(index) if key != "chunks"}
+    return head, {
+        upload_id: list.__getitem__(entries, slice(span["start"], span["start"] + span["count"]))
+        for upload_id, span in spans.items()
+    }
+
+
+def join_index_segments(index: object, segments: dict[str, object]) -> list | None:
+    """Chunks of a split state.index in manifest order, or None when ``index`` was stored whole."""
+    if not isinstance(index, dict) or "chunks" in index:
+        return None
+    manifest = index.get("segments")
+    if not isinstance(manifest, dict):
+        return None
+    chunks: list = []
+    for upload_id in manifest:
+        segment = segments.get(index_segment_key(str(upload_id)))
+        if not isinstance(segment, list):
+            return None
+        chunks.extend(segment)
+    return chunks
+
+
+def _is_segment_key(key: str) -> bool:
+    return key.startswith(INDEX_SEGMENT_PREFIX)
+
+
+def _same_objects(previous: tuple, current: list) -> bool:
+    return len(previous) == len(current) and all(map(is_, previous, current))
+
+
+def encode_state_value(value: object) -> str:
+    return json.dumps(encode_state(value))
+
+
+def decode_state_value(payload: object) -> tuple[bool, object]:
+    try:
+        return True, decode_state(json.loads(payload))
+    except Exception:
+        return False, None
+
+
+def split_state_document(payload: object) -> dict[str, object]:
+    ok, decoded = decode_state_value(payload)
+    if not ok or not isinstance(decoded, dict):
+        return {}
+    return decoded
+
+
+def stored_state_entries(rows: Iterable[dict]) -> dict[str, StoredStateEntry]:
+    return {
+        str(row["state_key"]): StoredStateEntry(revision=int(row["revision"]), ordinal=int(row["ordinal"]))
+        for row in rows
+    }
+
+
+def load_state_keys(store: object, keys: Iterable[str]) -> dict:
+    """Load only the given top-level state keys when the store can read them lazily."""
+    if _accepts_state_keys(store):
+        return store.load_state(keys=tuple(keys))  # type: ignore[attr-defined]
+    return store.load_state()  # type: ignore[attr-defined]
+
+
+def save_state_keys(store: object, state: dict, keys: Iterable[str] | None) -> None:
+    """Persist only the given top-level state keys (all of them for None); other keys stay as stored."""
+    if keys is not None and _accepts_state_keys(store):
+        store.save_state(state, keys=tuple(keys))  # type: ignore[attr-defined]
+        return
+    store.save_state(state)  # type: ignore[attr-defined]
+
+
+def _accepts_state_keys(store: object) -> bool:
+    load_state = getattr(store, "load_state", None)
+    if load_state is None:
+        return False
+    try:
+        return "keys" in inspect.signature(load_state).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+__all__ = [
+    "INDEX_SEGMENT_PREFIX",
+    "INDEX_STATE_KEY",
+    "STATE_ENTRIES_TABLE",
+    "StateBaseline",
+    "StatePlan",
+    "StateWrite",
+    "StoredStateEntry",
+    "TrackedState",
+    "changed_state_keys",
+    "decode_state_value",
+    "encode_state_value",
+    "index_segment_key",
+    "index_segment_parts",
+    "join_index_segments",
+    "load_state_keys",
+    "mark_state_saved",
+    "save_state_keys",
+    "segment_key_prefixes",
+    "split_state_document",
+    "stored_state_entries",
+]
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Dict, List, Callable, Optional, Any
+from typing import Dict, Iterable, List, Callable, Optional, Any
 
 from namel3ss.errors.base import Namel3ssError
 from namel3ss.schema.records import EXPIRES_AT_FIELD, SYSTEM_FIELDS, TENANT_KEY_FIELD, RecordSchema
-from namel3ss.runtime.records.ordering import sort_records
+from namel3ss.runtime.records.ordering import record_id_field, record_id_sort_key, sort_records
 from namel3ss.runtime.storage.predicate import PredicatePlan
 from namel3ss.runtime.storage.metadata import PersistenceMetadata
-from namel3ss.runtime.storage.base import RecordScope
+from namel3ss.runtime.storage.base import DEFAULT_PAGE_SIZE, RecordPage, RecordScope
 from namel3ss.utils.numbers import is_number, to_decimal
 
 
@@ -64,6 +64,9 @@ class MemoryStore:
         self._data[rec_name].append(record)
         return _strip_system_fields(record)
 
+    def save_many(self, schema: RecordSchema, records: List[dict]) -> List[dict]:
+        return [self.save(schema, record) for record in records]
+
     def update(self, schema: RecordSchema, record: dict) -> dict:
         rec_name = schema.name
         records = self._data.get(rec_name, [])
@@ -101,6 +104,9 @@ class MemoryStore:
         existing.update(updated)
         return _strip_system_fields(existing)
 
+    def update_many(self, schema: RecordSchema, records: List[dict]) -> List[dict]:
+        return [self.update(schema, record) for record in records]
+
     def delete(self, schema: RecordSchema, record_id: object) -> bool:
         rec_name = schema.name
         records = self._data.get(rec_name, [])
@@ -160,12 +166,36 @@ class MemoryStore:
                 return field
         return None
 
-    def list_records(self, schema: RecordSchema, limit: int = 20, scope: RecordScope | None = None) -> List[dict]:
+    def find_page(
+        self,
+        schema: RecordSchema,
+        predicate: Callable[[dict], bool] | dict[str, Any] | None,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> RecordPage:
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise Namel3ssError("Record page limit must be a positive integer")
+        rows = self.find(schema, predicate if predicate is not None else _match_all, scope=scope)
+        rows = _after_id(schema, rows, after_id)
+        page = rows[:limit]
+        next_after_id = page[-1].get(record_id_field(schema)) if len(rows) > limit else None
+        return RecordPage(records=page, next_after_id=next_after_id)
+
+    def list_records(
+        self,
+        schema: RecordSchema,
+        limit: int = 20,
+        scope: RecordScope | None = None,
+        *,
+        after_id: object | None = None,
+    ) -> List[dict]:
         scope = scope or RecordScope()
         self._cleanup_expired(schema, scope)
         records = list(self._data.get(schema.name, []))
         visible = [_strip_system_fields(rec) for rec in records if _record_visible(schema, rec, scope)]
-        ordered = sort_records(schema, visible)
+        ordered = _after_id(schema, sort_records(schema, visible), after_id)
         return ordered[:limit]
 
     def _cleanup_expired(self, schema: RecordSchema, scope: RecordScope) -> None:
@@ -187,11 +217,20 @@ class MemoryStore:
         self._counters.clear()
         self._state.clear()
 
-    def load_state(self) -> dict:
-        return dict(self._state)
+    def load_state(self, keys: Iterable[str] | None = None) -> dict:
+        if keys is None:
+            return dict(self._state)
+        return {key: self._state[key] for key in dict.fromkeys(keys) if key in self._state}
 
-    def save_state(self, state: dict) -> None:
-        self._state = dict(state)
+    def save_state(self, state: dict, *, keys: Iterable[str] | None = None) -> None:
+        if keys is None:
+            self._state = dict(state)
+            return
+        for key in dict.fromkeys(keys):
+            if key in state:
+                self._state[key] = state[key]
+            else:
+                self._state.pop(key, None)
 
     def get_metadata(self) -> PersistenceMetadata:
         return PersistenceMetadata(
@@ -202,6 +241,18 @@ class MemoryStore:
         )
 
 
+def _match_all(_record: dict) -> bool:
+    return True
+
+
+def _after_id(schema: RecordSchema, records: List[dict], after_id: object | None) -> List[dict]:
+    if after_id is None:
+        return records
+    id_field = record_id_field(schema)
+    floor = record_id_sort_key(after_id)
+    return [rec for rec in records if record_id_sort_key(rec.get(id_field)) > floor]
+
+
 def _matches_filter(record: dict, filters: dict[str, Any]) -> bool:
     for field, expected in filters.items():
         value = record.get(field)
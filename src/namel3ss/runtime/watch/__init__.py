@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from namel3ss.runtime.watch.paths import scan_project_sources, snapshot_paths
+from namel3ss.runtime.watch.watcher import BACKEND_INOTIFY, BACKEND_POLL, SourceWatcher
+
+__all__ = ["BACKEND_INOTIFY", "BACKEND_POLL", "SourceWatcher", "scan_project_sources", "snapshot_paths"]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+_SKIPPED_DIRS = {"node_modules", "__pycache__"}
+
+
+def scan_project_sources(project_root: Path) -> list[Path]:
+    paths: list[Path] = []
+    for path in sorted(project_root.rglob("*.ai"), key=lambda p: p.as_posix()):
+        if ".namel3ss" in path.parts:
+            continue
+        paths.append(path)
+    return paths or [project_root / "app.ai"]
+
+
+def snapshot_paths(paths: list[Path]) -> dict[Path, tuple[int, int]]:
+    snapshot: dict[Path, tuple[int, int]] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            snapshot[path] = (-1, -1)
+    return snapshot
+
+
+def project_dirs(project_root: Path) -> list[Path]:
+    dirs: list[Path] = []
+    for current, children, _files in os.walk(project_root):
+        children[:] = sorted(name for name in children if not name.startswith(".") and name not in _SKIPPED_DIRS)
+        dirs.append(Path(current))
+    return dirs
+
+
+__all__ = ["project_dirs", "scan_project_sources", "snapshot_paths"]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import os
+import select
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from namel3ss.runtime.watch.inotify import (
+    IN_CREATE,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVE_SELF,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    InotifyHandle,
+    inotify_available,
+)
+from namel3ss.runtime.watch.paths import project_dirs, scan_project_sources, snapshot_paths
+
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.05
+BACKEND_INOTIFY = "inotify"
+BACKEND_POLL = "poll"
+
+
+class SourceWatcher:
+    """Publishes a revision counter that increases whenever a tracked source file changes.
+
+    Callers read ``revision`` before loading and compare it with the current
+    value later, so the request path never touches the file system. With no
+    tracked files, any ``.ai`` file in the project counts. Changes are picked up
+    by inotify where available and by a background poll thread otherwise.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        use_inotify: bool = True,
+    ) -> None:
+        self.project_root = Path(project_root)
+        self._poll_interval = max(0.01, float(poll_interval))
+        self._debounce = max(0.0, float(debounce))
+        self._use_inotify = use_inotify
+        self._revision = 0
+        self._paths: frozenset[Path] = frozenset()
+        self._lock = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._inotify: InotifyHandle | None = None
+        self._wakeup: tuple[int, int] | None = None
+        self._watches: dict[int, Path] = {}
+        self._baseline: dict[Path, tuple[int, int]] = {}
+        self.backend: str | None = None
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def start(self) -> None:
+        with self._lock:
+            self._start_locked()
+
+    def track(self, paths: Iterable[Path]) -> None:
+        """Watch exactly these files, keeping changes seen since the previous call."""
+        tracked = frozenset(Path(path) for path in paths)
+        with self._lock:
+            self._start_locked()
+            self._paths = tracked
+            if self._inotify is not None:
+                self._sync_watches_locked()
+                return
+            current = snapshot_paths(self._watched_files())
+            # Files already polled keep their old stamp so an edit made during a load is still noticed.
+            self._baseline = {path: self._baseline.get(path, stamp) for path, stamp in current.items()}
+
+    def wait_for_change(self, revision: int, timeout: float | None = None) -> bool:
+        with self._lock:
+            return self._lock.wait_for(lambda: self._revision != revision, timeout=timeout)
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+            wakeup = self._wakeup
+        if wakeup is not None:
+            try:
+                os.write(wakeup[1], b"x")
+            except OSError:
+                pass
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            if self._wakeup is not None:
+                for fd in self._wakeup:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+                self._wakeup = None
+            self._watches = {}
+
+    def _start_locked(self) -> None:
+        if self._thread is not None or self._stop.is_set():
+            return
+        self._baseline = snapshot_paths(self._watched_files())
+        target = self._run_poll
+        self.backend = BACKEND_POLL
+        if self._use_inotify and inotify_available():
+            try:
+                self._inotify = InotifyHandle()
+                self._wakeup = os.pipe()
+                target = self._run_inotify
+                self.backend = BACKEND_INOTIFY
+            except OSError:
+                # Descriptor limits reached; fall back to polling.
+                self._inotify = None
+        if self._inotify is not None:
+            self._sync_watches_locked()
+        self._thread = threading.Thread(target=target, name="namel3ss-source-watch", daemon=True)
+        self._thread.start()
+
+    def _watched_files(self) -> list[Path]:
+        if self._paths:
+            return sorted(self._paths, key=lambda p: p.as_posix())
+        return scan_project_sources(self.project_root)
+
+    def _bump(self) -> None:
+        with self._lock:
+            self._revision += 1
+            self._lock.notify_all()
+
+    def _run_poll(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            current = snapshot_paths(self._watched_files())
+            with self._lock:
+                changed = current != self._baseline
+            if not changed:
+                continue
+            # Editors often save in several steps; fold them into one revision.
+            if self._stop.wait(self._debounce):
+                return
+            settled = snapshot_paths(self._watched_files())
+            with self._lock:
+                self._baseline = settled
+            self._bump()
+
+    def _run_inotify(self) -> None:
+        handle = self._inotify
+        wakeup = self._wakeup
+        if handle is None or wakeup is None:
+            return
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([handle.fd, wakeup[0]], [], [])
+            except (OSError, ValueError):
+                return
+            if self._stop.is_set():
+                return
+            if handle.fd not in ready or not self._handle_events(handle.read_events()):
+                continue
+            deadline = time.monotonic() + self._debounce
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    ready, _, _ = select.select([handle.fd], [], [], remaining)
+                except (OSError, ValueError):
+                    return
+                if not ready:
+                    break
+                self._handle_events(handle.read_events())
+            self._bump()
+
+    def _handle_events(self, events: list[tuple[int, int, str]]) -> bool:
+        changed = False
+        with self._lock:
+            for wd, mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    changed = True
+                    continue
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    changed = True
+                    continue
+                if not name:
+                    continue
+                path = directory / name
+                if self._paths:
+                    changed = changed or path in self._paths
+                    continue
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    for child in project_dirs(path):
+                        self._add_watch_locked(child)
+                    changed = True
+                elif name.endswith(".ai"):
+                    changed = True
+        return changed
+
+    def _sync_watches_locked(self) -> None:
+        if self._paths:
+            wanted = {path.parent for path in self._paths}
+        else:
+            wanted = set(project_dirs(self.project_root))
+        wanted.add(self.project_root)
+        for wd, directory in list(self._watches.items()):
+            if directory not in wanted and self._inotify is not None:
+                self._watches.pop(wd, None)
+                self._inotify.remove(wd)
+        watched = set(self._watches.values())
+        for directory in sorted(wanted - watched, key=lambda p: p.as_posix()):
+            self._add_watch_locked(directory)
+
+    def _add_watch_locked(self, directory: Path) -> None:
+        if self._inotify is None:
+            return
+        wd = self._inotify.add(directory)
+        if wd is not None:
+            self._watches[wd] = directory
+
+
+__all__ = ["BACKEND_INOTIFY", "BACKEND_POLL", "DEFAULT_DEBOUNCE", "DEFAULT_POLL_INTERVAL", "SourceWatcher"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -296,7 +297,7 @@ def update_memory_packs(source: str, session: SessionState | None, app_path: str
             if override_value is None:
                 continue
             overrides[agent_name] = override_value
-        config = load_config(app_path=app_file)
+        config = copy.deepcopy(load_config(app_path=app_file))
         config.memory_packs.default_pack = default_pack
         config.memory_packs.agent_overrides = overrides
         write_memory_pack_config(app_file.parent, config.memory_packs)
@@ -102,7 +102,7 @@ def handle_api_get(handler: Any) -> None:
     if handler.path == "/api/migrations/plan":
         _respond_with_source(handler, source, get_migrations_plan_payload, kind="data", include_app_path=True)
         return
-    if handler.path == "/api/logs":
+    if path == "/api/logs":
         payload = _observability_payload(handler, "logs")
         handler._respond_json(payload, status=200)
         return
@@ -122,15 +122,15 @@ def handle_api_get(handler: Any) -> None:
         status = 200 if payload.get("ok", True) else 404
         handler._respond_json(payload, status=status)
         return
-    if handler.path == "/api/traces":
+    if path == "/api/traces":
         payload = _observability_payload(handler, "traces")
         handler._respond_json(payload, status=200)
         return
-    if handler.path == "/api/trace":
+    if path == "/api/trace":
         payload = _observability_payload(handler, "trace")
         handler._respond_json(payload, status=200)
         return
-    if handler.path == "/api/metrics":
+    if path == "/api/metrics":
         payload = _observability_payload(handler, "metrics")
         handler._respond_json(payload, status=200)
         return
@@ -439,21 +439,15 @@ def _observability_payload(handler: Any, kind: str) -> dict:
 
     if not observability_enabled():
         return _empty_observability_payload(kind)
-    builder = _load_observability_builder(kind)
+    builder = _load_observability_builder(kind, urlparse(handler.path).query)
     if builder is None:
         return _empty_observability_payload(kind)
     return builder(handler.server.project_root, handler.server.app_path)  # type: ignore[attr-defined]
 
-def _load_observability_builder(kind: str):
+def _load_observability_builder(kind: str, query: str | None = None):
     from namel3ss.runtime import observability_api
 
-    mapping = {
-        "logs": observability_api.get_logs_payload,
-        "trace": observability_api.get_trace_payload,
-        "traces": observability_api.get_traces_payload,
-        "metrics": observability_api.get_metrics_payload,
-    }
-    return mapping.get(kind)
+    return observability_api.observability_builder(kind, query)
 
 def _empty_observability_payload(kind: str) -> dict:
     if kind == "metrics":
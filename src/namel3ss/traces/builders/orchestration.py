@@ -32,6 +32,8 @@ def build_orchestration_branch_finished(
     title: str,
     lines: list[str],
     error_message: str | None = None,
+    duration_ms: int | None = None,
+    concurrent: bool | None = None,
 ) -> dict:
     event = {
         "type": TraceEventType.ORCHESTRATION_BRANCH_FINISHED,
@@ -44,6 +46,10 @@ def build_orchestration_branch_finished(
     }
     if error_message:
         event["error_message"] = error_message
+    if duration_ms is not None:
+        event["duration_ms"] = int(duration_ms)
+    if concurrent is not None:
+        event["concurrent"] = bool(concurrent)
     return event
 
 
@@ -44,7 +44,7 @@ def _build_chart_element(
             )
         if store is not None:
             scope = build_record_scope(record, identity)
-            rows = store.list_records(record, scope=scope)[:50]
+            rows = store.list_records(record, limit=50, scope=scope)
         source_label = record.name
     elif item.source:
         source_label = _state_path_label(item.source)
@@ -44,7 +44,7 @@ def build_view_item(
         rows: list[dict] = []
         if store is not None:
             scope = build_record_scope(record, identity)
-            rows = store.list_records(record, scope=scope)[:20]
+            rows = store.list_records(record, limit=20, scope=scope)
         columns = _resolve_table_columns(record, None)
         rows = _stable_rows_by_id(rows, _table_id_field(record))
         element = {
@@ -62,7 +62,7 @@ def build_view_item(
     rows = []
     if store is not None:
         scope = build_record_scope(record, identity)
-        rows = store.list_records(record, scope=scope)[:20]
+        rows = store.list_records(record, limit=20, scope=scope)
     primary = _default_list_primary(record)
     rows = _stable_rows_by_id(rows, _list_id_field_ir(record))
     element = {
@@ -129,7 +129,7 @@ def build_table_item(
         rows: list[dict] = []
         if store is not None:
             scope = build_record_scope(record, identity)
-            rows = store.list_records(record, scope=scope)[:20]
+            rows = store.list_records(record, limit=20, scope=scope)
         columns = _resolve_table_columns(record, item.columns)
         if item.sort:
             rows = _apply_table_sort(rows, item.sort, record)
@@ -221,7 +221,7 @@ def build_list_item(
         rows: list[dict] = []
         if store is not None:
             scope = build_record_scope(record, identity)
-            rows = store.list_records(record, scope=scope)[:20]
+            rows = store.list_records(record, limit=20, scope=scope)
         action_entries, action_map = _build_list_actions(element_id, page_slug, item.actions, state_ctx, mode, warnings)
         element = {
             "type": "list",
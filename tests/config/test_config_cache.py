@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import os
+import pickle
+
+import pytest
+
+from namel3ss.config import loader_base
+from namel3ss.config.loader import load_config, resolve_config
+from namel3ss.config.model import AppConfig, PersistenceConfig
+from namel3ss.config.snapshot import is_frozen_config
+
+
+def _count_parses(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    original = loader_base._parse_toml
+
+    def _tracked(text, path):
+        calls.append(1)
+        return original(text, path)
+
+    monkeypatch.setattr(loader_base, "_parse_toml", _tracked)
+    return calls
+
+
+def test_repeated_loads_share_one_snapshot(tmp_path, monkeypatch) -> None:
+    (tmp_path / "namel3ss.toml").write_text('[persistence]\ntarget = "sqlite"\n', encoding="utf-8")
+    calls = _count_parses(monkeypatch)
+    first = load_config(app_path=tmp_path / "app.ai")
+    assert load_config(root=tmp_path) is first
+    config, sources = resolve_config(app_path=tmp_path / "app.ai")
+    assert config is first
+    assert sources[0].kind == "toml"
+    assert first.persistence.target == "sqlite"
+    assert len(calls) == 1
+
+
+def test_file_and_env_changes_invalidate(tmp_path, monkeypatch) -> None:
+    toml_path = tmp_path / "namel3ss.toml"
+    toml_path.write_text('[persistence]\ntarget = "sqlite"\n', encoding="utf-8")
+    calls = _count_parses(monkeypatch)
+    assert load_config(root=tmp_path).persistence.target == "sqlite"
+    stat = toml_path.stat()
+    toml_path.write_text('[persistence]\ntarget = "memory"\n', encoding="utf-8")
+    os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_config(root=tmp_path).persistence.target == "memory"
+    monkeypatch.setenv("N3_PERSIST_TARGET", "sqlite")
+    assert load_config(root=tmp_path).persistence.target == "sqlite"
+    monkeypatch.delenv("N3_PERSIST_TARGET")
+    assert load_config(root=tmp_path).persistence.target == "memory"
+    assert len(calls) == 4
+    toml_path.unlink()
+    assert load_config(root=tmp_path).persistence.target == "memory"
+    assert all(source.kind != "toml" for source in resolve_config(root=tmp_path)[1])
+
+
+def test_cached_dotenv_values_are_applied_again(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("N3_CACHE_DOTENV_PROBE", raising=False)
+    (tmp_path / ".env").write_text("N3_CACHE_DOTENV_PROBE=from-dotenv\n", encoding="utf-8")
+    first = load_config(root=tmp_path)
+    assert os.environ["N3_CACHE_DOTENV_PROBE"] == "from-dotenv"
+    monkeypatch.delenv("N3_CACHE_DOTENV_PROBE")
+    assert load_config(root=tmp_path) is first
+    assert os.environ["N3_CACHE_DOTENV_PROBE"] == "from-dotenv"
+    monkeypatch.delenv("N3_CACHE_DOTENV_PROBE")
+
+
+def test_snapshot_is_read_only_and_copies_are_editable(tmp_path) -> None:
+    config = load_config(root=tmp_path)
+    assert isinstance(config, AppConfig)
+    assert isinstance(config.persistence, PersistenceConfig)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.persistence.target = "sqlite"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.persistence = PersistenceConfig()
+    editable = copy.deepcopy(config)
+    editable.persistence.target = "sqlite"
+    assert not is_frozen_config(editable.persistence)
+    assert config.persistence.target == "memory"
+    replaced = dataclasses.replace(config.persistence, target="sqlite")
+    replaced.db_path = "other.db"
+    assert type(replaced) is PersistenceConfig
+    restored = pickle.loads(pickle.dumps(config))
+    assert type(restored) is AppConfig
+    restored.persistence.target = "sqlite"
+
+
+def test_snapshot_lists_and_dicts_are_read_only(tmp_path) -> None:
+    config = load_config(root=tmp_path)
+    assert isinstance(config.persistence.replica_urls, list)
+    assert isinstance(config.identity.defaults, dict)
+    with pytest.raises(TypeError):
+        config.persistence.replica_urls.append("postgres://replica")
+    with pytest.raises(TypeError):
+        config.identity.defaults["role"] = "admin"
+    assert load_config(root=tmp_path).persistence.replica_urls == []
+    assert load_config(root=tmp_path).identity.defaults == {}
+    editable = copy.deepcopy(config)
+    editable.persistence.replica_urls.append("postgres://replica")
+    editable.identity.defaults["role"] = "admin"
+    replaced = dataclasses.replace(config.persistence)
+    replaced.replica_urls.append("postgres://replica")
+    restored = pickle.loads(pickle.dumps(config))
+    restored.identity.defaults["role"] = "admin"
+    assert type(restored.identity.defaults) is dict
+    assert config.persistence.replica_urls == [] and config.identity.defaults == {}
@@ -92,6 +92,12 @@ def _secret_audit_path(tmp_path, monkeypatch):
     monkeypatch.setenv("N3_SECRET_AUDIT_PATH", str(tmp_path / "secret_audit.jsonl"))
 
 
+@pytest.fixture(autouse=True)
+def _compiled_cache_dir(tmp_path, monkeypatch):
+    # The compiled cache stays on; each test gets its own per-user cache folder.
+    monkeypatch.setenv("N3_COMPILED_CACHE_DIR", str(tmp_path / "compiled-cache"))
+
+
 __all__ = ["parse_program", "lower_ir_program", "run_flow"]
 
 
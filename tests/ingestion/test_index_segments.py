@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from namel3ss.ingestion.policy import ACTION_RETRIEVAL_INCLUDE_WARN, PolicyDecision
+from namel3ss.ingestion.segments import index_segments
+from namel3ss.ingestion.store import drop_index, update_index
+from namel3ss.retrieval import keyword_index
+from namel3ss.retrieval.api import run_retrieval
+
+
+WORDS = ["invoice", "payment", "refund", "account", "shipping", "contract", "renewal", "balance"]
+
+
+def _chunks(rng: random.Random, upload_id: str, count: int) -> list[dict]:
+    chunks = []
+    for chunk_index in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(2, 10))]
+        chunks.append(
+            {
+                "document_id": upload_id,
+                "source_name": f"{upload_id}.txt",
+                "page_number": 1 + chunk_index // 3,
+                "chunk_index": chunk_index,
+                "ingestion_phase": "deep" if chunk_index % 2 else "quick",
+                "keywords": sorted(set(words))[:3],
+                "text": " ".join(words),
+            }
+        )
+    return chunks
+
+
+def _retrieve(state: dict, query: str, *, explain: bool = False) -> dict:
+    decision = PolicyDecision(
+        action=ACTION_RETRIEVAL_INCLUDE_WARN,
+        allowed=True,
+        reason="test",
+        required_permissions=(),
+        source="test",
+    )
+    response = run_retrieval(
+        query=query,
+        state=state,
+        project_root=None,
+        app_path=None,
+        explain=explain,
+        policy_decision=decision,
+    )
+    response.pop("explain", None)
+    return response
+
+
+def test_segments_follow_adds_replacements_and_drops() -> None:
+    rng = random.Random(3)
+    state: dict = {"ingestion": {}}
+    expected: list[tuple[str, int]] = []
+    for step in range(40):
+        upload_id = f"upload-{rng.randint(0, 7)}"
+        state["ingestion"][upload_id] = {"status": "pass"}
+        expected = [item for item in expected if item[0] != upload_id]
+        if step % 5 == 4:
+            drop_index(state, upload_id=upload_id)
+        else:
+            count = rng.randint(0, 4)
+            update_index(state, upload_id=upload_id, chunks=_chunks(rng, upload_id, count), low_quality=False)
+            expected.extend((upload_id, idx) for idx in range(count))
+        entries = state["index"]["chunks"]
+        assert [(entry["upload_id"], entry["chunk_index"]) for entry in entries] == expected
+        manifest = index_segments(state["index"], entries)
+        assert manifest == state["index"]["segments"]
+        assert sum(span["count"] for span in manifest.values()) == len(entries)
+    for query in ["invoice", "refund balance", "oice pay", "missing"]:
+        assert _retrieve(state, query) == _retrieve(state, query, explain=True)
+
+
+def test_replacing_one_upload_rebuilds_only_its_segment(monkeypatch) -> None:
+    keyword_index.clear_keyword_index_cache()
+    rng = random.Random(5)
+    state: dict = {"ingestion": {}}
+    for upload in range(5):
+        upload_id = f"upload-{upload}"
+        state["ingestion"][upload_id] = {"status": "pass"}
+        update_index(state, upload_id=upload_id, chunks=_chunks(rng, upload_id, 6), low_quality=False)
+    _retrieve(state, "invoice")
+    kept = [entry for entry in state["index"]["chunks"] if entry["upload_id"] != "upload-1"]
+    built: list[int] = []
+    original = keyword_index.build_keyword_index
+
+    def _counting(entries, **kwargs):
+        built.append(len(entries))
+        return original(entries, **kwargs)
+
+    monkeypatch.setattr(keyword_index, "build_keyword_index", _counting)
+    update_index(state, upload_id="upload-1", chunks=_chunks(rng, "upload-1", 2), low_quality=False)
+    assert built == [2]
+    assert _retrieve(state, "invoice") == _retrieve(state, "invoice", explain=True)
+    assert built == [2]
+    assert all(a is b for a, b in zip(kept, state["index"]["chunks"]))
+    assert list(state["index"]["segments"]) == ["upload-0", "upload-2", "upload-3", "upload-4", "upload-1"]
+
+
+def test_stale_manifest_is_rebuilt_after_app_edits() -> None:
+    rng = random.Random(9)
+    state: dict = {"ingestion": {"a": {"status": "pass"}, "b": {"status": "pass"}}}
+    update_index(state, upload_id="a", chunks=_chunks(rng, "a", 3), low_quality=False)
+    update_index(state, upload_id="b", chunks=_chunks(rng, "b", 3), low_quality=False)
+    # Apps may rewrite the chunk list directly, leaving the manifest behind.
+    state["index"]["chunks"] = [entry for entry in state["index"]["chunks"] if entry["chunk_index"] != 1]
+    assert index_segments(state["index"], state["index"]["chunks"]) is None
+    assert _retrieve(state, "invoice") == _retrieve(state, "invoice", explain=True)
+    drop_index(state, upload_id="a")
+    assert [entry["upload_id"] for entry in state["index"]["chunks"]] == ["b", "b"]
+    assert state["index"]["segments"] == {"b": {"start": 0, "count": 2}}
+
+
+def _keyword_chunks(upload_id: str, words: list[str]) -> list[dict]:
+    return [
+        {
+            "upload_id": upload_id,
+            "document_id": upload_id,
+            "source_name": f"{upload_id}.txt",
+            "page_number": 1,
+            "chunk_index": chunk_index,
+            "chunk_id": f"{upload_id}:{chunk_index}",
+            "ingestion_phase": "deep",
+            "keywords": [word],
+            "text": word,
+        }
+        for chunk_index, word in enumerate(words)
+    ]
+
+
+def test_chunk_lists_of_the_same_shape_never_share_an_index() -> None:
+    keyword_index.clear_keyword_index_cache()
+    # Both lists carry the same revision, count and end chunks.
+    first = {"index": {"revision": 1, "chunks": _keyword_chunks("u", ["alpha", "beta", "omega"])}}
+    second = {"index": {"revision": 1, "chunks": _keyword_chunks("u", ["alpha", "gamma", "omega"])}}
+    for state in (first, second, first):
+        state["ingestion"] = {"u": {"status": "pass"}}
+        for query in ["beta", "gamma"]:
+            assert _retrieve(state, query) == _retrieve(state, query, explain=True)
+    assert [item["text"] for item in _retrieve(second, "gamma")["results"]] == ["gamma"]
+
+
+def test_segment_indexes_follow_the_chunks_not_the_manifest() -> None:
+    keyword_index.clear_keyword_index_cache()
+    states = []
+    for words in (["alpha", "beta", "omega"], ["alpha", "gamma", "omega"]):
+        state: dict = {"ingestion": {"u": {"status": "pass"}}}
+        update_index(
+            state,
+            upload_id="u",
+            chunks=_keyword_chunks("u", words),
+            low_quality=False,
+        )
+        states.append(state)
+    assert states[0]["index"]["segments"] == states[1]["index"]["segments"]
+    for state in states + states:
+        for query in ["beta", "gamma"]:
+            assert _retrieve(state, query) == _retrieve(state, query, explain=True)
+
+    # An app edit in the middle of a segment is noticed although the manifest still matches.
+    states[0]["index"]["chunks"][1]["keywords"] = ["zebra"]
+    states[0]["index"]["chunks"][1]["text"] = "zebra"
+    assert _retrieve(states[0], "zebra") == _retrieve(states[0], "zebra", explain=True)
+    assert [item["text"] for item in _retrieve(states[0], "zebra")["results"]] == ["zebra"]
+
+
+def test_keyword_postings_stay_out_of_state() -> None:
+    rng = random.Random(13)
+    state: dict = {"ingestion": {}}
+    for upload in range(3):
+        upload_id = f"upload-{upload}"
+        state["ingestion"][upload_id] = {"status": "pass"}
+        update_index(state, upload_id=upload_id, chunks=_chunks(rng, upload_id, 5), low_quality=False)
+    drop_index(state, upload_id="upload-1")
+    assert set(state["index"]) == {"chunks", "segments"}
+    expected = _retrieve(state, "invoice", explain=True)
+    # After a restart each segment's index is rebuilt from its chunks on the first query.
+    keyword_index.clear_keyword_index_cache()
+    state = json.loads(json.dumps(state))
+    assert _retrieve(state, "invoice") == expected
+
+
+def test_keyword_index_imports_before_the_ingestion_package() -> None:
+    env = os.environ.copy()
+    root = Path(__file__).resolve().parents[2]
+    env["PYTHONPATH"] = str(root / "src")
+    cmd = [sys.executable, "-c", "import namel3ss.retrieval.keyword_index"]
+    proc = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=root)
+    assert proc.returncode == 0, proc.stderr
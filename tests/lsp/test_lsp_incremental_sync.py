@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+
+from namel3ss.lsp.diagnostics_worker import DiagnosticsWorker
+from namel3ss.lsp.documents import TextDocument
+from namel3ss.lsp.server import serve_stdio
+
+
+SOURCE = 'spec is "1.0"\n\nflow "demo":\n  return "ok"\n\npage "home":\n  button "Run":\n    calls flow "demo"\n'
+
+
+def _change(start: tuple[int, int], end: tuple[int, int], text: str) -> dict:
+    return {
+        "range": {
+            "start": {"line": start[0], "character": start[1]},
+            "end": {"line": end[0], "character": end[1]},
+        },
+        "text": text,
+    }
+
+
+def _frame(payload: dict) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+
+def _read_frames(data: bytes) -> list[dict]:
+    messages = []
+    while data:
+        header, data = data.split(b"\r\n\r\n", 1)
+        length = int(header.split(b":", 1)[1])
+        messages.append(json.loads(data[:length]))
+        data = data[length:]
+    return messages
+
+
+def test_range_changes_match_the_edited_text() -> None:
+    document = TextDocument("file:///app.ai", 'a = "\U0001F600x"\r\nsecond\nthird')
+    document.apply_changes(
+        [
+            _change((0, 7), (0, 8), "y"),
+            _change((1, 3), (2, 2), "-"),
+            _change((1, 4), (1, 4), "\nnew line"),
+            _change((3, 0), (3, 0), "!"),
+        ],
+        version=4,
+    )
+    assert document.text == 'a = "\U0001F600y"\r\nsec-\nnew lineird!'
+    assert document.line_count() == 3
+    assert document.version == 4 and document.revision == 1
+    document.apply_changes([{"text": "replaced\n"}])
+    assert document.text == "replaced\n" and document.version == 4
+
+
+def test_symbol_index_is_cached_per_revision() -> None:
+    document = TextDocument("file:///app.ai", SOURCE)
+    index = document.symbols()
+    assert document.symbols() is index
+    assert {definition.name for definition in index.definitions.values()} == {"demo", "home"}
+    document.apply_changes([_change((2, 6), (2, 10), "start")])
+    assert document.symbols() is not index
+    assert {definition.name for definition in document.symbols().definitions.values()} == {"start", "home"}
+
+
+def test_worker_publishes_only_the_latest_revision() -> None:
+    revisions = {"doc": 0}
+    published: list[tuple[str, int | None, list]] = []
+    computing = threading.Event()
+    release = threading.Event()
+
+    def compute(text: str) -> list:
+        if text == "slow":
+            computing.set()
+            release.wait(timeout=5)
+        return [text]
+
+    worker = DiagnosticsWorker(
+        snapshot=lambda uri: (revisions[uri], revisions[uri], "slow" if revisions[uri] == 3 else f"v{revisions[uri]}"),
+        compute=compute,
+        publish=lambda uri, version, diagnostics: published.append((uri, version, diagnostics)),
+        delay=30,
+    )
+    for revision in (1, 2):
+        revisions["doc"] = revision
+        worker.schedule("doc", revision)
+    worker.close()
+    assert published == [("doc", 2, ["v2"])]
+
+    worker = DiagnosticsWorker(
+        snapshot=lambda uri: (revisions[uri], revisions[uri], "slow" if revisions[uri] == 3 else f"v{revisions[uri]}"),
+        compute=compute,
+        publish=lambda uri, version, diagnostics: published.append((uri, version, diagnostics)),
+        delay=0,
+    )
+    revisions["doc"] = 3
+    worker.schedule("doc", 3)
+    assert computing.wait(timeout=5)
+    revisions["doc"] = 4
+    release.set()
+    worker.schedule("doc", 4)
+    worker.close()
+    assert published[1:] == [("doc", 4, ["v4"])]
+
+
+def test_stdio_serves_incremental_edits_and_definitions() -> None:
+    uri = "file:///project/app.ai"
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "version": 1, "text": SOURCE}}},
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {"textDocument": {"uri": uri, "version": 2}, "contentChanges": [_change((2, 11), (2, 12), "")]},
+        },
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {"textDocument": {"uri": uri, "version": 3}, "contentChanges": [_change((2, 11), (2, 11), ":")]},
+        },
+        {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "textDocument/definition",
+            "params": {"textDocument": {"uri": uri}, "position": {"line": 7, "character": 17}},
+        },
+        {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "method": "textDocument/rename",
+            "params": {"textDocument": {"uri": uri}, "position": {"line": 2, "character": 7}, "newName": "start"},
+        },
+    ]
+    writer = io.BytesIO()
+    serve_stdio(io.BytesIO(b"".join(_frame(message) for message in messages)), writer)
+    replies = _read_frames(writer.getvalue())
+    responses = {reply["id"]: reply for reply in replies if "id" in reply}
+    assert responses[1]["result"]["capabilities"]["textDocumentSync"] == 2
+    assert responses[2]["result"] == [
+        {"uri": uri, "range": {"start": {"line": 2, "character": 5}, "end": {"line": 2, "character": 11}}}
+    ]
+    edits = responses[3]["result"]["changes"][uri]
+    assert [(edit["range"]["start"]["line"], edit["newText"]) for edit in edits] == [(2, '"start"'), (7, '"start"')]
+    published = [reply["params"] for reply in replies if reply.get("method") == "textDocument/publishDiagnostics"]
+    assert published[-1] == {"uri": uri, "diagnostics": [], "version": 3}
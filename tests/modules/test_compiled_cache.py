@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.ir.serialize import dump_ir
+from namel3ss.module_loader import core
+from namel3ss.module_loader import load_project
+from namel3ss.module_loader.compiled_cache import AST_DIR, COMPILED_DIR, KEY_FILENAME, compiled_cache_root
+from namel3ss.runtime.server.concurrency import compiled_cache_enabled
+
+
+APP_SOURCE = '''spec is "1.0"
+
+use "inventory" as inv
+
+flow "echo":
+  return input.message
+'''
+
+CAPSULE_SOURCE = '''capsule "inventory":
+  exports:
+    flow "calc_total"
+'''
+
+LOGIC_SOURCE = '''flow "calc_total":
+  return 42
+'''
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _project(tmp_path: Path) -> Path:
+    app = tmp_path / "app.ai"
+    _write(app, APP_SOURCE)
+    _write(tmp_path / "modules" / "inventory" / "capsule.ai", CAPSULE_SOURCE)
+    _write(tmp_path / "modules" / "inventory" / "logic.ai", LOGIC_SOURCE)
+    return app
+
+
+def _count_lowering(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    original = core.lower_program
+
+    def _tracked(program):
+        calls.append(1)
+        return original(program)
+
+    monkeypatch.setattr(core, "lower_program", _tracked)
+    return calls
+
+
+def test_warm_load_reuses_compiled_program(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("N3_PERSIST_ROOT", raising=False)
+    app = _project(tmp_path)
+    calls = _count_lowering(monkeypatch)
+    cold = load_project(app, compiled_cache=True)
+    warm = load_project(app, compiled_cache=True)
+    assert len(calls) == 1
+    assert dump_ir(warm.program) == dump_ir(cold.program)
+    assert warm.sources == cold.sources
+    assert warm.public_flows == cold.public_flows
+    root = compiled_cache_root(app)
+    assert root.parent == Path(os.environ["N3_COMPILED_CACHE_DIR"])
+    assert not (tmp_path / ".namel3ss").exists()
+    assert len(list((root / COMPILED_DIR).glob("*.pickle"))) == 1
+    assert len(list((root / AST_DIR).glob("*.pickle"))) == 3
+
+
+def test_source_edit_rebuilds_and_replaces_blob(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("N3_PERSIST_ROOT", raising=False)
+    app = _project(tmp_path)
+    calls = _count_lowering(monkeypatch)
+    load_project(app, compiled_cache=True)
+    _write(tmp_path / "modules" / "inventory" / "logic.ai", LOGIC_SOURCE.replace("42", "7"))
+    changed = load_project(app, compiled_cache=True)
+    assert len(calls) == 2
+    assert changed.sources[tmp_path / "modules" / "inventory" / "logic.ai"].endswith("return 7\n")
+    assert len(list((compiled_cache_root(app) / COMPILED_DIR).glob("*.pickle"))) == 1
+    overrides = {app: APP_SOURCE.replace("input.message", '"override"')}
+    load_project(app, compiled_cache=True, source_overrides=overrides)
+    assert len(calls) == 3
+
+
+def test_new_module_files_and_shadowing_capsules_rebuild(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("N3_PERSIST_ROOT", raising=False)
+    app = _project(tmp_path)
+    calls = _count_lowering(monkeypatch)
+    load_project(app, compiled_cache=True)
+    _write(tmp_path / "modules" / "inventory" / "b.ai", 'flow "b_total":\n  return 1\n')
+    added = load_project(app, compiled_cache=True)
+    assert len(calls) == 2
+    assert "inventory.b_total" in {flow.name for flow in added.program.flows}
+    assert tmp_path / "modules" / "inventory" / "b.ai" in added.modules["inventory"].files
+
+    packaged = tmp_path / "packaged"
+    packaged_app = packaged / "app.ai"
+    _write(packaged_app, APP_SOURCE)
+    _write(packaged / "packages" / "inventory" / "capsule.ai", CAPSULE_SOURCE)
+    _write(packaged / "packages" / "inventory" / "logic.ai", LOGIC_SOURCE)
+    assert load_project(packaged_app, compiled_cache=True).modules["inventory"].path == packaged / "packages" / "inventory"
+    _write(packaged / "modules" / "inventory" / "capsule.ai", CAPSULE_SOURCE)
+    _write(packaged / "modules" / "inventory" / "logic.ai", LOGIC_SOURCE.replace("42", "7"))
+    shadowed = load_project(packaged_app, compiled_cache=True)
+    assert shadowed.modules["inventory"].path == packaged / "modules" / "inventory"
+    assert len(calls) == 4
+
+
+def test_corrupt_cache_entries_are_rebuilt(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("N3_PERSIST_ROOT", raising=False)
+    app = _project(tmp_path)
+    calls = _count_lowering(monkeypatch)
+    expected = dump_ir(load_project(app, compiled_cache=True).program)
+    root = compiled_cache_root(app)
+    for path in [*(root / COMPILED_DIR).glob("*.pickle"), *(root / AST_DIR).glob("*.pickle")]:
+        path.write_bytes(b"not a pickle")
+    rebuilt = load_project(app, compiled_cache=True)
+    assert len(calls) == 2
+    assert dump_ir(rebuilt.program) == expected
+    assert dump_ir(load_project(app, compiled_cache=True).program) == expected
+    assert len(calls) == 2
+
+
+_EXECUTED: list[str] = []
+
+
+class _Payload:
+    def __reduce__(self):
+        return (_EXECUTED.append, ("unpickled",))
+
+
+def test_unsigned_pickles_are_never_loaded(tmp_path: Path, monkeypatch) -> None:
+    app = _project(tmp_path)
+    calls = _count_lowering(monkeypatch)
+    load_project(app, compiled_cache=True)
+    root = compiled_cache_root(app)
+    assert (root.parent / KEY_FILENAME).stat().st_mode & 0o077 == 0
+    for path in [*(root / COMPILED_DIR).glob("*.pickle"), *(root / AST_DIR).glob("*.pickle")]:
+        path.write_bytes(pickle.dumps(_Payload()))
+    load_project(app, compiled_cache=True)
+    assert _EXECUTED == []
+    assert len(calls) == 2
+
+
+def test_invalid_cache_setting_is_reported(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("N3_COMPILED_CACHE", raising=False)
+    app = _project(tmp_path)
+    assert compiled_cache_enabled(app_path=app) is True
+    (tmp_path / "concurrency.yaml").write_text("compiled_cache_enabled: maybe\n", encoding="utf-8")
+    with pytest.raises(Namel3ssError):
+        compiled_cache_enabled(app_path=app)
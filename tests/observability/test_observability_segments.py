@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from namel3ss.observability.log_store import LogStore, read_logs
+from namel3ss.observability.segment_store import SegmentStore
+from namel3ss.observability.trace_store import TraceStore, read_spans, trace_path
+
+
+def _identity(value: object) -> object:
+    return value
+
+
+def test_runs_rotate_segments_and_pages_skip_unread_ranges(tmp_path: Path, monkeypatch) -> None:
+    store = SegmentStore(tmp_path / "logs", max_bytes=200, retain_segments=2)
+    first = store.begin_run()
+    for batch in range(3):
+        store.append(first, [{"id": f"a{batch}{item}", "text": "x" * 20} for item in range(2)])
+    second = store.begin_run()
+    store.append(second, [{"id": "b0"}])
+    assert store.latest_run() == second
+    assert store.read_run() == [{"id": "b0"}]
+    assert [record["id"] for record in store.read_run(first)] == ["a00", "a01", "a10", "a11", "a20", "a21"]
+
+    reads: list[tuple[int, int]] = []
+    original = store._read_range
+
+    def _counting(segment: int, start: int, end: int) -> list[bytes]:
+        reads.append((segment, start))
+        return original(segment, start, end)
+
+    monkeypatch.setattr(store, "_read_range", _counting)
+    assert [record["id"] for record in store.read_run(first, offset=4, limit=1)] == ["a20"]
+    assert len(reads) == 1
+
+    for _ in range(6):
+        store.append(second, [{"id": "b", "text": "y" * 60}])
+    segments = sorted(path.name for path in (tmp_path / "logs").glob("segment-*.ndjson"))
+    assert len(segments) == 2
+    assert store.read_run(first) == []
+    assert len(store.read_run(second)) >= 1
+
+
+def test_trace_flush_appends_changes_and_keeps_start_order(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.ai"
+    traces = TraceStore(project_root=tmp_path, app_path=app_path, scrubber=_identity)
+    outer = traces.start_span(name="flow:demo", kind="flow", start_step=0)
+    inner = traces.start_span(name="step", kind="step", start_step=1)
+    traces.end_span(inner, status="ok", end_step=2)
+    traces.flush()
+    traces.end_span(outer, status="ok", end_step=3)
+    traces.start_span(name="late", kind="step", start_step=4)
+    traces.flush()
+
+    spans = read_spans(tmp_path, app_path)
+    assert spans == traces.snapshot()
+    assert [span["id"] for span in spans] == ["span:0001", "span:0002", "span:0003"]
+    assert spans[0]["status"] == "ok" and spans[0]["duration_steps"] == 3
+    assert read_spans(tmp_path, app_path, offset=1, limit=1) == [spans[1]]
+    assert read_spans(tmp_path, app_path, limit=1) == [spans[0]]
+    segment = next(trace_path(tmp_path, app_path).parent.glob("segment-*.ndjson"))
+    assert len(segment.read_text(encoding="utf-8").splitlines()) == 4
+
+    traces.reset()
+    traces.flush()
+    assert read_spans(tmp_path, app_path) == []
+
+
+def test_logs_append_per_session_and_read_legacy_files(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.ai"
+    legacy = trace_path(tmp_path, app_path)
+    legacy.parent.mkdir(parents=True, exist_ok=True)
+    legacy.write_text(json.dumps([{"id": "span:0001"}]), encoding="utf-8")
+    assert read_spans(tmp_path, app_path) == [{"id": "span:0001"}]
+
+    logs = LogStore(project_root=tmp_path, app_path=app_path, scrubber=_identity)
+    logs.record(level="info", message="one")
+    logs.flush()
+    logs.record(level="warn", message="two")
+    logs.flush()
+    assert [entry["message"] for entry in read_logs(tmp_path, app_path)] == ["one", "two"]
+    logs.reset()
+    logs.record(level="info", message="next session")
+    logs.flush()
+    assert [entry["id"] for entry in read_logs(tmp_path, app_path)] == ["log:0001"]
+    assert read_logs(tmp_path, app_path, limit=0) == []
+
+
+def test_update_records_stay_out_of_pages_and_writers_share_the_index(tmp_path: Path) -> None:
+    store = SegmentStore(tmp_path / "traces")
+    run_id = store.begin_run()
+    store.append(run_id, [{"id": "s1"}, {"id": "s2"}])
+    store.append(run_id, [{"id": "s1", "status": "ok"}], updates=True)
+    store.append(run_id, [{"id": "s3"}])
+    assert [record["id"] for record in store.read_run(run_id, offset=1, limit=2)] == ["s2", "s3"]
+    assert store.read_run(run_id, updates=True) == [{"id": "s1", "status": "ok"}]
+
+    def _write(prefix: str) -> None:
+        for item in range(20):
+            SegmentStore(tmp_path / "traces").append(run_id, [{"id": f"{prefix}{item}"}])
+
+    writers = [threading.Thread(target=_write, args=(prefix,)) for prefix in ("a", "b", "c")]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert len(store.read_run(run_id)) == 3 + 60
+
+
+def test_appends_leave_the_index_alone_and_pages_read_only_their_updates(tmp_path: Path, monkeypatch) -> None:
+    store = SegmentStore(tmp_path / "traces")
+    run_id = store.begin_run()
+    index = tmp_path / "traces" / "index.json"
+    before = index.read_bytes()
+    store.append(run_id, [{"id": "s1"}, {"id": "s2"}, {"id": "s3"}])
+    store.append(run_id, [{"id": "s1", "status": "ok"}], updates=True)
+    store.append(run_id, [{"id": "s3", "status": "ok"}], updates=True)
+    store.append(run_id, [{"id": "s3", "status": "error"}], updates=True)
+    assert index.read_bytes() == before
+    assert store.read_run("../index") == []
+
+    reads: list[int] = []
+    original = store._read_range
+
+    def _counting(segment: int, start: int, end: int) -> list[bytes]:
+        reads.append(start)
+        return original(segment, start, end)
+
+    monkeypatch.setattr(store, "_read_range", _counting)
+    assert store.read_updates(run_id, ["s2"]) == {}
+    assert reads == []
+    assert store.read_updates(run_id, ["s3"]) == {"s3": {"id": "s3", "status": "error"}}
+    assert len(reads) == 2
@@ -14,6 +14,7 @@ from namel3ss.runtime.observability_api import (
     get_metrics_payload,
     get_trace_payload,
     get_traces_payload,
+    observability_builder,
 )
 
 
@@ -134,6 +135,21 @@ def test_observability_endpoints_payloads(tmp_path: Path, monkeypatch) -> None:
     _assert_scrubbed(metrics_payload, secret_value, path_value)
 
 
+def test_observability_payloads_page_by_query(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("N3_OBSERVABILITY", "1")
+    app_file = _run_app(tmp_path, "sk-test-secret", (tmp_path / "secrets.txt").as_posix())
+
+    logs = get_logs_payload(tmp_path, app_file)["logs"]
+    page = observability_builder("logs", "offset=1&limit=1")(tmp_path, app_file)
+    assert page["logs"] == logs[1:2] and page["count"] == 1
+    spans = get_trace_payload(tmp_path, app_file)["spans"]
+    assert observability_builder("traces", "limit=1")(tmp_path, app_file)["spans"] == spans[:1]
+    assert observability_builder("trace", "run_id=run:999999")(tmp_path, app_file)["spans"] == []
+    assert observability_builder("logs", "limit=-1")(tmp_path, app_file)["ok"] is False
+    assert get_trace_payload(tmp_path, app_file, offset="x")["ok"] is False
+    assert observability_builder("metrics", "limit=1") is get_metrics_payload
+
+
 def test_observability_repo_clean(tmp_path: Path, monkeypatch) -> None:
     root = Path(__file__).resolve().parents[2]
     baseline = set(repo_dirty_entries(root))
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from namel3ss.observability import otlp_exporter
+from namel3ss.observability.otlp_batcher import BatchingSpanExporter
+from namel3ss.observability.trace_runs import write_trace_run
+from namel3ss.runtime.observability_api import get_metrics_payload
+
+
+class _Collector:
+    def __init__(self, failures: int = 0) -> None:
+        self.batches: list[dict] = []
+        self.encodings: list[str | None] = []
+        self.failures = failures
+        collector = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+                if collector.failures > 0:
+                    collector.failures -= 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                encoding = self.headers.get("Content-Encoding")
+                collector.encodings.append(encoding)
+                collector.batches.append(json.loads(gzip.decompress(body) if encoding == "gzip" else body))
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args) -> None:
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}/v1/traces"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def collector():
+    instances: list[_Collector] = []
+
+    def _make(failures: int = 0) -> _Collector:
+        instances.append(_Collector(failures))
+        return instances[-1]
+
+    yield _make
+    for instance in instances:
+        instance.close()
+
+
+def _spans(count: int) -> list[dict]:
+    return [{"span_id": f"step:{index:04d}", "name": "step"} for index in range(count)]
+
+
+def test_batches_by_size_and_retries_with_backoff(collector) -> None:
+    stand_in = collector(failures=1)
+    exporter = BatchingSpanExporter(
+        send=lambda batch: otlp_exporter._post_json(
+            endpoint=stand_in.endpoint,
+            payload={"spans": batch},
+            auth={},
+            compression="gzip",
+        ),
+        batch_size=3,
+        max_queue=100,
+        flush_interval=60,
+        backoff=0.01,
+    )
+    exporter.enqueue(_spans(6))
+    assert exporter.flush(timeout=5)
+    exporter.enqueue(_spans(1))
+    assert exporter.flush(timeout=5)
+    exporter.close(timeout=5)
+    assert [len(batch["spans"]) for batch in stand_in.batches] == [3, 3, 1]
+    assert set(stand_in.encodings) == {"gzip"}
+    stats = exporter.stats()
+    assert stats["exported_spans"] == 7 and stats["exported_batches"] == 3
+    assert stats["retries"] == 1 and stats["dropped_spans"] == 0
+
+
+def test_flush_sends_every_waiting_batch_now() -> None:
+    sent: list[int] = []
+    exporter = BatchingSpanExporter(
+        send=lambda batch: sent.append(len(batch)),
+        batch_size=3,
+        max_queue=100,
+        flush_interval=60,
+    )
+    with exporter._lock:
+        exporter.enqueue(_spans(5))
+        assert exporter.flush(timeout=5)
+    exporter.close(timeout=5)
+    assert sent == [3, 2]
+
+
+def test_full_queue_drops_and_failed_batches_give_up() -> None:
+    release = threading.Event()
+    given_up: list[int] = []
+
+    def _send(batch: list[dict]) -> None:
+        release.wait(timeout=5)
+        raise OSError("collector down")
+
+    exporter = BatchingSpanExporter(
+        send=_send,
+        batch_size=2,
+        max_queue=4,
+        flush_interval=0,
+        max_attempts=2,
+        backoff=0.01,
+        on_give_up=lambda batch, err: given_up.append(len(batch)),
+    )
+    exporter.enqueue(_spans(2))
+    assert exporter.enqueue(_spans(6)) <= 4
+    release.set()
+    assert exporter.flush(timeout=5)
+    exporter.close(timeout=5)
+    stats = exporter.stats()
+    assert stats["overflow_spans"] >= 2
+    assert stats["exported_spans"] == 0
+    assert stats["failed_batches"] == len(given_up)
+    assert stats["dropped_spans"] == stats["overflow_spans"] + sum(given_up)
+    assert stats["retries"] == stats["failed_batches"]
+
+
+def test_continuous_export_sends_written_runs(tmp_path: Path, collector, monkeypatch) -> None:
+    stand_in = collector()
+    monkeypatch.setenv("N3_OBSERVABILITY", "1")
+    app = tmp_path / "app.ai"
+    app.write_text('spec is "1.0"\n\nflow "demo":\n  return "ok"\n', encoding="utf-8")
+    (tmp_path / "observability.yaml").write_text(
+        (
+            "otlp_config:\n"
+            f'  endpoint: "{stand_in.endpoint}"\n'
+            "  batch_size: 10\n"
+            "  continuous: true\n"
+            "  flush_interval_ms: 50\n"
+        ),
+        encoding="utf-8",
+    )
+    try:
+        summary = write_trace_run(
+            project_root=tmp_path,
+            app_path=app,
+            flow_name="demo",
+            steps=[{"id": "step:0001", "kind": "flow_start"}, {"id": "step:0002", "kind": "flow_end"}],
+        )
+        assert otlp_exporter.queue_trace_run(project_root=tmp_path, app_path=app, run_id=summary["run_id"]) == 2
+        assert otlp_exporter.flush_background_exports(timeout=5)
+        assert [span["span_id"] for span in stand_in.batches[0]["spans"]] == ["step:0001", "step:0002"]
+        assert stand_in.encodings == ["gzip"]
+        payload = get_metrics_payload(tmp_path, app)
+        assert payload["otlp_exporter"]["exported_spans"] == 2
+        assert payload["otlp_exporter"]["dropped_spans"] == 0
+    finally:
+        otlp_exporter._close_background_exporters()
+
+
+def test_written_runs_are_queued_without_rereading(tmp_path: Path, collector, monkeypatch) -> None:
+    stand_in = collector()
+    monkeypatch.setenv("N3_OBSERVABILITY", "1")
+    app = tmp_path / "app.ai"
+    app.write_text('spec is "1.0"\n\nflow "demo":\n  return "ok"\n', encoding="utf-8")
+    (tmp_path / "observability.yaml").write_text(
+        f'otlp_config:\n  endpoint: "{stand_in.endpoint}"\n  continuous: true\n  flush_interval_ms: 60000\n',
+        encoding="utf-8",
+    )
+    threads: list[str] = []
+    entry_span = otlp_exporter._entry_span
+
+    def _tracked_span(run_id, entry):
+        threads.append(threading.current_thread().name)
+        return entry_span(run_id, entry)
+
+    def _no_reads(*args, **kwargs):
+        raise AssertionError("written runs must not be read again")
+
+    monkeypatch.setattr(otlp_exporter, "_entry_span", _tracked_span)
+    monkeypatch.setattr(otlp_exporter, "read_trace_entries", _no_reads)
+    monkeypatch.setattr(otlp_exporter, "load_observability_config", _no_reads)
+    try:
+        write_trace_run(
+            project_root=tmp_path,
+            app_path=app,
+            flow_name="demo",
+            steps=[{"id": "step:0001", "kind": "flow_start"}, {"id": "step:0002", "kind": "flow_end"}],
+            on_written=partial(otlp_exporter.queue_trace_entries, project_root=tmp_path, app_path=app),
+        )
+        assert otlp_exporter.flush_background_exports(timeout=5)
+        assert [span["span_id"] for span in stand_in.batches[0]["spans"]] == ["step:0001", "step:0002"]
+        assert set(threads) == {"namel3ss-otlp-export"}
+    finally:
+        otlp_exporter._close_background_exporters()
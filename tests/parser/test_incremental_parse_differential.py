@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import random
+
+from namel3ss.parser import incremental as incremental_module
+from namel3ss.parser.incremental import IncrementalEdit, full_parse_state, incremental_parse
+from tests.spec_freeze.helpers.ast_dump import dump_ast
+
+
+SOURCE = (
+    'spec is "1.0"\n\n'
+    "# Orders app\n"
+    'record "Order":\n'
+    "  name is text\n"
+    "  total is number\n\n"
+    'flow "create":\n'
+    "  let total is 1\n"
+    "  return total\n\n"
+    'flow "notes":\n'
+    '  let body is """\n'
+    "first line\n"
+    "  indented line\n"
+    '"""\n'
+    "  return body\n\n"
+    'flow "summary":\n'
+    "  # comment inside\n"
+    "  let count is 2\n"
+    "  if count is greater than 1:\n"
+    "    return count\n"
+    "  return 0\n"
+)
+
+SNIPPETS = [
+    "\n",
+    "  ",
+    "x",
+    '"',
+    '"""',
+    "#",
+    ":",
+    "\n\n",
+    "  let extra is 3\n",
+    'flow "added":\n  return 1\n',
+    'record "Note":\n  body is text\n',
+]
+
+
+def _dump_state(state) -> tuple:
+    tokens = [(tok.type, tok.value, tok.line, tok.column, tok.escaped) for tok in state.tokens]
+    return tokens, dump_ast(state.program) if state.program else None, state.error
+
+
+def _random_edit(rng: random.Random, source: str) -> IncrementalEdit:
+    start = rng.randint(0, len(source))
+    delete_len = min(rng.randint(0, 8), len(source) - start)
+    insert_text = rng.choice(SNIPPETS) if rng.random() < 0.7 else ""
+    return IncrementalEdit(start=start, delete_len=delete_len, insert_text=insert_text)
+
+
+def test_random_edits_match_full_parse() -> None:
+    # Each edit starts from the valid source, so most samples exercise reuse rather than lexer errors.
+    rng = random.Random(21)
+    base = full_parse_state(SOURCE)
+    assert base.error is None
+    for _ in range(60):
+        edit = _random_edit(rng, SOURCE)
+        removed = SOURCE[edit.start : edit.start + edit.delete_len]
+        state = incremental_parse(base, edit)
+        assert _dump_state(state) == _dump_state(full_parse_state(state.source))
+        chained = incremental_parse(state, _random_edit(rng, state.source))
+        assert _dump_state(chained) == _dump_state(full_parse_state(chained.source))
+        undo = IncrementalEdit(start=edit.start, delete_len=len(edit.insert_text), insert_text=removed)
+        assert _dump_state(incremental_parse(state, undo)) == _dump_state(base)
+
+
+def test_line_edits_shift_declarations_below(monkeypatch) -> None:
+    state = full_parse_state(SOURCE)
+    parsed: list[str] = []
+    parse_unit = incremental_module._ReusingParser._parse_unit
+    monkeypatch.setattr(
+        incremental_module._ReusingParser,
+        "_parse_unit",
+        lambda self, rule, parser: parsed.append(rule.name) or parse_unit(self, rule, parser),
+    )
+    start = state.source.index("  return total")
+    inserted = "  let extra is 3\n\n"
+    grown = incremental_parse(state, IncrementalEdit(start=start, delete_len=0, insert_text=inserted))
+    assert parsed == ["flow"]
+    assert [flow.line for flow in grown.program.flows] == [8, 14, 21]
+    shrunk = incremental_parse(grown, IncrementalEdit(start=start, delete_len=len(inserted), insert_text=""))
+    assert parsed == ["flow", "flow"]
+    assert _dump_state(grown) == _dump_state(full_parse_state(grown.source))
+    assert _dump_state(shrunk) == _dump_state(state)
+
+
+def test_edit_reuses_untouched_declarations() -> None:
+    state = full_parse_state(SOURCE)
+    flows = {flow.name: flow for flow in state.program.flows}
+    records = list(state.program.records)
+    start = state.source.index("let count is 2") + len("let count is ")
+    state = incremental_parse(state, IncrementalEdit(start=start, delete_len=1, insert_text="5"))
+    assert state.error is None
+    assert _dump_state(state) == _dump_state(full_parse_state(state.source))
+    reparsed = {flow.name: flow for flow in state.program.flows}
+    assert reparsed["create"] is flows["create"]
+    assert reparsed["notes"] is flows["notes"]
+    assert reparsed["summary"] is not flows["summary"]
+    assert all(new is old for new, old in zip(state.program.records, records))
+
+
+def test_broken_declaration_recovers_without_losing_reuse() -> None:
+    state = full_parse_state(SOURCE)
+    create = state.program.flows[0]
+    colon = state.source.index('flow "summary":') + len('flow "summary"')
+    broken = incremental_parse(state, IncrementalEdit(start=colon, delete_len=1, insert_text=""))
+    assert broken.program is None and broken.error is not None
+    fixed = incremental_parse(broken, IncrementalEdit(start=colon, delete_len=0, insert_text=":"))
+    assert _dump_state(fixed) == _dump_state(state)
+    assert fixed.program.flows[0] is create
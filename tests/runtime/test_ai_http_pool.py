@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.ai.http import metrics
+from namel3ss.runtime.ai.http.pool import ConnectionPool, PoolSettings, configure_shared_pool
+from namel3ss.runtime.ai.providers.openai import OpenAIProvider
+
+
+class _StubServer:
+    def __init__(self) -> None:
+        self.connections: set[tuple] = set()
+        self.statuses: list[int] = []
+        self.close_after: int | None = None
+        self.drop_next = False
+        self.requests = 0
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                self.rfile.read(int(self.headers.get("Content-Length", "0")))
+                stub.connections.add(self.client_address)
+                if stub.drop_next:
+                    # Hang up without answering, like a server timing out an idle connection.
+                    stub.drop_next = False
+                    self.close_connection = True
+                    return
+                stub.requests += 1
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                body = json.dumps({"output_text": f"reply {stub.requests}"}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if stub.close_after == stub.requests:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    metrics.reset_provider_call_stats()
+    server = _StubServer()
+    yield server
+    configure_shared_pool(PoolSettings()).close()
+    metrics.reset_provider_call_stats()
+    server.close()
+
+
+def _ask(server: _StubServer) -> str:
+    provider = OpenAIProvider(api_key="token", base_url=server.base_url)
+    return provider.ask(model="gpt-4.1", system_prompt=None, user_input="hi").output
+
+
+def test_provider_calls_reuse_one_pooled_connection(stub) -> None:
+    configure_shared_pool(PoolSettings(pool_size=2))
+    assert [_ask(stub) for _ in range(4)] == ["reply 1", "reply 2", "reply 3", "reply 4"]
+    assert len(stub.connections) == 1
+    stats = metrics.provider_call_stats()["openai"]
+    assert (stats["requests"], stats["connections_opened"], stats["connections_reused"]) == (4, 1, 3)
+    assert stats["errors"] == 0
+
+    stub.statuses = [500]
+    with pytest.raises(Namel3ssError):
+        _ask(stub)
+    assert _ask(stub) == "reply 6"
+    assert len(stub.connections) == 1
+    assert metrics.provider_call_stats()["openai"]["errors"] == 1
+
+
+def test_pool_limits_recycle_connections(stub) -> None:
+    clock = [0.0]
+    pool = ConnectionPool(PoolSettings(idle_timeout=10, max_requests_per_connection=2), clock=lambda: clock[0])
+    url = f"{stub.base_url}/v1/responses"
+
+    def post() -> bool:
+        with pool.urlopen(url, data=b"{}", timeout=5) as response:
+            assert json.loads(response.read())["output_text"]
+            return response.connection_reused
+
+    assert [post(), post(), post()] == [False, True, False]
+    assert len(stub.connections) == 2
+    clock[0] = 11.0
+    assert post() is False
+    assert len(stub.connections) == 3
+
+    stub.close_after = stub.requests + 1
+    assert [post(), post()] == [True, False]
+    assert len(stub.connections) == 4
+    assert pool.stats()["connections_opened"] == 4
+    pool.close()
+    assert pool.stats()["idle_connections"] == 0
+
+
+def test_stale_keep_alive_connection_is_retried(stub) -> None:
+    pool = ConnectionPool(PoolSettings())
+    url = f"{stub.base_url}/v1/responses"
+    with pool.urlopen(url, data=b"{}", timeout=5) as response:
+        response.read()
+    stub.drop_next = True
+    with pool.urlopen(url, data=b"{}", timeout=5) as response:
+        assert json.loads(response.read())["output_text"] == "reply 2"
+        assert response.connection_reused is False
+    assert len(stub.connections) == 2
+    assert pool.stats()["connections_reused"] == 0
+    pool.close()
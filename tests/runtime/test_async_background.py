@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import copy
+import sqlite3
+import threading
+
+import pytest
+
+from namel3ss.config.model import AppConfig
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.ai.mock_provider import MockProvider
+from namel3ss.runtime.executor import Executor
+from namel3ss.runtime.executor.state_snapshot import snapshot_state
+from namel3ss.runtime.storage.sqlite_store import SQLiteStore
+from tests.conftest import lower_ir_program
+
+
+SOURCE = '''spec is "1.0"
+
+capabilities:
+  performance
+
+ai "assistant":
+  provider is "mock"
+  model is "mock-model"
+
+contract flow "background":
+  input:
+    topic is text
+  output:
+    answer is text
+
+flow "background":
+  ask ai "assistant" with input: "background" as answer
+  return map:
+    "answer" is answer
+
+flow "demo":
+  let pending is async call flow "background":
+    input:
+      topic is "news"
+    output:
+      answer
+  ask ai "assistant" with input: "foreground" as ready
+  await pending
+  return map get pending key "answer"
+'''
+
+
+class _HandshakeProvider(MockProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.foreground_done = threading.Event()
+
+    def ask(self, **kwargs):
+        if kwargs.get("user_input") == "background":
+            # Only completes when the flow kept running past the launch.
+            assert self.foreground_done.wait(timeout=5)
+        response = super().ask(**kwargs)
+        if kwargs.get("user_input") == "foreground":
+            self.foreground_done.set()
+        return response
+
+
+def _background_executor(source: str, *, provider=None, store=None) -> Executor:
+    program = lower_ir_program(source)
+    flow = next(item for item in program.flows if item.name == "demo")
+    config = AppConfig()
+    config.performance.async_runtime = True
+    config.performance.cache_size = 0
+    return Executor(
+        flow,
+        schemas={schema.name: schema for schema in program.records},
+        ai_profiles=program.ais,
+        ai_provider=provider or MockProvider(),
+        store=store,
+        flows={item.name: item for item in program.flows},
+        flow_contracts=getattr(program, "flow_contracts", {}) or {},
+        capabilities=program.capabilities,
+        config=config,
+    )
+
+
+def test_async_launch_runs_in_background_until_await() -> None:
+    result = _background_executor(SOURCE, provider=_HandshakeProvider()).run()
+    assert str(result.last_value).startswith("[mock-model] background")
+    assert [trace.input for trace in result.traces if hasattr(trace, "input")] == ["foreground", "background"]
+
+
+def test_snapshot_shares_untouched_containers() -> None:
+    shared = {"rows": [1, 2, 3]}
+    state = {"index": shared, "settings": {"mode": "fast"}}
+    snapshot = snapshot_state(state)
+    assert dict.__getitem__(snapshot, "index") is shared
+    assert dict.__getitem__(dict.__getitem__(state, "index"), "rows") is shared["rows"]
+
+
+def test_snapshot_isolates_writes_in_both_directions() -> None:
+    state = {"settings": {"mode": "fast", "nested": {"level": 1}}, "items": [{"id": 1}]}
+    snapshot = snapshot_state(state)
+
+    state["settings"]["nested"]["level"] = 2
+    state["items"][0]["id"] = 99
+    state["fresh"] = True
+    snapshot["settings"]["mode"] = "slow"
+
+    assert snapshot["settings"]["nested"]["level"] == 1
+    assert snapshot["items"][0]["id"] == 1
+    assert "fresh" not in snapshot
+    assert state["settings"]["mode"] == "fast"
+    assert state["settings"]["nested"]["level"] == 2
+    assert state["items"][0]["id"] == 99
+
+
+WRITER_SOURCE = '''spec is "1.0"
+
+capabilities:
+  performance
+
+record "Note":
+  text text
+
+contract flow "writer":
+  input:
+    text is text
+  output:
+    saved is text
+
+flow "writer": requires true
+  yield "writing"
+  create "Note" with map:
+    "text" is input.text
+  as note
+  return map:
+    "saved" is note.text
+
+flow "demo":
+  let pending is async call flow "writer":
+    input:
+      text is "hello"
+    output:
+      saved
+  yield "launched"
+  await pending
+  return map get pending key "saved"
+'''
+
+
+def test_background_task_output_joins_the_flow(tmp_path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    executor = _background_executor(WRITER_SOURCE, store=store)
+    result = executor.run()
+    assert result.last_value == "hello"
+    assert [change["record"] for change in executor.ctx.record_changes] == ["Note"]
+    assert [(item["sequence"], item["output"]) for item in result.yield_messages] == [(1, "launched"), (2, "writing")]
+    assert executor.ctx.store is store
+    assert executor.ctx.async_services is None
+    errors: list[Exception] = []
+    worker = threading.Thread(target=_query_from_thread, args=(store, errors))
+    worker.start()
+    worker.join()
+    assert [type(err) for err in errors] == [sqlite3.ProgrammingError]
+    store.close()
+
+
+def _query_from_thread(store: SQLiteStore, errors: list[Exception]) -> None:
+    try:
+        store.conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError as err:
+        errors.append(err)
+
+
+FAILING_SOURCE = WRITER_SOURCE.replace("  await pending\n", "  let broken is 1 / 0\n  await pending\n")
+
+
+def test_failing_flow_drains_background_tasks_before_rollback(tmp_path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    executor = _background_executor(FAILING_SOURCE, store=store)
+    with pytest.raises(Namel3ssError):
+        executor.run()
+    assert executor.ctx.async_executor is None
+    assert executor.ctx.store is store
+    assert all(task.settled for task in executor.ctx.async_tasks.values())
+    program = lower_ir_program(FAILING_SOURCE)
+    assert store.list_records(program.records[0]) == []
+    store.close()
+
+
+def _nested() -> dict:
+    return {"inner": {"level": 1}, "items": [{"id": 1}]}
+
+
+@pytest.mark.parametrize(
+    "reach",
+    [
+        lambda snap: snap.get("inner"),
+        lambda snap: list(snap.values())[0],
+        lambda snap: dict(snap.items())["inner"],
+        lambda snap: [snap[key] for key in snap][0],
+        lambda snap: dict(snap)["inner"],
+        lambda snap: {**snap}["inner"],
+        lambda snap: (snap | {})["inner"],
+        lambda snap: copy.copy(snap)["inner"],
+        lambda snap: snap.popitem()[1] if list(snap)[-1] == "inner" else snap.pop("inner"),
+        lambda snap: snap.setdefault("inner", {}),
+    ],
+)
+def test_snapshot_dict_accessors_never_hand_out_shared_containers(reach) -> None:
+    state = _nested()
+    snapshot = snapshot_state(state)
+    reach(snapshot)["level"] = 2
+    assert state["inner"]["level"] == 1
+
+
+@pytest.mark.parametrize(
+    "reach",
+    [
+        lambda items: list(items)[0],
+        lambda items: [item for item in items][0],
+        lambda items: items[0:1][0],
+        lambda items: list(reversed(items))[0],
+        lambda items: (items + [])[0],
+        lambda items: (items * 1)[0],
+        lambda items: items.pop(),
+        lambda items: copy.copy(items)[0],
+    ],
+)
+def test_snapshot_list_accessors_never_hand_out_shared_containers(reach) -> None:
+    state = _nested()
+    snapshot = snapshot_state(state)
+    reach(snapshot["items"])["id"] = 2
+    assert state["items"][0]["id"] == 1
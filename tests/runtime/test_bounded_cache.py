@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+
+from namel3ss.runtime.memory_cache import MemoryCacheStore
+from namel3ss.runtime.performance.cache import BoundedCache
+
+
+def test_fifo_cache_does_not_promote_hits() -> None:
+    cache = BoundedCache(max_entries=2, promote_on_hit=False)
+    cache.set("one", 1)
+    cache.set("two", 2)
+    assert cache.get("one") == 1
+    cache.set("three", 3)
+    assert cache.get("one") is None
+    assert [key for key, _ in cache.items()] == ["two", "three"]
+    stats = cache.stats().as_dict()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_entries_expire_after_ttl_ticks() -> None:
+    cache = BoundedCache(max_entries=10, ttl_ticks=2)
+    cache.set("a", "first")
+    cache.set("b", "second")
+    assert cache.get("a") == "first"
+    cache.set("c", "third")
+    assert cache.get("a") is None
+    assert cache.get("b") == "second"
+    cache.advance(5)
+    assert cache.items() == []
+    assert cache.get("b") is None
+    assert cache.stats().expirations == 2
+
+
+def test_byte_budget_evicts_oldest_and_skips_oversized_values() -> None:
+    cache = BoundedCache(max_entries=10, max_weight=10)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache.set("c", "cccc")
+    assert cache.peek("a") is None
+    assert cache.stats().weight == 8
+    cache.set("huge", "x" * 11)
+    assert cache.peek("huge") is None
+    assert [key for key, _ in cache.items()] == ["b", "c"]
+    cache.set_max_weight(4)
+    assert [key for key, _ in cache.items()] == ["c"]
+
+
+def test_memory_cache_counts_version_mismatch_as_miss_and_restores_order() -> None:
+    cache = MemoryCacheStore(max_entries=2)
+    cache.set("one", "first", version=1)
+    cache.set("two", "second", version=1)
+    assert cache.get("one", version=2) is None
+    assert cache.get("one", version=1) == "first"
+    assert cache.stats().misses == 1
+    restored = MemoryCacheStore(max_entries=5)
+    restored.restore(reversed(cache.entries()), max_entries=cache.max_entries, counter=cache.counter)
+    restored.set("three", "third", version=1)
+    assert [key for key, _ in restored.entries()] == ["two", "three"]
+    assert restored.counter == 3
+
+
+def test_eviction_from_another_thread_waits_for_a_hit_to_finish() -> None:
+    cache = BoundedCache(max_entries=4, max_weight=1000)
+    cache.set("key", "value")
+    evicted = threading.Event()
+
+    def _evict_during_lookup(value: object) -> bool:
+        worker = threading.Thread(target=lambda: (cache.pop("key"), evicted.set()))
+        worker.start()
+        worker.join(timeout=0.05)
+        return True
+
+    assert cache.get("key", accept=_evict_during_lookup) == "value"
+    assert evicted.wait(timeout=5)
+    assert cache.peek("key") is None
+    assert cache.stats().weight == 0
+
+
+def test_concurrent_sets_keep_the_weight_total() -> None:
+    cache = BoundedCache(max_entries=8, max_weight=10_000)
+
+    def _writer(offset: int) -> None:
+        for position in range(300):
+            cache.set(f"key{(position + offset) % 20}", "x" * (position % 7))
+            cache.get(f"key{position % 20}")
+
+    threads = [threading.Thread(target=_writer, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats().weight == sum(len(value) for _, value in cache.items())
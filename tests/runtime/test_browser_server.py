@@ -9,7 +9,9 @@ def test_dev_server_recovers_after_fix(tmp_path):
     assert status.get("ok") is False
     overlay = status.get("overlay") or {}
     assert overlay.get("title") == "something went wrong"
+    revision = state._watcher.revision
     app.write_text('spec is "1.0"\n\npage "home":\n  text is "Hello"\n', encoding="utf-8")
+    assert state._watcher.wait_for_change(revision, timeout=5)
     status = state.status_payload()
     assert status.get("ok") is True
     assert status.get("revision")
@@ -22,7 +22,7 @@ def test_concurrency_config_defaults(tmp_path: Path) -> None:
 
 def test_concurrency_config_file_and_env_override(tmp_path: Path, monkeypatch) -> None:
     (tmp_path / "concurrency.yaml").write_text(
-        "server_mode: single\nmax_threads: 2\nworker_processes: 3\ncompiled_cache_enabled: false\n",
+        "server_mode: single\nmax_threads: 2\nworker_processes: 3\ncompiled_cache_enabled: false\nwatch_sources: false\n",
         encoding="utf-8",
     )
     config = load_concurrency_config(project_root=tmp_path)
@@ -30,6 +30,7 @@ def test_concurrency_config_file_and_env_override(tmp_path: Path, monkeypatch) -
     assert config.max_threads == 2
     assert config.worker_processes == 3
     assert config.compiled_cache_enabled is False
+    assert config.watch_sources is False
 
     monkeypatch.setenv("N3_SERVER_MODE", "threaded")
     monkeypatch.setenv("N3_MAX_THREADS", "5")
@@ -50,3 +50,97 @@ def test_create_persists_with_sqlite(tmp_path):
     store.close()
     assert result.last_value["total"] == Decimal("9.99")
     assert records[0]["total"] == Decimal("9.99")
+
+
+def test_create_rejects_a_list_of_records():
+    source = SOURCE.replace("state.order as order", "state.orders as order")
+    with pytest.raises(Namel3ssError) as excinfo:
+        run_flow(source, initial_state={"orders": [{"total": Decimal("1.50")}]})
+    assert "Create expects a record dictionary of values." in str(excinfo.value)
+
+
+LOOP_SOURCE = '''record "Order":
+  total number
+
+spec is "1.0"
+
+flow "demo": requires true
+  for each order in state.orders:
+    create "Order" with order as order
+  return order
+'''
+
+
+class _CountingStore(SQLiteStore):
+    def __init__(self, path) -> None:
+        super().__init__(path)
+        self.calls: list[tuple[str, int]] = []
+
+    def save(self, schema, record):
+        self.calls.append(("save", 1))
+        return super().save(schema, record)
+
+    def save_many(self, schema, records):
+        records = list(records)
+        self.calls.append(("save_many", len(records)))
+        return super().save_many(schema, records)
+
+
+def test_create_in_for_each_writes_rows_in_one_batch(tmp_path):
+    program = lower_ir_program(LOOP_SOURCE)
+    store = _CountingStore(tmp_path / "data.db")
+    initial_state = {"orders": [{"total": Decimal("1.50")}, {"total": Decimal("2.50")}, {"total": Decimal("3.50")}]}
+    result = run_flow(LOOP_SOURCE, initial_state=initial_state, store=store)
+    records = store.list_records(program.records[0])
+    store.close()
+    assert store.calls == [("save_many", 3)]
+    assert result.last_value == {"_id": 3, "total": Decimal("3.50")}
+    assert [row["_id"] for row in records] == [1, 2, 3]
+    created = [step for step in result.execution_steps if step["kind"] == "statement_create"]
+    assert len(created) == 3
+
+
+RUNNING_TOTAL_SOURCE = '''record "Order":
+  total number
+
+spec is "1.0"
+
+flow "demo": requires true
+  let saved is map:
+    "total" is 0
+  for each order in state.orders:
+    create "Order" with map:
+      "total" is saved.total + order.total
+    as saved
+  return saved
+'''
+
+
+def test_create_in_for_each_reading_its_target_saves_row_by_row(tmp_path):
+    store = _CountingStore(tmp_path / "data.db")
+    initial_state = {"orders": [{"total": Decimal("1.50")}, {"total": Decimal("2.50")}]}
+    result = run_flow(RUNNING_TOTAL_SOURCE, initial_state=initial_state, store=store)
+    store.close()
+    assert store.calls == [("save", 1), ("save", 1)]
+    assert result.last_value["total"] == Decimal("4.00")
+
+
+def test_create_in_for_each_fails_at_the_bad_row():
+    initial_state = {"orders": [{"total": Decimal("1.50")}, 7]}
+    with pytest.raises(Namel3ssError) as excinfo:
+        run_flow(LOOP_SOURCE, initial_state=initial_state)
+    assert "Create expects a record dictionary of values." in str(excinfo.value)
+
+
+class _FailingBulkStore(SQLiteStore):
+    def save_many(self, schema, records):
+        raise RuntimeError("disk full")
+
+
+def test_create_in_for_each_reports_the_bad_row_when_the_flush_fails(tmp_path):
+    store = _FailingBulkStore(tmp_path / "data.db")
+    initial_state = {"orders": [{"total": Decimal("1.50")}, 7]}
+    with pytest.raises(Namel3ssError) as excinfo:
+        run_flow(LOOP_SOURCE, initial_state=initial_state, store=store)
+    store.close()
+    assert "Create expects a record dictionary of values." in str(excinfo.value)
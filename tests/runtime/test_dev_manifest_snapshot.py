@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+
+from namel3ss.runtime.dev_server import BrowserAppState
+from namel3ss.runtime.server.dev.snapshot import ManifestCache
+
+
+APP_SOURCE = 'spec is "1.0"\n\npage "home":\n  text is "Hello"\n'
+
+
+def test_manifest_cache_evicts_least_recently_used() -> None:
+    cache = ManifestCache(max_entries=2)
+    cache.set("a", {"name": "a"})
+    cache.set("b", {"name": "b"})
+    assert cache.get("a") == {"name": "a"}
+    cache.set("c", {"name": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"name": "a"}
+    assert len(cache) == 2
+    cache.pop("a")
+    assert cache.get("a") is None
+
+
+def test_cached_manifest_is_served_while_state_lock_is_held(tmp_path) -> None:
+    app = tmp_path / "app.ai"
+    app.write_text(APP_SOURCE, encoding="utf-8")
+    state = BrowserAppState(app, mode="preview", debug=False)
+    first = state.manifest_payload()
+    held = threading.Event()
+    release = threading.Event()
+
+    def _hold_lock() -> None:
+        with state._lock:
+            held.set()
+            release.wait(timeout=10)
+
+    holder = threading.Thread(target=_hold_lock)
+    holder.start()
+    held.wait(timeout=5)
+    results: list[dict] = []
+    reader = threading.Thread(target=lambda: results.extend([state.manifest_payload(), state.status_payload()]))
+    reader.start()
+    reader.join(timeout=5)
+    finished = not reader.is_alive()
+    release.set()
+    holder.join()
+    reader.join()
+    assert finished
+    assert results[0] is first
+    assert results[1] == {"ok": True, "revision": state.revision}
+
+
+def test_source_edit_swaps_snapshot_and_drops_cached_manifests(tmp_path) -> None:
+    app = tmp_path / "app.ai"
+    app.write_text(APP_SOURCE, encoding="utf-8")
+    state = BrowserAppState(app, mode="dev", debug=False)
+    first = state.manifest_payload()
+    revision = state.revision
+    watch_revision = state._watcher.revision
+    app.write_text(APP_SOURCE.replace('"home"', '"welcome"'), encoding="utf-8")
+    assert state._watcher.wait_for_change(watch_revision, timeout=5)
+    second = state.manifest_payload()
+    assert second is not first
+    assert second["pages"][0]["name"] == "welcome"
+    assert state.revision != revision
+    assert len(state._snapshot.manifests) == 1
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from namel3ss.config.model import AppConfig
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.ingestion.embeddings import store_chunk_embeddings
+from namel3ss.ingestion.hash import hash_chunk
+from namel3ss.retrieval import embedding_plan
+from namel3ss.retrieval.embedding_plan import build_embedding_plan
+from namel3ss.runtime.embeddings import ann
+from namel3ss.runtime.embeddings.ann import IvfIndex, build_ivf_index, clear_ivf_cache
+from namel3ss.runtime.embeddings.service import embed_text, resolve_embedding_model
+from namel3ss.runtime.embeddings.store import get_embedding_store
+
+_WORDS = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "theta", "lambda", "zeta", "rho", "tau"]
+
+
+def _config(index: str) -> AppConfig:
+    config = AppConfig()
+    config.embedding.dims = 16
+    config.embedding.candidate_limit = 10
+    config.embedding.index = index
+    config.persistence.target = "memory"
+    return config
+
+
+def _chunks(count: int) -> list[dict]:
+    chunks = []
+    for position in range(count):
+        words = [_WORDS[(position * step) % len(_WORDS)] for step in (1, 5, 7)]
+        text = " ".join(words + [f"item{position % 37}"])
+        chunks.append(
+            {
+                "upload_id": "doc",
+                "chunk_id": f"doc:{position}",
+                "document_id": "doc",
+                "page_number": 1,
+                "chunk_index": position,
+                "ingestion_phase": "deep",
+                "text": text,
+                "chunk_hash": hash_chunk(document_id="doc", page_number=1, chunk_index=position, text=text),
+            }
+        )
+    return chunks
+
+
+def _plan(chunks: list[dict], query: str, config: AppConfig, tmp_path: Path):
+    return build_embedding_plan(
+        chunks,
+        query_text=query,
+        config=config,
+        project_root=str(tmp_path),
+        app_path=(tmp_path / "app.ai").as_posix(),
+        capabilities=("embedding",),
+    )
+
+
+def test_ivf_build_is_deterministic_and_round_trips() -> None:
+    model = resolve_embedding_model(_config("ivf"))
+    items = [(chunk["chunk_hash"], embed_text(chunk["text"], model)) for chunk in _chunks(300)]
+    first = build_ivf_index(items, dims=16)
+    second = build_ivf_index(list(reversed(items)), dims=16)
+    assert first.to_payload() == second.to_payload()
+    assert len(first.lists) == 17
+    assert len(first) == 300
+    restored = IvfIndex.from_payload(first.to_payload())
+    query = embed_text("alpha omega", model)
+    allowed = {chunk_hash for chunk_hash, _ in items}
+    assert restored.search(query, probes=2, limit=5, allowed=allowed) == first.search(
+        query, probes=2, limit=5, allowed=allowed
+    )
+    with pytest.raises(Namel3ssError):
+        IvfIndex.from_payload(b"{}")
+
+
+def test_ivf_plan_matches_exact_scores_and_recall(tmp_path: Path) -> None:
+    clear_ivf_cache()
+    chunks = _chunks(400)
+    app_path = (tmp_path / "app.ai").as_posix()
+    store_chunk_embeddings(
+        chunks,
+        upload_id="doc",
+        config=_config("ivf"),
+        project_root=str(tmp_path),
+        app_path=app_path,
+        capabilities=("embedding",),
+    )
+    hits = 0
+    for query in ("alpha omega", "gamma item3", "sigma tau rho", "lambda beta item12"):
+        exact = _plan(chunks, query, _config("exact"), tmp_path)
+        approximate = _plan(chunks, query, _config("ivf"), tmp_path)
+        assert approximate.explain_payload()["index"] == "ivf"
+        assert "index" not in exact.explain_payload()
+        for item in approximate.candidates:
+            assert item["score"] == exact.score_for(item["chunk_id"])
+        for chunk in chunks[:25]:
+            assert approximate.score_for(chunk["chunk_id"]) == exact.score_for(chunk["chunk_id"])
+        hits += len(approximate.candidate_ids & exact.candidate_ids)
+    assert hits / 40 >= 0.8
+
+    model = resolve_embedding_model(_config("ivf"))
+    store = get_embedding_store(_config("ivf"), project_root=str(tmp_path), app_path=app_path)
+    build_id = store.ann_build_id(model.model_id)
+    assert build_id
+    clear_ivf_cache()
+    again = _plan(chunks, "alpha omega", _config("ivf"), tmp_path)
+    assert store.ann_build_id(model.model_id) == build_id
+    assert again.candidates == _plan(chunks, "alpha omega", _config("ivf"), tmp_path).candidates
+
+
+def test_ingestion_maintains_the_index_and_queries_only_read_it(tmp_path: Path, monkeypatch) -> None:
+    clear_ivf_cache()
+    chunks = _chunks(330)
+    config = _config("ivf")
+    app_path = (tmp_path / "app.ai").as_posix()
+    model = resolve_embedding_model(config)
+    store = get_embedding_store(config, project_root=str(tmp_path), app_path=app_path)
+
+    def _store(batch: list[dict]) -> None:
+        store_chunk_embeddings(
+            batch,
+            upload_id="doc",
+            config=config,
+            project_root=str(tmp_path),
+            app_path=app_path,
+            capabilities=("embedding",),
+        )
+
+    _store(chunks[:200])
+    assert store.ann_build_id(model.model_id) is None
+    _store(chunks[:300])
+    first = IvfIndex.from_payload(store.read_ann_index(model.model_id))
+    assert len(first) == 300 and first.base_size == 300
+    base_payload = store.read_ann_index(model.model_id)
+    _store(chunks)
+    assert store.read_ann_index(model.model_id) == base_payload
+    assert len(store.read_ann_additions(model.model_id, after=0)) == 1
+    clear_ivf_cache()
+    extended = ann._current_index(store, model.model_id)
+    assert len(extended) == 330 and extended.base_size == 300
+    assert extended.centroids == first.centroids
+    assert extended.build_id == store.ann_build_id(model.model_id)
+
+    def _no_writes(*args, **kwargs) -> None:
+        raise AssertionError("queries must not write the index")
+
+    monkeypatch.setattr(store, "write_ann_index", _no_writes)
+    monkeypatch.setattr(embedding_plan, "_entry_hashes", _counting(embedding_plan._entry_hashes))
+    for query in ("alpha omega", "gamma item3"):
+        plan = build_embedding_plan(
+            chunks,
+            query_text=query,
+            config=config,
+            project_root=str(tmp_path),
+            app_path=app_path,
+            capabilities=("embedding",),
+        )
+        assert plan.index == "ivf"
+        assert plan.score_for("doc:329") is not None
+    assert embedding_plan._entry_hashes.calls == 1
+
+
+def _counting(function):
+    def _wrapped(*args, **kwargs):
+        _wrapped.calls += 1
+        return function(*args, **kwargs)
+
+    _wrapped.calls = 0
+    return _wrapped
+
+
+def test_sqlite_store_keeps_additions_until_the_next_rebuild(tmp_path: Path) -> None:
+    clear_ivf_cache()
+    config = _config("ivf")
+    config.persistence.target = "sqlite"
+    config.persistence.db_path = (tmp_path / "data.db").as_posix()
+    model = resolve_embedding_model(config)
+    chunks = _chunks(620)
+    for end in (300, 320, 340, 620):
+        store_chunk_embeddings(
+            chunks[:end],
+            upload_id="doc",
+            config=config,
+            project_root=str(tmp_path),
+            app_path=(tmp_path / "app.ai").as_posix(),
+            capabilities=("embedding",),
+        )
+        store = get_embedding_store(config, project_root=str(tmp_path), app_path=None)
+        additions = store.read_ann_additions(model.model_id, after=0)
+        assert len(additions) == (0 if end in (300, 620) else (end - 300) // 20)
+        clear_ivf_cache()
+        index = ann._current_index(store, model.model_id)
+        assert len(index) == end and index.base_size == (620 if end == 620 else 300)
+        assert index.build_id == store.ann_build_id(model.model_id)
+        store.close()
+
+
+def test_small_corpus_falls_back_to_exact_scan(tmp_path: Path) -> None:
+    chunks = _chunks(40)
+    store_chunk_embeddings(
+        chunks,
+        upload_id="doc",
+        config=_config("ivf"),
+        project_root=str(tmp_path),
+        app_path=(tmp_path / "app.ai").as_posix(),
+        capabilities=("embedding",),
+    )
+    plan = _plan(chunks, "alpha omega", _config("ivf"), tmp_path)
+    assert plan.index == "exact"
+    assert plan.candidates == _plan(chunks, "alpha omega", _config("exact"), tmp_path).candidates
+
+
+def test_chunk_lists_of_the_same_shape_get_their_own_view(tmp_path: Path) -> None:
+    chunks = _chunks(40)
+    config = _config("exact")
+    store_chunk_embeddings(
+        chunks,
+        upload_id="doc",
+        config=config,
+        project_root=str(tmp_path),
+        app_path=(tmp_path / "app.ai").as_posix(),
+        capabilities=("embedding",),
+    )
+    # Same count and same end chunks, but a different chunk in the middle.
+    swapped = chunks[:20] + [dict(chunks[20], chunk_id="doc:other")] + chunks[21:]
+    assert "doc:20" in _plan(chunks, "alpha omega item20", config, tmp_path).scores
+    scores = _plan(swapped, "alpha omega item20", config, tmp_path).scores
+    assert "doc:20" not in scores and "doc:other" in scores
+
+
+def test_unknown_index_kind_is_rejected() -> None:
+    with pytest.raises(Namel3ssError) as exc:
+        resolve_embedding_model(_config("hnsw"))
+    assert "exact or ivf" in str(exc.value)
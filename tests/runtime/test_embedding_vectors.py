@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.embeddings import matrix_cache
+from namel3ss.runtime.embeddings.service import vector_similarity
+from namel3ss.runtime.embeddings.store import EmbeddingRecord, SQLiteEmbeddingStore
+from namel3ss.runtime.embeddings.vectors import VectorMatrix, pack_vector, round_scores, unpack_vector
+from namel3ss.runtime.performance.cache import BoundedCache
+
+
+def _record(chunk_hash: str, vector: list[float] | None, *, status: str = "ok") -> EmbeddingRecord:
+    return EmbeddingRecord(
+        chunk_id=f"doc:{chunk_hash}",
+        chunk_hash=chunk_hash,
+        model_id="test:v1",
+        dims=3,
+        vector=vector,
+        status=status,
+    )
+
+
+def test_packed_vectors_round_trip_exactly() -> None:
+    vector = [0.123457, -0.5, 1.0, 0.0, 1e-09]
+    packed = pack_vector(vector)
+    assert len(packed) == 8 * len(vector)
+    assert unpack_vector(packed).tolist() == vector
+    with pytest.raises(Namel3ssError):
+        unpack_vector(packed[:-1])
+
+
+def test_batched_scores_match_per_vector_similarity() -> None:
+    vectors = {
+        "a": [0.6, -0.8, 0.0],
+        "b": [0.267261, 0.534522, 0.801784],
+        "c": [-0.57735, 0.57735, -0.57735],
+    }
+    query = [0.408248, -0.408248, 0.816497]
+    matrix = VectorMatrix()
+    for chunk_hash, vector in vectors.items():
+        matrix.add(chunk_hash=chunk_hash, chunk_id=chunk_hash, dims=3, status="ok", vector=vector)
+    scores = round_scores(matrix.dot(["c", "a", "b"], query), 6)
+    expected = [vector_similarity(query, vectors[key], precision=6) for key in ("c", "a", "b")]
+    assert scores == expected
+    with pytest.raises(Namel3ssError):
+        matrix.dot(["a"], [1.0, 0.0])
+
+
+def test_sqlite_store_writes_blobs_and_reads_legacy_json(tmp_path: Path) -> None:
+    db_path = tmp_path / "data.db"
+    store = SQLiteEmbeddingStore(db_path)
+    store.write_records([_record("h1", [0.1, 0.2, 0.3]), _record("h2", None, status="unavailable")])
+    store.conn.execute(
+        "INSERT INTO embedding_vectors (chunk_hash, model_id, chunk_id, dims, vector, status) "
+        "VALUES ('h3', 'test:v1', 'doc:h3', 3, '[0.5,0.5,0.0]', 'ok')"
+    )
+    raw = sqlite3.connect(db_path).execute(
+        "SELECT vector, vector_blob FROM embedding_vectors WHERE chunk_hash = 'h1'"
+    ).fetchone()
+    assert raw[0] is None
+    assert isinstance(raw[1], bytes)
+
+    records = store.get_records(model_id="test:v1", chunk_hashes=["h1", "h2", "h3"])
+    assert records["h1"].vector == [0.1, 0.2, 0.3]
+    assert records["h2"].vector is None
+    assert records["h3"].vector == [0.5, 0.5, 0.0]
+
+    matrix = store.vector_matrix(model_id="test:v1", chunk_hashes=["h1", "h2", "h3", "missing"])
+    assert "h2" in matrix and "missing" not in matrix
+    assert round_scores(matrix.dot(["h1", "h3"], [1.0, 1.0, 1.0]), 3) == [0.6, 1.0]
+    reopened = SQLiteEmbeddingStore(db_path)
+    assert reopened.vector_matrix(model_id="test:v1", chunk_hashes=["h1"]) is matrix
+    reopened.close()
+    store.close()
+    fresh = SQLiteEmbeddingStore(db_path)
+    assert fresh.vector_matrix(model_id="test:v1", chunk_hashes=["h1"]) is not matrix
+    fresh.close()
+
+
+def test_shared_matrices_are_bounded(tmp_path: Path, monkeypatch) -> None:
+    cache = BoundedCache(max_entries=2, max_weight=64, weigher=lambda matrix: matrix.nbytes)
+    monkeypatch.setattr(matrix_cache, "_SHARED_MATRICES", cache)
+    stores = [SQLiteEmbeddingStore(tmp_path / f"data{index}.db") for index in range(3)]
+    for store in stores:
+        store.write_records([_record("h1", [0.1, 0.2, 0.3])])
+        store.vector_matrix(model_id="test:v1", chunk_hashes=["h1"])
+    assert len(cache) == 2
+    stores[0].write_records([_record(f"h{index}", [0.1, 0.2, 0.3]) for index in range(2, 5)])
+    # Four 3-dim rows exceed the 64 byte budget, so the grown matrix is not kept.
+    stores[0].vector_matrix(model_id="test:v1", chunk_hashes=["h1", "h2", "h3", "h4"])
+    assert cache.stats().weight <= 64
+    for store in stores:
+        store.close()
+    assert len(cache) == 0
@@ -0,0 +1,192 @@
+from contextlib import contextmanager
+import os
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.memory.contract import MemoryKind
+from namel3ss.runtime.memory.manager import MemoryManager
+from namel3ss.runtime.memory_persist import journal as journal_module
+from namel3ss.runtime.memory_persist.paths import journal_path, snapshot_paths
+from namel3ss.runtime.memory_persist.writer import build_snapshot_payload, serialize_snapshot
+
+
+STORE_KEY = "session:owner:my"
+
+
+def _remember(manager: MemoryManager, text: str, kind: MemoryKind = MemoryKind.SEMANTIC, store_key: str = STORE_KEY):
+    phase, _ = manager._phases.ensure_phase(store_key)
+    item = manager._factory.create(
+        session=store_key,
+        kind=kind,
+        text=text,
+        source="user",
+        meta={"phase_id": phase.phase_id, "space": "session", "owner": "owner", "lane": "my"},
+    )
+    if kind == MemoryKind.SEMANTIC:
+        manager.semantic.store_item(store_key, item)
+    else:
+        manager.short_term.store_item(store_key, item)
+    manager._ledger.record_add(store_key, phase=phase, item=item)
+    return item
+
+
+def _payload(manager: MemoryManager, root: str) -> str:
+    return serialize_snapshot(build_snapshot_payload(manager, project_root=root, app_path=None))
+
+
+def test_persist_appends_only_changed_units_and_restores_tail(tmp_path):
+    root = str(tmp_path)
+    manager = MemoryManager()
+    _remember(manager, "First note", store_key="session:other:my")
+    manager.persist(project_root=root)
+    snapshot_path, _ = snapshot_paths(project_root=root, app_path=None)
+    snapshot_before = snapshot_path.read_text(encoding="utf-8")
+    path = journal_path(project_root=root, app_path=None)
+    assert not path.exists()
+
+    second = _remember(manager, "Second note")
+    _remember(manager, "Chat line", kind=MemoryKind.SHORT_TERM)
+    manager.persist(project_root=root)
+    manager.persist(project_root=root)
+    manager.semantic.delete_item(STORE_KEY, second.id)
+    manager.persist(project_root=root)
+
+    assert snapshot_path.read_text(encoding="utf-8") == snapshot_before
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert "First note" not in lines[0]
+    assert "Second note" in lines[0]
+
+    restored = MemoryManager()
+    restored.ensure_restored(project_root=root, app_path=None)
+    assert _payload(restored, root) == _payload(manager, root)
+    assert restored._persist_journal.entries == 2
+
+    _remember(restored, "Third note")
+    restored.persist(project_root=root)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_managers_sharing_a_project_append_in_sequence(tmp_path):
+    root = str(tmp_path)
+    seed = MemoryManager()
+    _remember(seed, "Seed note")
+    seed.persist(project_root=root)
+
+    first = MemoryManager()
+    second = MemoryManager()
+    first.ensure_restored(project_root=root, app_path=None)
+    second.ensure_restored(project_root=root, app_path=None)
+    _remember(first, "First process", store_key="session:first:my")
+    first.persist(project_root=root)
+    _remember(second, "Second process", store_key="session:second:my")
+    second.persist(project_root=root)
+    _remember(first, "First again", store_key="session:first:my")
+    first.persist(project_root=root)
+
+    path = journal_path(project_root=root, app_path=None)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+    restored = MemoryManager()
+    restored.ensure_restored(project_root=root, app_path=None)
+    assert restored._persist_journal.entries == 3
+    payload = _payload(restored, root)
+    for text in ("Seed note", "First process", "Second process", "First again"):
+        assert text in payload
+
+
+def test_journal_compacts_into_snapshot_when_due(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal_module, "JOURNAL_COMPACT_ENTRIES", 2)
+    root = str(tmp_path)
+    manager = MemoryManager()
+    manager.persist(project_root=root)
+    path = journal_path(project_root=root, app_path=None)
+    for idx in range(2):
+        _remember(manager, f"Note {idx}")
+        manager.persist(project_root=root)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    _remember(manager, "Note 2")
+    manager.persist(project_root=root)
+    assert not path.exists()
+    restored = MemoryManager()
+    restored.ensure_restored(project_root=root, app_path=None)
+    assert [item.text for item in restored.semantic.all_items()] == ["Note 0", "Note 1", "Note 2"]
+
+
+def test_torn_journal_tail_is_ignored_and_compacted(tmp_path):
+    root = str(tmp_path)
+    manager = MemoryManager()
+    manager.persist(project_root=root)
+    _remember(manager, "Kept note")
+    manager.persist(project_root=root)
+    path = journal_path(project_root=root, app_path=None)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('0123 {"base":')
+
+    restored = MemoryManager()
+    restored.ensure_restored(project_root=root, app_path=None)
+    assert [item.text for item in restored.semantic.all_items()] == ["Kept note"]
+    assert restored._persist_journal.needs_compaction is True
+    restored.persist(project_root=root)
+    assert not path.exists()
+
+
+def test_corrupted_journal_entry_fails_restore(tmp_path):
+    root = str(tmp_path)
+    manager = MemoryManager()
+    manager.persist(project_root=root)
+    for text in ("One", "Two"):
+        _remember(manager, text)
+        manager.persist(project_root=root)
+    path = journal_path(project_root=root, app_path=None)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    path.write_text("\n".join([lines[0].replace("One", "Uno"), lines[1]]) + "\n", encoding="utf-8")
+    restored = MemoryManager()
+    with pytest.raises(Namel3ssError, match="Memory journal is corrupted"):
+        restored.ensure_restored(project_root=root, app_path=None)
+
+
+def test_persist_regroups_only_dirty_stores(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    manager = MemoryManager()
+    _remember(manager, "Quiet note", store_key="session:other:my")
+    _remember(manager, "Busy note")
+    manager.persist(project_root=root)
+    grouped: list[str] = []
+    original = journal_module.store_phase_groups
+    monkeypatch.setattr(
+        journal_module,
+        "store_phase_groups",
+        lambda manager, store_key: grouped.append(store_key) or original(manager, store_key),
+    )
+    manager.persist(project_root=root)
+    assert grouped == []
+
+    _remember(manager, "Another busy note")
+    manager.persist(project_root=root)
+    assert grouped == [STORE_KEY]
+    restored = MemoryManager()
+    restored.ensure_restored(project_root=root, app_path=None)
+    assert _payload(restored, root) == _payload(manager, root)
+
+
+def test_journal_appends_are_locked_and_synced(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    manager = MemoryManager()
+    manager.persist(project_root=root)
+    events: list[str] = []
+    real_lock = journal_module.locked_path
+    real_fsync = os.fsync
+
+    @contextmanager
+    def recording_lock(path):
+        with real_lock(path):
+            events.append(f"lock {path.name}")
+            yield
+            events.append("unlock")
+
+    monkeypatch.setattr(journal_module, "locked_path", recording_lock)
+    monkeypatch.setattr(os, "fsync", lambda fd: events.append("fsync") or real_fsync(fd))
+    _remember(manager, "Durable note")
+    manager.persist(project_root=root)
+    assert events == ["lock memory_journal.jsonl", "fsync", "unlock"]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+
+from namel3ss.config.model import AppConfig
+from namel3ss.determinism import canonical_trace_json
+from namel3ss.runtime.ai.mock_provider import MockProvider
+from namel3ss.runtime.executor import Executor
+from tests.conftest import lower_ir_program, pipeline_contracts
+
+
+SOURCE = '''spec is "1.0"
+
+capabilities:
+  performance
+
+ai "assistant":
+  provider is "mock"
+  model is "mock-model"
+
+contract flow "ask_alpha":
+  input:
+  output:
+    result is text
+
+contract flow "ask_beta":
+  input:
+  output:
+    result is text
+
+flow "ask_alpha":
+  ask ai "assistant" with input: "alpha" as answer
+  return map:
+    "result" is answer
+
+flow "ask_beta":
+  ask ai "assistant" with input: "beta" as answer
+  return map:
+    "result" is answer
+
+flow "demo":
+  orchestration:
+    branch "beta":
+      call flow "ask_beta":
+        input:
+        output:
+          result
+    branch "alpha":
+      call flow "ask_alpha":
+        input:
+        output:
+          result
+  merge:
+    policy is "all_ok"
+  as out
+  return out
+'''
+
+
+class _BarrierProvider(MockProvider):
+    def __init__(self, parties: int) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def ask(self, **kwargs):
+        # Both branches must be in flight at once for the barrier to release.
+        self.barrier.wait()
+        return super().ask(**kwargs)
+
+
+def _run(*, async_runtime: bool, provider: MockProvider, max_fan_out: int = 4, source: str = SOURCE, state=None):
+    program = lower_ir_program(source)
+    flow = next(item for item in program.flows if item.name == "demo")
+    config = AppConfig()
+    config.performance.async_runtime = async_runtime
+    config.performance.max_fan_out = max_fan_out
+    config.performance.cache_size = 0
+    executor = Executor(
+        flow,
+        schemas={},
+        initial_state=state,
+        ai_profiles=program.ais,
+        ai_provider=provider,
+        flows={item.name: item for item in program.flows},
+        flow_contracts=getattr(program, "flow_contracts", {}) or {},
+        pipeline_contracts=pipeline_contracts(),
+        capabilities=program.capabilities,
+        config=config,
+    )
+    return executor.run()
+
+
+def _results(result) -> list[str]:
+    return [str(item["result"]).split(" | ")[0] for item in result.last_value]
+
+
+def test_orchestration_branches_run_concurrently_with_async_runtime() -> None:
+    result = _run(async_runtime=True, provider=_BarrierProvider(parties=2))
+    assert _results(result) == ["[mock-model] beta", "[mock-model] alpha"]
+    finished = [event for event in result.traces if isinstance(event, dict) and event.get("type") == "orchestration_branch_finished"]
+    assert [event["concurrent"] for event in finished] == [True, True]
+    assert all(isinstance(event["duration_ms"], int) and event["duration_ms"] >= 0 for event in finished)
+    assert "duration_ms" not in canonical_trace_json(result.traces)
+
+
+def test_concurrent_orchestration_matches_sequential_run() -> None:
+    concurrent = _run(async_runtime=True, provider=MockProvider())
+    sequential = _run(async_runtime=False, provider=MockProvider())
+    assert _results(concurrent) == _results(sequential)
+    assert [(step["id"], step["kind"]) for step in concurrent.execution_steps] == [
+        (step["id"], step["kind"]) for step in sequential.execution_steps
+    ]
+    flow_calls = [
+        event.get("flow_call_id")
+        for event in concurrent.traces
+        if isinstance(event, dict) and event.get("flow_call_id")
+    ]
+    expected = [
+        event.get("flow_call_id")
+        for event in sequential.traces
+        if isinstance(event, dict) and event.get("flow_call_id")
+    ]
+    assert flow_calls == expected
+
+
+def test_fan_out_of_one_keeps_branches_sequential() -> None:
+    result = _run(async_runtime=True, provider=MockProvider(), max_fan_out=1)
+    finished = [event for event in result.traces if isinstance(event, dict) and event.get("type") == "orchestration_branch_finished"]
+    assert all("concurrent" not in event for event in finished)
+    assert canonical_trace_json(result.traces)
+
+
+STATE_SOURCE = '''spec is "1.0"
+
+capabilities:
+  performance
+
+contract flow "write_a":
+  input:
+  output:
+    result is text
+
+contract flow "write_b":
+  input:
+  output:
+    result is text
+
+flow "write_a": requires true
+  set state.counter is 5
+  set state.a is "from_a"
+  return map:
+    "result" is "a"
+
+flow "write_b": requires true
+  set state.b is "from_b"
+  return map:
+    "result" is "b"
+
+flow "demo": requires true
+  orchestration:
+    branch "a":
+      call flow "write_a":
+        input:
+        output:
+          result
+    branch "b":
+      call flow "write_b":
+        input:
+        output:
+          result
+  merge:
+    policy is "all_ok"
+  as out
+  return out
+'''
+
+
+def test_concurrent_branches_keep_each_others_state_writes() -> None:
+    runs = [
+        _run(async_runtime=flag, provider=MockProvider(), source=STATE_SOURCE, state={"counter": 0})
+        for flag in (False, True)
+    ]
+    assert [dict(run.state) for run in runs] == [{"counter": 5, "a": "from_a", "b": "from_b"}] * 2
+    finished = [event for event in runs[1].traces if isinstance(event, dict) and event.get("type") == "orchestration_branch_finished"]
+    assert [event["concurrent"] for event in finished] == [True, True]
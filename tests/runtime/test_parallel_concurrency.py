@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from namel3ss.config.model import AppConfig
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.ai.mock_provider import MockProvider
+from namel3ss.runtime.executor import Executor
+from namel3ss.runtime.executor.parallel import scheduler as parallel_scheduler
+from namel3ss.runtime.executor.parallel.concurrent import (
+    ConcurrentTaskOutcome,
+    count_agent_call,
+    run_tasks_concurrently,
+)
+from tests.conftest import lower_ir_program
+
+
+SOURCE = '''spec is "1.0"
+
+capabilities:
+  performance
+
+ai "assistant":
+  provider is "mock"
+  model is "mock-model"
+
+flow "demo":
+  parallel:
+    run "gamma":
+      ask ai "assistant" with input: "gamma" as gamma
+    run "alpha":
+      ask ai "assistant" with input: "alpha" as alpha
+    run "beta":
+      ask ai "assistant" with input: "beta" as beta
+'''
+
+
+class _BarrierProvider(MockProvider):
+    def __init__(self, parties: int) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def ask(self, **kwargs):
+        # Every task must be in flight at once for the barrier to release.
+        self.barrier.wait()
+        return super().ask(**kwargs)
+
+
+AGENT_SOURCE = '''spec is "1.0"
+
+capabilities:
+  performance
+
+ai "assistant":
+  provider is "mock"
+  model is "mock-model"
+
+agent "helper":
+  ai is "assistant"
+
+flow "demo":
+  parallel:
+    run "one":
+      run agent "helper" with input: "one a" as one_a
+      run agent "helper" with input: "one b" as one_b
+    run "two":
+      run agent "helper" with input: "two a" as two_a
+      run agent "helper" with input: "two b" as two_b
+    run "three":
+      run agent "helper" with input: "three a" as three_a
+      run agent "helper" with input: "three b" as three_b
+'''
+
+
+def _run(*, async_runtime: bool, provider: MockProvider, source: str = SOURCE, max_concurrency: int | None = None):
+    program = lower_ir_program(source)
+    flow = program.flows[0]
+    config = AppConfig()
+    config.performance.async_runtime = async_runtime
+    config.performance.cache_size = 0
+    if max_concurrency is not None:
+        config.performance.max_concurrency = max_concurrency
+    executor = Executor(
+        flow,
+        schemas={},
+        ai_profiles=program.ais,
+        agents=program.agents,
+        ai_provider=provider,
+        capabilities=program.capabilities,
+        config=config,
+    )
+    return executor.run()
+
+
+def test_parallel_tasks_run_concurrently_with_async_runtime() -> None:
+    result = _run(async_runtime=True, provider=_BarrierProvider(parties=3))
+    values = result.last_value
+    assert [value.split(" | ")[0] for value in values] == [
+        "[mock-model] alpha",
+        "[mock-model] beta",
+        "[mock-model] gamma",
+    ]
+
+
+def test_concurrent_parallel_matches_sequential_traces_and_steps() -> None:
+    concurrent = _run(async_runtime=True, provider=MockProvider())
+    sequential = _run(async_runtime=False, provider=MockProvider())
+    assert concurrent.last_value == sequential.last_value
+    assert _trace_kinds(concurrent.traces) == _trace_kinds(sequential.traces)
+    assert [(step["id"], step["kind"], step["what"]) for step in concurrent.execution_steps] == [
+        (step["id"], step["kind"], step["what"]) for step in sequential.execution_steps
+    ]
+
+
+def test_concurrent_parallel_tasks_share_the_agent_call_limit() -> None:
+    with pytest.raises(Namel3ssError, match="Agent call limit exceeded"):
+        _run(async_runtime=False, provider=MockProvider(), source=AGENT_SOURCE)
+    with pytest.raises(Namel3ssError, match="Agent call limit exceeded"):
+        _run(async_runtime=True, provider=MockProvider(), source=AGENT_SOURCE)
+
+
+def test_failing_task_cancels_tasks_not_started_and_joins_counters() -> None:
+    ctx = SimpleNamespace(
+        store=object(),
+        memory_manager=object(),
+        agent_calls=1,
+        flow_call_counter=3,
+        call_stack=[],
+        flow_stack=[],
+        calc_assignment_index={},
+        provider_cache={},
+        async_tasks={},
+    )
+    first_running = threading.Event()
+    started: list[int] = []
+
+    def run_task(fork, task: int):
+        started.append(task)
+        fork.flow_call_counter += task
+        count_agent_call(fork)
+        if task == 0:
+            first_running.wait(5)
+            return None, Namel3ssError("task failed")
+        first_running.set()
+        # Finish after the failing task has reported its error.
+        time.sleep(0.2)
+        return task, None
+
+    outcomes = run_tasks_concurrently(ctx, [0, 1, 2, 3], max_workers=2, run_task=run_task)
+    assert sorted(started) == [0, 1]
+    assert [outcome.cancelled for outcome in outcomes] == [False, False, True, True]
+    assert isinstance(outcomes[0].error, Namel3ssError)
+    assert ctx.agent_calls == 3
+    assert ctx.flow_call_counter == 4
+
+
+def test_cancelled_task_reports_the_later_task_error(monkeypatch) -> None:
+    failure = Namel3ssError("beta failed")
+
+    def fake_run(ctx, tasks, *, max_workers, run_task):
+        # Task 0 saw task 1 fail before it started.
+        return [
+            ConcurrentTaskOutcome(result=None, error=None, steps=[], explain_log=[], context=ctx, cancelled=True),
+            ConcurrentTaskOutcome(result=None, error=failure, steps=[], explain_log=[], context=ctx),
+            ConcurrentTaskOutcome(result=None, error=None, steps=[], explain_log=[], context=ctx, cancelled=True),
+        ]
+
+    monkeypatch.setattr(parallel_scheduler, "run_tasks_concurrently", fake_run)
+    with pytest.raises(Namel3ssError, match="beta failed"):
+        _run(async_runtime=True, provider=MockProvider())
+
+
+def _trace_kinds(traces: list) -> list[str]:
+    kinds: list[str] = []
+    for trace in traces:
+        if isinstance(trace, dict):
+            kinds.append(str(trace.get("type")))
+        else:
+            kinds.append(f"ai:{getattr(trace, 'input', '')}")
+    return kinds
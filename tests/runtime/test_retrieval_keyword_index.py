@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+
+from namel3ss.ingestion.policy import ACTION_RETRIEVAL_INCLUDE_WARN, PolicyDecision
+from namel3ss.ingestion.store import update_index
+from namel3ss.retrieval.api import run_retrieval
+from namel3ss.retrieval.keyword_index import build_keyword_index, clear_keyword_index_cache, keyword_index_for
+
+
+WORDS = ["invoice", "payment", "refund", "account", "shipping", "contract", "renewal", "balance", "voice"]
+
+
+def _allow_warn() -> PolicyDecision:
+    return PolicyDecision(
+        action=ACTION_RETRIEVAL_INCLUDE_WARN,
+        allowed=True,
+        reason="test",
+        required_permissions=(),
+        source="test",
+    )
+
+
+def _corpus(seed: int) -> dict:
+    rng = random.Random(seed)
+    state: dict = {"ingestion": {}}
+    for upload in range(6):
+        upload_id = f"upload-{upload}"
+        state["ingestion"][upload_id] = {"status": ("pass", "warn", "block")[upload % 3]}
+        chunks = []
+        for chunk_index in range(12):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(2, 24))]
+            chunks.append(
+                {
+                    "document_id": upload_id,
+                    "source_name": f"{upload_id}.txt",
+                    "page_number": 1 + chunk_index // 4,
+                    "chunk_index": chunk_index,
+                    "ingestion_phase": "deep" if chunk_index % 2 else "quick",
+                    # Keywords are capped, so text can still match words missing from them.
+                    "keywords": sorted(set(words))[:2],
+                    "text": " ".join(words),
+                }
+            )
+        update_index(state, upload_id=upload_id, chunks=chunks, low_quality=upload % 3 == 1)
+    return state
+
+
+def _indexed(state: dict, query: str) -> dict:
+    return run_retrieval(query=query, state=state, project_root=None, app_path=None, policy_decision=_allow_warn())
+
+
+def _scanned(state: dict, query: str) -> dict:
+    response = run_retrieval(
+        query=query,
+        state=state,
+        project_root=None,
+        app_path=None,
+        explain=True,
+        policy_decision=_allow_warn(),
+    )
+    response.pop("explain")
+    return response
+
+
+def test_indexed_retrieval_matches_full_scan() -> None:
+    for seed in range(3):
+        state = _corpus(seed)
+        for query in ["invoice", "refund balance", "voice", "oice pay", "contract renewal invoice", "missing"]:
+            assert _indexed(state, query) == _scanned(state, query)
+
+
+def test_index_is_rebuilt_after_out_of_band_chunk_edits() -> None:
+    clear_keyword_index_cache()
+    state = _corpus(7)
+    before = keyword_index_for(state["index"]["chunks"])
+    state["index"]["chunks"][0]["keywords"] = ["zebra"]
+    state["index"]["chunks"][0].pop("chunk_hash")
+    after = keyword_index_for(state["index"]["chunks"])
+    assert after is not before
+    assert after.postings["zebra"] == (0,)
+    assert _indexed(state, "zebra") == _scanned(state, "zebra")
+
+
+def test_candidates_include_substring_and_unindexed_chunks() -> None:
+    provenance = {"document_id": "u1", "source_name": "u1.txt", "page_number": 1, "ingestion_phase": "deep"}
+    entries = [
+        {**provenance, "upload_id": "u1", "chunk_index": 0, "keywords": ["alpha"], "text": "Alpha beta"},
+        {**provenance, "upload_id": "u1", "chunk_index": 1, "keywords": ["gamma"], "text": "gamma INVOICES"},
+        {**provenance, "upload_id": "u1", "chunk_index": 2, "text": "no stored keywords"},
+        "not a chunk",
+        {"upload_id": "u2", "chunk_index": 0, "keywords": ["alpha"], "text": "missing provenance"},
+    ]
+    index = build_keyword_index(entries)
+    assert index.always == (2, 4)
+    assert index.candidates("alpha", ["alpha"]) == [0, 2, 4]
+    assert index.candidates("voice", ["voice"]) == [1, 2, 4]
+    assert index.candidates("beta", ["beta"], extra_chunk_ids=["u1:1"]) == [0, 1, 2, 4]
+    assert index.blocked_count(lambda upload_id: upload_id == "u1") == 3
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from namel3ss.cli.app_loader import load_program
+from namel3ss.runtime.router import refresh as refresh_module
+from namel3ss.runtime.router.refresh import refresh_routes
+from namel3ss.runtime.router.registry import RouteRegistry
+
+
+SOURCE = '''spec is "1.0"
+
+flow "echo":
+  return "ok"
+
+route "user":
+  path is "/api/users/{id}"
+  method is "GET"
+  parameters:
+    id is text
+  request:
+    id is text
+  response:
+    value is text
+  flow is "echo"
+
+route "user_posts":
+  path is "/api/users/{user_id}/posts"
+  method is "GET"
+  parameters:
+    user_id is text
+  request:
+    user_id is text
+  response:
+    value is text
+  flow is "echo"
+
+route "me_settings":
+  path is "/api/users/me/settings"
+  method is "GET"
+  request:
+    verbose is text
+  response:
+    value is text
+  flow is "echo"
+'''
+
+
+def _program(tmp_path: Path):
+    app = tmp_path / "app.ai"
+    app.write_text(SOURCE, encoding="utf-8")
+    program, _sources = load_program(app.as_posix())
+    return program
+
+
+def test_trie_backtracks_from_static_to_param_segments(tmp_path: Path) -> None:
+    registry = RouteRegistry()
+    registry.update(_program(tmp_path).routes, revision="r1")
+    match = registry.match("GET", "/api/users/me/posts")
+    assert match is not None
+    assert match.entry.name == "user_posts"
+    assert match.path_params == {"user_id": "me"}
+    assert registry.match("GET", "/api/users/me/settings").entry.name == "me_settings"
+    assert registry.match("GET", "/api/users/42/").path_params == {"id": "42"}
+    assert registry.match("POST", "/api/users/42") is None
+    assert registry.match("GET", "/api/users/42/posts/7") is None
+    stats = registry.lookup_stats()
+    assert stats["lookups"] == 5
+    assert stats["candidates"] == 3
+
+
+def test_lookup_cost_follows_path_length_not_route_count(tmp_path: Path) -> None:
+    registry = RouteRegistry()
+    registry.update(_program(tmp_path).routes, revision="r1")
+    registry.match("GET", "/api/users/42")
+    # root, api, users, {id}
+    assert registry.lookup_stats()["nodes_visited"] == 4
+
+
+def test_refresh_skips_registry_work_for_same_revision(tmp_path: Path, monkeypatch) -> None:
+    program = _program(tmp_path)
+    registry = RouteRegistry()
+    calls: list[int] = []
+    original = refresh_module.load_route_permissions
+
+    def _tracked(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(refresh_module, "load_route_permissions", _tracked)
+    diff = refresh_routes(program=program, registry=registry, revision="r1")
+    assert diff["added"] == ["me_settings", "user", "user_posts"]
+    routes_before = registry.routes
+    refresh_routes(program=program, registry=registry, revision="r1")
+    assert len(calls) == 1
+    assert registry.routes == routes_before
+    refresh_routes(program=program, registry=registry, revision="r2")
+    assert len(calls) == 2
+    assert registry.revision == "r2"
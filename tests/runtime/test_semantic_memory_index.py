@@ -0,0 +1,100 @@
+import random
+
+from namel3ss.runtime.memory import semantic_index
+from namel3ss.runtime.memory.contract import MemoryClock, MemoryIdGenerator, MemoryItemFactory
+from namel3ss.runtime.memory.events import EVENT_CONTEXT, EVENT_DECISION, build_dedupe_key, normalize_text
+from namel3ss.runtime.memory.semantic import SemanticMemory
+from namel3ss.runtime.memory_policy.defaults import default_contract
+
+
+WORDS = ["ship", "weekly", "release", "shipping", "notes", "deploy", "friday", "team", "reviews", "we"]
+
+
+def _memory() -> SemanticMemory:
+    return SemanticMemory(factory=MemoryItemFactory(clock=MemoryClock(), id_generator=MemoryIdGenerator()))
+
+
+def _reference_recall(items, query, top_k, phase_ids):
+    if phase_ids is not None:
+        items = [item for item in items if item.meta.get("phase_id") in set(phase_ids)]
+    phase_rank = {phase_id: idx for idx, phase_id in enumerate(phase_ids or [])}
+    now_tick = max((item.created_at for item in items), default=0)
+    scored = []
+    for item in items:
+        q_norm = normalize_text(query)
+        t_norm = normalize_text(item.text)
+        sim = 0
+        if q_norm and t_norm:
+            sim = 2 if q_norm in t_norm else 1 if set(q_norm.split()) & set(t_norm.split()) else 0
+        score, _ = semantic_index.score_item(item, sim, now_tick)
+        rank = phase_rank.get(item.meta.get("phase_id"), 0) if len(phase_rank) > 1 else 0
+        scored.append(((rank, -score, -item.created_at, item.id), score))
+    scored.sort(key=lambda pair: pair[0])
+    return [(key[3], score) for key, score in scored[:top_k]]
+
+
+def test_indexed_recall_matches_full_scan_ranking():
+    rng = random.Random(7)
+    memory = _memory()
+    store_key = "session:s1:my"
+    for step in range(120):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5)))
+        meta = {"dedup_key": build_dedupe_key(EVENT_DECISION, text), "phase_id": f"phase-{1 + step // 40}"}
+        memory.record(store_key, text=text, source="user", importance=rng.randint(0, 5), meta=meta)
+        if step % 17 == 0:
+            victim = rng.choice(memory.items_for_store(store_key))
+            assert memory.delete_item(store_key, victim.id) is victim
+    items = memory.items_for_store(store_key)
+    queries = ["ship", "hip", "weekly release", "notes deploy friday", "nothing here", ""]
+    phase_sets = [None, ["phase-3"], ["phase-3", "phase-1"], ["phase-2", "phase-3", "phase-1"], []]
+    for query in queries:
+        for phase_ids in phase_sets:
+            for top_k in (1, 3, 10, -2):
+                recalled = memory.recall(store_key, query, top_k=top_k, phase_ids=phase_ids)
+                got = [(item.id, item.meta["score"]) for item in recalled]
+                assert got == _reference_recall(items, query, top_k, phase_ids), (query, phase_ids, top_k)
+
+
+def test_recall_scores_matching_items_and_newest_per_group(monkeypatch):
+    memory = _memory()
+    store_key = "session:s1:my"
+    for idx in range(200):
+        memory.record(store_key, text=f"filler entry {idx}", source="user", meta={"phase_id": "phase-1"})
+    memory.record(store_key, text="Ship the weekly release", source="user", importance=4, meta={"phase_id": "phase-1"})
+    for idx in range(50):
+        memory.record(store_key, text=f"more filler {idx}", source="user", meta={"phase_id": "phase-1"})
+    calls: list[str] = []
+    original = semantic_index.score_item
+
+    def _counting(item, sim_score, now_tick):
+        calls.append(item.id)
+        return original(item, sim_score, now_tick)
+
+    monkeypatch.setattr(semantic_index, "score_item", _counting)
+    recalled = memory.recall(store_key, "weekly release", top_k=3, phase_ids=["phase-1"])
+    assert recalled[0].text == "Ship the weekly release"
+    assert recalled[0].meta["recall_reason"] == ["matches_query", "importance"]
+    assert len(calls) <= 1 + 3
+
+
+def test_dedup_map_follows_deletes_and_retention():
+    memory = _memory()
+    store_key = "session:s1:my"
+    meta = {"dedup_key": build_dedupe_key(EVENT_DECISION, "ship weekly"), "event_type": EVENT_DECISION}
+    first = memory.record(store_key, text="ship weekly", source="user", meta=dict(meta))
+    second = memory.record(store_key, text="ship weekly", source="user", meta=dict(meta))
+    assert [item.id for item in memory.items_for_store(store_key)] == [second.id]
+    assert memory.get_item(store_key, first.id) is None
+    memory.delete_item(store_key, second.id)
+    third = memory.record(store_key, text="ship weekly", source="user", meta=dict(meta))
+    assert memory.get_item(store_key, third.id) is third
+    for idx in range(16):
+        memory.record(store_key, text=f"context {idx}", source="user", meta={"event_type": EVENT_CONTEXT}, dedupe_enabled=False)
+    now_tick = max(item.created_at for item in memory.items_for_store(store_key))
+    forgotten = memory.apply_retention(store_key, default_contract(write_policy="normal", forget_policy="decay"), now_tick)
+    assert forgotten
+    forgotten_ids = {item.id for item, _ in forgotten}
+    assert all(memory.get_item(store_key, item_id) is None for item_id in forgotten_ids)
+    recalled = memory.recall(store_key, "context", top_k=20)
+    assert recalled and not forgotten_ids & {item.id for item in recalled}
+    assert {item.id for item in recalled} == {item.id for item in memory.items_for_store(store_key)}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from namel3ss.runtime.router.program_state import ProgramState
+from namel3ss.runtime.watch import BACKEND_INOTIFY, BACKEND_POLL, SourceWatcher
+from namel3ss.runtime.watch.inotify import inotify_available
+
+
+APP_SOURCE = 'spec is "1.0"\n\nflow "demo":\n  return "ok"\n'
+
+
+def _watcher(tmp_path: Path, backend: str) -> SourceWatcher:
+    if backend == BACKEND_INOTIFY and not inotify_available():
+        pytest.skip("inotify is not available")
+    return SourceWatcher(tmp_path, poll_interval=0.02, debounce=0.01, use_inotify=backend == BACKEND_INOTIFY)
+
+
+@pytest.mark.parametrize("backend", [BACKEND_INOTIFY, BACKEND_POLL])
+def test_tracked_file_edits_bump_revision(tmp_path: Path, backend: str) -> None:
+    app = tmp_path / "app.ai"
+    app.write_text(APP_SOURCE, encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("draft", encoding="utf-8")
+    watcher = _watcher(tmp_path, backend)
+    try:
+        watcher.track([app])
+        assert watcher.backend == backend
+        (tmp_path / "notes.txt").write_text("draft two", encoding="utf-8")
+        assert not watcher.wait_for_change(0, timeout=0.3)
+        app.write_text(APP_SOURCE.replace("ok", "changed"), encoding="utf-8")
+        assert watcher.wait_for_change(0, timeout=5)
+        assert watcher.revision > 0
+    finally:
+        watcher.close()
+
+
+@pytest.mark.parametrize("backend", [BACKEND_INOTIFY, BACKEND_POLL])
+def test_untracked_project_counts_new_source_files(tmp_path: Path, backend: str) -> None:
+    watcher = _watcher(tmp_path, backend)
+    try:
+        watcher.track([])
+        (tmp_path / "modules").mkdir()
+        (tmp_path / "modules" / "extra.ai").write_text(APP_SOURCE, encoding="utf-8")
+        assert watcher.wait_for_change(0, timeout=5)
+    finally:
+        watcher.close()
+
+
+def test_program_state_reloads_only_after_watched_change(tmp_path: Path) -> None:
+    app = tmp_path / "app.ai"
+    app.write_text(APP_SOURCE, encoding="utf-8")
+    state = ProgramState(app)
+    revision = state.revision
+    assert state.refresh_if_needed() is False
+    watch_revision = state._watcher.revision
+    app.write_text(APP_SOURCE.replace("ok", "changed"), encoding="utf-8")
+    assert state._watcher.wait_for_change(watch_revision, timeout=5)
+    assert state.refresh_if_needed() is True
+    assert state.revision != revision
+    assert state.refresh_if_needed() is False
+
+
+def test_program_state_without_watching_keeps_first_load(tmp_path: Path) -> None:
+    app = tmp_path / "app.ai"
+    app.write_text(APP_SOURCE, encoding="utf-8")
+    state = ProgramState(app, watch_sources=False)
+    revision = state.revision
+    app.write_text(APP_SOURCE.replace("ok", "changed"), encoding="utf-8")
+    assert state.refresh_if_needed() is False
+    assert state.revision == revision
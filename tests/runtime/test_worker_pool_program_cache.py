@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from namel3ss.runtime.server import worker_pool
+from namel3ss.runtime.server.worker_pool import ServiceActionWorkerPool
+
+
+APP_SOURCE = '''spec is "1.0"
+
+flow "echo":
+  return input.message
+'''
+
+
+def test_worker_program_is_compiled_once_per_revision(tmp_path: Path, monkeypatch) -> None:
+    app_path = tmp_path / "app.ai"
+    app_path.write_text(APP_SOURCE, encoding="utf-8")
+    monkeypatch.setattr(worker_pool, "_compiled_programs", {})
+    loads: list[Path] = []
+    original = worker_pool.load_project
+
+    def _tracked_load(path, **kwargs):
+        loads.append(Path(path))
+        return original(path, **kwargs)
+
+    monkeypatch.setattr(worker_pool, "load_project", _tracked_load)
+    first = worker_pool._worker_program(app_path.as_posix())
+    assert worker_pool._worker_program(app_path.as_posix()) is first
+    result = worker_pool._run_flow_worker(app_path.as_posix(), "echo", {"message": "hi"}, {}, "")
+    assert result["last_value"] == "hi"
+    assert len(loads) == 1
+
+    watcher = worker_pool._compiled_programs[app_path.resolve()]._watcher
+    revision = watcher.revision
+    stat = app_path.stat()
+    os.utime(app_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert watcher.wait_for_change(revision, timeout=5)
+    assert worker_pool._worker_program(app_path.as_posix()) is first
+    assert len(loads) == 1
+
+    revision = watcher.revision
+    app_path.write_text(APP_SOURCE.replace("input.message", '"changed"'), encoding="utf-8")
+    assert watcher.wait_for_change(revision, timeout=5)
+    second = worker_pool._worker_program(app_path.as_posix())
+    assert second is not first
+    assert len(loads) == 2
+    result = worker_pool._run_flow_worker(app_path.as_posix(), "echo", {"message": "hi"}, {}, "")
+    assert result["last_value"] == "changed"
+
+
+def test_pool_prewarms_every_worker_on_start_and_resize(tmp_path: Path, monkeypatch) -> None:
+    created: list[_FakeExecutor] = []
+
+    def _fake_create(workers: int, app_path: str) -> _FakeExecutor:
+        executor = _FakeExecutor(workers, app_path)
+        created.append(executor)
+        return executor
+
+    monkeypatch.setattr(worker_pool, "_create_executor", _fake_create)
+    pool = ServiceActionWorkerPool(app_path=tmp_path / "app.ai", workers=2, ui_mode="service")
+    pool.resize(3)
+    assert [executor.workers for executor in created] == [2, 3]
+    assert created[0].submitted == [worker_pool._worker_ready] * 2
+    assert created[1].submitted == [worker_pool._worker_ready] * 3
+    assert created[1].app_path == (tmp_path / "app.ai").resolve().as_posix()
+    assert created[0].closed
+    assert pool.queue_depth() == 0
+
+
+class _FakeExecutor:
+    def __init__(self, workers: int, app_path: str) -> None:
+        self.workers = workers
+        self.app_path = app_path
+        self.submitted: list[object] = []
+        self.closed = False
+
+    def submit(self, fn, *args):
+        self.submitted.append(fn)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self.closed = True
+
+
+def test_warm_worker_logs_compile_failures(tmp_path: Path, monkeypatch, caplog) -> None:
+    app_path = tmp_path / "app.ai"
+    app_path.write_text('spec is "1.0"\n\nflow "broken"\n', encoding="utf-8")
+    monkeypatch.setattr(worker_pool, "_compiled_programs", {})
+    with caplog.at_level("WARNING", logger=worker_pool.__name__):
+        worker_pool._warm_worker(app_path.as_posix())
+    assert any(app_path.as_posix() in record.getMessage() and record.exc_info for record in caplog.records)
@@ -0,0 +1,243 @@
+import json
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.ingestion.store import drop_index, update_index
+from namel3ss.runtime.storage import sqlite_store, state_entries
+from namel3ss.runtime.storage.sqlite_store import SCHEMA_VERSION, SQLiteStore
+from namel3ss.runtime.storage.state_entries import TrackedState, load_state_keys, save_state_keys
+from namel3ss.runtime.store.memory_store import MemoryStore
+from tests.conftest import run_flow
+
+
+def _writes(store: SQLiteStore) -> list[str]:
+    statements: list[str] = []
+    store.conn.set_trace_callback(statements.append)
+    return statements
+
+
+def _state_writes(statements: list[str]) -> list[str]:
+    return [sql for sql in statements if sql.startswith(("INSERT INTO app_state_entries", "DELETE FROM app_state_entries"))]
+
+
+def test_save_state_writes_only_changed_keys(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    state = {"index": {"chunks": [{"text": "x" * 200}] * 50}, "chat": {"messages": []}, "count": Decimal("1")}
+    store.save_state(state)
+    state["chat"]["messages"].append({"role": "user", "content": "hi"})
+    statements = _writes(store)
+    store.save_state(state)
+    writes = _state_writes(statements)
+    assert len(writes) == 1
+    assert "'chat'" in writes[0]
+    statements.clear()
+    store.save_state(state)
+    assert _state_writes(statements) == []
+    store.close()
+
+    reopened = SQLiteStore(tmp_path / "data.db")
+    assert reopened.load_state() == state
+    reopened.close()
+
+
+def test_type_only_changes_are_persisted(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save_state({"flag": 1, "items": {"b": 1, "a": 2}})
+    store.save_state({"flag": True, "items": {"a": 2, "b": 1}})
+    loaded = SQLiteStore(tmp_path / "data.db").load_state()
+    assert loaded["flag"] is True
+    assert list(loaded["items"]) == ["a", "b"]
+
+
+def test_removed_keys_are_deleted_and_order_is_kept(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save_state({"b": 1, "a": 2, "c": 3})
+    store.save_state({"b": 1, "c": 3})
+    assert list(SQLiteStore(tmp_path / "data.db").load_state()) == ["b", "c"]
+
+
+def test_lazy_load_and_keyed_save(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save_state({"chat": {"threads": []}, "index": {"chunks": [1, 2]}, "user": "ada"})
+    partial = load_state_keys(store, ("chat",))
+    assert partial == {"chat": {"threads": []}}
+    partial["chat"]["threads"].append({"id": "t1"})
+    save_state_keys(store, partial, ("chat",))
+    assert store.load_state() == {
+        "chat": {"threads": [{"id": "t1"}]},
+        "index": {"chunks": [1, 2]},
+        "user": "ada",
+    }
+
+
+def test_unchanged_key_is_rewritten_after_another_writer(tmp_path: Path) -> None:
+    first = SQLiteStore(tmp_path / "data.db")
+    second = SQLiteStore(tmp_path / "data.db")
+    state = first.load_state()
+    state["user"] = "ada"
+    first.save_state(state)
+    other = second.load_state()
+    other["user"] = "grace"
+    second.save_state(other)
+    first.save_state(state)
+    assert SQLiteStore(tmp_path / "data.db").load_state() == {"user": "ada"}
+
+
+def test_legacy_state_document_is_split_into_entries(tmp_path: Path) -> None:
+    path = tmp_path / "data.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE schema_version (version INTEGER NOT NULL)")
+    conn.execute("INSERT INTO schema_version (version) VALUES (2)")
+    conn.execute("CREATE TABLE app_state (id INTEGER PRIMARY KEY CHECK (id = 1), payload TEXT NOT NULL)")
+    payload = {"chat": {"messages": ["hi"]}, "total": {"__n3_decimal__": "2.5"}}
+    conn.execute("INSERT INTO app_state (id, payload) VALUES (1, ?)", (json.dumps(payload),))
+    conn.commit()
+    conn.close()
+    store = SQLiteStore(path)
+    assert store.load_state() == {"chat": {"messages": ["hi"]}, "total": Decimal("2.5")}
+    assert store.conn.execute("SELECT COUNT(*) FROM app_state").fetchone()[0] == 0
+    assert store.conn.execute("SELECT version FROM schema_version").fetchone()[0] == SCHEMA_VERSION
+    store.close()
+
+
+def test_older_store_refuses_split_state(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "data.db"
+    store = SQLiteStore(path)
+    store.save_state({"total": 1})
+    store.close()
+    # A binary from before the split only knows schema version 2.
+    monkeypatch.setattr(sqlite_store, "SCHEMA_VERSION", 2)
+    with pytest.raises(Namel3ssError, match="Unsupported schema version 3"):
+        SQLiteStore(path)
+
+
+def test_memory_store_keyed_state() -> None:
+    store = MemoryStore()
+    store.save_state({"a": 1, "b": 2})
+    assert store.load_state(keys=("b", "missing")) == {"b": 2}
+    store.save_state({"b": 3}, keys=("a", "b"))
+    assert store.load_state() == {"b": 3}
+
+
+def test_loaded_state_tracks_keys_that_may_change(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save_state({"count": 1, "index": {"chunks": [1]}, "chat": {"messages": []}, "user": "ada"})
+    state = store.load_state()
+    assert isinstance(state, TrackedState)
+    assert state["count"] == 1 and state.get("user") == "ada" and "index" in state
+    assert state.dirty == set()
+    state["chat"]["messages"].append("hi")
+    state["count"] = 2
+    state.pop("user")
+    assert state.dirty == {"chat", "count", "user"}
+    store.close()
+
+
+def test_flow_save_encodes_only_touched_keys(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save_state({"count": 1, "index": {"chunks": ["x" * 50] * 20}, "notes": {"a": 1}})
+    encoded: list[object] = []
+    original = state_entries.encode_state_value
+
+    def _encode(value: object) -> str:
+        encoded.append(value)
+        return original(value)
+
+    monkeypatch.setattr(state_entries, "encode_state_value", _encode)
+    source = '''spec is "1.0"
+
+flow "demo":
+  set state.count is state.count + 1
+  return state.count
+'''
+    run_flow(source, store=store)
+    assert encoded == [2]
+    monkeypatch.undo()
+    assert SQLiteStore(tmp_path / "data.db").load_state() == {
+        "count": 2,
+        "index": {"chunks": ["x" * 50] * 20},
+        "notes": {"a": 1},
+    }
+    store.close()
+
+
+def _upload_chunks(upload_id: str, count: int) -> list[dict]:
+    return [
+        {
+            "document_id": upload_id,
+            "source_name": f"{upload_id}.txt",
+            "page_number": 1,
+            "chunk_index": chunk_index,
+            "ingestion_phase": "deep",
+            "keywords": ["alpha"],
+            "text": f"alpha {upload_id} {chunk_index}",
+        }
+        for chunk_index in range(count)
+    ]
+
+
+def _index_state(uploads: int) -> dict:
+    state: dict = {}
+    for upload in range(uploads):
+        upload_id = f"upload-{upload}"
+        update_index(state, upload_id=upload_id, chunks=_upload_chunks(upload_id, 3), low_quality=False)
+    return state
+
+
+def _state_keys(store: SQLiteStore) -> list[str]:
+    return [row[0] for row in store.conn.execute("SELECT state_key FROM app_state_entries ORDER BY state_key")]
+
+
+def test_index_uploads_are_stored_and_written_one_row_each(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save_state(_index_state(3))
+    assert _state_keys(store) == ["index", "index/upload-0", "index/upload-1", "index/upload-2"]
+    state = store.load_state()
+    assert state == _index_state(3)
+
+    encoded: list[object] = []
+    original = state_entries.encode_state_value
+
+    def _encode(value: object) -> str:
+        encoded.append(value)
+        return original(value)
+
+    monkeypatch.setattr(state_entries, "encode_state_value", _encode)
+    statements = _writes(store)
+    update_index(state, upload_id="upload-1", chunks=_upload_chunks("upload-1", 1), low_quality=False)
+    store.save_state(state, keys=tuple(state.dirty))
+    writes = _state_writes(statements)
+    assert len(writes) == 2
+    assert "'index/upload-1'" in writes[0] or "'index/upload-1'" in writes[1]
+    assert [len(value) for value in encoded if isinstance(value, list)] == [1]
+
+    statements.clear()
+    drop_index(state, upload_id="upload-2")
+    store.save_state(state, keys=("index",))
+    assert [sql for sql in _state_writes(statements) if sql.startswith("DELETE")] == [
+        "DELETE FROM app_state_entries WHERE state_key = 'index/upload-2'"
+    ]
+    monkeypatch.undo()
+    store.close()
+
+    reopened = SQLiteStore(tmp_path / "data.db")
+    assert reopened.load_state() == state
+    assert load_state_keys(reopened, ("index",)) == {"index": state["index"]}
+    assert _state_keys(reopened) == ["index", "index/upload-0", "index/upload-1"]
+    reopened.close()
+
+
+def test_index_without_a_valid_manifest_is_stored_whole(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    state = _index_state(2)
+    store.save_state(state)
+    # Apps may rewrite the chunk list directly, leaving the manifest behind.
+    state["index"]["chunks"] = state["index"]["chunks"][1:]
+    store.save_state(state)
+    assert _state_keys(store) == ["index"]
+    assert SQLiteStore(tmp_path / "data.db").load_state() == state
+    store.close()
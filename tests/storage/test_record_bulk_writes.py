@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.records.service import save_records_or_raise
+from namel3ss.runtime.store.memory_store import MemoryStore
+from namel3ss.runtime.storage.sqlite_store import SQLiteStore
+from namel3ss.schema.records import FieldConstraint, FieldSchema, RecordSchema
+
+
+def _schema() -> RecordSchema:
+    return RecordSchema(
+        name="Item",
+        fields=[
+            FieldSchema(name="id", type_name="number"),
+            FieldSchema(name="name", type_name="text"),
+            FieldSchema(name="sku", type_name="text", constraint=FieldConstraint(kind="unique")),
+        ],
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path: Path):
+    if request.param == "memory":
+        yield MemoryStore()
+        return
+    sqlite_store = SQLiteStore(tmp_path / "data.db")
+    yield sqlite_store
+    sqlite_store.close()
+
+
+def test_save_many_assigns_ids_in_order(store) -> None:
+    schema = _schema()
+    store.save(schema, {"name": "first", "sku": "a"})
+    saved = store.save_many(schema, [{"name": "b", "sku": "b"}, {"name": "c", "sku": "c"}])
+    assert [row["id"] for row in saved] == [2, 3]
+    assert [row["name"] for row in store.find(schema, lambda _rec: True)] == ["first", "b", "c"]
+
+
+def test_update_many_writes_every_record(store) -> None:
+    schema = _schema()
+    saved = store.save_many(schema, [{"name": "a", "sku": "a"}, {"name": "b", "sku": "b"}])
+    store.update_many(schema, [dict(row, name=row["name"].upper()) for row in saved])
+    assert [row["name"] for row in store.find(schema, lambda _rec: True)] == ["A", "B"]
+
+
+def test_sqlite_save_many_rolls_back_on_conflict(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    schema = _schema()
+    store.save(schema, {"name": "a", "sku": "a"})
+    with pytest.raises(Namel3ssError):
+        store.save_many(schema, [{"name": "b", "sku": "b"}, {"name": "dup", "sku": "a"}])
+    assert [row["sku"] for row in store.find(schema, lambda _rec: True)] == ["a"]
+    store.close()
+
+
+def test_sqlite_update_many_reports_missing_record(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    schema = _schema()
+    saved = store.save(schema, {"name": "a", "sku": "a"})
+    with pytest.raises(Namel3ssError) as excinfo:
+        store.update_many(schema, [saved, {"id": 99, "name": "ghost", "sku": "g"}])
+    assert "id=99 was not found" in str(excinfo.value)
+    store.close()
+
+
+def test_save_records_rejects_duplicates_inside_batch() -> None:
+    schema = _schema()
+    store = MemoryStore()
+    with pytest.raises(Namel3ssError) as excinfo:
+        save_records_or_raise(
+            "Item",
+            [{"name": "a", "sku": "x"}, {"name": "b", "sku": "x"}],
+            {"Item": schema},
+            {},
+            store,
+        )
+    assert "must be unique" in str(excinfo.value)
+    assert store.find(schema, lambda _rec: True) == []
@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pytest
+
+from namel3ss.errors.base import Namel3ssError
+from namel3ss.runtime.records.inspection import collect_record_preview
+from namel3ss.runtime.store.memory_store import MemoryStore
+from namel3ss.runtime.storage.pagination import iter_record_pages, iter_records
+from namel3ss.runtime.storage.sqlite_store import SQLiteStore
+from namel3ss.schema.records import FieldSchema, RecordSchema
+from tests.conftest import run_flow
+
+
+def _schema() -> RecordSchema:
+    return RecordSchema(
+        name="Item",
+        fields=[
+            FieldSchema(name="id", type_name="number"),
+            FieldSchema(name="name", type_name="text"),
+        ],
+    )
+
+
+def _seed(store, count: int) -> RecordSchema:
+    schema = _schema()
+    for index in range(1, count + 1):
+        store.save(schema, {"name": f"item-{index}"})
+    return schema
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path: Path):
+    if request.param == "memory":
+        yield MemoryStore()
+        return
+    sqlite_store = SQLiteStore(tmp_path / "data.db")
+    yield sqlite_store
+    sqlite_store.close()
+
+
+def test_find_page_walks_keyset_pages(store) -> None:
+    schema = _seed(store, 7)
+    first = store.find_page(schema, lambda _rec: True, limit=3)
+    assert [row["id"] for row in first.records] == [1, 2, 3]
+    assert first.next_after_id == 3
+    second = store.find_page(schema, lambda _rec: True, after_id=first.next_after_id, limit=3)
+    assert [row["id"] for row in second.records] == [4, 5, 6]
+    last = store.find_page(schema, lambda _rec: True, after_id=second.next_after_id, limit=3)
+    assert [row["id"] for row in last.records] == [7]
+    assert last.next_after_id is None
+
+
+def test_find_page_filters_across_scanned_pages(store) -> None:
+    schema = _seed(store, 10)
+    even = lambda rec: rec["id"] % 2 == 0
+    page = store.find_page(schema, even, limit=2)
+    assert [row["id"] for row in page.records] == [2, 4]
+    rest = store.find_page(schema, even, after_id=page.next_after_id, limit=10)
+    assert [row["id"] for row in rest.records] == [6, 8, 10]
+    assert rest.next_after_id is None
+
+
+def test_find_page_accepts_filter_maps(store) -> None:
+    schema = _seed(store, 4)
+    page = store.find_page(schema, {"name": "item-3"}, limit=5)
+    assert [row["name"] for row in page.records] == ["item-3"]
+
+
+def test_list_records_resumes_after_id(store) -> None:
+    schema = _seed(store, 5)
+    assert [row["id"] for row in store.list_records(schema, limit=2, after_id=2)] == [3, 4]
+
+
+def test_iter_records_matches_find(store) -> None:
+    schema = _seed(store, 12)
+    streamed = list(iter_records(store, schema, lambda _rec: True, page_size=5))
+    assert streamed == store.find(schema, lambda _rec: True)
+
+
+def test_sqlite_pages_are_bounded(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    schema = _seed(store, 11)
+    pages = list(iter_record_pages(store, schema, lambda _rec: True, page_size=4))
+    assert [len(page) for page in pages] == [4, 4, 3]
+    store.close()
+
+
+def test_find_page_rejects_invalid_limit(store) -> None:
+    schema = _seed(store, 1)
+    with pytest.raises(Namel3ssError):
+        store.find_page(schema, lambda _rec: True, limit=0)
+
+
+def test_record_preview_counts_every_row(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    schema = _seed(store, 8)
+    rows, counts, errors = collect_record_preview([schema], store, None, limit=3)
+    assert [row["id"] for row in rows["Item"]] == [1, 2, 3]
+    assert counts == {"Item": 8}
+    assert errors == {}
+    store.close()
+
+
+class _PageCountingStore(SQLiteStore):
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.pages = 0
+
+    def find_page(self, *args, **kwargs):
+        self.pages += 1
+        return super().find_page(*args, **kwargs)
+
+
+def test_flow_find_reads_through_store_pages(tmp_path: Path) -> None:
+    source = '''record "Item":
+  name text
+
+spec is "1.0"
+
+flow "demo": requires true
+  find "Item" where name is not "skip"
+  return item_results
+'''
+    store = _PageCountingStore(tmp_path / "data.db")
+    _seed(store, 3)
+    result = run_flow(source, store=store)
+    assert [row["name"] for row in result.last_value] == ["item-1", "item-2", "item-3"]
+    assert store.pages == 1
+    store.close()
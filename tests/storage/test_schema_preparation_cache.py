@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from namel3ss.runtime.storage.sqlite_store import SQLiteStore
+from namel3ss.schema.records import FieldSchema, RecordSchema
+
+
+def _schema(*extra: str) -> RecordSchema:
+    fields = [FieldSchema(name="id", type_name="number"), FieldSchema(name="name", type_name="text")]
+    fields.extend(FieldSchema(name=name, type_name="text") for name in extra)
+    return RecordSchema(name="Item", fields=fields)
+
+
+def _traced(store: SQLiteStore) -> list[str]:
+    statements: list[str] = []
+    store.conn.set_trace_callback(statements.append)
+    return statements
+
+
+def _introspection(statements: list[str]) -> list[str]:
+    markers = ("PRAGMA table_info", "PRAGMA index_list", "sqlite_master", "CREATE TABLE", "ALTER TABLE")
+    return [sql for sql in statements if any(marker in sql for marker in markers)]
+
+
+def test_prepared_schema_skips_introspection(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    schema = _schema()
+    store.save(schema, {"name": "first"})
+    statements = _traced(store)
+    store.save(schema, {"name": "second"})
+    store.find(schema, lambda _rec: True)
+    store.list_records(schema)
+    store.check_unique(schema, {"name": "third"})
+    assert _introspection(statements) == []
+    store.close()
+
+
+def test_schema_change_prepares_again(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    store.save(_schema(), {"name": "first"})
+    statements = _traced(store)
+    store.save(_schema("note"), {"name": "second", "note": "added"})
+    assert any("ALTER TABLE" in sql for sql in statements)
+    assert [row.get("note") for row in store.find(_schema("note"), lambda _rec: True)] == [None, "added"]
+    store.close()
+
+
+def test_clear_and_rollback_invalidate_prepared_schemas(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "data.db")
+    schema = _schema()
+    store.save(schema, {"name": "first"})
+    store.clear()
+    assert store.find(schema, lambda _rec: True) == []
+    store.begin()
+    store.save(_schema("note"), {"name": "draft", "note": "x"})
+    store.rollback()
+    store.save(_schema("note"), {"name": "kept", "note": "y"})
+    assert [row["name"] for row in store.find(_schema("note"), lambda _rec: True)] == ["kept"]
+    store.close()
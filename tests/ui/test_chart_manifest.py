@@ -74,6 +74,20 @@ def test_chart_summary_defaults_and_explain():
     assert chart["explain"] == "Summary of Metric for value."
 
 
+def test_table_and_chart_read_their_row_limits_from_the_store():
+    program = lower_ir_program(SUMMARY_SOURCE)
+    store = MemoryStore()
+    record = _load_record(program, "Metric")
+    for index in range(30):
+        store.save(record, {"name": f"m{index}", "value": 1})
+    manifest = build_manifest(program, state={}, store=store)
+    elements = manifest["pages"][0]["elements"]
+    table = next(el for el in elements if el["type"] == "table")
+    chart = next(el for el in elements if el["type"] == "chart")
+    assert len(table["rows"]) == 20
+    assert chart["summary"]["count"] == 30
+
+
 def test_chart_series_bar_is_deterministic():
     program = lower_ir_program(BAR_SOURCE)
     store = MemoryStore()
@@ -20,6 +20,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from namel3ss.cli.doc_mode import build_doc_payload
+from namel3ss.config.model import AppConfig
 from namel3ss.determinism import canonical_json_dumps
 from namel3ss.ingestion.detect import detect_upload
 from namel3ss.ingestion.gate import gate_quality
@@ -32,7 +33,12 @@ from namel3ss.ir.nodes import lower_program
 from namel3ss.ir.serialize import dump_ir
 from namel3ss.lexer.lexer import Lexer
 from namel3ss.lexer.scan_payload import tokens_to_payload
+from namel3ss.module_loader import load_project
+from namel3ss.module_loader.compiled_cache import COMPILED_DIR, compiled_cache_root
 from namel3ss.parser.core import parse
+from namel3ss.runtime.embeddings.ann import build_ivf_index
+from namel3ss.runtime.embeddings.service import embed_text, resolve_embedding_model
+from namel3ss.runtime.embeddings.vectors import VectorMatrix
 from namel3ss.runtime.audit import audit_report_json, build_audit_report, build_decision_model
 from namel3ss.runtime.executor.api import execute_program_flow
 from namel3ss.runtime.native.exec_adapter import _reset_exec_state, native_exec_available
@@ -85,9 +91,11 @@ def build_report(config: BenchConfig) -> dict:
     suites = []
     suites.append(_bench_scan(config))
     suites.append(_bench_lowering(config))
+    suites.append(_bench_cold_start(config))
     suites.append(_bench_audit(config))
     suites.append(_bench_ingestion_gate(config))
     suites.append(_bench_exec_parity(config))
+    suites.append(_bench_embedding_ann(config))
     fixture_sets = _fixture_sets()
     suite_defs = _suite_definitions(suites)
     report_signature = _report_signature(runtime_signature, suite_defs, fixture_sets)
@@ -139,6 +147,34 @@ def _bench_lowering(config: BenchConfig) -> dict:
     }
     return _suite_entry("lowering", [_case_entry("starter_template", config.iterations, metrics, timing)])
 
+def _bench_cold_start(config: BenchConfig) -> dict:
+    source = _ensure_spec(_read_text_fixture("templates", "starter_template.ai"))
+    with tempfile.TemporaryDirectory() as tmp, _env_override({"N3_PERSIST_ROOT": tmp}):
+        app_path = Path(tmp) / "app.ai"
+        app_path.write_text(source, encoding="utf-8")
+        expected = dump_ir(load_project(app_path).program)
+        load_project(app_path, compiled_cache=True)
+        cached = []
+        def _run_compile() -> None:
+            load_project(app_path)
+        def _run_cached() -> None:
+            cached[:] = [load_project(app_path, compiled_cache=True)]
+
+        compile_timing = _measure(config, _run_compile)
+        cached_timing = _measure(config, _run_cached)
+        matches = int(bool(cached) and dump_ir(cached[0].program) == expected)
+        blobs = list((compiled_cache_root(app_path) / COMPILED_DIR).glob("*.pickle"))
+    metrics = {
+        "source_bytes": len(source.encode("utf-8")),
+        "compiled_blobs": len(blobs),
+        "ir_match": matches,
+    }
+    timings = {
+        "compile": _timing_payload(compile_timing, config.iterations),
+        "cached": _timing_payload(cached_timing, config.iterations),
+    }
+    return _suite_entry("cold_start", [_case_entry("compiled_cache", config.iterations, metrics, timings)])
+
 def _bench_audit(config: BenchConfig) -> dict:
     payload = json.loads(_read_text_fixture("doctor", "audit_input.json"))
     state = payload.get("state") if isinstance(payload, dict) else {}
@@ -232,6 +268,54 @@ def _bench_exec_parity(config: BenchConfig) -> dict:
     }
     return _suite_entry("exec_parity", [_case_entry("native_exec_basic", config.iterations, metrics, timings)])
 
+def _bench_embedding_ann(config: BenchConfig) -> dict:
+    model = resolve_embedding_model(AppConfig())
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "theta", "lambda", "zeta", "rho", "tau"]
+    items = []
+    for position in range(2000):
+        text = " ".join([words[(position * step) % len(words)] for step in (1, 5, 7, 11)] + [f"term{position % 97}"])
+        items.append((hashlib.sha256(text.encode("utf-8") + str(position).encode("ascii")).hexdigest(), text))
+    matrix = VectorMatrix()
+    for chunk_hash, text in items:
+        matrix.add(chunk_hash=chunk_hash, chunk_id=chunk_hash, dims=model.dims, status="ok", vector=embed_text(text, model))
+    hashes = [chunk_hash for chunk_hash, _ in items]
+    allowed = set(hashes)
+    queries = [embed_text(f"{words[i % len(words)]} {words[(i * 5) % len(words)]} term{i * 7 % 97}", model) for i in range(20)]
+    limit = model.candidate_limit
+    index = build_ivf_index([(chunk_hash, matrix.vector(chunk_hash)) for chunk_hash in hashes], dims=model.dims)
+    exact_top: list[set[str]] = []
+    ivf_top: list[set[str]] = []
+    scored = 0
+    def _top(candidates: list[str], query: list[float]) -> set[str]:
+        scores = matrix.dot(candidates, query)
+        ordered = sorted(zip(scores, candidates), key=lambda item: (-item[0], item[1]))
+        return {chunk_hash for _, chunk_hash in ordered[:limit]}
+    def _run_exact() -> None:
+        exact_top[:] = [_top(hashes, query) for query in queries]
+    def _run_ivf() -> None:
+        nonlocal scored
+        found = [index.search(query, probes=model.index_probes, limit=limit, allowed=allowed) for query in queries]
+        scored = sum(len(candidates) for candidates in found)
+        ivf_top[:] = [_top(candidates, query) for candidates, query in zip(found, queries)]
+
+    exact_timing = _measure(config, _run_exact)
+    ivf_timing = _measure(config, _run_ivf)
+    hits = sum(len(exact & approximate) for exact, approximate in zip(exact_top, ivf_top))
+    metrics = {
+        "vectors": len(hashes),
+        "queries": len(queries),
+        "lists": len(index.lists),
+        "probes": model.index_probes,
+        "candidate_limit": limit,
+        "recall_per_mille": (hits * 1000) // (limit * len(queries)),
+        "scored_per_query": scored // len(queries),
+    }
+    timings = {
+        "exact": _timing_payload(exact_timing, len(hashes) * len(queries)),
+        "ivf": _timing_payload(ivf_timing, len(hashes) * len(queries)),
+    }
+    return _suite_entry("embedding_ann", [_case_entry("ivf_recall", config.iterations, metrics, timings)])
+
 def _run_ingestion_case(
     *,
     name: str,
@@ -395,11 +479,13 @@ def _fixture_sets() -> dict:
     return {
         "scan_basic": "scan_basic",
         "starter_template": "starter_template",
+        "compiled_cache": "starter_template",
         "audit_basic": "audit_basic",
         "ingestion_valid": "ingestion_valid",
         "ingestion_cracked_null": "ingestion_cracked_null",
         "ingestion_redact": "ingestion_redact",
         "native_exec_basic": "native_exec_basic",
+        "ivf_recall": "synthetic_hash_corpus",
     }
 
 def _suite_definitions(suites: list[dict]) -> list[dict]: